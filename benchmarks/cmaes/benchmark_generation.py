@@ -0,0 +1,56 @@
+"""Measure the time that CMA-ES needs per generation.
+
+The objective function is trivial so that we only measure the overhead of
+the optimizer: sampling, bound handling and the update of the search
+distribution.
+"""
+import timeit
+import numpy as np
+from bolero.optimizer import CMAESOptimizer
+
+
+n_params_list = [10, 100, 1000]
+n_generations = {10: 2000, 100: 500, 1000: 20}
+variants = {
+    "CMA-ES": {},
+    "aCMA-ES": {"active": True},
+    "CMA-ES with bounds": {"bounds_scale": 1.0},
+}
+
+
+def make_optimizer(n_params, active=False, bounds_scale=None):
+    if bounds_scale is None:
+        bounds = None
+    else:
+        bounds = np.array([[-bounds_scale, bounds_scale]] * n_params)
+    opt = CMAESOptimizer(active=active, bounds=bounds, maximize=False,
+                         random_state=0)
+    opt.init(n_params)
+    return opt
+
+
+def run_generations(opt, n_generations):
+    for _ in range(n_generations):
+        X = opt.get_next_parameters_batch()
+        opt.set_evaluation_feedback_batch(np.sum(X ** 2, axis=1))
+
+
+def benchmark():
+    """Return seconds per generation for each variant and dimension."""
+    results = {}
+    for name, kwargs in sorted(variants.items()):
+        for n_params in n_params_list:
+            opt = make_optimizer(n_params, **kwargs)
+            n = n_generations[n_params]
+            times = timeit.repeat(lambda: run_generations(opt, n), repeat=3,
+                                  number=1)
+            results[(name, n_params)] = min(times) / n
+    return results
+
+
+if __name__ == "__main__":
+    results = benchmark()
+    print("%-20s %10s %22s" % ("Variant", "n_params", "Time per generation"))
+    for name, n_params in sorted(results.keys()):
+        print("%-20s %10d %19.3f ms"
+              % (name, n_params, 1000.0 * results[(name, n_params)]))
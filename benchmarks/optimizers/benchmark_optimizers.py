@@ -0,0 +1,201 @@
+"""Benchmark all optimizers on all objective functions.
+
+Each optimizer from bolero.optimizer.__all__ is run on each function from
+bolero.environment.objective_functions.FUNCTIONS for several numbers of
+dimensions and random seeds. We record the sample efficiency (error of the
+best solution after each number of evaluations) and the wall-clock time that
+the optimizer needs (the time for the objective function is excluded).
+Results will be stored in a JSON file that can be compared with results of
+another commit by compare_results.py.
+"""
+from __future__ import print_function
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+import numpy as np
+import bolero
+import bolero.optimizer
+from bolero.optimizer import Optimizer
+from bolero.environment.objective_functions import FUNCTIONS
+
+
+TARGETS = [1e2, 1e1, 1e0, 1e-1, 1e-2, 1e-3, 1e-5, 1e-8]
+
+# Some optimizers require additional constructor arguments
+ADDITIONAL_ARGS = {
+    "SkOptOptimizer": lambda n_dims: {"dimensions": [(-5.0, 5.0)] * n_dims},
+}
+
+
+def available_optimizers():
+    """Get all non-contextual optimizers from bolero.optimizer.__all__."""
+    optimizers = {}
+    for name in bolero.optimizer.__all__:
+        Opt = getattr(bolero.optimizer, name)
+        if (isinstance(Opt, type) and issubclass(Opt, Optimizer) and
+                Opt is not Optimizer and
+                not getattr(Opt, "__abstractmethods__", None)):
+            optimizers[name] = Opt
+    return optimizers
+
+
+def make_optimizer(name, Opt, n_dims, seed):
+    kwargs = {}
+    if name in ADDITIONAL_ARGS:
+        kwargs.update(ADDITIONAL_ARGS[name](n_dims))
+    if "random_state" in Opt._get_arg_names():
+        kwargs["random_state"] = seed
+    return Opt(**kwargs)
+
+
+def update_interval(opt):
+    """Number of evaluations between two updates of the optimizer."""
+    for attr in ["train_freq", "n_samples_per_update"]:
+        interval = getattr(opt, attr, None)
+        if interval is not None:
+            return interval
+    return 1
+
+
+def checkpoints(budget):
+    """Numbers of evaluations after which the error will be recorded."""
+    n_evals = np.unique(np.round(np.logspace(0, np.log10(budget), 20)))
+    return [int(n) for n in n_evals]
+
+
+def run(optimizer_name, Opt, function_name, n_dims, seed, budget):
+    """Perform one benchmark run.
+
+    Returns
+    -------
+    result : dict
+        Result of the run
+    """
+    result = {"optimizer": optimizer_name, "function": function_name,
+              "n_dims": n_dims, "seed": seed, "budget": budget}
+    objective = FUNCTIONS[function_name](seed, n_dims)
+    opt = make_optimizer(optimizer_name, Opt, n_dims, seed)
+
+    time_ask = 0.0
+    time_tell = 0.0
+    best_feedback = -np.inf
+    errors = np.empty(budget)
+    params = np.empty(n_dims)
+    try:
+        start = time.time()
+        opt.init(n_dims)
+        time_init = time.time() - start
+        for i in range(budget):
+            start = time.time()
+            opt.get_next_parameters(params)
+            time_ask += time.time() - start
+
+            feedback = objective.feedback(params)
+
+            start = time.time()
+            opt.set_evaluation_feedback(np.array([feedback]))
+            time_tell += time.time() - start
+
+            best_feedback = max(best_feedback, feedback)
+            errors[i] = objective.f_opt - best_feedback
+    except Exception as e:
+        result["exception"] = "%s: %s" % (type(e).__name__, e)
+        return result
+
+    n_updates = budget // update_interval(opt)
+    result.update({
+        "time_init": time_init,
+        "time_ask_per_eval": time_ask / budget,
+        "time_tell_per_eval": time_tell / budget,
+        "n_updates": n_updates,
+        "time_per_update": time_tell / max(n_updates, 1),
+        "final_error": float(errors[-1]),
+        "errors": [float(errors[n - 1]) for n in checkpoints(budget)],
+        "evals_to_target": dict(
+            ("%g" % target, _first_below(errors, target))
+            for target in TARGETS)
+    })
+    return result
+
+
+def _first_below(errors, target):
+    idx = np.nonzero(errors <= target)[0]
+    if len(idx) == 0:
+        return None
+    return int(idx[0]) + 1
+
+
+def git_revision():
+    """Commit of the repository that contains this benchmark."""
+    try:
+        with open(os.devnull, "w") as devnull:
+            return subprocess.check_output(
+                ["git", "rev-parse", "HEAD"], stderr=devnull,
+                cwd=os.path.dirname(os.path.abspath(__file__))
+            ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark(optimizers, functions, dims, seeds, evals_per_dim, verbose=0):
+    all_optimizers = available_optimizers()
+    results = []
+    for optimizer_name in optimizers:
+        Opt = all_optimizers[optimizer_name]
+        for function_name in functions:
+            for n_dims in dims:
+                budget = evals_per_dim * n_dims
+                for seed in seeds:
+                    result = run(optimizer_name, Opt, function_name, n_dims,
+                                 seed, budget)
+                    if verbose:
+                        print("%s on %s (%d dims, seed %d): %s" % (
+                            optimizer_name, function_name, n_dims, seed,
+                            result.get("exception",
+                                       "%g" % result.get("final_error"))))
+                    results.append(result)
+    return results
+
+
+def main():
+    all_optimizers = sorted(available_optimizers().keys())
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--optimizers", nargs="+", default=all_optimizers,
+                        choices=all_optimizers)
+    parser.add_argument("--functions", nargs="+",
+                        default=sorted(FUNCTIONS.keys()),
+                        choices=sorted(FUNCTIONS.keys()))
+    parser.add_argument("--dims", nargs="+", type=int, default=[2, 10])
+    parser.add_argument("--seeds", type=int, default=5,
+                        help="Number of random seeds per configuration")
+    parser.add_argument("--evals-per-dim", type=int, default=100,
+                        help="Budget of evaluations per dimension")
+    parser.add_argument("--output", default="results.json")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    results = benchmark(args.optimizers, args.functions, args.dims,
+                        list(range(args.seeds)), args.evals_per_dim,
+                        args.verbose)
+    output = {
+        "metadata": {
+            "git_revision": git_revision(),
+            "bolero_version": getattr(bolero, "__version__", None),
+            "numpy_version": np.__version__,
+            "python_version": platform.python_version(),
+            "machine": platform.platform(),
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "targets": TARGETS,
+            "arguments": vars(args),
+        },
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=1, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Compare results of benchmark_optimizers.py from two commits.
+
+Results are aggregated over random seeds (median). We report the relative
+change of the time per evaluation and per update and the change of the
+final error (in orders of magnitude) for each optimizer and function.
+Changes that exceed the given thresholds will be marked.
+"""
+from __future__ import print_function
+import argparse
+import json
+from collections import defaultdict
+import numpy as np
+
+
+def load(filename):
+    with open(filename, "r") as f:
+        return json.load(f)
+
+
+def aggregate(results):
+    """Compute median over seeds for each configuration."""
+    groups = defaultdict(list)
+    for result in results:
+        key = (result["optimizer"], result["function"], result["n_dims"])
+        groups[key].append(result)
+
+    aggregated = {}
+    for key, runs in groups.items():
+        successful = [run for run in runs if "exception" not in run]
+        if len(successful) == 0:
+            aggregated[key] = {"exception": runs[0]["exception"]}
+            continue
+        aggregated[key] = dict(
+            (measure, float(np.median([run[measure] for run in successful])))
+            for measure in ["time_ask_per_eval", "time_tell_per_eval",
+                            "time_per_update", "final_error"])
+    return aggregated
+
+
+def log_error(error, floor=1e-12):
+    return np.log10(max(error, floor))
+
+
+def compare(old, new, time_threshold, error_threshold):
+    """Print comparison of two aggregated results.
+
+    Returns
+    -------
+    n_regressions : int
+        Number of configurations that became slower or worse
+    """
+    n_regressions = 0
+    header = "%-24s %-24s %5s %10s %10s %10s" % (
+        "optimizer", "function", "dims", "eval time", "upd. time",
+        "log error")
+    print(header)
+    print("-" * len(header))
+    for key in sorted(set(old.keys()) & set(new.keys())):
+        o = old[key]
+        n = new[key]
+        if "exception" in o or "exception" in n:
+            print("%-24s %-24s %5d %s" % (
+                key + (n.get("exception", "fixed: " + o.get("exception", "")),
+                       )))
+            continue
+
+        time_eval = _relative_change(
+            o["time_ask_per_eval"] + o["time_tell_per_eval"],
+            n["time_ask_per_eval"] + n["time_tell_per_eval"])
+        time_update = _relative_change(o["time_per_update"],
+                                       n["time_per_update"])
+        error = log_error(n["final_error"]) - log_error(o["final_error"])
+
+        regression = (time_eval > time_threshold or
+                      time_update > time_threshold or
+                      error > error_threshold)
+        n_regressions += int(regression)
+        print("%-24s %-24s %5d %+9.1f%% %+9.1f%% %+10.2f%s" % (
+            key + (100.0 * time_eval, 100.0 * time_update, error,
+                   " *" if regression else "")))
+    return n_regressions
+
+
+def _relative_change(old, new):
+    if old == 0.0:
+        return 0.0
+    return (new - old) / old
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("old", help="Results of the reference commit")
+    parser.add_argument("new", help="Results of the new commit")
+    parser.add_argument("--time-threshold", type=float, default=0.2,
+                        help="Maximum tolerated relative increase of time")
+    parser.add_argument("--error-threshold", type=float, default=1.0,
+                        help="Maximum tolerated increase of the final error "
+                        "in orders of magnitude")
+    args = parser.parse_args()
+
+    old = load(args.old)
+    new = load(args.new)
+    print("Old: %s (%s)" % (old["metadata"]["git_revision"],
+                            old["metadata"]["date"]))
+    print("New: %s (%s)" % (new["metadata"]["git_revision"],
+                            new["metadata"]["date"]))
+    print("")
+    n_regressions = compare(aggregate(old["results"]),
+                            aggregate(new["results"]),
+                            args.time_threshold, args.error_threshold)
+    print("")
+    print("%d regression(s)" % n_regressions)
+
+
+if __name__ == "__main__":
+    main()
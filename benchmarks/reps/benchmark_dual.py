@@ -0,0 +1,111 @@
+"""Measure the time that the dual functions of REPS and C-REPS need.
+
+The previous implementation with numerical gradients is included as a
+reference.
+"""
+import timeit
+import numpy as np
+from scipy.optimize import fmin_l_bfgs_b
+from bolero.optimizer.reps import solve_dual_reps
+from bolero.optimizer.creps import solve_dual_contextual_reps
+from bolero.representation.context_transformations import (
+    CONTEXT_TRANSFORMATIONS)
+from bolero.utils.mathext import logsumexp
+
+
+n_samples_list = [100, 1000, 10000]
+context_features_list = ["affine", "quadratic", "cubic"]
+n_context_dims = 3
+n_updates = 8
+epsilon = 2.0
+min_eta = 1e-8
+
+
+def reference_dual_reps(R):
+    R = (R - R.min()) / (R.max() - R.min())
+
+    def g(eta):
+        return eta * epsilon + eta * logsumexp(R / eta, b=1.0 / len(R))
+
+    return fmin_l_bfgs_b(g, [1], approx_grad=True,
+                         bounds=np.array([[min_eta, None]]))[0]
+
+
+def reference_dual_contextual_reps(S, R):
+    def g(x):
+        eta = x[0]
+        nu = x[1:]
+        return (eta * epsilon + nu.T.dot(S.mean(axis=0)) +
+                eta * logsumexp((R - nu.dot(S.T)) / eta, b=1.0 / len(R)))
+
+    bounds = np.vstack(([[min_eta, None]], np.tile(None, (S.shape[1], 2))))
+    return fmin_l_bfgs_b(g, [1] + [1] * S.shape[1], approx_grad=True,
+                         bounds=bounds)[0]
+
+
+def make_windows(n_samples, context_features, random_state):
+    """Sliding windows of contexts features and returns."""
+    n_new = n_samples // 4
+    n_total = n_samples + (n_updates - 1) * n_new
+    contexts = random_state.rand(n_total, n_context_dims)
+    R = (-np.sum((contexts - 0.5) ** 2, axis=1) +
+         0.1 * random_state.randn(n_total))
+    S = CONTEXT_TRANSFORMATIONS[context_features](contexts)
+    return [(S[i * n_new:i * n_new + n_samples],
+             R[i * n_new:i * n_new + n_samples]) for i in range(n_updates)]
+
+
+def run_reference(windows, contextual):
+    for S, R in windows:
+        if contextual:
+            reference_dual_contextual_reps(S, R)
+        else:
+            reference_dual_reps(R)
+
+
+def run(windows, contextual, warm_start):
+    eta = None
+    nu = None
+    for S, R in windows:
+        if contextual:
+            _, eta_, nu_ = solve_dual_contextual_reps(
+                S, R, epsilon, min_eta, eta, nu)
+        else:
+            _, eta_ = solve_dual_reps(R, epsilon, min_eta, eta)
+            nu_ = None
+        if warm_start:
+            eta, nu = eta_, nu_
+
+
+def measure(fun):
+    return min(timeit.repeat(fun, repeat=3, number=1)) / n_updates
+
+
+def benchmark():
+    """Return seconds per update of the reference, cold and warm solver."""
+    random_state = np.random.RandomState(0)
+    results = {}
+    for n_samples in n_samples_list:
+        for context_features in [None] + context_features_list:
+            contextual = context_features is not None
+            windows = make_windows(n_samples, context_features or "affine",
+                                   random_state)
+            results[(n_samples, context_features or "-")] = (
+                measure(lambda: run_reference(windows, contextual)),
+                measure(lambda: run(windows, contextual, False)),
+                measure(lambda: run(windows, contextual, True)))
+    return results
+
+
+if __name__ == "__main__":
+    results = benchmark()
+    print("%-7s %10s %10s %12s %12s %12s"
+          % ("Dual", "n_samples", "Features", "Reference", "Analytic",
+             "Warm start"))
+    for key in sorted(results.keys()):
+        n_samples, context_features = key
+        reference_time, cold_time, warm_time = results[key]
+        print("%-7s %10d %10s %9.3f ms %9.3f ms %9.3f ms"
+              % ("REPS" if context_features == "-" else "C-REPS", n_samples,
+                 context_features, 1000.0 * reference_time,
+                 1000.0 * cold_time, 1000.0 * warm_time))
@@ -0,0 +1,79 @@
+"""Measure the time of weighted maximum-likelihood updates of policies.
+
+The previous implementation with one outer product per sample is included
+as a reference.
+"""
+import timeit
+import numpy as np
+from bolero.representation.ul_policies import (ConstantGaussianPolicy,
+                                               LinearGaussianPolicy)
+
+
+n_samples_list = [10, 100, 1000]
+n_params_list = [10, 100, 500]
+n_context_features = 10
+
+
+def reference_constant_fit(Y, weights):
+    mean = (weights * Y.T).sum(axis=1) / weights.sum()
+    Z = (weights.sum() ** 2 - (weights ** 2).sum()) / weights.sum()
+    nominator = np.zeros((Y.shape[1], Y.shape[1]))
+    for i in range(Y.shape[0]):
+        temp = Y[i] - mean
+        nominator += weights[i] * np.outer(temp, temp)
+    return mean, nominator / (1e-10 + Z)
+
+
+def reference_linear_fit(X, Y, weights, W, gamma=0.0):
+    Z = (weights.sum() ** 2 - (weights ** 2).sum()) / weights.sum()
+    nominator = np.zeros((Y.shape[1], Y.shape[1]))
+    for i in range(Y.shape[0]):
+        temp = Y[i] - W.dot(X[i])
+        nominator += weights[i] * np.outer(temp, temp)
+    D = np.diag(weights)
+    W = np.linalg.pinv(X.T.dot(D).dot(X) + np.eye(X.shape[1]) *
+                       gamma).dot(X.T).dot(D).dot(Y).T
+    return W, nominator / Z
+
+
+def measure(fit, n_repeats):
+    return min(timeit.repeat(fit, repeat=3, number=n_repeats)) / n_repeats
+
+
+def benchmark():
+    """Return seconds per fit of each policy and reference."""
+    random_state = np.random.RandomState(0)
+    results = {}
+    for n_samples in n_samples_list:
+        for n_params in n_params_list:
+            X = random_state.randn(n_samples, n_context_features)
+            Y = random_state.randn(n_samples, n_params)
+            weights = random_state.rand(n_samples)
+            n_repeats = max(1, 20000 // (n_samples * n_params))
+
+            constant = ConstantGaussianPolicy(n_params)
+            linear = LinearGaussianPolicy(n_params, n_context_features)
+            W = linear.W.copy()
+
+            results[("constant", n_samples, n_params)] = (
+                measure(lambda: constant.fit(None, Y, weights), n_repeats),
+                measure(lambda: reference_constant_fit(Y, weights),
+                        n_repeats))
+            results[("linear", n_samples, n_params)] = (
+                measure(lambda: linear.fit(X, Y, weights), n_repeats),
+                measure(lambda: reference_linear_fit(X, Y, weights, W),
+                        n_repeats))
+    return results
+
+
+if __name__ == "__main__":
+    results = benchmark()
+    print("%-10s %10s %10s %12s %12s %8s"
+          % ("Policy", "n_samples", "n_params", "Fit", "Reference",
+             "Speedup"))
+    for key in sorted(results.keys()):
+        name, n_samples, n_params = key
+        fit_time, reference_time = results[key]
+        print("%-10s %10d %10d %9.3f ms %9.3f ms %7.1fx"
+              % (name, n_samples, n_params, 1000.0 * fit_time,
+                 1000.0 * reference_time, reference_time / fit_time))
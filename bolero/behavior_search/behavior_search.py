@@ -4,6 +4,7 @@ from abc import ABCMeta, abstractmethod
 from ..utils import NonContextualException
 from ..base import Base
 import pickle
+import copy
 
 
 class ContextualBehaviorSearch(Base):
@@ -132,6 +133,20 @@ class BehaviorSearch(Base):
             mapping from input to output
         """
 
+    def get_next_behaviors(self):
+        """Obtain all behaviors that can be evaluated before the next update.
+
+        The feedbacks for these behaviors must be passed to
+        :func:`set_evaluation_feedback` in the same order. The default
+        implementation only returns the next behavior.
+
+        Returns
+        -------
+        behaviors : list of Behavior
+            Independent copies of the behaviors
+        """
+        return [copy.deepcopy(self.get_next_behavior())]
+
     @abstractmethod
     def set_evaluation_feedback(self, feedbacks):
         """Set feedback for the last behavior.
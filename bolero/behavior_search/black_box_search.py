@@ -1,6 +1,7 @@
 # Author: Alexander Fabisch <afabisch@informatik.uni-bremen.de>
 #         Jan Hendrik Metzen <jhm@informatik.uni-bremen.de>
 
+import copy
 import numpy as np
 from .behavior_search import BehaviorSearch, ContextualBehaviorSearch
 from .behavior_search import PickableMixin
@@ -102,6 +103,47 @@ class BlackBoxSearch(BlackBoxSearchMixin, PickableMixin, BehaviorSearch):
         self.behavior.set_meta_parameters(self.metaparameter_keys,
                                           self.metaparameter_values)
         self.params = np.zeros(self.n_params)
+        self.n_pending_feedbacks = 0
+        self.pending_feedbacks = []
+
+    def get_next_behavior(self):
+        self._set_pending_feedbacks()
+        return super(BlackBoxSearch, self).get_next_behavior()
+
+    def get_best_behavior(self):
+        self._set_pending_feedbacks()
+        return super(BlackBoxSearch, self).get_best_behavior()
+
+    def get_next_behaviors(self):
+        self._set_pending_feedbacks()
+        params = self.optimizer.get_next_parameters_batch()
+        self.n_pending_feedbacks = len(params)
+
+        behaviors = []
+        for p in params:
+            self.behavior.set_params(p)
+            self.behavior.reset()
+            behaviors.append(copy.deepcopy(self.behavior))
+        return behaviors
+
+    def set_evaluation_feedback(self, feedbacks):
+        if self.n_pending_feedbacks > 0:
+            self.pending_feedbacks.append(feedbacks)
+            self.n_pending_feedbacks -= 1
+            if self.n_pending_feedbacks == 0:
+                self._set_pending_feedbacks()
+        else:
+            self.optimizer.set_evaluation_feedback(feedbacks)
+
+    def _set_pending_feedbacks(self):
+        # Feedbacks of a batch that has not been evaluated completely, e.g.
+        # because the controller reached its number of episodes, will be
+        # passed to the optimizer before it generates new parameters.
+        if self.pending_feedbacks:
+            self.optimizer.set_evaluation_feedback_batch(
+                self.pending_feedbacks)
+            self.pending_feedbacks = []
+        self.n_pending_feedbacks = 0
 
 
 class JustOptimizer(BlackBoxSearch):
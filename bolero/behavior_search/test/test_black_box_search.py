@@ -2,9 +2,10 @@ import numpy as np
 import os
 from bolero.behavior_search import BlackBoxSearch
 from bolero.representation import ConstantBehavior
-from bolero.optimizer import NoOptimizer
+from bolero.optimizer import NoOptimizer, CMAESOptimizer
 from bolero.utils.testing import assert_pickle
-from nose.tools import assert_false, assert_true, assert_raises_regexp
+from nose.tools import (assert_false, assert_true, assert_raises_regexp,
+                        assert_equal)
 from numpy.testing import assert_array_equal
 
 
@@ -43,6 +44,33 @@ def test_black_box_search_protocol():
     bs.set_evaluation_feedback(np.array([0.0]))
 
 
+def test_black_box_search_passes_batches_of_feedbacks():
+    bs = BlackBoxSearch(ConstantBehavior(),
+                        CMAESOptimizer(n_samples_per_update=4, random_state=0))
+    bs.init(2, 2)
+    batch_sizes = []
+    set_evaluation_feedback_batch = bs.optimizer.set_evaluation_feedback_batch
+
+    def record_batch(feedbacks):
+        batch_sizes.append(len(feedbacks))
+        set_evaluation_feedback_batch(feedbacks)
+    bs.optimizer.set_evaluation_feedback_batch = record_batch
+
+    behaviors = bs.get_next_behaviors()
+    assert_equal(len(behaviors), 4)
+    for _ in behaviors:
+        bs.set_evaluation_feedback(np.array([0.0]))
+    assert_equal(batch_sizes, [4])
+
+    # Feedbacks of an incomplete batch are passed on with the next request
+    bs.get_next_behaviors()
+    bs.set_evaluation_feedback(np.array([0.0]))
+    bs.set_evaluation_feedback(np.array([0.0]))
+    assert_equal(batch_sizes, [4])
+    bs.get_best_behavior()
+    assert_equal(batch_sizes, [4, 2])
+
+
 def test_save_black_box_search():
     bs = BlackBoxSearch(ConstantBehavior(), NoOptimizer())
     bs.init(5, 5)
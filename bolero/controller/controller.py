@@ -1,15 +1,174 @@
 # Author: Alexander Fabisch <afabisch@informatik.uni-bremen.de>
 #         Jan Hendrik Metzen <jhm@informatik.uni-bremen.de>
 
+import os
 import numpy as np
 import warnings
+import multiprocessing
+import cProfile
+from timeit import default_timer as _timer
 from ..utils import from_dict
 from ..utils.validation import check_feedback
+from ..utils.recording import TrajectoryBuffer
 from ..environment import Environment, ContextualEnvironment
 from ..behavior_search import BehaviorSearch
 from ..base import Base
 
 
+# Phases of an episode that will be timed if 'record_timing' is activated
+_PHASES = ("get_behavior", "behavior_step", "environment_step",
+           "search_update", "test", "episode")
+
+
+def _rollout(environment, behavior, inputs, outputs, recorded_inputs=None,
+             recorded_outputs=None, durations=None):
+    """Execute a behavior in an environment until the evaluation is done.
+
+    If the behavior is open-loop and the environment can execute
+    trajectories, all outputs of the behavior will be generated at once and
+    passed to the environment in one call instead of stepping both.
+
+    Parameters
+    ----------
+    environment : Environment
+        Initialized environment
+
+    behavior : Behavior
+        Behavior, the meta parameters have to be set already
+
+    inputs : array, shape (n_inputs,)
+        Buffer for the inputs of the environment, will be modified
+
+    outputs : array, shape (n_outputs,)
+        Buffer for the outputs of the environment, will be modified
+
+    recorded_inputs : TrajectoryBuffer, optional (default: None)
+        Record the inputs of the environment for each step in a new episode
+        of this buffer
+
+    recorded_outputs : TrajectoryBuffer, optional (default: None)
+        Record the outputs of the environment for each step in a new episode
+        of this buffer
+
+    durations : dict, optional (default: None)
+        The time spent in the behavior will be added to the entry
+        'behavior_step' and the remaining time of the rollout to
+        'environment_step'
+
+    Returns
+    -------
+    feedbacks : array, shape (n_steps,)
+        Feedback for each step in the environment
+    """
+    timed = durations is not None
+    if timed:
+        start = _timer()
+        behavior_time = 0.0
+
+    environment.reset()
+
+    record_inputs = recorded_inputs is not None
+    record_outputs = recorded_outputs is not None
+
+    # Sense initial state
+    environment.get_outputs(outputs)
+    if behavior.is_open_loop() and environment.can_execute_trajectory():
+        if timed:
+            behavior_start = _timer()
+        behavior.set_inputs(outputs)
+        trajectory = behavior.get_output_trajectory()
+        if len(trajectory) == 0:
+            trajectory = inputs[np.newaxis]
+        if timed:
+            behavior_time += _timer() - behavior_start
+        # Act and sense for the whole episode
+        sensed = environment.execute_trajectory(trajectory)
+
+        n_steps = len(sensed)
+        if n_steps > 0:
+            trajectory = trajectory[np.minimum(np.arange(n_steps),
+                                               len(trajectory) - 1)]
+            inputs[:] = trajectory[-1]
+            outputs[:] = sensed[-1]
+        if record_inputs:
+            recorded_inputs.append(trajectory)
+        if record_outputs:
+            recorded_outputs.append(sensed)
+    else:
+        if record_inputs:
+            recorded_inputs.start_episode()
+        if record_outputs:
+            recorded_outputs.start_episode()
+
+        while not environment.is_evaluation_done():
+            if timed:
+                behavior_start = _timer()
+            behavior.set_inputs(outputs)
+            if behavior.can_step():
+                behavior.step()
+                behavior.get_outputs(inputs)
+            if timed:
+                behavior_time += _timer() - behavior_start
+            # Act
+            environment.set_inputs(inputs)
+            environment.step_action()
+            # Sense
+            environment.get_outputs(outputs)
+
+            if record_inputs:
+                recorded_inputs.append_step(inputs)
+            if record_outputs:
+                recorded_outputs.append_step(outputs)
+
+    feedbacks = environment.get_feedback()
+
+    if timed:
+        durations["behavior_step"] += behavior_time
+        durations["environment_step"] += _timer() - start - behavior_time
+
+    return feedbacks
+
+
+# Copy of the environment that is owned by a worker process
+_worker_environment = None
+
+
+def _init_worker(environment):
+    """Store the copy of the environment in the worker process."""
+    global _worker_environment
+    _worker_environment = environment
+
+
+def _rollout_in_worker(args):
+    """Execute a behavior in the environment of the worker process."""
+    (behavior, meta_parameter_keys, meta_parameters, record_inputs,
+     record_outputs, record_timing) = args
+    behavior.set_meta_parameters(meta_parameter_keys, meta_parameters)
+    inputs = np.zeros(_worker_environment.get_num_inputs())
+    outputs = np.zeros(_worker_environment.get_num_outputs())
+    recorded_inputs = _episode_buffer(len(inputs), record_inputs)
+    recorded_outputs = _episode_buffer(len(outputs), record_outputs)
+    if record_timing:
+        durations = dict.fromkeys(_PHASES, 0.0)
+    else:
+        durations = None
+    feedbacks = _rollout(_worker_environment, behavior, inputs, outputs,
+                         recorded_inputs, recorded_outputs, durations)
+    if record_inputs:
+        recorded_inputs = recorded_inputs[0]
+    if record_outputs:
+        recorded_outputs = recorded_outputs[0]
+    return feedbacks, recorded_inputs, recorded_outputs, durations
+
+
+def _episode_buffer(n_dims, record):
+    """Buffer for one episode of the worker process or None."""
+    if record:
+        return TrajectoryBuffer(n_dims, n_episodes=1)
+    else:
+        return None
+
+
 class Controller(Base):
     """A controller implements the communication between learning components.
 
@@ -27,6 +186,11 @@ class Controller(Base):
       of behaviors) of each episode in `self.inputs_`
     * record_outputs (bool) - store outputs of environment (inputs for
       behaviors) for each episode in `self.outputs_`
+    * record_to_file (bool or string) - store recorded inputs and outputs in
+      memory-mapped files '<prefix>_inputs.npy' and '<prefix>_outputs.npy'
+      in $BL_LOG_PATH instead of the main memory. The prefix is either the
+      given string or 'controller'. See
+      :class:`~bolero.utils.recording.TrajectoryBuffer` for details.
     * accumulate_feedbacks (bool) - log the sum of feedbacks (episode returns
       a scalar) or all feedbacks
     * record_contexts (bool) - store context vectors of each episode in
@@ -36,6 +200,31 @@ class Controller(Base):
     * finish_after_convergence (bool) - finish the evaluation after either the
       environment or the behavior search reports convergence even though the
       maximum number of episodes might not be reached yet
+    * n_jobs (int) - number of worker processes that execute the episodes of
+      :func:`learn`, -1 means that one process per CPU will be used. Each
+      worker holds its own copy of the initialized environment, hence, the
+      environment must be picklable. The behavior search must support
+      :func:`get_next_behaviors` to provide several behaviors at once, e.g.
+      the whole population of CMA-ES. Feedbacks will be passed to the
+      behavior search in the same order as the behaviors were requested.
+    * record_timing (bool) - store the wall-clock time in seconds of each
+      episode and of its phases in `self.durations_`, a dictionary that maps
+      each phase to an array with one entry per episode. The phases are
+      'get_behavior' (behavior search provides the next behavior),
+      'behavior_step' (all steps of the behavior), 'environment_step'
+      (reset and steps of the environment), 'search_update' (the behavior
+      search processes the feedback, e.g. the update of the optimizer),
+      'test' (evaluation of the best behavior, 0 if there was no test), and
+      'episode' (the whole episode). In parallel episodes, the rollout
+      phases are measured in the worker processes and 'episode' is the sum
+      of all phases.
+    * profile_episodes (int) - profile the controller with cProfile and
+      write the statistics after every `profile_episodes` episodes to a file
+      in $BL_LOG_PATH, only the main process will be profiled
+    * profile_filename (string) - name of the profile, it must contain
+      '%d', which will be replaced by the current episode count (default:
+      'controller_%d.pstats'); the statistics can be loaded with
+      `pstats.Stats`
     * verbose (bool) - print information to stdout
 
     Parameters
@@ -96,21 +285,33 @@ class Controller(Base):
         self._set_attribute(config, "record_inputs", False)
         self._set_attribute(config, "record_outputs", False)
         self._set_attribute(config, "record_feedbacks", False)
+        self._set_attribute(config, "record_to_file", False)
         self._set_attribute(config, "accumulate_feedbacks", True)
         self._set_attribute(config, "n_episodes_before_test", None)
         self._set_attribute(config, "finish_after_convergence", False)
+        self._set_attribute(config, "n_jobs", 1)
+        self._set_attribute(config, "record_timing", False)
+        self._set_attribute(config, "profile_episodes", None)
+        self._set_attribute(config, "profile_filename", "controller_%d.pstats")
         self._set_attribute(config, "verbose", False)
 
         if self.record_inputs:
-            self.inputs_ = []
+            self.inputs_ = self._trajectory_buffer(self.n_inputs, "inputs")
 
         if self.record_outputs:
-            self.outputs_ = []
+            self.outputs_ = self._trajectory_buffer(self.n_outputs, "outputs")
 
         if self.record_feedbacks:
             self.feedbacks_ = []
 
+        if self.record_timing:
+            # Preallocated for the expected number of episodes, the capacity
+            # is doubled if more episodes are executed
+            self._durations = np.zeros((max(self.n_episodes, 1), len(_PHASES)))
+            self._n_timed_episodes = 0
+
         self.episode_cnt = 0
+        self._profiler = None
 
         self.do_test = self.n_episodes_before_test is not None
         if self.do_test:
@@ -127,6 +328,19 @@ class Controller(Base):
         return self.inputs_
     trajectories_ = property(__get_inputs_bw_compatible, doc="inputs to the environment (outputs of the behavior)")
 
+    def _trajectory_buffer(self, n_dims, name):
+        """Create buffer for recorded trajectories."""
+        if self.record_to_file:
+            if self.record_to_file is True:
+                prefix = "controller"
+            else:
+                prefix = self.record_to_file
+            filename = "%s_%s.npy" % (prefix, name)
+        else:
+            filename = None
+        return TrajectoryBuffer(n_dims, n_episodes=self.n_episodes,
+                                filename=filename)
+
     def _set_attribute(self, config, name, default):
         value = config.get("Controller", {}).get(name, default)
         if not hasattr(self, name):
@@ -175,14 +389,16 @@ class Controller(Base):
             before the n_episodes is reached, the length of feedback_history
             is shorter than n_episodes.
         """
-        feedback_history = []
-        for _ in range(self.n_episodes):
-            feedbacks = self.episode(meta_parameter_keys, meta_parameters)
-            feedback_history.append(feedbacks)
-            if (self.finish_after_convergence and
-                    (self.behavior_search.is_behavior_learning_done() or
-                     self.environment.is_behavior_learning_done())):
-                break
+        if self.n_jobs == 1:
+            feedback_history = []
+            for _ in range(self.n_episodes):
+                feedbacks = self.episode(meta_parameter_keys, meta_parameters)
+                feedback_history.append(feedbacks)
+                if self._learning_done():
+                    break
+        else:
+            feedback_history = self._learn_parallel(meta_parameter_keys,
+                                                    meta_parameters)
         if self.verbose >= 2:
             print("[Controller] Terminated because of:\nbehavior_search: %s, "
                   "environment: %s"
@@ -190,6 +406,58 @@ class Controller(Base):
                      self.environment.is_behavior_learning_done()))
         return np.array(feedback_history)
 
+    def _learning_done(self):
+        return (self.finish_after_convergence and
+                (self.behavior_search.is_behavior_learning_done() or
+                 self.environment.is_behavior_learning_done()))
+
+    def _learn_parallel(self, meta_parameter_keys, meta_parameters):
+        """Execute episodes in a pool of worker processes."""
+        if self.behavior_search is None:
+            raise ValueError("A BehaviorSearch is required to execute an "
+                             "episode without specifying a behavior.")
+
+        if self.n_jobs < 0:
+            n_processes = multiprocessing.cpu_count()
+        else:
+            n_processes = self.n_jobs
+        pool = multiprocessing.Pool(n_processes, _init_worker,
+                                    (self.environment,))
+        try:
+            feedback_history = []
+            while len(feedback_history) < self.n_episodes:
+                self._start_profiling()
+                start = _timer()
+                behaviors = self.behavior_search.get_next_behaviors()
+                behaviors = behaviors[:self.n_episodes - len(feedback_history)]
+                get_behavior_time = (_timer() - start) / len(behaviors)
+                if self.verbose >= 1:
+                    print("[Controller] Episodes: #%d - #%d"
+                          % (self.episode_cnt + 1,
+                             self.episode_cnt + len(behaviors)))
+
+                results = pool.map(
+                    _rollout_in_worker,
+                    [(behavior, meta_parameter_keys, meta_parameters,
+                      self.record_inputs, self.record_outputs,
+                      self.record_timing)
+                     for behavior in behaviors])
+
+                for feedbacks, inputs, outputs, durations in results:
+                    if durations is not None:
+                        durations["get_behavior"] = get_behavior_time
+                    self._record(feedbacks, inputs, outputs)
+                    feedback_history.append(self._finish_episode(
+                        feedbacks, meta_parameter_keys, meta_parameters,
+                        durations))
+
+                if self._learning_done():
+                    break
+        finally:
+            pool.close()
+            pool.join()
+        return feedback_history
+
     def episode(self, meta_parameter_keys=(), meta_parameters=()):
         """Execute one learning episode.
 
@@ -213,10 +481,32 @@ class Controller(Base):
         if self.verbose >= 1:
             print("[Controller] Episode: #%d" % (self.episode_cnt + 1))
 
+        self._start_profiling()
+        start = _timer()
+        if self.record_timing:
+            durations = dict.fromkeys(_PHASES, 0.0)
+        else:
+            durations = None
+
         behavior = self.behavior_search.get_next_behavior()
-        feedbacks = self.episode_with(behavior, meta_parameter_keys,
-                                      meta_parameters)
+        if durations is not None:
+            durations["get_behavior"] = _timer() - start
+        feedbacks = self._execute(behavior, meta_parameter_keys,
+                                  meta_parameters, True, durations)
+        feedbacks = self._finish_episode(feedbacks, meta_parameter_keys,
+                                         meta_parameters, durations)
+        if durations is not None:
+            self._last_durations()[_PHASES.index("episode")] = (
+                _timer() - start)
+        return feedbacks
+
+    def _finish_episode(self, feedbacks, meta_parameter_keys,
+                        meta_parameters, durations=None):
+        """Pass feedbacks to the behavior search and test if required."""
+        start = _timer()
         self.behavior_search.set_evaluation_feedback(feedbacks)
+        if durations is not None:
+            durations["search_update"] = _timer() - start
 
         if self.verbose >= 2:
             if self.accumulate_feedbacks:
@@ -229,14 +519,67 @@ class Controller(Base):
         self.episode_cnt += 1
 
         if self.do_test and self.episode_cnt % self.n_episodes_before_test == 0:
+            start = _timer()
             self.test_results_.append(
                 self._perform_test(meta_parameter_keys, meta_parameters))
+            if durations is not None:
+                durations["test"] = _timer() - start
+
+        if durations is not None:
+            durations["episode"] = sum(
+                durations[phase] for phase in _PHASES[:-1])
+            self._append_durations(durations)
+
+        self._stop_profiling()
 
         feedbacks = check_feedback(
             feedbacks, compute_sum=self.accumulate_feedbacks)
 
         return feedbacks
 
+    @property
+    def durations_(self):
+        """Durations of the phases of all timed episodes.
+
+        Maps each phase to an array with one entry per episode. The arrays
+        are views of the current buffer and are created on each access.
+        """
+        if not getattr(self, "record_timing", False):
+            raise AttributeError("Durations are only recorded if "
+                                 "'record_timing' is activated")
+        durations = self._durations[:self._n_timed_episodes]
+        return dict((phase, durations[:, i])
+                    for i, phase in enumerate(_PHASES))
+
+    def _append_durations(self, durations):
+        """Store the durations of the phases of an episode."""
+        if self._n_timed_episodes == len(self._durations):
+            self._durations = np.vstack(
+                (self._durations, np.zeros_like(self._durations)))
+        self._durations[self._n_timed_episodes] = [
+            durations[phase] for phase in _PHASES]
+        self._n_timed_episodes += 1
+
+    def _last_durations(self):
+        """Durations of the phases of the last episode (modifiable view)."""
+        return self._durations[self._n_timed_episodes - 1]
+
+    def _start_profiling(self):
+        """Start profiler if it is not running yet."""
+        if self.profile_episodes is not None and self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def _stop_profiling(self):
+        """Write profile after every 'profile_episodes' episodes."""
+        if (self._profiler is not None and
+                self.episode_cnt % self.profile_episodes == 0):
+            self._profiler.disable()
+            filename = os.path.join(os.environ.get("BL_LOG_PATH", "."),
+                                    self.profile_filename % self.episode_cnt)
+            self._profiler.dump_stats(filename)
+            self._profiler = None
+
     def episode_with(self, behavior, meta_parameter_keys=[],
                      meta_parameters=[], record=True):
         """Execute a behavior in the environment.
@@ -260,44 +603,37 @@ class Controller(Base):
         feedbacks : array, shape (n_steps,)
             Feedback for each step in the environment
         """
-        behavior.set_meta_parameters(meta_parameter_keys, meta_parameters)
-        self.environment.reset()
-
-        if self.record_inputs:
-            inputs = []
-        if self.record_outputs:
-            outputs = []
-
-        # Sense initial state
-        self.environment.get_outputs(self.outputs)
-        while not self.environment.is_evaluation_done():
-            behavior.set_inputs(self.outputs)
-            if behavior.can_step():
-                behavior.step()
-                behavior.get_outputs(self.inputs)
-            # Act
-            self.environment.set_inputs(self.inputs)
-            self.environment.step_action()
-            # Sense
-            self.environment.get_outputs(self.outputs)
-
-            if record:
-                if self.record_inputs:
-                    inputs.append(self.inputs.copy())
-                if self.record_outputs:
-                    outputs.append(self.outputs.copy())
-
-        feedbacks = self.environment.get_feedback()
+        return self._execute(behavior, meta_parameter_keys, meta_parameters,
+                             record)
 
+    def _execute(self, behavior, meta_parameter_keys, meta_parameters,
+                 record, durations=None):
+        """Execute a behavior and measure the durations if required."""
+        behavior.set_meta_parameters(meta_parameter_keys, meta_parameters)
+        if record and self.record_inputs:
+            recorded_inputs = self.inputs_
+        else:
+            recorded_inputs = None
+        if record and self.record_outputs:
+            recorded_outputs = self.outputs_
+        else:
+            recorded_outputs = None
+        feedbacks = _rollout(
+            self.environment, behavior, self.inputs, self.outputs,
+            recorded_inputs, recorded_outputs, durations)
         if record:
-            if self.record_inputs:
-                self.inputs_.append(inputs)
-            if self.record_outputs:
-                self.outputs_.append(outputs)
-            if self.record_feedbacks:
-                self.feedbacks_.append(feedbacks)
+            self._record(feedbacks)
         return feedbacks
 
+    def _record(self, feedbacks, inputs=None, outputs=None):
+        """Store feedbacks and trajectories that are not recorded yet."""
+        if self.record_inputs and inputs is not None:
+            self.inputs_.append(inputs)
+        if self.record_outputs and outputs is not None:
+            self.outputs_.append(outputs)
+        if self.record_feedbacks:
+            self.feedbacks_.append(feedbacks)
+
     def _perform_test(self, meta_parameter_keys, meta_parameters):
         behavior = self.behavior_search.get_best_behavior()
         performance = np.sum(self.episode_with(
@@ -318,6 +654,9 @@ class ContextualController(Controller):
 
     * test_contexts (array-like) - the upper-level policy will be evaluated in
       these contexts
+
+    If 'record_timing' is activated, the negotiation of the context is
+    included in the phase 'get_behavior'.
     """
     def __init__(self, config={}, environment=None, behavior_search=None,
                  **kwargs):
@@ -330,6 +669,10 @@ class ContextualController(Controller):
         if self.record_contexts:
             self.contexts_ = []
 
+        if self.n_jobs != 1:
+            raise ValueError("ContextualController does not support parallel "
+                             "execution of episodes, n_jobs must be 1.")
+
         if self.do_test:
             if self.test_contexts is None:
                 raise ValueError("You must provide 'test_contexts' if "
@@ -372,11 +715,18 @@ class ContextualController(Controller):
                              "execute an episode without specifying a "
                              "behavior.")
 
+        start = _timer()
         context = self._negotiate_context()
+        negotiation_time = _timer() - start
 
         accumulated_feedback = super(ContextualController, self).episode(
             meta_parameter_keys, meta_parameters)
 
+        if self.record_timing:
+            durations = self._last_durations()
+            durations[_PHASES.index("get_behavior")] += negotiation_time
+            durations[_PHASES.index("episode")] += negotiation_time
+
         if self.verbose >= 2 and context is not None:
             print("[Controller] Context: %s" % context)
 
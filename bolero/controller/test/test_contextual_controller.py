@@ -27,6 +27,12 @@ def test_noncontextual_behavior_search():
         behavior_search=JustOptimizer(opt))
 
 
+def test_parallel_episodes_not_supported():
+    assert_raises_regexp(
+        ValueError, "does not support parallel", ContextualController,
+        environment=ContextualObjectiveFunction(), n_jobs=2)
+
+
 def test_missing_behavior_search():
     ctrl = ContextualController(environment=ContextualObjectiveFunction())
     beh = DummyBehavior(initial_params=np.array([0.0]))
@@ -137,3 +143,16 @@ def test_context_cannot_be_set():
         behavior_search=JustContextualOptimizer(opt),
         n_episodes=2, n_episodes_before_test=1, test_contexts=test_contexts)
     assert_raises_regexp(Exception, "could not set context", ctrl.learn)
+
+
+def test_record_timing():
+    opt = CREPSOptimizer(initial_params=np.zeros(1))
+    ctrl = ContextualController(
+        environment=ContextualObjectiveFunction(),
+        behavior_search=JustContextualOptimizer(opt),
+        n_episodes=10, record_timing=True)
+    ctrl.learn()
+    for durations in ctrl.durations_.values():
+        assert_equal(len(durations), 10)
+    assert_true(np.all(np.array(ctrl.durations_["get_behavior"]) <=
+                       np.array(ctrl.durations_["episode"])))
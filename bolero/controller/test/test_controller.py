@@ -1,12 +1,16 @@
+import os
+import shutil
+import tempfile
+import pstats
 import numpy as np
 from nose.tools import (assert_equal, assert_less, assert_greater, assert_true,
                         assert_raises_regexp)
 from bolero.controller import Controller
-from bolero.environment import ObjectiveFunction
+from bolero.environment import ObjectiveFunction, OptimumTrajectory
 from bolero.behavior_search import JustOptimizer
 from bolero.representation import DummyBehavior
 from bolero.optimizer import CMAESOptimizer
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_equal, assert_array_almost_equal
 
 
 def test_missing_environment():
@@ -117,3 +121,149 @@ def test_learn_controller_cmaes_sphere():
     returns = ctrl.learn()
     dist_to_maximum = returns.max() - ctrl.environment.get_maximum_feedback()
     assert_greater(dist_to_maximum, -1e-5)
+
+
+def test_learn_parallel_equals_sequential():
+    returns = []
+    for n_jobs in [1, 2]:
+        opt = CMAESOptimizer(initial_params=np.zeros(2), random_state=0)
+        ctrl = Controller(environment=ObjectiveFunction(random_state=0),
+                          behavior_search=JustOptimizer(opt),
+                          n_episodes=20, n_jobs=n_jobs)
+        returns.append(ctrl.learn())
+    assert_array_equal(returns[0], returns[1])
+
+
+def test_learn_parallel_record():
+    opt = CMAESOptimizer(initial_params=np.zeros(2))
+    ctrl = Controller(environment=ObjectiveFunction(),
+                      behavior_search=JustOptimizer(opt),
+                      record_inputs=True, record_feedbacks=True,
+                      n_episodes=15, n_jobs=2)
+    returns = ctrl.learn()
+    assert_equal(len(returns), 15)
+    assert_equal(np.array(ctrl.inputs_).shape, (15, 1, 2))
+    assert_array_equal(returns, np.sum(ctrl.feedbacks_, axis=1))
+
+
+def test_record_timing():
+    opt = CMAESOptimizer(initial_params=np.zeros(2))
+    ctrl = Controller(environment=ObjectiveFunction(),
+                      behavior_search=JustOptimizer(opt),
+                      record_timing=True, n_episodes_before_test=5)
+    ctrl.learn()
+    phases = ["get_behavior", "behavior_step", "environment_step",
+              "search_update", "test", "episode"]
+    assert_equal(sorted(ctrl.durations_.keys()), sorted(phases))
+    for phase in phases:
+        durations = ctrl.durations_[phase]
+        assert_true(isinstance(durations, np.ndarray))
+        assert_equal(durations.shape, (10,))
+        assert_true(np.all(durations >= 0.0))
+    assert_true(np.all(np.array(ctrl.durations_["test"])[[0, 1, 2, 3, 5]]
+                       == 0.0))
+    assert_greater(ctrl.durations_["test"][4], 0.0)
+    parts = np.sum([ctrl.durations_[phase] for phase in phases[:-1]], axis=0)
+    assert_true(np.all(parts <= ctrl.durations_["episode"]))
+
+
+def test_record_timing_more_episodes_than_expected():
+    opt = CMAESOptimizer(initial_params=np.zeros(2))
+    ctrl = Controller(environment=ObjectiveFunction(),
+                      behavior_search=JustOptimizer(opt),
+                      record_timing=True, n_episodes=2)
+    for _ in range(5):
+        ctrl.episode()
+    for durations in ctrl.durations_.values():
+        assert_equal(durations.shape, (5,))
+    assert_true(np.all(ctrl.durations_["episode"] > 0.0))
+
+
+def test_no_durations_without_record_timing():
+    opt = CMAESOptimizer(initial_params=np.zeros(2))
+    ctrl = Controller(environment=ObjectiveFunction(),
+                      behavior_search=JustOptimizer(opt), n_episodes=2)
+    ctrl.learn()
+    assert_true(not hasattr(ctrl, "durations_"))
+
+
+def test_learn_parallel_record_timing():
+    opt = CMAESOptimizer(initial_params=np.zeros(2))
+    ctrl = Controller(environment=ObjectiveFunction(),
+                      behavior_search=JustOptimizer(opt),
+                      record_timing=True, n_episodes=15, n_jobs=2)
+    ctrl.learn()
+    for durations in ctrl.durations_.values():
+        assert_equal(len(durations), 15)
+
+
+def test_profile_episodes():
+    log_path = tempfile.mkdtemp()
+    old_log_path = os.environ.get("BL_LOG_PATH")
+    os.environ["BL_LOG_PATH"] = log_path
+    try:
+        opt = CMAESOptimizer(initial_params=np.zeros(2))
+        ctrl = Controller(environment=ObjectiveFunction(),
+                          behavior_search=JustOptimizer(opt),
+                          profile_episodes=4)
+        ctrl.learn()
+        assert_equal(sorted(os.listdir(log_path)),
+                     ["controller_4.pstats", "controller_8.pstats"])
+        stats = pstats.Stats(os.path.join(log_path, "controller_4.pstats"))
+        assert_greater(stats.total_calls, 0)
+    finally:
+        if old_log_path is None:
+            del os.environ["BL_LOG_PATH"]
+        else:
+            os.environ["BL_LOG_PATH"] = old_log_path
+        shutil.rmtree(log_path)
+
+
+def test_record_to_file():
+    log_path = tempfile.mkdtemp()
+    old_log_path = os.environ.get("BL_LOG_PATH")
+    os.environ["BL_LOG_PATH"] = log_path
+    try:
+        opt = CMAESOptimizer(initial_params=np.zeros(2))
+        ctrl = Controller(environment=ObjectiveFunction(),
+                          behavior_search=JustOptimizer(opt),
+                          record_inputs=True, record_outputs=True,
+                          record_to_file="test")
+        ctrl.learn()
+        assert_equal(sorted(os.listdir(log_path)),
+                     ["test_inputs.npy", "test_outputs.npy"])
+        assert_equal(np.array(ctrl.inputs_).shape, (10, 1, 2))
+    finally:
+        if old_log_path is None:
+            del os.environ["BL_LOG_PATH"]
+        else:
+            os.environ["BL_LOG_PATH"] = old_log_path
+        shutil.rmtree(log_path)
+
+
+def test_open_loop_equals_closed_loop():
+    try:
+        from bolero.representation import DMPBehavior
+    except ImportError:
+        from nose import SkipTest
+        raise SkipTest("dmp is not installed")
+
+    class ClosedLoopOptimumTrajectory(OptimumTrajectory):
+        def can_execute_trajectory(self):
+            return False
+
+    results = []
+    for env in [OptimumTrajectory(penalty_goal_dist=1.0, penalty_vel=0.1),
+                ClosedLoopOptimumTrajectory(penalty_goal_dist=1.0,
+                                            penalty_vel=0.1)]:
+        ctrl = Controller(environment=env, record_inputs=True,
+                          record_outputs=True)
+        beh = DMPBehavior(n_features=10)
+        beh.init(6, 6)
+        beh.set_params(100.0 * np.random.RandomState(0).randn(20))
+        beh.reset()
+        feedbacks = ctrl.episode_with(beh)
+        results.append((feedbacks, np.asarray(ctrl.inputs_),
+                        np.asarray(ctrl.outputs_)))
+    for open_loop, closed_loop in zip(*results):
+        assert_array_almost_equal(open_loop, closed_loop)
@@ -98,6 +98,41 @@ class Environment(Base):
     def get_maximum_feedback(self):
         """Returns the maximum sum of feedbacks obtainable."""
 
+    def can_execute_trajectory(self):
+        """Returns if all inputs of an episode can be set at once.
+
+        This is only possible if the environment reaches each desired state
+        (input) perfectly so that its outputs do not have to be passed to the
+        behavior in each step.
+
+        Returns
+        -------
+        can_execute_trajectory : bool
+            Can we call execute_trajectory()?
+        """
+        return False
+
+    def execute_trajectory(self, inputs):
+        """Execute a whole episode.
+
+        The result must be the same as calling set_inputs(), step_action()
+        and get_outputs() for each input until the evaluation is done. The
+        last input will be repeated if there are less inputs than steps and
+        remaining inputs will be ignored.
+
+        Parameters
+        ----------
+        inputs : array, shape (n_inputs_steps, n_inputs)
+            Inputs of the environment for each step, e.g. desired states
+
+        Returns
+        -------
+        outputs : array, shape (n_steps, n_outputs)
+            Outputs of the environment after each step
+        """
+        raise NotImplementedError("%s cannot execute trajectories"
+                                  % type(self).__name__)
+
 
 class ContextualEnvironment(Environment):
     """Common interface for (contextual) environments."""
@@ -194,12 +194,12 @@ def T_osc(f):
 
     Parameters
     ----------
-    f : array-like, shape (n_dims,) or float
+    f : array-like, shape (n_dims,), (n_samples, n_dims) or float
         Input
 
     Returns
     -------
-    g : array-like, shape (n_dims,) or float
+    g : array-like, shape (n_dims,), (n_samples, n_dims) or float
         Output
     """
     is_scalar = np.isscalar(f)
@@ -234,15 +234,15 @@ def T_asy(x, beta):
 
     Parameters
     ----------
-    x : array-like, shape (n_dims,)
+    x : array-like, shape (n_dims,) or (n_samples, n_dims)
         Input
 
     Returns
     -------
-    z : array-like, shape (n_dims,)
+    z : array-like, shape (n_dims,) or (n_samples, n_dims)
         Output
     """
-    exponent = np.linspace(0, beta, len(x))
+    exponent = np.broadcast_to(np.linspace(0, beta, x.shape[-1]), x.shape)
     idx = np.where(x > 0)
     z = x.copy()
     z[idx] **= 1.0 + exponent[idx] * np.sqrt(x[idx])
@@ -306,15 +306,15 @@ def f_pen(x):
 
     Parameters
     ----------
-    x : array-like, shape (n_dims,)
+    x : array-like, shape (n_dims,) or (n_samples, n_dims)
         Input
 
     Returns
     -------
-    f_pen : float
+    f_pen : float or array-like, shape (n_samples,)
         Penalty
     """
-    return np.sum(np.maximum(0.0, np.abs(x) - 5.0) ** 2)
+    return np.sum(np.maximum(0.0, np.abs(x) - 5.0) ** 2, axis=-1)
 
 
 def linear_transformation(random_state, n_dims, alpha, return_rotations=False):
@@ -357,7 +357,7 @@ def rastrigin(x, penalize_norm=True):
 
     Parameters
     ----------
-    x : array-like, shape (n_dims,)
+    x : array-like, shape (n_dims,) or (n_samples, n_dims)
         Input
 
     penalize_norm : bool (default: True)
@@ -365,12 +365,12 @@ def rastrigin(x, penalize_norm=True):
 
     Returns
     -------
-    f : float
+    f : float or array-like, shape (n_samples,)
         Function value
     """
-    f = 10.0 * (x.shape[0] - np.sum(np.cos(2.0 * np.pi * x)))
+    f = 10.0 * (x.shape[-1] - np.sum(np.cos(2.0 * np.pi * x), axis=-1))
     if penalize_norm:
-        f += x.dot(x)
+        f += np.sum(x * x, axis=-1)
     return f
 
 
@@ -383,15 +383,40 @@ def rosenbrock(x):
 
     Parameters
     ----------
-    x : array-like, shape (n_dims,)
+    x : array-like, shape (n_dims,) or (n_samples, n_dims)
         Input
 
     Returns
     -------
-    f : float
+    f : float or array-like, shape (n_samples,)
         Function value
     """
-    return np.sum(100 * (x[:-1] ** 2 - x[1:]) ** 2 + (x[:-1] - 1) ** 2)
+    return np.sum(100 * (x[..., :-1] ** 2 - x[..., 1:]) ** 2 +
+                  (x[..., :-1] - 1) ** 2, axis=-1)
+
+
+def _dot_rows(A, B):
+    """Matrix product that does not depend on the number of rows of A.
+
+    BLAS uses different kernels for different numbers of rows, so the result
+    of np.dot for one row might differ in the last digits from the result for
+    the same row in a larger batch. Single evaluations and batch evaluations
+    of objective functions must give exactly the same values though.
+
+    Parameters
+    ----------
+    A : array-like, shape (n,) or (n_samples, n)
+        Row vector or batch of row vectors
+
+    B : array-like, shape (n, m)
+        Matrix
+
+    Returns
+    -------
+    C : array-like, shape (m,) or (n_samples, m)
+        Product of each row of A with B
+    """
+    return np.einsum("...j,jk->...k", A, B)
 
 
 class ObjectiveFunctionBase(object):
@@ -426,7 +451,6 @@ class ObjectiveFunctionBase(object):
         self.x_opt = generate_x_opt(self.random_state, self.n_dims)
         self.f_opt = generate_f_opt(self.random_state)
 
-    @abstractmethod
     def feedback(self, x):
         """Evaluate function at a given point.
 
@@ -440,6 +464,27 @@ class ObjectiveFunctionBase(object):
         f : float
             Function value
         """
+        return self.feedback_batch(np.asarray(x, dtype=np.float64))
+
+    @abstractmethod
+    def feedback_batch(self, X):
+        """Evaluate function at multiple points.
+
+        The result for each point is exactly the same as the result of
+        :func:`feedback`. All operations work on the last axis, so that
+        :func:`feedback` can pass a single point without wrapping it in a
+        batch.
+
+        Parameters
+        ----------
+        X : array-like, shape (n_samples, n_dims) or (n_dims,)
+            Parameters
+
+        Returns
+        -------
+        F : array, shape (n_samples,) or float
+            Function values
+        """
 
 
 class Sphere(ObjectiveFunctionBase):
@@ -463,10 +508,15 @@ class Sphere(ObjectiveFunctionBase):
         super(Sphere, self).__init__(random_state, n_dims)
 
     def feedback(self, x, x_opt_offset=None):
+        return self.feedback_batch(np.asarray(x, dtype=np.float64),
+                                   x_opt_offset)
+
+    def feedback_batch(self, X, x_opt_offset=None):
         x_opt = self.x_opt
         if x_opt_offset is not None:
             x_opt = x_opt + x_opt_offset
-        return -(np.linalg.norm(x - x_opt) ** 2) + self.f_opt
+        D = X - x_opt
+        return -np.sum(D * D, axis=-1) + self.f_opt
 
 
 class Ellipsoidal(ObjectiveFunctionBase):
@@ -492,9 +542,9 @@ class Ellipsoidal(ObjectiveFunctionBase):
         self.condition = condition
         self.scales = self.condition ** np.linspace(0, 1, self.n_dims)
 
-    def feedback(self, x):
-        z = T_osc(x - self.x_opt)
-        return -np.dot(self.scales, z ** 2) + self.f_opt
+    def feedback_batch(self, X):
+        Z = T_osc(X - self.x_opt)
+        return -np.sum(self.scales * Z ** 2, axis=-1) + self.f_opt
 
 
 class Rastrigin(ObjectiveFunctionBase):
@@ -526,11 +576,15 @@ class Rastrigin(ObjectiveFunctionBase):
         self.Lambda = Lambda(self.n_dims, self.condition)
 
     def feedback(self, x, x_opt_offset=None):
+        return self.feedback_batch(np.asarray(x, dtype=np.float64),
+                                   x_opt_offset)
+
+    def feedback_batch(self, X, x_opt_offset=None):
         x_opt = self.x_opt
         if x_opt_offset is not None:
             x_opt = x_opt + x_opt_offset
-        z = self.Lambda * T_asy(T_osc(x - x_opt), 0.2)
-        return -rastrigin(z) + self.f_opt
+        Z = self.Lambda * T_asy(T_osc(X - x_opt), 0.2)
+        return -rastrigin(Z) + self.f_opt
 
 
 class BuecheRastrigin(ObjectiveFunctionBase):
@@ -561,12 +615,12 @@ class BuecheRastrigin(ObjectiveFunctionBase):
         self.condition = condition
         self.Lambda = Lambda(self.n_dims, self.condition)
 
-    def feedback(self, x):
-        z = T_osc(x - self.x_opt)
-        tmp_z = z[::2]
-        tmp_z[tmp_z > 0] *= 10.0
-        z *= self.Lambda
-        return -(rastrigin(z) + 100.0 * f_pen(x)) + self.f_opt
+    def feedback_batch(self, X):
+        Z = T_osc(X - self.x_opt)
+        tmp_Z = Z[..., ::2]
+        tmp_Z[tmp_Z > 0] *= 10.0
+        Z *= self.Lambda
+        return -(rastrigin(Z) + 100.0 * f_pen(X)) + self.f_opt
 
 
 class LinearSlope(ObjectiveFunctionBase):
@@ -595,11 +649,11 @@ class LinearSlope(ObjectiveFunctionBase):
         self.scales = np.sign(self.x_opt) * Lambda(self.n_dims, 100)
         self.offset = 5 * np.sum(np.abs(self.scales))
 
-    def feedback(self, x):
-        z = x.copy()
-        idx = self.x_opt * x > 25
-        z[idx] = np.sign(z[idx])
-        return -(self.offset - np.dot(self.scales, z)) + self.f_opt
+    def feedback_batch(self, X):
+        Z = X.copy()
+        idx = self.x_opt * X > 25
+        Z[idx] = np.sign(Z[idx])
+        return -(self.offset - np.sum(self.scales * Z, axis=-1)) + self.f_opt
 
 
 class AttractiveSector(ObjectiveFunctionBase):
@@ -631,10 +685,10 @@ class AttractiveSector(ObjectiveFunctionBase):
         self.lin_trans = linear_transformation(self.random_state, self.n_dims,
                                                self.alpha)
 
-    def feedback(self, x):
-        z = np.dot(self.lin_trans, x - self.x_opt)
-        z[z * self.x_opt > 0] *= self.alpha
-        return -T_osc(z.dot(z)) ** 0.9 + self.f_opt
+    def feedback_batch(self, X):
+        Z = _dot_rows(X - self.x_opt, self.lin_trans.T)
+        Z[Z * self.x_opt > 0] *= self.alpha
+        return -T_osc(np.sum(Z * Z, axis=-1)) ** 0.9 + self.f_opt
 
 
 class StepEllipsoidal(ObjectiveFunctionBase):
@@ -666,17 +720,14 @@ class StepEllipsoidal(ObjectiveFunctionBase):
         self.Q = generate_rotation(self.random_state, self.n_dims)
         self.scales = self.condition ** np.linspace(0, 1, self.n_dims)
 
-    def feedback(self, x):
-        z_hat = np.dot(self.lin_trans, x - self.x_opt)
-        z_sim = np.empty(self.n_dims)
-        idx = z_hat > 0.5
-        z_sim[idx] = np.round(z_hat[idx])
-        idx = np.logical_not(idx)
-        z_sim[idx] = np.round(self.alpha * z_hat[idx]) / self.alpha
-        z = self.Q.dot(z_sim)
-        return -(0.1 * np.maximum(1e-4 * np.abs(z_hat[0]),
-                                  np.dot(self.scales, z ** 2)) +
-                 100.0 * f_pen(z)) + self.f_opt
+    def feedback_batch(self, X):
+        Z_hat = _dot_rows(X - self.x_opt, self.lin_trans.T)
+        Z_sim = np.where(Z_hat > 0.5, np.round(Z_hat),
+                         np.round(self.alpha * Z_hat) / self.alpha)
+        Z = _dot_rows(Z_sim, self.Q.T)
+        return -(0.1 * np.maximum(1e-4 * np.abs(Z_hat[..., 0]),
+                                  np.sum(self.scales * Z ** 2, axis=-1)) +
+                 100.0 * f_pen(Z)) + self.f_opt
 
 
 class Rosenbrock(ObjectiveFunctionBase):
@@ -710,11 +761,15 @@ class Rosenbrock(ObjectiveFunctionBase):
         self.scale = np.maximum(1, np.sqrt(self.n_dims) / 8)
 
     def feedback(self, x, x_opt_offset=None):
+        return self.feedback_batch(np.asarray(x, dtype=np.float64),
+                                   x_opt_offset)
+
+    def feedback_batch(self, X, x_opt_offset=None):
         x_opt = self.x_opt
         if x_opt_offset is not None:
             x_opt = x_opt + x_opt_offset
-        z = self.scale * (x - self.x_opt) + 1
-        return -rosenbrock(z) + self.f_opt
+        Z = self.scale * (X - x_opt) + 1
+        return -rosenbrock(Z) + self.f_opt
 
 
 class RosenbrockRotated(ObjectiveFunctionBase):
@@ -742,9 +797,9 @@ class RosenbrockRotated(ObjectiveFunctionBase):
         self.R = scale * generate_rotation(self.random_state, self.n_dims)
         self.x_opt = np.dot(0.5 * np.ones(self.n_dims), self.R.T) / scale ** 2
 
-    def feedback(self, x):
-        z = x.dot(self.R) + 0.5
-        return -rosenbrock(z) + self.f_opt
+    def feedback_batch(self, X):
+        Z = _dot_rows(X, self.R) + 0.5
+        return -rosenbrock(Z) + self.f_opt
 
 
 class EllipsoidalRotated(ObjectiveFunctionBase):
@@ -774,10 +829,9 @@ class EllipsoidalRotated(ObjectiveFunctionBase):
         self.scales = self.condition ** np.linspace(0, 1, self.n_dims)
         self.R = generate_rotation(self.random_state, self.n_dims)
 
-    def feedback(self, x):
-        z = T_osc(np.dot(self.R, x - self.x_opt))
-        f = np.dot(self.scales, z ** 2)
-        return -f + self.f_opt
+    def feedback_batch(self, X):
+        Z = T_osc(_dot_rows(X - self.x_opt, self.R.T))
+        return -np.sum(self.scales * Z ** 2, axis=-1) + self.f_opt
 
 
 class Discus(ObjectiveFunctionBase):
@@ -804,9 +858,10 @@ class Discus(ObjectiveFunctionBase):
         self.condition = condition
         self.R = generate_rotation(self.random_state, self.n_dims)
 
-    def feedback(self, x):
-        z = T_osc((x - self.x_opt).dot(self.R))
-        return -((self.condition - 1) * z[0] ** 2 + z.dot(z)) + self.f_opt
+    def feedback_batch(self, X):
+        Z = T_osc(_dot_rows(X - self.x_opt, self.R))
+        return -((self.condition - 1) * Z[..., 0] ** 2 +
+                 np.sum(Z * Z, axis=-1)) + self.f_opt
 
 
 class BentCigar(ObjectiveFunctionBase):
@@ -837,10 +892,11 @@ class BentCigar(ObjectiveFunctionBase):
         self.beta = beta
         self.R = generate_rotation(self.random_state, self.n_dims)
 
-    def feedback(self, x):
-        z = T_asy((x - self.x_opt).dot(self.R), self.beta).dot(self.R)
-        return -(self.condition * z.dot(z) +
-                 (1 - self.condition) * z[0] ** 2) + self.f_opt
+    def feedback_batch(self, X):
+        Z = _dot_rows(T_asy(_dot_rows(X - self.x_opt, self.R), self.beta),
+                      self.R)
+        return -(self.condition * np.sum(Z * Z, axis=-1) +
+                 (1 - self.condition) * Z[..., 0] ** 2) + self.f_opt
 
 
 class SharpRidge(ObjectiveFunctionBase):
@@ -872,9 +928,10 @@ class SharpRidge(ObjectiveFunctionBase):
         self.lin_trans = linear_transformation(self.random_state, self.n_dims,
                                                10)
 
-    def feedback(self, x):
-        z = np.dot(self.lin_trans, x - self.x_opt)
-        return -(z[0] ** 2 + 100.0 * np.sqrt(np.sum(z[1:] ** 2))) + self.f_opt
+    def feedback_batch(self, X):
+        Z = _dot_rows(X - self.x_opt, self.lin_trans.T)
+        return -(Z[..., 0] ** 2 + 100.0 *
+                 np.sqrt(np.sum(Z[..., 1:] ** 2, axis=-1))) + self.f_opt
 
 
 class DifferentPowers(ObjectiveFunctionBase):
@@ -903,9 +960,10 @@ class DifferentPowers(ObjectiveFunctionBase):
         super(DifferentPowers, self).__init__(random_state, n_dims)
         self.R = generate_rotation(self.random_state, self.n_dims)
 
-    def feedback(self, x):
-        z = np.dot(self.R, x - self.x_opt)
-        return -(np.sum(np.abs(z) ** np.linspace(2, 6, self.n_dims))) + self.f_opt
+    def feedback_batch(self, X):
+        Z = _dot_rows(X - self.x_opt, self.R.T)
+        return -np.sum(np.abs(Z) ** np.linspace(2, 6, self.n_dims),
+                       axis=-1) + self.f_opt
 
 
 class RastriginRotated(ObjectiveFunctionBase):
@@ -940,10 +998,10 @@ class RastriginRotated(ObjectiveFunctionBase):
         self.lin_trans, _, self.R = linear_transformation(
             self.random_state, self.n_dims, 10, return_rotations=True)
 
-    def feedback(self, x):
-        z = np.dot(self.lin_trans, T_asy(T_osc(np.dot(self.R, x - self.x_opt)),
-                                         0.2))
-        return -rastrigin(z) + self.f_opt
+    def feedback_batch(self, X):
+        Z = _dot_rows(T_asy(T_osc(_dot_rows(X - self.x_opt, self.R.T)), 0.2),
+                      self.lin_trans.T)
+        return -rastrigin(Z) + self.f_opt
 
 
 class Weierstrass(ObjectiveFunctionBase):
@@ -977,13 +1035,15 @@ class Weierstrass(ObjectiveFunctionBase):
         self.k_range = np.arange(12)
         self.f0 = np.sum(0.5 ** self.k_range * np.cos(np.pi * 3 ** self.k_range))
 
-    def feedback(self, x):
-        z = np.dot(self.lin_trans, T_osc(np.dot(self.R, x - self.x_opt)))
-        return -(10.0 * (np.sum([0.5 ** self.k_range *
-                                 np.cos(2 * np.pi * 3 ** self.k_range *
-                                        (zi + 0.5)) / self.n_dims
-                                 for zi in z]) - self.f0) ** 3 +
-                 10.0 / self.n_dims * f_pen(x)) + self.f_opt
+    def feedback_batch(self, X):
+        Z = _dot_rows(T_osc(_dot_rows(X - self.x_opt, self.R.T)),
+                      self.lin_trans.T)
+        terms = (0.5 ** self.k_range *
+                 np.cos(2 * np.pi * 3 ** self.k_range *
+                        (Z[..., np.newaxis] + 0.5)) / self.n_dims)
+        s = np.sum(terms.reshape(Z.shape[:-1] + (-1,)), axis=-1)
+        return -(10.0 * (s - self.f0) ** 3 +
+                 10.0 / self.n_dims * f_pen(X)) + self.f_opt
 
 
 class SchaffersF7(ObjectiveFunctionBase):
@@ -1015,11 +1075,13 @@ class SchaffersF7(ObjectiveFunctionBase):
         self.Q = generate_rotation(self.random_state, self.n_dims)
         self.Lambda = Lambda(self.n_dims, self.condition)
 
-    def feedback(self, x):
-        z = np.diag(self.Lambda).dot(self.Q).dot(T_asy(self.R.dot(x - self.x_opt), 0.5))
-        s = np.sqrt(z[:-1] ** 2 + z[1:] ** 2)
-        f = np.mean(np.sqrt(s) + np.sqrt(s) * np.sin(50 * s ** 0.2) ** 2) ** 2
-        return -(f + 10.0 * f_pen(x)) + self.f_opt
+    def feedback_batch(self, X):
+        Z = self.Lambda * _dot_rows(
+            T_asy(_dot_rows(X - self.x_opt, self.R.T), 0.5), self.Q.T)
+        S = np.sqrt(Z[..., :-1] ** 2 + Z[..., 1:] ** 2)
+        f = np.mean(np.sqrt(S) + np.sqrt(S) * np.sin(50 * S ** 0.2) ** 2,
+                    axis=-1) ** 2
+        return -(f + 10.0 * f_pen(X)) + self.f_opt
 
 
 class SchaffersF7Ill(SchaffersF7):
@@ -1070,10 +1132,10 @@ class CompositeGriewankRosenbrockF8F2(ObjectiveFunctionBase):
         self.R = generate_rotation(self.random_state, self.n_dims)
         self.x_opt = np.dot(0.5 / self.scale * np.ones(self.n_dims), self.R)
 
-    def feedback(self, x):
-        z = self.scale * np.dot(self.R, x) + 0.5
-        s = rosenbrock(z)
-        f = 10.0 + 10.0 * np.mean(s / 4000.0 - np.cos(s))
+    def feedback_batch(self, X):
+        Z = self.scale * _dot_rows(X, self.R.T) + 0.5
+        s = rosenbrock(Z)
+        f = 10.0 + 10.0 * (s / 4000.0 - np.cos(s))
         return -f + self.f_opt
 
 
@@ -1108,12 +1170,13 @@ class Schwefel(ObjectiveFunctionBase):
         self.x_opt = 0.5 * 4.2096874633 * self.x_signs
         self.Lambda = Lambda(self.n_dims, 10.0)
 
-    def feedback(self, x):
-        z_hat = 2 * self.x_signs * x
-        z_hat[1:] += 0.25 * (z_hat[:-1] - 2 * self.x_opt[:-1])
-        z = 100.0 * (self.Lambda * (z_hat - 2 * self.x_opt) + 2 * self.x_opt)
-        fpen = 100.0 * f_pen(z / 100.0)
-        f = 4.189828872724339 - 0.01 * np.mean(z * np.sin(np.sqrt(np.abs(z))))
+    def feedback_batch(self, X):
+        Z_hat = 2 * self.x_signs * X
+        Z_hat[..., 1:] += 0.25 * (Z_hat[..., :-1] - 2 * self.x_opt[:-1])
+        Z = 100.0 * (self.Lambda * (Z_hat - 2 * self.x_opt) + 2 * self.x_opt)
+        fpen = 100.0 * f_pen(Z / 100.0)
+        f = 4.189828872724339 - 0.01 * np.mean(
+            Z * np.sin(np.sqrt(np.abs(Z))), axis=-1)
         return -(f + fpen) + self.f_opt
 
 
@@ -1155,13 +1218,13 @@ class GallaghersGaussian101mePeaks(ObjectiveFunctionBase):
         self.Y[1:] = self.random_state.uniform(-4, 4, (self.n_peaks - 1,
                                                        self.n_dims))
         self.x_opt = self.Y[0]
+        self.rotated_Y = _dot_rows(self.Y, self.R.T)
 
-    def feedback(self, x):
-        D = (x - self.Y).dot(self.R.T)
-        p = np.exp(-0.5 / self.n_dims *
-                   np.array([D[i].T.dot(np.diag(self.C[i])).dot(D[i])
-                             for i in range(self.n_peaks)]))
-        return -(T_osc(10.0 - np.max(self.w * p)) ** 2 + f_pen(x)) + self.f_opt
+    def feedback_batch(self, X):
+        D = _dot_rows(X, self.R.T)[..., np.newaxis, :] - self.rotated_Y
+        p = np.exp(-0.5 / self.n_dims * np.sum(self.C * D ** 2, axis=-1))
+        return -(T_osc(10.0 - np.max(self.w * p, axis=-1)) ** 2 +
+                 f_pen(X)) + self.f_opt
 
 
 class GallaghersGaussian21hiPeaks(GallaghersGaussian101mePeaks):
@@ -1214,14 +1277,18 @@ class Katsuura(ObjectiveFunctionBase):
         Q = generate_rotation(self.random_state, self.n_dims)
         self.lin_trans = Q.dot(Lambda(self.n_dims, 100)[:, np.newaxis] * R)
         self.scale = 10.0 / self.n_dims ** 2
-
-    def feedback(self, x):
-        z = self.lin_trans.dot(x - self.x_opt)
+        self.powers = 2.0 ** np.arange(1, 33)
+
+    def feedback_batch(self, X):
+        Z = _dot_rows(X - self.x_opt, self.lin_trans.T)
+        scaled_Z = self.powers[:, np.newaxis] * Z[..., np.newaxis, :]
+        s = np.sum((np.abs(scaled_Z - np.round(scaled_Z)) /
+                    self.powers[:, np.newaxis]).reshape(Z.shape[:-1] + (-1,)),
+                   axis=-1)
         return -(self.scale * np.prod(
-            1 + np.arange(1, self.n_dims + 1) *
-            np.sum([np.abs(2 ** j * z - np.round(2 ** j * z)) / 2 ** j
-                    for j in range(1, 33)])) ** (10.0 / self.n_dims ** 1.2) -
-            self.scale + f_pen(x)) + self.f_opt
+            1 + np.arange(1, self.n_dims + 1) * s[..., np.newaxis],
+            axis=-1) ** (10.0 / self.n_dims ** 1.2) -
+            self.scale + f_pen(X)) + self.f_opt
 
 
 class LunacekBiRastrigin(ObjectiveFunctionBase):
@@ -1263,14 +1330,15 @@ class LunacekBiRastrigin(ObjectiveFunctionBase):
         self.mu_1 = -np.sqrt((self.mu_0 ** 2 - self.d) / self.s)
         self.x_opt = 0.5 * np.sign(self.x_opt) * self.mu_0
 
-    def feedback(self, x):
-        x_hat = 2 * np.sign(self.x_opt) * x
-        z = self.lin_trans.dot(x_hat - self.mu_0)
-        d_mu_0 = x_hat - self.mu_0
-        d_mu_1 = x_hat - self.mu_1
-        return -(np.minimum(d_mu_0.dot(d_mu_0), self.d * self.n_dims +
-                            self.s * d_mu_1.dot(d_mu_1)) +
-                 rastrigin(z, penalize_norm=False) + 1e4 * f_pen(x)) + self.f_opt
+    def feedback_batch(self, X):
+        X_hat = 2 * np.sign(self.x_opt) * X
+        Z = _dot_rows(X_hat - self.mu_0, self.lin_trans.T)
+        D_mu_0 = X_hat - self.mu_0
+        D_mu_1 = X_hat - self.mu_1
+        return -(np.minimum(np.sum(D_mu_0 * D_mu_0, axis=-1),
+                            self.d * self.n_dims +
+                            self.s * np.sum(D_mu_1 * D_mu_1, axis=-1)) +
+                 rastrigin(Z, penalize_norm=False) + 1e4 * f_pen(X)) + self.f_opt
 
 
 SEPARABLE_FUNCTIONS = [
@@ -1407,10 +1475,8 @@ def plot_function(name, random_state=None, fig=None, contour=False):
     X = np.arange(-5, 5, 0.2)
     Y = np.arange(-5, 5, 0.2)
     X, Y = np.meshgrid(X, Y)
-    F = np.ndarray(X.shape)
-    for i in range(X.shape[0]):
-        for j in range(X.shape[1]):
-            F[i, j] = f.feedback(np.array([X[i, j], Y[i, j]]))
+    F = f.feedback_batch(np.column_stack((X.ravel(), Y.ravel())))
+    F = F.reshape(X.shape)
 
     if fig is None:
         fig = plt.figure(figsize=(12, 5))
@@ -1518,6 +1584,28 @@ class ObjectiveFunction(Environment):
     def get_feedback(self):
         return np.array([self.f])
 
+    def feedback_batch(self, params):
+        """Evaluate multiple parameter vectors at once.
+
+        This is much faster than running one episode per parameter vector.
+        The result for each parameter vector is the same.
+
+        Parameters
+        ----------
+        params : array-like, shape (n_samples, n_params)
+            Parameter vectors, e.g. from the batch interface of an optimizer
+
+        Returns
+        -------
+        feedbacks : array, shape (n_samples, 1)
+            Feedbacks for each parameter vector
+        """
+        params = np.asarray(params, dtype=np.float64)
+        if params.ndim != 2 or params.shape[1] != self.n_params:
+            raise ValueError("Expected parameters with shape (n_samples, %d), "
+                             "got %r" % (self.n_params, params.shape))
+        return self.objective.feedback_batch(params)[:, np.newaxis]
+
     def is_behavior_learning_done(self):
         return False
 
@@ -1,11 +1,17 @@
 # Authors: Alexander Fabisch <afabisch@informatik.uni-bremen.de>
 
 import numpy as np
+from scipy.spatial import cKDTree
 from scipy.spatial.distance import cdist
 from .environment import Environment
 from bolero.utils.log import get_logger
 
 
+def _norms(X):
+    """Euclidean norms of vectors along the last axis."""
+    return np.sqrt(np.sum(X ** 2, axis=-1))
+
+
 class OptimumTrajectory(Environment):
     """Optimize a trajectory according to some criteria.
 
@@ -45,6 +51,13 @@ class OptimumTrajectory(Environment):
     penalty_obstacle : float, optional (default: 0)
         Penalty weight for obstacle avoidance
 
+    obstacle_index : bool, optional (default: False)
+        Build a KD-tree of the obstacles in init() and only compute distances
+        to obstacles that are closer than obstacle_dist. The cost of collision
+        checks depends on the local density of obstacles instead of their
+        number. The penalties might differ in the last digits from the
+        dense computation.
+
     log_to_file: optional, boolean or string (default: False)
         Log results to given file, it will be located in the $BL_LOG_PATH
 
@@ -55,7 +68,8 @@ class OptimumTrajectory(Environment):
                  dt=0.01, obstacles=None, obstacle_dist=0.1,
                  penalty_start_dist=0.0, penalty_goal_dist=0.0,
                  penalty_vel=0.0, penalty_acc=0.0, penalty_obstacle=0.0,
-                 log_to_file=False, log_to_stdout=False):
+                 obstacle_index=False, log_to_file=False,
+                 log_to_stdout=False):
         self.x0 = x0
         self.g = g
         self.execution_time = execution_time
@@ -67,6 +81,7 @@ class OptimumTrajectory(Environment):
         self.penalty_vel = penalty_vel
         self.penalty_acc = penalty_acc
         self.penalty_obstacle = penalty_obstacle
+        self.obstacle_index = obstacle_index
         self.log_to_file = log_to_file
         self.log_to_stdout = log_to_stdout
 
@@ -82,6 +97,11 @@ class OptimumTrajectory(Environment):
         self.Xd = np.empty((n_steps, self.n_task_dims))
         self.Xdd = np.empty((n_steps, self.n_task_dims))
 
+        if self.obstacles is not None and self.obstacle_index:
+            self.obstacle_tree_ = cKDTree(np.asarray(self.obstacles))
+        else:
+            self.obstacle_tree_ = None
+
     def reset(self):
         """Reset state of the environment."""
         self.t = 0
@@ -142,6 +162,39 @@ class OptimumTrajectory(Environment):
         """Execute step perfectly."""
         self.t += 1
 
+    def can_execute_trajectory(self):
+        """Returns if all inputs of an episode can be set at once.
+
+        Returns
+        -------
+        can_execute_trajectory : bool
+            Always true, steps are executed perfectly
+        """
+        return True
+
+    def execute_trajectory(self, inputs):
+        """Execute a whole episode perfectly.
+
+        Parameters
+        ----------
+        inputs : array, shape (n_inputs_steps, 3 * n_task_dims)
+            Positions, velocities and accelerations for each step. The last
+            step will be repeated if there are less steps than in an episode.
+
+        Returns
+        -------
+        outputs : array, shape (n_steps, 3 * n_task_dims)
+            Positions, velocities and accelerations after each step
+        """
+        n_steps = len(self.X)
+        inputs = np.asarray(inputs)[
+            np.minimum(np.arange(n_steps), len(inputs) - 1)]
+        self.X[:] = inputs[:, :self.n_task_dims]
+        self.Xd[:] = inputs[:, self.n_task_dims:-self.n_task_dims]
+        self.Xdd[:] = inputs[:, -self.n_task_dims:]
+        self.t = n_steps
+        return inputs
+
     def is_evaluation_done(self):
         """Check if the time is over.
 
@@ -160,9 +213,9 @@ class OptimumTrajectory(Environment):
         start_dist : float
             start distance
         """
-        start_dist = np.linalg.norm(self.x0 - self.X[0])
-        self.logger.info("Distance to start: %.3f (* %.2f)"
-                         % (start_dist, self.penalty_start_dist))
+        start_dist = self._start_dists(self.X[np.newaxis])[0]
+        self.logger.info("Distance to start: %.3f (* %.2f)",
+                         start_dist, self.penalty_start_dist)
         return start_dist
 
     def get_goal_dist(self):
@@ -173,10 +226,10 @@ class OptimumTrajectory(Environment):
         goal_dist : float
             goal distance
         """
-        goal_dist = np.linalg.norm(self.g - self.X[-1])
-        self.logger.info("Distance to goal: %.3f (* %.2f)"
-                         % (goal_dist, self.penalty_goal_dist))
-        self.logger.info("Goal: %s, last position: %s" % (self.g, self.X[-1]))
+        goal_dist = self._goal_dists(self.X[np.newaxis])[0]
+        self.logger.info("Distance to goal: %.3f (* %.2f)",
+                         goal_dist, self.penalty_goal_dist)
+        self.logger.info("Goal: %s, last position: %s", self.g, self.X[-1])
         return goal_dist
 
     def get_speed(self):
@@ -187,8 +240,8 @@ class OptimumTrajectory(Environment):
         speed : array-like, shape (n_steps,)
             the speed (scalar) at all previous timestamps
         """
-        speed = np.sqrt(np.sum(self.Xd ** 2, axis=1))
-        self.logger.info("Speed: %r" % speed)
+        speed = _norms(self.Xd)
+        self.logger.info("Speed: %r", speed)
         return speed
 
     def get_acceleration(self):
@@ -199,8 +252,8 @@ class OptimumTrajectory(Environment):
         acceleration : array-like, shape (n_steps,)
             the total acceleration (scalar) at all previous timestamps
         """
-        acceleration = np.sqrt(np.sum(self.Xdd ** 2, axis=1))
-        self.logger.info("Accelerations: %r" % acceleration)
+        acceleration = _norms(self.Xdd)
+        self.logger.info("Accelerations: %r", acceleration)
         return acceleration
 
     def get_collision(self, obstacle_filter=None):
@@ -220,16 +273,49 @@ class OptimumTrajectory(Environment):
         """
         if self.obstacles is None:
             return np.zeros(self.t)
-        if obstacle_filter is None:
-            obstacles = self.obstacles
+        return self._collisions(self.X[np.newaxis], obstacle_filter)[0]
+
+    def _start_dists(self, X):
+        """Distances of the first positions to the start."""
+        return _norms(X[:, 0] - self.x0)
+
+    def _goal_dists(self, X):
+        """Distances of the last positions to the goal."""
+        return _norms(self.g - X[:, -1])
+
+    def _collisions(self, X, obstacle_filter=None):
+        """Collision penalties of each step of multiple trajectories."""
+        n_samples, n_steps = X.shape[:2]
+        X = X.reshape(n_samples * n_steps, -1)
+        if self.obstacle_tree_ is not None:
+            collisions = self._indexed_collisions(X, obstacle_filter)
         else:
-            obstacles = np.asarray(self.obstacles)[obstacle_filter, :]
-        distances = cdist(self.X, obstacles)
-        self.logger.info("Distances to obstacles: %r" % distances)
-        collision_penalties = np.maximum(0., 1.0 - distances /
+            if obstacle_filter is None:
+                obstacles = self.obstacles
+            else:
+                obstacles = np.asarray(self.obstacles)[obstacle_filter, :]
+            distances = cdist(X, obstacles)
+            self.logger.info("Distances to obstacles: %r", distances)
+            collision_penalties = np.maximum(0., 1.0 - distances /
+                                             self.obstacle_dist)
+            collisions = collision_penalties.sum(axis=1)
+        return collisions.reshape(n_samples, n_steps)
+
+    def _indexed_collisions(self, X, obstacle_filter=None):
+        """Collision penalties of positions based on the obstacle index."""
+        distances = cKDTree(X).sparse_distance_matrix(
+            self.obstacle_tree_, self.obstacle_dist,
+            output_type="coo_matrix")
+        self.logger.info("Distances to obstacles: %r", distances)
+        steps, obstacles = distances.row, distances.col
+        collision_penalties = np.maximum(0., 1.0 - distances.data /
                                          self.obstacle_dist)
-        collisions = collision_penalties.sum(axis=1)
-        return collisions
+        if obstacle_filter is not None:
+            selected = np.zeros(self.obstacle_tree_.n, dtype=bool)
+            selected[np.asarray(obstacle_filter)] = True
+            collision_penalties = collision_penalties * selected[obstacles]
+        return np.bincount(steps, weights=collision_penalties,
+                           minlength=len(X))
 
     def get_num_obstacles(self):
         """Get number of obstacles in environment.
@@ -264,6 +350,50 @@ class OptimumTrajectory(Environment):
             rewards -= self.penalty_obstacle * self.get_collision()
         return rewards
 
+    def get_feedback_batch(self, X, Xd=None, Xdd=None):
+        """Get rewards for multiple trajectories without executing them.
+
+        All trajectories are evaluated at once. The result for each
+        trajectory is exactly the same as the result of :func:`get_feedback`
+        after it has been executed step by step.
+
+        Parameters
+        ----------
+        X : array-like, shape (n_samples, n_steps, n_task_dims)
+            Positions of each trajectory
+
+        Xd : array-like, shape (n_samples, n_steps, n_task_dims), optional
+            Velocities of each trajectory, required if penalty_vel > 0
+
+        Xdd : array-like, shape (n_samples, n_steps, n_task_dims), optional
+            Accelerations of each trajectory, required if penalty_acc > 0
+
+        Returns
+        -------
+        rewards : array, shape (n_samples, n_steps)
+            reward for every timestamp of each trajectory; non-positive values
+        """
+        X = np.asarray(X, dtype=np.float64)
+        rewards = np.zeros(X.shape[:2])
+        if self.penalty_start_dist > 0.0:
+            rewards[:, 0] -= self._start_dists(X) * self.penalty_start_dist
+        if self.penalty_goal_dist > 0.0:
+            rewards[:, -1] -= self._goal_dists(X) * self.penalty_goal_dist
+        if self.penalty_vel > 0.0:
+            if Xd is None:
+                raise ValueError("Velocities are required to penalize them")
+            speed = _norms(np.asarray(Xd, dtype=np.float64))
+            rewards -= speed * self.penalty_vel
+        if self.penalty_acc > 0.0:
+            if Xdd is None:
+                raise ValueError(
+                    "Accelerations are required to penalize them")
+            acceleration = _norms(np.asarray(Xdd, dtype=np.float64))
+            rewards -= acceleration * self.penalty_acc
+        if self.obstacles is not None and self.penalty_obstacle > 0.0:
+            rewards -= self.penalty_obstacle * self._collisions(X)
+        return rewards
+
     def is_behavior_learning_done(self):
         """Check if the behavior learning is finished.
 
@@ -1,6 +1,8 @@
 import numpy as np
 from bolero.environment.objective_functions import FUNCTIONS, ObjectiveFunction
-from nose.tools import assert_less, assert_almost_equal, assert_raises_regexp
+from numpy.testing import assert_array_equal
+from nose.tools import (assert_less, assert_almost_equal, assert_raises_regexp,
+                        assert_equal)
 
 
 def test_optimum():
@@ -22,3 +24,31 @@ def test_input_validation():
     assert_raises_regexp(ValueError, "Unknown function", env.init)
     env = ObjectiveFunction("Sphere", 0)
     assert_raises_regexp(ValueError, "Number of parameters", env.init)
+
+
+def test_feedback_batch():
+    random_state = np.random.RandomState(0)
+    for name, Objective in FUNCTIONS.items():
+        for n_dims in [2, 10]:
+            objective = Objective(random_state, n_dims=n_dims)
+            X = random_state.uniform(-6.0, 6.0, (20, n_dims))
+            F = objective.feedback_batch(X)
+            assert_equal(F.shape, (20,))
+            f = np.array([objective.feedback(x) for x in X])
+            assert_array_equal(F, f, err_msg="Batch evaluation of '%s' is "
+                               "not equal to single evaluations" % name)
+
+
+def test_environment_feedback_batch():
+    env = ObjectiveFunction("Rosenbrock", 3, random_state=0)
+    env.init()
+    X = np.random.RandomState(0).randn(5, 3)
+    feedbacks = env.feedback_batch(X)
+    assert_equal(feedbacks.shape, (5, 1))
+    for x, feedback in zip(X, feedbacks):
+        env.reset()
+        env.set_inputs(x)
+        env.step_action()
+        assert_array_equal(env.get_feedback(), feedback)
+    assert_raises_regexp(ValueError, "Expected parameters",
+                         env.feedback_batch, np.zeros((5, 2)))
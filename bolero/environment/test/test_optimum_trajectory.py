@@ -1,6 +1,7 @@
 import numpy as np
 from bolero.environment import OptimumTrajectory
-from nose.tools import assert_equal, assert_false, assert_true
+from nose.tools import (assert_equal, assert_false, assert_true,
+                        assert_raises_regexp)
 from numpy.testing import assert_array_equal, assert_array_almost_equal
 
 
@@ -143,3 +144,76 @@ def test_penalize_obstacles():
     assert_true(env.is_evaluation_done())
     rewards = env.get_feedback()
     assert_array_almost_equal(rewards, -8.0 * np.ones(2))
+
+
+def test_execute_trajectory():
+    env = OptimumTrajectory(x0=np.zeros(1), g=np.ones(1), dt=0.25,
+                            penalty_goal_dist=5.0, penalty_vel=1.0)
+    env.init()
+    assert_true(env.can_execute_trajectory())
+    inputs = np.array([[0.0, 0.0, 0.0], [0.5, 1.0, 0.0], [1.0, 2.0, 0.0]])
+
+    env.reset()
+    outputs = env.execute_trajectory(inputs)
+    assert_true(env.is_evaluation_done())
+    assert_array_equal(outputs, inputs[[0, 1, 2, 2, 2]])
+    rewards = env.get_feedback()
+
+    xva = np.empty(3)
+    env.reset()
+    env.get_outputs(xva)
+    for x in outputs:
+        env.set_inputs(x)
+        env.step_action()
+        env.get_outputs(xva)
+        assert_array_equal(xva, x)
+    assert_true(env.is_evaluation_done())
+    assert_array_equal(env.get_feedback(), rewards)
+
+
+def test_feedback_batch():
+    env = OptimumTrajectory(x0=np.zeros(2), g=np.ones(2), dt=0.1,
+                            obstacles=np.array([[0.5, 0.5], [0.2, 0.8]]),
+                            obstacle_dist=0.3, penalty_start_dist=1.0,
+                            penalty_goal_dist=2.0, penalty_vel=0.1,
+                            penalty_acc=0.01, penalty_obstacle=5.0)
+    env.init()
+    random_state = np.random.RandomState(0)
+    X, Xd, Xdd = random_state.rand(3, 5, 11, 2)
+    rewards = env.get_feedback_batch(X, Xd, Xdd)
+    assert_equal(rewards.shape, (5, 11))
+
+    xva = np.empty(6)
+    for i in range(5):
+        env.reset()
+        for t in range(11):
+            env.get_outputs(xva)
+            env.set_inputs(np.hstack((X[i, t], Xd[i, t], Xdd[i, t])))
+            env.step_action()
+        assert_true(env.is_evaluation_done())
+        assert_array_equal(env.get_feedback(), rewards[i])
+
+
+def test_feedback_batch_requires_derivatives():
+    env = OptimumTrajectory(penalty_vel=1.0)
+    env.init()
+    assert_raises_regexp(ValueError, "Velocities are required",
+                         env.get_feedback_batch, np.zeros((1, 101, 2)))
+
+
+def test_obstacle_index():
+    random_state = np.random.RandomState(0)
+    obstacles = random_state.rand(200, 2)
+    X = random_state.rand(3, 101, 2)
+    rewards = []
+    collisions = []
+    for obstacle_index in [False, True]:
+        env = OptimumTrajectory(obstacles=obstacles, obstacle_dist=0.05,
+                                penalty_obstacle=1.0,
+                                obstacle_index=obstacle_index)
+        env.init()
+        rewards.append(env.get_feedback_batch(X))
+        env.X[:] = X[0]
+        collisions.append(env.get_collision(obstacle_filter=(0, 2, 5)))
+    assert_array_almost_equal(rewards[0], rewards[1])
+    assert_array_almost_equal(collisions[0], collisions[1])
@@ -1,9 +1,12 @@
 from .optimizer import Optimizer, ContextualOptimizer
 from .baseline import NoOptimizer, RandomOptimizer
 from .cmaes import (CMAESOptimizer, RestartCMAESOptimizer, IPOPCMAESOptimizer,
-                    BIPOPCMAESOptimizer, fmin)
+                    BIPOPCMAESOptimizer, SepCMAESOptimizer,
+                    SepRestartCMAESOptimizer, SepIPOPCMAESOptimizer,
+                    SepBIPOPCMAESOptimizer, fmin)
 from .reps import REPSOptimizer
 from .creps import CREPSOptimizer
+from .lmmaes import LMMAESOptimizer
 from .acmes import ACMESOptimizer
 from .ccmaes import CCMAESOptimizer
 
@@ -17,7 +20,12 @@ __all__ = [
     "RestartCMAESOptimizer",
     "IPOPCMAESOptimizer",
     "BIPOPCMAESOptimizer",
+    "SepCMAESOptimizer",
+    "SepRestartCMAESOptimizer",
+    "SepIPOPCMAESOptimizer",
+    "SepBIPOPCMAESOptimizer",
     "fmin",
+    "LMMAESOptimizer",
     "ACMESOptimizer",
     "CCMAESOptimizer",
     "REPSOptimizer",
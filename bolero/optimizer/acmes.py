@@ -150,6 +150,31 @@ class ACMESOptimizer(Optimizer):
     def get_next_parameters(self, params):
         params[:] = self.samples[self.k]
 
+    def get_next_parameters_batch(self, n_samples=None):
+        """Get the next individuals of the current generation.
+
+        The feedbacks have to be passed to
+        :func:`set_evaluation_feedback_batch` in the same order.
+
+        Parameters
+        ----------
+        n_samples : int, optional (default: remaining samples of generation)
+            Number of individuals
+
+        Returns
+        -------
+        params : array, shape (n_samples, n_params)
+            Parameter vectors
+        """
+        n_remaining = len(self.samples) - self.k
+        if n_samples is None:
+            n_samples = n_remaining
+        elif n_samples > n_remaining:
+            raise ValueError("Only %d samples are left in the current "
+                             "generation, got request for %d samples."
+                             % (n_remaining, n_samples))
+        return self.samples[self.k:self.k + n_samples].copy()
+
     def set_evaluation_feedback(self, feedback):
         f = check_feedback(feedback, compute_sum=True)
         if self.maximize:
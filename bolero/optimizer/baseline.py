@@ -1,6 +1,7 @@
 # Author: Alexander Fabisch <afabisch@informatik.uni-bremen.de>
 
 import numpy as np
+from collections import deque
 from .optimizer import Optimizer
 from ..utils.validation import check_random_state
 
@@ -28,6 +29,7 @@ class NoOptimizer(Optimizer):
             raise ValueError("Number of dimensions (%d) does not match "
                              "number of initial parameters (%d)."
                              % (dimension, len(self.initial_params)))
+        self.n_params = dimension
         self.best_params = np.asarray(self.initial_params).copy()
 
     def get_next_parameters(self, p, explore=True):
@@ -73,24 +75,42 @@ class RandomOptimizer(Optimizer):
             raise ValueError("Number of dimensions (%d) does not match "
                              "number of initial parameters (%d)."
                              % (dimension, len(self.initial_params)))
+        self.n_params = dimension
         self.best_params = np.asarray(self.initial_params).copy()
         self.params = np.zeros(dimension)
         if self.covariance is None:
             self.covariance = np.eye(dimension)
         self.random_state = check_random_state(self.random_state)
         self.best_reward = -np.inf
+        self.pending_params = deque()
 
     def get_next_parameters(self, p):
         self.params = self.random_state.multivariate_normal(
             self.initial_params, self.covariance, size=1)[0]
         p[:] = self.params
 
+    def get_next_parameters_batch(self, n_samples=None):
+        if n_samples is None:
+            n_samples = 1
+        params = self.random_state.multivariate_normal(
+            self.initial_params, self.covariance, size=n_samples)
+        self.pending_params = deque(params)
+        return params
+
     def set_evaluation_feedback(self, rewards):
         r = np.sum(rewards)
         if r > self.best_reward:
             self.best_reward = r
             self.best_params = self.params.copy()
 
+    def set_evaluation_feedback_batch(self, feedbacks):
+        if len(feedbacks) > len(self.pending_params):
+            raise ValueError("Received %d feedbacks for %d parameter vectors."
+                             % (len(feedbacks), len(self.pending_params)))
+        for feedback in feedbacks:
+            self.params = self.pending_params.popleft()
+            self.set_evaluation_feedback(feedback)
+
     def get_best_parameters(self):
         return self.best_params
 
@@ -1,15 +1,14 @@
 # Author: Alexander Fabisch <afabisch@informatik.uni-bremen.de>
 
 import numpy as np
-from collections import deque
 from ..optimizer import ContextualOptimizer
+from ..representation.context_transformations import polynomial
 from ..representation.ul_policies import (ContextTransformationPolicy,
-                                          LinearGaussianPolicy)
+                                          LinearGaussianPolicy, _solve_spd)
 from ..utils.validation import check_random_state, check_feedback, check_context
 from ..utils.log import get_logger
+from ..utils.recording import SampleHistory
 from .cmaes import inv_sqrt
-from sklearn.preprocessing import PolynomialFeatures
-from sklearn.linear_model import Ridge
 
 
 class CCMAESOptimizer(ContextualOptimizer):
@@ -136,10 +135,13 @@ class CCMAESOptimizer(ContextualOptimizer):
 
         self.hsig_threshold = 2 + 4.0 / (self.n_params + 1)
 
-        self.history_theta = deque(maxlen=self.n_samples_per_update)
-        self.history_R = deque(maxlen=self.n_samples_per_update)
-        self.history_s = deque(maxlen=self.n_samples_per_update)
-        self.history_phi_s = deque(maxlen=self.n_samples_per_update)
+        self.history = SampleHistory(self.n_samples_per_update)
+
+        # Contexts, parameters and context features from
+        # get_next_parameters_batch without feedback
+        self.pending_contexts = np.empty((0, n_context_dims))
+        self.pending_params = np.empty((0, n_params))
+        self.pending_context_features = None
 
         # Evolution path for covariance
         self.pc = np.zeros(self.n_params)
@@ -174,9 +176,10 @@ class CCMAESOptimizer(ContextualOptimizer):
 
         self.weights = np.empty(self.n_samples_per_update)
 
-        self.reward_model_features = PolynomialFeatures(
-            degree=self.baseline_degree, include_bias=False)
-        self.reward_model = Ridge(alpha=self.gamma, fit_intercept=True)
+        # Regularization of the ridge regression of the reward baseline, the
+        # intercept (the feature that is constant 1) will not be regularized
+        bias = polynomial(np.zeros(n_context_dims), self.baseline_degree)
+        self.baseline_regularization = self.gamma * np.diag(bias == 0.0)
 
         self.invsqrtC = inv_sqrt(self.cov)[0]
         self.eigen_decomp_updated = self.it
@@ -217,6 +220,33 @@ class CCMAESOptimizer(ContextualOptimizer):
         self.params = self.policy_(self.context, explore=explore)
         params[:] = self.params
 
+    def get_next_parameters_batch(self, contexts, explore=True):
+        """Get next individuals/parameter vectors for multiple contexts.
+
+        The feedbacks have to be passed to
+        :func:`set_evaluation_feedback_batch` in the same order.
+
+        Parameters
+        ----------
+        contexts : array-like, shape (n_samples, n_context_dims)
+            The contexts in which the parameter vectors will be evaluated
+
+        explore : bool, optional (default: True)
+            Whether we want to turn exploration on for the next evaluations
+
+        Returns
+        -------
+        params : array, shape (n_samples, n_params)
+            Parameter vectors
+        """
+        contexts = np.asarray(contexts)
+        params = self.policy_.evaluate_batch(contexts, explore=explore)
+        self.pending_contexts = contexts
+        self.pending_params = params
+        self.pending_context_features = self.policy_.transform_contexts(
+            contexts)
+        return params
+
     def set_evaluation_feedback(self, rewards):
         """Set feedbacks for the parameter vector.
 
@@ -226,30 +256,72 @@ class CCMAESOptimizer(ContextualOptimizer):
             Feedbacks for each step or for the episode, depending on the
             problem
         """
-        self._add_sample(rewards)
+        self._add_sample(rewards,
+                         self.policy_.transform_context(self.context))
 
         if self.it % self.n_samples_per_update == 0:
-            s = np.asarray(self.history_s)
-            phi_s = np.asarray(self.history_phi_s)
-            theta = np.asarray(self.history_theta)
-            R = np.asarray(self.history_R)
-            self._update(s, phi_s, theta, R)
+            self._update()
+
+    def set_evaluation_feedback_batch(self, feedbacks):
+        """Set feedbacks for multiple parameter vectors.
 
-    def _add_sample(self, rewards):
+        Parameters
+        ----------
+        feedbacks : array-like, shape (n_samples, n_feedbacks) or (n_samples,)
+            Feedbacks of each parameter vector that has been obtained from
+            :func:`get_next_parameters_batch`, in the same order
+        """
+        n_samples = len(feedbacks)
+        if n_samples > len(self.pending_params):
+            raise ValueError("Received %d feedbacks for %d parameter vectors."
+                             % (n_samples, len(self.pending_params)))
+        if n_samples == 0:
+            return
+        contexts = self.pending_contexts[:n_samples]
+        params = self.pending_params[:n_samples]
+        context_features = self.pending_context_features[:n_samples]
+        self.pending_contexts = self.pending_contexts[n_samples:]
+        self.pending_params = self.pending_params[n_samples:]
+        self.pending_context_features = (
+            self.pending_context_features[n_samples:])
+        rewards = np.array([check_feedback(feedback, compute_sum=True)
+                            for feedback in feedbacks])
+        if self.log_to_stdout or self.log_to_file:
+            for reward in rewards:
+                self.logger.info("[CCMAES] Reward %.6f" % reward)
+
+        # Add all samples until the next update at once
+        start = 0
+        while start < n_samples:
+            end = min(n_samples, start + self.n_samples_per_update -
+                      self.it % self.n_samples_per_update)
+            self.history.extend(params[start:end], rewards[start:end],
+                                contexts[start:end],
+                                context_features[start:end])
+            self.it += end - start
+            if self.it % self.n_samples_per_update == 0:
+                self._update()
+            start = end
+
+        self.context = contexts[-1]
+        self.params = params[-1]
+        self.reward = rewards[-1]
+
+    def _add_sample(self, rewards, phi_s):
         self.reward = check_feedback(rewards, compute_sum=True)
         if self.log_to_stdout or self.log_to_file:
             self.logger.info("[CCMAES] Reward %.6f" % self.reward)
 
-        phi_s = self.policy_.transform_context(self.context)
-
-        self.history_theta.append(self.params)
-        self.history_R.append(self.reward)
-        self.history_s.append(self.context)
-        self.history_phi_s.append(phi_s)
+        self.history.append(self.params, self.reward, self.context, phi_s)
 
         self.it += 1
 
-    def _update(self, s, phi_s, theta, R):
+    def _update(self):
+        s = np.asarray(self.history.contexts)
+        phi_s = np.asarray(self.history.context_features)
+        theta = np.asarray(self.history.params)
+        R = np.asarray(self.history.returns)
+
         advantages = self._estimate_baseline(s, R)
         indices = np.argsort(np.argsort(advantages)[::-1])
 
@@ -300,9 +372,13 @@ class CCMAESOptimizer(ContextualOptimizer):
         self.policy_.policy.Sigma = self.var * self.cov
 
     def _estimate_baseline(self, s, R):
-        baseline_features = self.reward_model_features.fit_transform(s)
-        self.reward_model.fit(baseline_features, R)
-        return R - self.reward_model.predict(baseline_features)
+        # The samples of the window are replaced completely between two
+        # updates, so we build the normal equations from all of them at once
+        baseline_features = polynomial(s, self.baseline_degree)
+        coefficients = _solve_spd(
+            baseline_features.T.dot(baseline_features) +
+            self.baseline_regularization, baseline_features.T.dot(R))
+        return R - baseline_features.dot(coefficients)
 
     def _update_step_size_evolution_path(self, mean_diff):
         self.ps *= 1.0 - self.c_sigma
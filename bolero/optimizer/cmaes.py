@@ -22,10 +22,32 @@ def _bound(bounds, samples):
         are within the boundaries.
     """
     if bounds is not None:
-        # TODO vectorize?
-        for k in range(len(samples)):
-            samples[k] = np.maximum(samples[k], bounds[:, 0])
-            samples[k] = np.minimum(samples[k], bounds[:, 1])
+        np.maximum(samples, bounds[:, 0], out=samples)
+        np.minimum(samples, bounds[:, 1], out=samples)
+
+
+def _diagonal_covariance(covariance, n_params):
+    """Get the diagonal of the initial covariance.
+
+    Parameters
+    ----------
+    covariance : array-like, shape (n_params,) or (n_params, n_params)
+        Diagonal or full covariance matrix, the default are ones if None
+
+    n_params : int
+        Number of parameters
+
+    Returns
+    -------
+    diagonal : array, shape (n_params,)
+        Copy of the diagonal of the covariance
+    """
+    if covariance is None:
+        return np.ones(n_params)
+    covariance = np.asarray(covariance, dtype=np.float64)
+    if covariance.ndim == 2:
+        covariance = np.diag(covariance)
+    return covariance.copy()
 
 
 def inv_sqrt(cov):
@@ -35,7 +57,7 @@ def inv_sqrt(cov):
     # HACK: avoid numerical problems
     D = np.maximum(D, np.finfo(np.float).eps)
     D = np.sqrt(D)
-    return B.dot(np.diag(1.0 / D)).dot(B.T), B, D
+    return (B / D).dot(B.T), B, D
 
 
 class CMAESOptimizer(Optimizer):
@@ -155,12 +177,7 @@ class CMAESOptimizer(Optimizer):
                              "number of initial parameters (%d)."
                              % (n_params, len(self.initial_params)))
 
-        if self.covariance is None:
-            self.covariance = np.eye(self.n_params)
-        else:
-            self.covariance = np.asarray(self.covariance).copy()
-        if self.covariance.ndim == 1:
-            self.covariance = np.diag(self.covariance)
+        self._init_covariance()
 
         self.best_fitness = np.inf
         self.best_fitness_it = self.it
@@ -168,6 +185,14 @@ class CMAESOptimizer(Optimizer):
 
         self._reinit()
 
+    def _init_covariance(self):
+        if self.covariance is None:
+            self.covariance = np.eye(self.n_params)
+        else:
+            self.covariance = np.asarray(self.covariance).copy()
+        if self.covariance.ndim == 1:
+            self.covariance = np.diag(self.covariance)
+
     def _reinit(self):
         # Iteration of last reinitialization
         self.initial_it = self.it
@@ -182,6 +207,7 @@ class CMAESOptimizer(Optimizer):
 
         self.mean = self.initial_params.copy()
         self.cov = self.covariance.copy()
+        self._update_eigen_decomposition()
 
         self.samples = self._sample(self.n_samples_per_update)
         self.fitness = np.empty(self.n_samples_per_update)
@@ -220,17 +246,36 @@ class CMAESOptimizer(Optimizer):
         # Evolution path for sigma
         self.ps = np.zeros(self.n_params)
 
+        # Work buffers of the update, they will be reused in each generation
+        self.last_mean = np.empty(self.n_params)
+        self.selected_noise = np.empty((self.mu, self.n_params))
+        self.weighted_noise = np.empty((self.mu, self.n_params))
+        self.rank_one_update = np.empty_like(self.cov)
+        self.rank_mu_update = np.empty_like(self.cov)
+        if self.active:
+            self.neg_rank_mu_update = np.empty_like(self.cov)
+
         if self.active:
             self.alpha_old = 0.5
             self.neg_cmu = ((1.0 - self.cmu) * 0.25 * self.mueff /
                             ((self.n_params + 2) ** 1.5 + 2.0 * self.mueff))
 
-        self.invsqrtC = inv_sqrt(self.cov)[0]
+    def _update_eigen_decomposition(self):
+        """Factorize the covariance matrix.
+
+        We cache the inverse square root of the covariance for the update of
+        the evolution path and B * D (B: eigenvectors, D: square roots of
+        eigenvalues) to transform samples from a standard normal
+        distribution. The decomposition is in O(n_params^3), hence it will
+        only be updated every eigen_update_freq iterations.
+        """
+        self.invsqrtC, B, D = inv_sqrt(self.cov)
+        self.sample_trans = B * D
         self.eigen_decomp_updated = self.it
 
     def _sample(self, n_samples):
-        samples = self.random_state.multivariate_normal(
-            self.mean, self.var * self.cov, size=n_samples)
+        Z = self.random_state.randn(n_samples, self.n_params)
+        samples = self.mean + np.sqrt(self.var) * Z.dot(self.sample_trans.T)
         _bound(self.bounds, samples)
         return samples
 
@@ -245,6 +290,37 @@ class CMAESOptimizer(Optimizer):
         k = self.it % self.n_samples_per_update
         params[:] = self.samples[k]
 
+    def get_next_parameters_batch(self, n_samples=None):
+        """Get the next individuals of the current generation.
+
+        The feedbacks have to be passed to
+        :func:`set_evaluation_feedback_batch` in the same order.
+
+        Parameters
+        ----------
+        n_samples : int, optional (default: remaining samples of generation)
+            Number of individuals
+
+        Returns
+        -------
+        params : array, shape (n_samples, n_params)
+            Parameter vectors
+        """
+        n_remaining = self._n_remaining_samples()
+        if n_samples is None:
+            n_samples = n_remaining
+        elif n_samples > n_remaining:
+            raise ValueError("Only %d samples are left in the current "
+                             "generation, got request for %d samples."
+                             % (n_remaining, n_samples))
+        indices = (self.it + np.arange(n_samples)) % self.n_samples_per_update
+        return self.samples[indices]
+
+    def _n_remaining_samples(self):
+        """Number of samples that will be evaluated before the next update."""
+        return (self.n_samples_per_update -
+                (self.it - self.initial_it) % self.n_samples_per_update)
+
     def set_evaluation_feedback(self, feedback):
         """Set feedbacks for the parameter vector.
 
@@ -273,13 +349,55 @@ class CMAESOptimizer(Optimizer):
         if (self.it - self.initial_it) % self.n_samples_per_update == 0:
             self._update(self.samples, self.fitness, self.it)
 
+    def set_evaluation_feedback_batch(self, feedbacks):
+        """Set feedbacks for multiple individuals of the current generation.
+
+        Parameters
+        ----------
+        feedbacks : array-like, shape (n_samples, n_feedbacks) or (n_samples,)
+            Feedbacks of each individual that has been obtained from
+            :func:`get_next_parameters_batch`, in the same order
+        """
+        fitness = np.array([check_feedback(feedback, compute_sum=True)
+                            for feedback in feedbacks])
+        n_samples = len(fitness)
+        if n_samples > self._n_remaining_samples():
+            raise ValueError("Only %d samples are left in the current "
+                             "generation, got %d feedbacks."
+                             % (self._n_remaining_samples(), n_samples))
+        if self.maximize:
+            fitness *= -1
+
+        indices = (self.it + np.arange(n_samples)) % self.n_samples_per_update
+        self.fitness[indices] = fitness
+
+        # The last of multiple equally good samples is the best one
+        best = n_samples - 1 - np.argmin(fitness[::-1])
+        if fitness[best] <= self.best_fitness:
+            self.best_fitness = fitness[best]
+            self.best_fitness_it = self.it + best
+            self.best_params[:] = self.samples[indices[best]]
+
+        if self.log_to_stdout or self.log_to_file:
+            for i in range(n_samples):
+                self.logger.info("Iteration #%d, fitness: %g"
+                                 % (self.it + i + 1, fitness[i]))
+            self.logger.info("Variance %g" % self.var)
+
+        self.it += n_samples
+
+        if (self.it - self.initial_it) % self.n_samples_per_update == 0:
+            self._update(self.samples, self.fitness, self.it)
+
     def _update(self, samples, fitness, it):
         # 1) Update sample distribution mean
 
-        self.last_mean = self.mean
+        self.last_mean, self.mean = self.mean, self.last_mean
         ranking = np.argsort(fitness, axis=0)
-        update_samples = samples[ranking[:self.mu]]
-        self.mean = np.sum(self.weights[:, np.newaxis] * update_samples, axis=0)
+        # NOTE mode='clip' avoids buffering, indices are always valid
+        noise = np.take(samples, ranking[:self.mu], axis=0,
+                        out=self.selected_noise, mode="clip")
+        np.dot(self.weights, noise, out=self.mean)
 
         mean_diff = self.mean - self.last_mean
         sigma = np.sqrt(self.var)
@@ -288,7 +406,7 @@ class CMAESOptimizer(Optimizer):
 
         # Isotropic (step size) evolution path
         self.ps += (-self.cs * self.ps + self.ps_update_weight / sigma *
-                    self.invsqrtC.dot(mean_diff))
+                    self._whiten(mean_diff))
         # Anisotropic (covariance) evolution path
         ps_norm_2 = np.linalg.norm(self.ps) ** 2  # Temporary constant
         generation = it / self.n_samples_per_update
@@ -302,31 +420,37 @@ class CMAESOptimizer(Optimizer):
         # 3) Update sample distribution covariance
 
         # Rank-1 update
-        rank_one_update = np.outer(self.pc, self.pc)
+        self._rank_one_update(self.pc, out=self.rank_one_update)
 
         # Rank-mu update
-        noise = (update_samples - self.last_mean) / sigma
-        rank_mu_update = noise.T.dot(np.diag(self.weights)).dot(noise)
+        noise -= self.last_mean
+        noise /= sigma
+        self._rank_mu_update(noise, out=self.rank_mu_update)
 
         # Correct variance loss by hsig
         c1a = self.c1 * (1 - (1 - hsig) * self.cc * (2.0 - self.cc))
 
         if self.active:
-            neg_update = samples[ranking[::-1][:self.mu]]
-            neg_update -= self.last_mean
-            neg_update /= sigma
-            neg_rank_mu_update = neg_update.T.dot(np.diag(self.weights)
-                                                  ).dot(neg_update)
+            neg_noise = np.take(samples, ranking[::-1][:self.mu], axis=0,
+                                out=self.selected_noise, mode="clip")
+            neg_noise -= self.last_mean
+            neg_noise /= sigma
+            self._rank_mu_update(neg_noise, out=self.neg_rank_mu_update)
 
             self.cov *= 1.0 - c1a - self.cmu + self.neg_cmu * self.alpha_old
-            self.cov += rank_one_update * self.c1
-            self.cov += rank_mu_update * (self.cmu + self.neg_cmu *
-                                          (1.0 - self.alpha_old))
-            self.cov -= neg_rank_mu_update * self.neg_cmu
+            self.rank_one_update *= self.c1
+            self.cov += self.rank_one_update
+            self.rank_mu_update *= (self.cmu + self.neg_cmu *
+                                    (1.0 - self.alpha_old))
+            self.cov += self.rank_mu_update
+            self.neg_rank_mu_update *= self.neg_cmu
+            self.cov -= self.neg_rank_mu_update
         else:
             self.cov *= 1.0 - c1a - self.cmu
-            self.cov += rank_one_update * self.c1
-            self.cov += rank_mu_update * self.cmu
+            self.rank_one_update *= self.c1
+            self.cov += self.rank_one_update
+            self.rank_mu_update *= self.cmu
+            self.cov += self.rank_mu_update
 
         # NOTE here is a bug: it should be cs / (2 * damps), however, that
         #      breaks unit tests and does not improve results
@@ -340,11 +464,28 @@ class CMAESOptimizer(Optimizer):
         self.var *= np.exp(np.min((0.6, log_step_size_update))) ** 2
 
         if it - self.eigen_decomp_updated > self.eigen_update_freq:
-            self.invsqrtC = inv_sqrt(self.cov)[0]
-            self.eigen_decomp_updated = self.it
+            self._update_eigen_decomposition()
 
         self.samples = self._sample(self.n_samples_per_update)
 
+    def _whiten(self, x):
+        """Multiply vector with inverse square root of the covariance."""
+        return self.invsqrtC.dot(x)
+
+    def _rank_one_update(self, path, out):
+        """Rank-one update of the covariance from an evolution path."""
+        return np.multiply(path[:, np.newaxis], path, out=out)
+
+    def _rank_mu_update(self, noise, out):
+        """Weighted rank-mu update of the covariance from selected steps."""
+        np.multiply(self.weights[:, np.newaxis], noise,
+                    out=self.weighted_noise)
+        return np.dot(noise.T, self.weighted_noise, out=out)
+
+    def _cov_diag(self):
+        """Variances of the individual parameters."""
+        return np.diag(self.cov)
+
     def is_behavior_learning_done(self):
         """Check if the optimization is finished.
 
@@ -368,7 +509,7 @@ class CMAESOptimizer(Optimizer):
             return True
 
         if (self.min_variance is not None and
-                np.max(np.diag(self.cov)) * self.var <= self.min_variance):
+                np.max(self._cov_diag()) * self.var <= self.min_variance):
             self.logger.info("Stopping: %g < min_variance" % self.var)
             return True
 
@@ -377,7 +518,7 @@ class CMAESOptimizer(Optimizer):
             self.logger.info("Stopping: %g < min_fitness_dist" % max_dist)
             return True
 
-        cov_diag = np.diag(self.cov)
+        cov_diag = self._cov_diag()
         if (self.max_condition is not None and
                 np.max(cov_diag) > self.max_condition * np.min(cov_diag)):
             self.logger.info("Stopping: %g / %g > max_condition"
@@ -402,7 +543,8 @@ class CMAESOptimizer(Optimizer):
         if method == "best":
             return self.best_params
         else:
-            return self.mean
+            # The mean is stored in a buffer that will be reused
+            return self.mean.copy()
 
     def get_best_fitness(self):
         """Get the best observed fitness.
@@ -679,10 +821,316 @@ class BIPOPCMAESOptimizer(RestartCMAESOptimizer):
             self._reinit()
 
 
+class SepCMAESOptimizer(CMAESOptimizer):
+    """Separable CMA-ES.
+
+    CMA-ES with a diagonal covariance matrix [1]_. Sampling and the update
+    of the search distribution are in O(n_params) per sample and no matrix
+    decomposition is required. Hence, this variant is suitable for very
+    high-dimensional search spaces, e.g. the weights of DMPs with many
+    degrees of freedom. Because only n_params variances have to be learned,
+    the learning rates of the covariance are increased by a factor of
+    (n_params + 1.5) / 3.
+
+    Separable CMA-ES cannot learn correlations between parameters, so it
+    will usually need more evaluations than CMA-ES on non-separable problems
+    with few parameters.
+
+    Parameters
+    ----------
+    initial_params : array-like, shape = (n_params,), optional (default: 0s)
+        Initial parameter vector.
+
+    variance : float, optional (default: 1.0)
+        Initial exploration variance.
+
+    covariance : array-like, shape (n_params,), optional (default: None)
+        Diagonal of the initial covariance matrix. If a full covariance
+        matrix is given, only its diagonal will be used.
+
+    n_samples_per_update : integer, optional (default: 4+int(3*log(n_params)))
+        Number of roll-outs that are required for a parameter update.
+
+    active : bool, optional (default: False)
+        Active CMA-ES (aCMA-ES) with negative weighted covariance matrix
+        update
+
+    bounds : array-like, shape (n_params, 2), optional (default: None)
+        Upper and lower bounds for each parameter.
+
+    maximize : boolean, optional (default: True)
+        Maximize return or minimize cost?
+
+    min_variance : float, optional (default: 2 * np.finfo(np.float).eps ** 2)
+        Minimum variance before restart
+
+    min_fitness_dist : float, optional (default: 2 * np.finfo(np.float).eps)
+        Minimum distance between fitness values before restart
+
+    max_condition : float optional (default: 1e7)
+        Maximum condition of covariance matrix
+
+    log_to_file: boolean or string, optional (default: False)
+        Log results to given file, it will be located in the $BL_LOG_PATH
+
+    log_to_stdout: boolean, optional (default: False)
+        Log to standard output
+
+    random_state : int or RandomState, optional (default: None)
+        Seed for the random number generator or RandomState object.
+
+    References
+    ----------
+    .. [1] Ros, R.; Hansen, N. A Simple Modification in CMA-ES Achieving
+        Linear Time and Space Complexity. In: Parallel Problem Solving from
+        Nature (PPSN X), pp. 296-305, 2008.
+        https://hal.inria.fr/inria-00287367/document
+    """
+    def __init__(
+            self, initial_params=None, variance=1.0, covariance=None,
+            n_samples_per_update=None, active=False, bounds=None, maximize=True,
+            min_variance=2 * np.finfo(np.float).eps ** 2,
+            min_fitness_dist=2 * np.finfo(np.float).eps, max_condition=1e7,
+            log_to_file=False, log_to_stdout=False, random_state=None):
+        super(SepCMAESOptimizer, self).__init__(
+            initial_params, variance, covariance, n_samples_per_update,
+            active, bounds, maximize, min_variance, min_fitness_dist,
+            max_condition, log_to_file, log_to_stdout, random_state)
+
+    def _init_covariance(self):
+        self.covariance = _diagonal_covariance(self.covariance, self.n_params)
+
+    def _reinit(self):
+        super(SepCMAESOptimizer, self)._reinit()
+
+        # Faster adaption of the covariance because there are only n_params
+        # variances
+        cov_rate_factor = (self.n_params + 1.5) / 3.0
+        self.c1 *= cov_rate_factor
+        self.cmu = min(1.0 - self.c1, self.cmu * cov_rate_factor)
+        if self.active:
+            self.neg_cmu = ((1.0 - self.cmu) * 0.25 * self.mueff /
+                            ((self.n_params + 2) ** 1.5 + 2.0 * self.mueff))
+        # The square root of a diagonal matrix is cheap
+        self.eigen_update_freq = 0
+
+    def _update_eigen_decomposition(self):
+        D = np.sqrt(np.maximum(self.cov, np.finfo(np.float).eps))
+        self.invsqrtC = 1.0 / D
+        self.sample_trans = D
+        self.eigen_decomp_updated = self.it
+
+    def _sample(self, n_samples):
+        Z = self.random_state.randn(n_samples, self.n_params)
+        samples = self.mean + np.sqrt(self.var) * self.sample_trans * Z
+        _bound(self.bounds, samples)
+        return samples
+
+    def _whiten(self, x):
+        return self.invsqrtC * x
+
+    def _rank_one_update(self, path, out):
+        return np.multiply(path, path, out=out)
+
+    def _rank_mu_update(self, noise, out):
+        np.multiply(noise, noise, out=self.weighted_noise)
+        return np.dot(self.weights, self.weighted_noise, out=out)
+
+    def _cov_diag(self):
+        return self.cov
+
+
+class SepRestartCMAESOptimizer(RestartCMAESOptimizer, SepCMAESOptimizer):
+    """Separable CMA-ES with restarts.
+
+    Combines the restarts of :class:`RestartCMAESOptimizer` with the diagonal
+    covariance of :class:`SepCMAESOptimizer`.
+
+    Parameters
+    ----------
+    initial_params : array-like, shape = (n_params,), optional (default: 0s)
+        Initial parameter vector.
+
+    variance : float, optional (default: 1.0)
+        Initial exploration variance.
+
+    covariance : array-like, shape (n_params,), optional (default: None)
+        Diagonal of the initial covariance matrix. If a full covariance
+        matrix is given, only its diagonal will be used.
+
+    n_samples_per_update : integer, optional (default: 4+int(3*log(n_params)))
+        Number of roll-outs that are required for a parameter update.
+
+    active : bool, optional (default: False)
+        Active CMA-ES (aCMA-ES) with negative weighted covariance matrix
+        update
+
+    bounds : array-like, shape (n_params, 2), optional (default: None)
+        Upper and lower bounds for each parameter.
+
+    maximize : boolean, optional (default: True)
+        Maximize return or minimize cost?
+
+    min_variance : float, optional (default: 2 * np.finfo(np.float).eps ** 2)
+        Minimum variance before restart
+
+    min_fitness_dist : float, optional (default: 2 * np.finfo(np.float).eps)
+        Minimum distance between fitness values before restart
+
+    max_condition : float optional (default: 1e7)
+        Maximum condition of covariance matrix
+
+    log_to_file: boolean or string, optional (default: False)
+        Log results to given file, it will be located in the $BL_LOG_PATH
+
+    log_to_stdout: boolean, optional (default: False)
+        Log to standard output
+
+    random_state : int or RandomState, optional (default: None)
+        Seed for the random number generator or RandomState object.
+    """
+    def __init__(
+            self, initial_params=None, variance=1.0, covariance=None,
+            n_samples_per_update=None, active=False, bounds=None, maximize=True,
+            min_variance=2 * np.finfo(np.float).eps ** 2,
+            min_fitness_dist=2 * np.finfo(np.float).eps, max_condition=1e7,
+            log_to_file=False, log_to_stdout=False, random_state=None):
+        super(SepRestartCMAESOptimizer, self).__init__(
+            initial_params, variance, covariance, n_samples_per_update,
+            active, bounds, maximize, min_variance, min_fitness_dist,
+            max_condition, log_to_file, log_to_stdout, random_state)
+
+
+class SepIPOPCMAESOptimizer(IPOPCMAESOptimizer, SepCMAESOptimizer):
+    """Separable increasing population size CMA-ES.
+
+    Combines the restarts of :class:`IPOPCMAESOptimizer` with the diagonal
+    covariance of :class:`SepCMAESOptimizer`.
+
+    Parameters
+    ----------
+    initial_params : array-like, shape = (n_params,), optional (default: 0s)
+        Initial parameter vector.
+
+    variance : float, optional (default: 1.0)
+        Initial exploration variance.
+
+    covariance : array-like, shape (n_params,), optional (default: None)
+        Diagonal of the initial covariance matrix. If a full covariance
+        matrix is given, only its diagonal will be used.
+
+    n_samples_per_update : integer, optional (default: 4+int(3*log(n_params)))
+        Number of roll-outs that are required for a parameter update.
+
+    active : bool, optional (default: False)
+        Active CMA-ES (aCMA-ES) with negative weighted covariance matrix
+        update
+
+    bounds : array-like, shape (n_params, 2), optional (default: None)
+        Upper and lower bounds for each parameter.
+
+    maximize : boolean, optional (default: True)
+        Maximize return or minimize cost?
+
+    min_variance : float, optional (default: 2 * np.finfo(np.float).eps ** 2)
+        Minimum variance before restart
+
+    min_fitness_dist : float, optional (default: 2 * np.finfo(np.float).eps)
+        Minimum distance between fitness values before restart
+
+    max_condition : float optional (default: 1e7)
+        Maximum condition of covariance matrix
+
+    log_to_file: boolean or string, optional (default: False)
+        Log results to given file, it will be located in the $BL_LOG_PATH
+
+    log_to_stdout: boolean, optional (default: False)
+        Log to standard output
+
+    random_state : int or RandomState, optional (default: None)
+        Seed for the random number generator or RandomState object.
+    """
+    def __init__(
+            self, initial_params=None, variance=1.0, covariance=None,
+            n_samples_per_update=None, active=False, bounds=None, maximize=True,
+            min_variance=2 * np.finfo(np.float).eps ** 2,
+            min_fitness_dist=2 * np.finfo(np.float).eps, max_condition=1e7,
+            log_to_file=False, log_to_stdout=False, random_state=None):
+        super(SepIPOPCMAESOptimizer, self).__init__(
+            initial_params, variance, covariance, n_samples_per_update,
+            active, bounds, maximize, min_variance, min_fitness_dist,
+            max_condition, log_to_file, log_to_stdout, random_state)
+
+
+class SepBIPOPCMAESOptimizer(BIPOPCMAESOptimizer, SepCMAESOptimizer):
+    """Separable BI-population CMA-ES.
+
+    Combines the restarts of :class:`BIPOPCMAESOptimizer` with the diagonal
+    covariance of :class:`SepCMAESOptimizer`.
+
+    Parameters
+    ----------
+    initial_params : array-like, shape = (n_params,), optional (default: 0s)
+        Initial parameter vector.
+
+    variance : float, optional (default: 1.0)
+        Initial exploration variance.
+
+    covariance : array-like, shape (n_params,), optional (default: None)
+        Diagonal of the initial covariance matrix. If a full covariance
+        matrix is given, only its diagonal will be used.
+
+    n_samples_per_update : integer, optional (default: 4+int(3*log(n_params)))
+        Number of roll-outs that are required for a parameter update.
+
+    active : bool, optional (default: False)
+        Active CMA-ES (aCMA-ES) with negative weighted covariance matrix
+        update
+
+    bounds : array-like, shape (n_params, 2), optional (default: None)
+        Upper and lower bounds for each parameter.
+
+    maximize : boolean, optional (default: True)
+        Maximize return or minimize cost?
+
+    min_variance : float, optional (default: 2 * np.finfo(np.float).eps ** 2)
+        Minimum variance before restart
+
+    min_fitness_dist : float, optional (default: 2 * np.finfo(np.float).eps)
+        Minimum distance between fitness values before restart
+
+    max_condition : float optional (default: 1e7)
+        Maximum condition of covariance matrix
+
+    log_to_file: boolean or string, optional (default: False)
+        Log results to given file, it will be located in the $BL_LOG_PATH
+
+    log_to_stdout: boolean, optional (default: False)
+        Log to standard output
+
+    random_state : int or RandomState, optional (default: None)
+        Seed for the random number generator or RandomState object.
+    """
+    def __init__(
+            self, initial_params=None, variance=1.0, covariance=None,
+            n_samples_per_update=None, active=False, bounds=None, maximize=True,
+            min_variance=2 * np.finfo(np.float).eps ** 2,
+            min_fitness_dist=2 * np.finfo(np.float).eps, max_condition=1e7,
+            log_to_file=False, log_to_stdout=False, random_state=None):
+        super(SepBIPOPCMAESOptimizer, self).__init__(
+            initial_params, variance, covariance, n_samples_per_update,
+            active, bounds, maximize, min_variance, min_fitness_dist,
+            max_condition, log_to_file, log_to_stdout, random_state)
+
+
 cma_types = {"standard": CMAESOptimizer,
              "restart": RestartCMAESOptimizer,
              "ipop": IPOPCMAESOptimizer,
-             "bipop": BIPOPCMAESOptimizer}
+             "bipop": BIPOPCMAESOptimizer,
+             "sep": SepCMAESOptimizer,
+             "sep-restart": SepRestartCMAESOptimizer,
+             "sep-ipop": SepIPOPCMAESOptimizer,
+             "sep-bipop": SepBIPOPCMAESOptimizer}
 
 
 def fmin(objective_function, cma_type="standard", x0=None,
@@ -695,7 +1143,9 @@ def fmin(objective_function, cma_type="standard", x0=None,
         Objective function
 
     cma_type : string, optional (default: 'standard')
-        Must be one of ['standard', 'restart', 'ipop', 'bipop']
+        Must be one of ['standard', 'restart', 'ipop', 'bipop', 'sep',
+        'sep-restart', 'sep-ipop', 'sep-bipop']. The variants with the
+        prefix 'sep' use a diagonal covariance matrix.
 
     x0 : array-like, shape = (n_params,), optional (default: 0)
         Initial parameter vector.
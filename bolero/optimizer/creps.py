@@ -3,18 +3,17 @@
 
 import numpy as np
 from scipy.optimize import fmin_l_bfgs_b
-from collections import deque
 from ..optimizer import ContextualOptimizer
-from ..utils.mathext import logsumexp
 from ..utils.scaling import Scaling
 from ..representation.ul_policies import (ContextTransformationPolicy,
                                           LinearGaussianPolicy,
                                           BoundedScalingPolicy)
 from ..utils.validation import check_random_state, check_feedback, check_context
 from ..utils.log import get_logger
+from ..utils.recording import SampleHistory
 
 
-def solve_dual_contextual_reps(S, R, epsilon, min_eta):
+def solve_dual_contextual_reps(S, R, epsilon, min_eta, eta0=None, nu0=None):
     """Solve dual function for C-REPS.
 
     Parameters
@@ -32,6 +31,12 @@ def solve_dual_contextual_reps(S, R, epsilon, min_eta):
     min_eta : float
         Minimum eta, 0 would result in numerical problems
 
+    eta0 : float, optional (default: 1)
+        Initial guess of eta, e.g. the solution of the last update
+
+    nu0 : array, shape (n_context_features,), optional (default: ones)
+        Initial guess of nu, e.g. the solution of the last update
+
     Returns
     -------
     d : array, shape (n_samples_per_update,)
@@ -48,23 +53,35 @@ def solve_dual_contextual_reps(S, R, epsilon, min_eta):
                          "returns (%d)." % (S.shape[0], R.shape[0]))
 
     n_samples_per_update = len(R)
+    log_n_samples = np.log(n_samples_per_update)
+    mean_S = S.mean(axis=0)
 
-    # Definition of the dual function
-    def g(x):  # Objective function
+    # Definition of the dual function and its gradient
+    def g(x):
         eta = x[0]
         nu = x[1:]
-        return (eta * epsilon + nu.T.dot(S.mean(axis=0)) +
-                eta * logsumexp((R - nu.dot(S.T)) / eta,
-                                b=1.0 / n_samples_per_update))
+        log_d = (R - S.dot(nu)) / eta
+        log_d_max = log_d.max()
+        d = np.exp(log_d - log_d_max)
+        sum_d = d.sum()
+        lse = log_d_max + np.log(sum_d) - log_n_samples
+        d /= sum_d
+        gradient = np.empty_like(x)
+        gradient[0] = epsilon + lse - d.dot(log_d)
+        gradient[1:] = mean_S - d.dot(S)
+        return eta * epsilon + nu.dot(mean_S) + eta * lse, gradient
 
     # Lower bound for Lagrange parameters eta and nu
     bounds = np.vstack(([[min_eta, None]], np.tile(None, (S.shape[1], 2))))
     # Start point for optimization
-    x0 = [1] + [1] * S.shape[1]
+    if eta0 is None or not np.isfinite(eta0):
+        eta0 = 1.0
+    if nu0 is None:
+        nu0 = np.ones(S.shape[1])
+    x0 = np.hstack(([max(eta0, min_eta)], nu0))
 
     # Perform the actual optimization of the dual function
-    #r = NLP(g, x0, lb=lb).solve('ralg', iprint=-10)
-    r = fmin_l_bfgs_b(g, x0, approx_grad=True, bounds=bounds)
+    r = fmin_l_bfgs_b(g, x0, bounds=bounds)
     # Fetch optimal lagrangian parameter eta. Corresponds to a temperature
     # of a softmax distribution
     eta = r[0][0]
@@ -200,6 +217,7 @@ class CREPSOptimizer(ContextualOptimizer):
             raise ValueError("Number of dimensions (%d) does not match "
                              "number of initial parameters (%d)."
                              % (n_params, len(self.initial_params)))
+        self.n_params = n_params
 
         self.context = None
         self.params = None
@@ -217,12 +235,18 @@ class CREPSOptimizer(ContextualOptimizer):
             random_state=self.random_state)
         self.policy_ = BoundedScalingPolicy(policy, self.scaler, self.bounds)
 
-        self.history_theta = deque(maxlen=self.n_samples_per_update)
-        self.history_R = deque(maxlen=self.n_samples_per_update)
-        self.history_s = deque(maxlen=self.n_samples_per_update)
-        self.history_phi_s = deque(maxlen=self.n_samples_per_update)
+        self.history = SampleHistory(self.n_samples_per_update)
+
+        # Contexts, parameters and context features from
+        # get_next_parameters_batch without feedback
+        self.pending_contexts = np.empty((0, n_context_dims))
+        self.pending_params = np.empty((0, n_params))
+        self.pending_context_features = None
 
         self.weights = np.zeros(self.n_samples_per_update)
+        # Solution of the dual function of the last update
+        self.eta = None
+        self.nu = None
 
     def get_desired_context(self):
         """C-REPS does not actively select the context.
@@ -258,6 +282,33 @@ class CREPSOptimizer(ContextualOptimizer):
         self.params = self.policy_(self.context, explore=explore)
         params[:] = self.params
 
+    def get_next_parameters_batch(self, contexts, explore=True):
+        """Get next individuals/parameter vectors for multiple contexts.
+
+        The feedbacks have to be passed to
+        :func:`set_evaluation_feedback_batch` in the same order.
+
+        Parameters
+        ----------
+        contexts : array-like, shape (n_samples, n_context_dims)
+            The contexts in which the parameter vectors will be evaluated
+
+        explore : bool, optional (default: True)
+            Whether we want to turn exploration on for the next evaluations
+
+        Returns
+        -------
+        params : array, shape (n_samples, n_params)
+            Parameter vectors
+        """
+        contexts = np.asarray(contexts)
+        params = self.policy_.evaluate_batch(contexts, explore=explore)
+        self.pending_contexts = contexts
+        self.pending_params = params
+        self.pending_context_features = self.policy_.transform_contexts(
+            contexts)
+        return params
+
     def set_evaluation_feedback(self, rewards):
         """Set feedbacks for the parameter vector.
 
@@ -266,33 +317,76 @@ class CREPSOptimizer(ContextualOptimizer):
         rewards : list of float
             Feedbacks for each step or for the episode, depends on the problem
         """
-        self._add_sample(rewards)
+        self._add_sample(rewards,
+                         self.policy_.transform_context(self.context))
 
         if self.it % self.train_freq == 0:
-            phi_s = np.asarray(self.history_phi_s)
-            theta = np.asarray(self.history_theta)
-            R = np.asarray(self.history_R)
+            self._update()
 
-            self.weights = solve_dual_contextual_reps(
-                phi_s, R, self.epsilon, self.min_eta)[0]
-            # NOTE the context have already been transformed
-            self.policy_.fit(phi_s, theta, self.weights,
-                             context_transform=False)
+    def set_evaluation_feedback_batch(self, feedbacks):
+        """Set feedbacks for multiple parameter vectors.
 
-    def _add_sample(self, rewards):
+        Parameters
+        ----------
+        feedbacks : array-like, shape (n_samples, n_feedbacks) or (n_samples,)
+            Feedbacks of each parameter vector that has been obtained from
+            :func:`get_next_parameters_batch`, in the same order
+        """
+        n_samples = len(feedbacks)
+        if n_samples > len(self.pending_params):
+            raise ValueError("Received %d feedbacks for %d parameter vectors."
+                             % (n_samples, len(self.pending_params)))
+        if n_samples == 0:
+            return
+        contexts = self.pending_contexts[:n_samples]
+        params = self.pending_params[:n_samples]
+        context_features = self.pending_context_features[:n_samples]
+        self.pending_contexts = self.pending_contexts[n_samples:]
+        self.pending_params = self.pending_params[n_samples:]
+        self.pending_context_features = (
+            self.pending_context_features[n_samples:])
+        rewards = np.array([check_feedback(feedback, compute_sum=True)
+                            for feedback in feedbacks])
+        if self.log_to_stdout or self.log_to_file:
+            for reward in rewards:
+                self.logger.info("[CREPS] Reward %.6f" % reward)
+
+        # Add all samples until the next update at once
+        start = 0
+        while start < n_samples:
+            end = min(n_samples, start + self.train_freq -
+                      self.it % self.train_freq)
+            self.history.extend(params[start:end], rewards[start:end],
+                                contexts[start:end],
+                                context_features[start:end])
+            self.it += end - start
+            if self.it % self.train_freq == 0:
+                self._update()
+            start = end
+
+        self.context = contexts[-1]
+        self.params = params[-1]
+        self.reward = rewards[-1]
+
+    def _add_sample(self, rewards, phi_s):
         self.reward = check_feedback(rewards, compute_sum=True)
         if self.log_to_stdout or self.log_to_file:
             self.logger.info("[CREPS] Reward %.6f" % self.reward)
 
-        phi_s = self.policy_.transform_context(self.context)
-
-        self.history_theta.append(self.params)
-        self.history_R.append(self.reward)
-        self.history_s.append(self.context)
-        self.history_phi_s.append(phi_s)
+        self.history.append(self.params, self.reward, self.context, phi_s)
 
         self.it += 1
 
+    def _update(self):
+        phi_s = np.asarray(self.history.context_features)
+        theta = np.asarray(self.history.params)
+        R = np.asarray(self.history.returns)
+
+        self.weights, self.eta, self.nu = solve_dual_contextual_reps(
+            phi_s, R, self.epsilon, self.min_eta, self.eta, self.nu)
+        # NOTE the context have already been transformed
+        self.policy_.fit(phi_s, theta, self.weights, context_transform=False)
+
     def best_policy(self):
         """Return current best estimate of contextual policy.
 
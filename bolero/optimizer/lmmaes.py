@@ -0,0 +1,202 @@
+# Author: Alexander Fabisch <afabisch@informatik.uni-bremen.de>
+
+import numpy as np
+from .cmaes import CMAESOptimizer, _bound, _diagonal_covariance
+
+
+class LMMAESOptimizer(CMAESOptimizer):
+    """Limited-memory matrix adaptation evolution strategy (LM-MA-ES).
+
+    LM-MA-ES [1]_ is a variant of CMA-ES for large-scale optimization. The
+    covariance matrix is not stored explicitly. Instead, a fixed number of
+    direction vectors (similar to the evolution path of CMA-ES) with
+    different learning rates is accumulated. Each sample is transformed by
+    these vectors. Hence, sampling and the update of the search distribution
+    are in O(n_vectors * n_params) per sample and the required memory is in
+    O(n_vectors * n_params). In contrast to separable CMA-ES, correlations
+    between parameters can be learned.
+
+    The initial covariance is a diagonal matrix that will be used to scale
+    each parameter. The learning rates of LM-MA-ES are designed for search
+    spaces with many dimensions, e.g. several hundreds or thousands of DMP
+    weights. For only a few parameters, CMA-ES is a better choice.
+
+    Parameters
+    ----------
+    initial_params : array-like, shape = (n_params,), optional (default: 0s)
+        Initial parameter vector.
+
+    variance : float, optional (default: 1.0)
+        Initial exploration variance.
+
+    covariance : array-like, shape (n_params,), optional (default: None)
+        Diagonal of the initial covariance matrix that defines the scale of
+        each parameter. If a full covariance matrix is given, only its
+        diagonal will be used.
+
+    n_samples_per_update : integer, optional (default: 4+int(3*log(n_params)))
+        Number of roll-outs that are required for a parameter update.
+
+    n_vectors : integer, optional (default: 4+int(3*log(n_params)))
+        Number of direction vectors that represent the covariance.
+
+    bounds : array-like, shape (n_params, 2), optional (default: None)
+        Upper and lower bounds for each parameter.
+
+    maximize : boolean, optional (default: True)
+        Maximize return or minimize cost?
+
+    min_variance : float, optional (default: 2 * np.finfo(np.float).eps ** 2)
+        Minimum variance before stop
+
+    min_fitness_dist : float, optional (default: 2 * np.finfo(np.float).eps)
+        Minimum distance between fitness values before stop
+
+    log_to_file: boolean or string, optional (default: False)
+        Log results to given file, it will be located in the $BL_LOG_PATH
+
+    log_to_stdout: boolean, optional (default: False)
+        Log to standard output
+
+    random_state : int or RandomState, optional (default: None)
+        Seed for the random number generator or RandomState object.
+
+    References
+    ----------
+    .. [1] Loshchilov, I.; Glasmachers, T.; Beyer, H.-G. Large Scale
+        Black-box Optimization by Limited-Memory Matrix Adaptation. IEEE
+        Transactions on Evolutionary Computation 23(2), pp. 353-358, 2019.
+        https://arxiv.org/abs/1705.06693
+    """
+    def __init__(
+            self, initial_params=None, variance=1.0, covariance=None,
+            n_samples_per_update=None, n_vectors=None, bounds=None,
+            maximize=True, min_variance=2 * np.finfo(np.float).eps ** 2,
+            min_fitness_dist=2 * np.finfo(np.float).eps, log_to_file=False,
+            log_to_stdout=False, random_state=None):
+        self.initial_params = initial_params
+        self.variance = variance
+        self.covariance = covariance
+        self.n_samples_per_update = n_samples_per_update
+        self.n_vectors = n_vectors
+        self.bounds = bounds
+        self.maximize = maximize
+        self.min_variance = min_variance
+        self.min_fitness_dist = min_fitness_dist
+        self.log_to_file = log_to_file
+        self.log_to_stdout = log_to_stdout
+        self.random_state = random_state
+
+    def _init_covariance(self):
+        self.covariance = _diagonal_covariance(self.covariance, self.n_params)
+
+    def _reinit(self):
+        # Iteration of last reinitialization
+        self.initial_it = self.it
+
+        self.var = self.variance
+
+        if self.n_samples_per_update is None:
+            self.n_samples_per_update = 4 + int(3 * np.log(self.n_params))
+        if self.n_vectors is None:
+            self.n_vectors = 4 + int(3 * np.log(self.n_params))
+
+        if self.bounds is not None:
+            self.bounds = np.asarray(self.bounds)
+
+        self.mean = self.initial_params.copy()
+        self.scale = np.sqrt(self.covariance)
+
+        # Sample weights for mean recombination
+        self.mu = self.n_samples_per_update / 2.0
+        self.weights = (np.log(self.mu + 0.5) -
+                        np.log1p(np.arange(int(self.mu))))
+        self.mu = int(self.mu)
+        self.weights = self.weights / np.sum(self.weights)
+        self.mueff = 1.0 / np.sum(self.weights ** 2)
+
+        # Learning rate for sigma control, the original values are only
+        # valid for n_params >> n_samples_per_update
+        self.cs = min(1.0, 2.0 * self.n_samples_per_update / self.n_params)
+        # Learning rates of the direction vectors
+        self.cd = 1.0 / (self.n_params * 1.5 ** np.arange(self.n_vectors))
+        self.cc = np.minimum(1.0, self.n_samples_per_update /
+                             (self.n_params * 4.0 ** np.arange(self.n_vectors)))
+
+        self.ps_update_weight = np.sqrt(self.mueff * self.cs * (2 - self.cs))
+        self.M_update_weights = np.sqrt(self.mueff * self.cc * (2 - self.cc))
+
+        # Evolution path for sigma
+        self.ps = np.zeros(self.n_params)
+        # Direction vectors
+        self.M = np.zeros((self.n_vectors, self.n_params))
+        # Number of direction vectors that have been updated
+        self.n_active_vectors = 0
+
+        self.samples = self._sample(self.n_samples_per_update)
+        self.fitness = np.empty(self.n_samples_per_update)
+
+    def _sample(self, n_samples):
+        self.Z = self.random_state.randn(n_samples, self.n_params)
+        self.D = self.Z.copy()
+        for j in range(self.n_active_vectors):
+            self.D *= 1.0 - self.cd[j]
+            self.D += (self.cd[j] * self.D.dot(self.M[j]))[:, np.newaxis] * \
+                self.M[j]
+        samples = self.mean + np.sqrt(self.var) * self.scale * self.D
+        _bound(self.bounds, samples)
+        return samples
+
+    def _update(self, samples, fitness, it):
+        ranking = np.argsort(fitness, axis=0)[:self.mu]
+        weighted_z = self.weights.dot(self.Z[ranking])
+
+        self.last_mean = self.mean
+        self.mean = self.weights.dot(samples[ranking])
+
+        self.ps *= 1.0 - self.cs
+        self.ps += self.ps_update_weight * weighted_z
+
+        self.M *= (1.0 - self.cc)[:, np.newaxis]
+        self.M += self.M_update_weights[:, np.newaxis] * weighted_z
+        self.n_active_vectors = min(self.n_active_vectors + 1, self.n_vectors)
+
+        log_step_size_update = (0.5 * self.cs *
+                                (self.ps.dot(self.ps) / self.n_params - 1))
+        # Adapt step size with factor <= exp(0.6)
+        self.var *= np.exp(np.min((0.6, log_step_size_update))) ** 2
+
+        self.samples = self._sample(self.n_samples_per_update)
+
+    def is_behavior_learning_done(self):
+        """Check if the optimization is finished.
+
+        Returns
+        -------
+        finished : bool
+            Is the learning of a behavior finished?
+        """
+        if self.it <= self.n_samples_per_update:
+            return False
+
+        if not np.all(np.isfinite(self.fitness)):
+            return True
+
+        # Check for invalid values
+        if not (np.all(np.isfinite(self.M)) and
+                np.all(np.isfinite(self.mean)) and
+                np.isfinite(self.var)):
+            self.logger.info("Stopping: infs or nans")
+            return True
+
+        if (self.min_variance is not None and
+                np.max(self.covariance) * self.var <= self.min_variance):
+            self.logger.info("Stopping: %g < min_variance" % self.var)
+            return True
+
+        max_dist = np.max(self.fitness) - np.min(self.fitness)
+        if max_dist < self.min_fitness_dist:
+            self.logger.info("Stopping: %g < min_fitness_dist" % max_dist)
+            return True
+
+        return False
@@ -1,5 +1,6 @@
 """Optimizer interface."""
 from abc import ABCMeta, abstractmethod
+import numpy as np
 from ..utils import NonContextualException
 from ..base import Base
 
@@ -34,6 +35,33 @@ class ContextualOptimizer(Base):
             Parameter vector, will be modified
         """
 
+    def get_next_parameters_batch(self, contexts):
+        """Get next individuals/parameter vectors for multiple contexts.
+
+        The feedbacks have to be passed to :func:`set_evaluation_feedback_batch`
+        in the same order. The default implementation sets each context and
+        calls :func:`get_next_parameters`, which is only valid if the
+        optimizer does not require feedback before it generates the next
+        parameter vector. It requires the attribute `n_params` that is set
+        in :func:`init`.
+
+        Parameters
+        ----------
+        contexts : array-like, shape (n_samples, n_context_dims)
+            The contexts in which the parameter vectors will be evaluated
+
+        Returns
+        -------
+        params : array, shape (n_samples, n_params)
+            Parameter vectors
+        """
+        contexts = np.asarray(contexts)
+        params = np.empty((len(contexts), self.n_params))
+        for i in range(len(contexts)):
+            self.set_context(contexts[i])
+            self.get_next_parameters(params[i])
+        return params
+
     @abstractmethod
     def set_evaluation_feedback(self, rewards):
         """Set feedbacks for the parameter vector.
@@ -44,6 +72,18 @@ class ContextualOptimizer(Base):
             Feedbacks for each step or for the episode, depends on the problem
         """
 
+    def set_evaluation_feedback_batch(self, feedbacks):
+        """Set feedbacks for multiple parameter vectors.
+
+        Parameters
+        ----------
+        feedbacks : array-like, shape (n_samples, n_feedbacks) or (n_samples,)
+            Feedbacks of each parameter vector that has been obtained from
+            :func:`get_next_parameters_batch`, in the same order
+        """
+        for feedback in feedbacks:
+            self.set_evaluation_feedback(feedback)
+
     @abstractmethod
     def is_behavior_learning_done(self):
         """Check if the optimization is finished.
@@ -112,6 +152,35 @@ class Optimizer(Base):
             Parameter vector, will be modified
         """
 
+    def get_next_parameters_batch(self, n_samples=None):
+        """Get next individuals/parameter vectors for evaluation.
+
+        The feedbacks have to be passed to :func:`set_evaluation_feedback_batch`
+        in the same order. The default implementation calls
+        :func:`get_next_parameters` for each sample, which is only valid if
+        the optimizer does not require feedback before it generates the next
+        parameter vector. It requires the attribute `n_params` that is set
+        in :func:`init`.
+
+        Parameters
+        ----------
+        n_samples : int, optional (default: 1)
+            Number of parameter vectors. Optimizers that generate a whole
+            population at once will return the remaining individuals of the
+            current population by default.
+
+        Returns
+        -------
+        params : array, shape (n_samples, n_params)
+            Parameter vectors
+        """
+        if n_samples is None:
+            n_samples = 1
+        params = np.empty((n_samples, self.n_params))
+        for i in range(n_samples):
+            self.get_next_parameters(params[i])
+        return params
+
     @abstractmethod
     def set_evaluation_feedback(self, rewards):
         """Set feedbacks for the parameter vector.
@@ -122,6 +191,18 @@ class Optimizer(Base):
             feedbacks for each step or for the episode, depends on the problem
         """
 
+    def set_evaluation_feedback_batch(self, feedbacks):
+        """Set feedbacks for multiple parameter vectors.
+
+        Parameters
+        ----------
+        feedbacks : array-like, shape (n_samples, n_feedbacks) or (n_samples,)
+            Feedbacks of each parameter vector that has been obtained from
+            :func:`get_next_parameters_batch`, in the same order
+        """
+        for feedback in feedbacks:
+            self.set_evaluation_feedback(feedback)
+
     @abstractmethod
     def is_behavior_learning_done(self):
         """Check if the optimization is finished.
@@ -3,17 +3,16 @@
 
 import numpy as np
 from scipy.optimize import fmin_l_bfgs_b
-from collections import deque
 from .optimizer import Optimizer
 from ..utils.scaling import Scaling
-from ..utils.mathext import logsumexp
 from ..representation.ul_policies import BoundedScalingPolicy
 from ..representation.ul_policies import ConstantGaussianPolicy
 from ..utils.validation import check_random_state, check_feedback
 from ..utils.log import get_logger
+from ..utils.recording import SampleHistory
 
 
-def solve_dual_reps(R, epsilon, min_eta):
+def solve_dual_reps(R, epsilon, min_eta, eta0=None):
     """Solve dual function for REPS.
 
     Parameters
@@ -28,6 +27,10 @@ def solve_dual_reps(R, epsilon, min_eta):
     min_eta : float
         Minimum eta, 0 would result in numerical problems
 
+    eta0 : float, optional (default: 1)
+        Initial guess of eta, e.g. the solution of the last update. Returns
+        are normalized to [0, 1], so eta is always on the same scale.
+
     Returns
     -------
     d : array, shape (n_samples_per_update,)
@@ -46,18 +49,29 @@ def solve_dual_reps(R, epsilon, min_eta):
     # Normalize returns into range [0, 1] such that eta (and min_eta)
     # always lives on the same scale
     R = (R - R_min) / (R_max - R_min)
-
-    # Definition of the dual function
-    def g(eta):  # Objective function
-        return eta * epsilon + eta * logsumexp(R / eta, b=1.0 / len(R))
+    log_n_samples = np.log(len(R))
+
+    # Definition of the dual function and its gradient
+    def g(x):
+        eta = x[0]
+        log_d = R / eta
+        log_d_max = log_d.max()
+        d = np.exp(log_d - log_d_max)
+        sum_d = d.sum()
+        lse = log_d_max + np.log(sum_d) - log_n_samples
+        d /= sum_d
+        return (eta * epsilon + eta * lse,
+                np.array([epsilon + lse - d.dot(log_d)]))
 
     # Lower bound for Lagrangian eta
     bounds = np.array([[min_eta, None]])
     # Start point of optimization
-    x0 = [1]
+    if eta0 is None or not np.isfinite(eta0):
+        eta0 = 1.0
+    x0 = [max(eta0, min_eta)]
 
     # Perform the actual optimization of the dual function
-    r = fmin_l_bfgs_b(g, x0, approx_grad=True, bounds=bounds)
+    r = fmin_l_bfgs_b(g, x0, bounds=bounds)
 
     # Fetch optimal Lagrangian parameter eta. Corresponds to a temperature
     # of a softmax distribution
@@ -72,7 +86,7 @@ def solve_dual_reps(R, epsilon, min_eta):
     d = np.exp(log_d - log_d.max())
     d /= d.sum()
 
-    return d, r[0]
+    return d, eta
 
 
 class REPSOptimizer(Optimizer):
@@ -181,6 +195,7 @@ class REPSOptimizer(Optimizer):
             raise ValueError("Number of dimensions (%d) does not match "
                              "number of initial parameters (%d)."
                              % (n_params, len(self.initial_params)))
+        self.n_params = n_params
 
         self.params = None
         self.reward = None
@@ -197,8 +212,12 @@ class REPSOptimizer(Optimizer):
         # Best parameters found so far
         self.best_params = self.initial_params.copy()
 
-        self.history_theta = deque(maxlen=self.n_samples_per_update)
-        self.history_R = deque(maxlen=self.n_samples_per_update)
+        self.history = SampleHistory(self.n_samples_per_update)
+        # Solution of the dual function of the last update
+        self.eta = None
+
+        # Parameters from get_next_parameters_batch without feedback
+        self.pending_params = np.empty((0, n_params))
 
     def get_next_parameters(self, params, explore=True):
         """Return parameter vector that shall be evaluated next.
@@ -214,20 +233,42 @@ class REPSOptimizer(Optimizer):
         self.params = self.policy_(None, explore=explore)
         params[:] = self.params
 
+    def get_next_parameters_batch(self, n_samples=None, explore=True):
+        """Return parameter vectors that shall be evaluated next.
+
+        The feedbacks have to be passed to
+        :func:`set_evaluation_feedback_batch` in the same order.
+
+        Parameters
+        ----------
+        n_samples : int, optional (default: samples until next update)
+            Number of parameter vectors
+
+        explore : bool
+            Whether exploration in parameter selection is enabled
+
+        Returns
+        -------
+        params : array, shape (n_samples, n_params)
+            Parameter vectors
+        """
+        if n_samples is None:
+            n_samples = self.train_freq - self.it % self.train_freq
+        params = self.policy_.evaluate_batch(np.empty((n_samples, 0)),
+                                             explore=explore)
+        self.pending_params = params
+        return params
+
     def set_evaluation_feedback(self, feedbacks):
         """Inform optimizer of outcome of a rollout with current weights."""
         self.reward = check_feedback(feedbacks, compute_sum=True)
 
-        self.history_theta.append(self.params)
-        self.history_R.append(self.reward)
+        self.history.append(self.params, self.reward)
 
         self.it += 1
 
         if self.it % self.train_freq == 0:
-            theta = np.asarray(self.history_theta)
-            R = np.asarray(self.history_R)
-            d = solve_dual_reps(R, self.epsilon, self.min_eta)[0]
-            self.policy_.fit(None, theta, d)
+            self._update()
 
         self.logger.info("Reward %.6f" % self.reward)
 
@@ -235,6 +276,56 @@ class REPSOptimizer(Optimizer):
             self.max_return = self.reward
             self.best_params = self.params
 
+    def set_evaluation_feedback_batch(self, feedbacks):
+        """Inform optimizer of outcomes of rollouts with multiple weights.
+
+        Parameters
+        ----------
+        feedbacks : array-like, shape (n_samples, n_feedbacks) or (n_samples,)
+            Feedbacks of each parameter vector that has been obtained from
+            :func:`get_next_parameters_batch`, in the same order
+        """
+        n_samples = len(feedbacks)
+        if n_samples > len(self.pending_params):
+            raise ValueError("Received %d feedbacks for %d parameter vectors."
+                             % (n_samples, len(self.pending_params)))
+        if n_samples == 0:
+            return
+        params = self.pending_params[:n_samples]
+        self.pending_params = self.pending_params[n_samples:]
+        rewards = np.array([check_feedback(feedback, compute_sum=True)
+                            for feedback in feedbacks])
+
+        # Add all samples until the next update at once
+        start = 0
+        while start < n_samples:
+            end = min(n_samples, start + self.train_freq -
+                      self.it % self.train_freq)
+            self.history.extend(params[start:end], rewards[start:end])
+            self.it += end - start
+            if self.it % self.train_freq == 0:
+                self._update()
+            start = end
+
+        if self.log_to_stdout or self.log_to_file:
+            for reward in rewards:
+                self.logger.info("Reward %.6f" % reward)
+
+        self.params = params[-1]
+        self.reward = rewards[-1]
+        best = np.argmax(rewards)
+        if rewards[best] > self.max_return:
+            self.max_return = rewards[best]
+            self.best_params = params[best].copy()
+
+    def _update(self):
+        theta = np.asarray(self.history.params)
+        R = np.asarray(self.history.returns)
+        d, eta = solve_dual_reps(R, self.epsilon, self.min_eta, self.eta)
+        if np.isfinite(eta):
+            self.eta = eta
+        self.policy_.fit(None, theta, d)
+
     def get_best_parameters(self):
         """Get the best parameters.
 
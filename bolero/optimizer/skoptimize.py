@@ -1,4 +1,5 @@
 import numpy as np
+from collections import deque
 try:
     from skopt.optimizer import Optimizer as _SkOptOptimizer
     from skopt.learning import (ExtraTreesRegressor, RandomForestRegressor,
@@ -176,6 +177,7 @@ class SkOptOptimizer(Optimizer):
                              "number of given parameter specifications (%d)."
                              % (n_params, self.n_params))
         self.current_params = None
+        self.pending_params = deque()
         self.best_fitness = np.inf
         self.best_params = None
 
@@ -190,6 +192,24 @@ class SkOptOptimizer(Optimizer):
         self.current_params = self.optimizer.ask()
         params[:] = self.current_params
 
+    def get_next_parameters_batch(self, n_samples=None):
+        """Get next individuals/parameter vectors for evaluation.
+
+        Parameters
+        ----------
+        n_samples : int, optional (default: 1)
+            Number of parameter vectors
+
+        Returns
+        -------
+        params : array, shape (n_samples, n_params)
+            Parameter vectors
+        """
+        if n_samples is None:
+            n_samples = 1
+        self.pending_params = deque(self.optimizer.ask(n_points=n_samples))
+        return np.array(self.pending_params, dtype=np.float64)
+
     def set_evaluation_feedback(self, feedback):
         """Set feedbacks for the parameter vector.
 
@@ -206,6 +226,22 @@ class SkOptOptimizer(Optimizer):
             self.best_params = np.copy(self.current_params)
         self.optimizer.tell(self.current_params, feedback)
 
+    def set_evaluation_feedback_batch(self, feedbacks):
+        """Set feedbacks for multiple parameter vectors.
+
+        Parameters
+        ----------
+        feedbacks : array-like, shape (n_samples, n_feedbacks) or (n_samples,)
+            Feedbacks of each parameter vector that has been obtained from
+            :func:`get_next_parameters_batch`, in the same order
+        """
+        if len(feedbacks) > len(self.pending_params):
+            raise ValueError("Received %d feedbacks for %d parameter vectors."
+                             % (len(feedbacks), len(self.pending_params)))
+        for feedback in feedbacks:
+            self.current_params = self.pending_params.popleft()
+            self.set_evaluation_feedback(feedback)
+
     def is_behavior_learning_done(self):
         """Check if the optimization is finished.
 
@@ -3,6 +3,9 @@ from bolero.environment.contextual_objective_functions import \
     LinearContextualSphere
 from bolero.optimizer import CCMAESOptimizer
 from nose.tools import assert_greater, assert_raises_regexp
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+from sklearn.preprocessing import PolynomialFeatures
+from sklearn.linear_model import Ridge
 
 
 def test_cmaes_no_initial_params():
@@ -26,6 +29,21 @@ def test_cmaes_diagonal_cov():
     opt.get_next_parameters(params)
 
 
+def test_baseline_equals_ridge_regression():
+    random_state = np.random.RandomState(0)
+    opt = CCMAESOptimizer(baseline_degree=2, gamma=1e-2,
+                          random_state=random_state)
+    opt.init(2, 3)
+    contexts = random_state.rand(opt.n_samples_per_update, 3)
+    R = np.sin(contexts).sum(axis=1) + random_state.randn(len(contexts))
+    advantages = opt._estimate_baseline(contexts, R)
+
+    features = PolynomialFeatures(degree=2, include_bias=False)
+    X = features.fit_transform(contexts)
+    model = Ridge(alpha=1e-2, fit_intercept=True).fit(X, R)
+    assert_array_almost_equal(advantages, R - model.predict(X))
+
+
 def evaluate(policy, obj):
     c1 = c2 = np.linspace(-1, 1, 11)
     C1, C2 = np.meshgrid(c1, c2)
@@ -54,3 +72,23 @@ def test_linear_contextual_sphere():
     policy = opt.best_policy()
     mean_reward = evaluate(policy, obj)
     assert_greater(mean_reward, -1e-4)
+
+
+def test_batch_equals_sequential():
+    opts = [CCMAESOptimizer(context_features="affine", n_samples_per_update=10,
+                            random_state=0)
+            for _ in range(2)]
+    for opt in opts:
+        opt.init(2, 1)
+    contexts = np.random.RandomState(1).rand(25, 1)
+    params = opts[0].get_next_parameters_batch(contexts)
+    rewards = -np.sum((params - contexts) ** 2, axis=1)
+    opts[0].set_evaluation_feedback_batch(rewards[:3])
+    opts[0].set_evaluation_feedback_batch(rewards[3:])
+    for s, p, reward in zip(contexts, params, rewards):
+        opts[1].set_context(s)
+        opts[1].params = p
+        opts[1].set_evaluation_feedback([reward])
+    assert_array_equal(opts[0].history.params, opts[1].history.params)
+    assert_array_almost_equal(opts[0].policy_.W, opts[1].policy_.W)
+    assert_array_almost_equal(opts[0].cov, opts[1].cov)
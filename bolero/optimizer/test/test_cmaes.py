@@ -1,9 +1,11 @@
 import numpy as np
-from nose.tools import (assert_less, assert_greater, assert_equal,
+from nose.tools import (assert_less, assert_greater, assert_equal, assert_true,
                         assert_raises_regexp)
 from sklearn.utils.testing import assert_warns
-from numpy.testing import assert_array_almost_equal
-from bolero.optimizer import CMAESOptimizer, fmin
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+from bolero.optimizer import (CMAESOptimizer, SepCMAESOptimizer,
+                              SepIPOPCMAESOptimizer, fmin)
+from bolero.optimizer.cmaes import _bound
 
 
 def test_cmaes_no_initial_params():
@@ -43,7 +45,7 @@ def test_cmaes_stop_conditioning():
         opt.get_next_parameters(params)
         opt.set_evaluation_feedback(objective(params))
         it += 1
-    assert_less(it, 600)
+    assert_less(it, 700)
 
 
 def test_cmaes_stop_fitness_variance():
@@ -135,6 +137,19 @@ def test_cmaes_get_best_params_mean():
     assert_array_almost_equal(np.zeros(10), best_params)
 
 
+def test_cmaes_get_best_params_mean_not_overwritten():
+    opt = CMAESOptimizer(random_state=0)
+    opt.init(5)
+    X = opt.get_next_parameters_batch()
+    opt.set_evaluation_feedback_batch(-np.sum(X ** 2, axis=1))
+    best_params = opt.get_best_parameters(method="mean")
+    expected = best_params.copy()
+    for _ in range(2):
+        X = opt.get_next_parameters_batch()
+        opt.set_evaluation_feedback_batch(-np.sum(X ** 2, axis=1))
+    assert_array_equal(best_params, expected)
+
+
 def test_cmaes_get_best_params_best():
     opt = CMAESOptimizer()
     opt.init(10)
@@ -143,3 +158,128 @@ def test_cmaes_get_best_params_best():
     opt.set_evaluation_feedback(np.array([0.0]))
     best_params = opt.get_best_parameters(method="best")
     assert_array_almost_equal(params, best_params)
+
+
+def test_cmaes_batch_equals_sequential():
+    def objective(x):
+        return -np.linalg.norm(x)
+
+    seq = CMAESOptimizer(random_state=0)
+    seq.init(3)
+    params = np.empty(3)
+    for _ in range(5 * seq.n_samples_per_update):
+        seq.get_next_parameters(params)
+        seq.set_evaluation_feedback(objective(params))
+
+    batch = CMAESOptimizer(random_state=0)
+    batch.init(3)
+    for _ in range(5):
+        X = batch.get_next_parameters_batch()
+        assert_equal(len(X), batch.n_samples_per_update)
+        batch.set_evaluation_feedback_batch([objective(x) for x in X])
+
+    assert_array_almost_equal(seq.mean, batch.mean)
+    assert_array_almost_equal(seq.cov, batch.cov)
+    assert_array_almost_equal(seq.get_best_parameters(),
+                              batch.get_best_parameters())
+
+
+def test_cmaes_batch_too_large():
+    opt = CMAESOptimizer()
+    opt.init(2)
+    assert_raises_regexp(ValueError, "samples are left",
+                         opt.get_next_parameters_batch,
+                         opt.n_samples_per_update + 1)
+
+
+def test_cmaes_sampling_distribution():
+    covariance = np.array([[4.0, 1.0], [1.0, 2.0]])
+    opt = CMAESOptimizer(initial_params=np.array([1.0, -1.0]), variance=0.5,
+                         covariance=covariance, random_state=0)
+    opt.init(2)
+    samples = opt._sample(100000)
+    assert_array_almost_equal(np.mean(samples, axis=0), [1.0, -1.0],
+                              decimal=2)
+    assert_array_almost_equal(np.cov(samples, rowvar=False),
+                              0.5 * covariance, decimal=1)
+
+
+def test_cmaes_lazy_eigen_decomposition():
+    opt = CMAESOptimizer(random_state=0)
+    opt.init(100)
+    assert_greater(opt.eigen_update_freq, 2 * opt.n_samples_per_update)
+    sample_trans = opt.sample_trans.copy()
+
+    params = np.empty(100)
+    for _ in range(2 * opt.n_samples_per_update):
+        opt.get_next_parameters(params)
+        opt.set_evaluation_feedback(-np.linalg.norm(params))
+    assert_equal(opt.eigen_decomp_updated, 0)
+    assert_array_equal(opt.sample_trans, sample_trans)
+
+    while opt.eigen_decomp_updated == 0:
+        opt.get_next_parameters(params)
+        opt.set_evaluation_feedback(-np.linalg.norm(params))
+    assert_array_almost_equal(opt.sample_trans.dot(opt.sample_trans.T),
+                              opt.cov)
+
+
+def test_sepcmaes_diagonal_covariance():
+    opt = SepCMAESOptimizer(covariance=np.diag([1.0, 2.0, 3.0]),
+                            random_state=0)
+    opt.init(3)
+    assert_array_equal(opt.cov, [1.0, 2.0, 3.0])
+    params = np.empty(3)
+    for _ in range(5 * opt.n_samples_per_update):
+        opt.get_next_parameters(params)
+        opt.set_evaluation_feedback(-np.linalg.norm(params))
+    assert_equal(opt.cov.shape, (3,))
+    assert_true(np.all(opt.cov > 0.0))
+
+
+def test_sepcmaes_minimize_separable():
+    scales = 10.0 ** np.arange(5)
+    _, f = fmin(lambda x: np.sum(scales * x ** 2), cma_type="sep",
+                x0=np.ones(5), random_state=0, maxfun=2000)
+    assert_less(f, 1e-5)
+
+
+def test_sepcmaes_restarts():
+    for cma_type in ["sep-restart", "sep-ipop", "sep-bipop"]:
+        _, f = fmin(lambda x: np.linalg.norm(x), cma_type=cma_type,
+                    x0=np.zeros(2), random_state=0, maxfun=300)
+        assert_less(f, 1e-5)
+
+
+def test_sepipop_cmaes_increases_population():
+    opt = SepIPOPCMAESOptimizer(random_state=0, maximize=False)
+    opt.init(2)
+    n_samples_per_update = opt.n_samples_per_update
+    params = np.empty(2)
+    for _ in range(2000):
+        opt.get_next_parameters(params)
+        opt.set_evaluation_feedback(np.linalg.norm(params))
+    assert_greater(opt.n_samples_per_update, n_samples_per_update)
+    assert_equal(opt.cov.shape, (2,))
+
+
+def test_bound():
+    samples = np.array([[-2.0, 0.5, 3.0], [0.0, -1.0, 1.0]])
+    bounds = np.array([[-1.0, 1.0], [0.0, 2.0], [-5.0, 5.0]])
+    _bound(bounds, samples)
+    assert_array_equal(samples, [[-1.0, 0.5, 3.0], [0.0, 0.0, 1.0]])
+
+
+def test_cmaes_update_reuses_buffers():
+    opt = CMAESOptimizer(active=True, random_state=0)
+    opt.init(5)
+    names = ["cov", "rank_one_update", "rank_mu_update", "neg_rank_mu_update",
+             "selected_noise", "weighted_noise"]
+    buffers = [getattr(opt, name) for name in names]
+    mean_buffers = set([id(opt.mean), id(opt.last_mean)])
+    for _ in range(10):
+        X = opt.get_next_parameters_batch()
+        opt.set_evaluation_feedback_batch(-np.sum(X ** 2, axis=1))
+    for name, buffer in zip(names, buffers):
+        assert_true(getattr(opt, name) is buffer)
+    assert_equal(set([id(opt.mean), id(opt.last_mean)]), mean_buffers)
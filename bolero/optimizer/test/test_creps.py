@@ -1,7 +1,8 @@
 import numpy as np
 from bolero.optimizer.creps import solve_dual_contextual_reps, CREPSOptimizer
-from bolero.representation.context_transformations import quadratic
+from bolero.representation.context_transformations import quadratic, cubic
 from nose.tools import assert_raises_regexp, assert_true, assert_equal, assert_almost_equal
+from numpy.testing import assert_array_equal, assert_array_almost_equal
 
 
 def test_shapes_mismatch():
@@ -27,3 +28,48 @@ def test_baseline_overestimates():
 def test_cmaes_dimensions_mismatch():
     opt = CREPSOptimizer(initial_params=np.zeros(5))
     assert_raises_regexp(ValueError, "Number of dimensions", opt.init, 10, 2)
+
+
+def test_batch_context_features():
+    contexts = np.random.RandomState(0).randn(5, 2)
+    opt = CREPSOptimizer(initial_params=np.zeros(3), context_features="cubic",
+                         train_freq=100, random_state=0)
+    opt.init(3, 2)
+    opt.get_next_parameters_batch(contexts)
+    opt.set_evaluation_feedback_batch(np.zeros(5))
+    assert_array_equal(opt.history.context_features,
+                       [cubic(s) for s in contexts])
+
+
+def test_dual_warm_start():
+    random_state = np.random.RandomState(0)
+    s = random_state.rand(100, 2)
+    S = quadratic(s)
+    R = -np.sum((s - 0.5) ** 2, axis=1) + 0.1 * random_state.randn(100)
+    d, eta, nu = solve_dual_contextual_reps(S, R, 1.0, 1e-8)
+    d2, eta2, _ = solve_dual_contextual_reps(S, R, 1.0, 1e-8, eta, nu)
+    assert_almost_equal(eta, eta2, places=4)
+    assert_array_almost_equal(d, d2, decimal=4)
+
+
+def test_batch_equals_sequential():
+    opts = [CREPSOptimizer(initial_params=np.zeros(2), train_freq=10,
+                           n_samples_per_update=20, context_features="affine",
+                           random_state=0)
+            for _ in range(2)]
+    for opt in opts:
+        opt.init(2, 1)
+    contexts = np.random.RandomState(1).rand(25, 1)
+    params = opts[0].get_next_parameters_batch(contexts)
+    rewards = -np.sum((params - contexts) ** 2, axis=1)
+    opts[0].set_evaluation_feedback_batch(rewards[:3])
+    opts[0].set_evaluation_feedback_batch(rewards[3:])
+    for s, p, reward in zip(contexts, params, rewards):
+        opts[1].set_context(s)
+        opts[1].params = p
+        opts[1].set_evaluation_feedback([reward])
+    assert_equal(opts[0].it, opts[1].it)
+    assert_array_equal(opts[0].history.params, opts[1].history.params)
+    assert_array_equal(opts[0].history.contexts, opts[1].history.contexts)
+    assert_array_almost_equal(opts[0].policy_.upper_level_policy.W,
+                              opts[1].policy_.upper_level_policy.W)
@@ -0,0 +1,64 @@
+import numpy as np
+from nose.tools import (assert_less, assert_equal, assert_true,
+                        assert_raises_regexp)
+from numpy.testing import assert_array_equal
+from bolero.optimizer import LMMAESOptimizer
+
+
+def test_lmmaes_dimensions_mismatch():
+    opt = LMMAESOptimizer(initial_params=np.zeros(5))
+    assert_raises_regexp(ValueError, "Number of dimensions", opt.init, 10)
+
+
+def test_lmmaes_limited_memory():
+    opt = LMMAESOptimizer(n_vectors=3, random_state=0)
+    opt.init(200)
+    assert_equal(opt.M.shape, (3, 200))
+    assert_equal(opt.covariance.shape, (200,))
+    params = np.empty(200)
+    for _ in range(5 * opt.n_samples_per_update):
+        opt.get_next_parameters(params)
+        opt.set_evaluation_feedback(-np.linalg.norm(params - 1.0))
+    assert_equal(opt.n_active_vectors, 3)
+    assert_true(np.all(np.isfinite(opt.M)))
+
+
+def test_lmmaes_full_covariance_uses_diagonal():
+    opt = LMMAESOptimizer(covariance=np.diag([1.0, 4.0]))
+    opt.init(2)
+    assert_array_equal(opt.scale, [1.0, 2.0])
+
+
+def test_lmmaes_minimize_many_params():
+    opt = LMMAESOptimizer(maximize=False, random_state=0)
+    opt.init(100)
+    for _ in range(200):
+        X = opt.get_next_parameters_batch()
+        opt.set_evaluation_feedback_batch(np.linalg.norm(X - 1.0, axis=1))
+    assert_less(opt.get_best_fitness(), 1.0)
+    assert_less(np.linalg.norm(opt.get_best_parameters(method="mean") - 1.0),
+                1.0)
+
+
+def test_lmmaes_bounds():
+    bounds = np.array([[-1.0, 0.5]] * 3)
+    opt = LMMAESOptimizer(variance=100.0, bounds=bounds, random_state=0)
+    opt.init(3)
+    params = np.empty(3)
+    for _ in range(100):
+        opt.get_next_parameters(params)
+        assert_true(np.all(params >= -1.0))
+        assert_true(np.all(params <= 0.5))
+        opt.set_evaluation_feedback(params.sum())
+
+
+def test_lmmaes_stop_fitness_variance():
+    opt = LMMAESOptimizer(random_state=0)
+    opt.init(2)
+    params = np.empty(2)
+    it = 0
+    while not opt.is_behavior_learning_done():
+        assert_less(it, 10000)
+        opt.get_next_parameters(params)
+        opt.set_evaluation_feedback(0.0)
+        it += 1
@@ -65,3 +65,39 @@ def test_contextual_optimizers_follow_standard_protocol():
         assert_true(np.isfinite(policy(context)).all())
 
         assert_pickle(name, opt)
+
+
+def test_optimizers_follow_batch_protocol():
+    for name, Optimizer in ALL_OPTIMIZERS:
+        opt = Optimizer()
+        n_params = 2
+        opt.init(n_params)
+        assert_equal(opt.n_params, n_params)
+        params = opt.get_next_parameters_batch(2)
+        assert_equal(params.shape, (2, n_params))
+        assert_true(np.isfinite(params).all())
+        opt.set_evaluation_feedback_batch(np.zeros((2, 1)))
+        params = opt.get_best_parameters()
+        assert_equal(len(params), n_params)
+        assert_true(np.isfinite(params).all())
+
+        assert_pickle(name, opt)
+
+
+def test_contextual_optimizers_follow_batch_protocol():
+    for name, ContextualOptimizer in ALL_CONTEXTUALOPTIMIZERS:
+        opt = ContextualOptimizer()
+        n_params = 1
+        n_context_dims = 1
+        opt.init(n_params, n_context_dims)
+        assert_equal(opt.n_params, n_params)
+        contexts = np.array([[0.0], [1.0]])
+        params = opt.get_next_parameters_batch(contexts)
+        assert_equal(params.shape, (2, n_params))
+        assert_true(np.isfinite(params).all())
+        opt.set_evaluation_feedback_batch(np.zeros(2))
+
+        policy = opt.best_policy()
+        assert_true(np.isfinite(policy(contexts[0])).all())
+
+        assert_pickle(name, opt)
@@ -0,0 +1,49 @@
+import numpy as np
+from bolero.optimizer.reps import solve_dual_reps, REPSOptimizer
+from nose.tools import (assert_raises_regexp, assert_true, assert_almost_equal,
+                        assert_equal)
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+
+def test_returns_not_flat():
+    assert_raises_regexp(ValueError, "flat array", solve_dual_reps,
+                         np.zeros((10, 1)), 1.0, 1e-8)
+
+
+def test_equal_returns():
+    d, eta = solve_dual_reps(np.ones(10), 1.0, 1e-8)
+    assert_array_almost_equal(d, 0.1 * np.ones(10))
+    assert_true(np.isnan(eta))
+
+
+def test_dual_warm_start():
+    R = -np.linspace(-1, 1, 50) ** 2
+    d, eta = solve_dual_reps(R, 1.0, 1e-8)
+    assert_true(np.all(np.diff(d[:25]) > 0))
+    assert_almost_equal(np.sum(d), 1.0)
+    for eta0 in [1e-4, 0.5, 100.0]:
+        d2, eta2 = solve_dual_reps(R, 1.0, 1e-8, eta0)
+        assert_almost_equal(eta, eta2, places=5)
+        assert_array_almost_equal(d, d2, decimal=5)
+
+
+def test_batch_equals_sequential():
+    opts = [REPSOptimizer(initial_params=np.zeros(2), train_freq=10,
+                          n_samples_per_update=20, random_state=0)
+            for _ in range(2)]
+    for opt in opts:
+        opt.init(2)
+    params = opts[0].get_next_parameters_batch(25)
+    rewards = -np.sum((params - 1.0) ** 2, axis=1)
+    opts[0].set_evaluation_feedback_batch(rewards[:3])
+    opts[0].set_evaluation_feedback_batch(rewards[3:])
+    for p, reward in zip(params, rewards):
+        opts[1].params = p
+        opts[1].set_evaluation_feedback([reward])
+    assert_equal(opts[0].it, opts[1].it)
+    assert_array_equal(opts[0].history.params, opts[1].history.params)
+    assert_array_equal(opts[0].history.returns, opts[1].history.returns)
+    assert_array_equal(opts[0].policy_.upper_level_policy.mean,
+                       opts[1].policy_.upper_level_policy.mean)
+    assert_array_equal(opts[0].get_best_parameters(),
+                       opts[1].get_best_parameters())
@@ -82,6 +82,37 @@ class Behavior(Base):
         """
         return True
 
+    def is_open_loop(self):
+        """Returns if the outputs can be generated without inputs.
+
+        An open-loop behavior computes all outputs from the first input (e.g.
+        the initial state) if the inputs of the following steps are the
+        outputs of the previous steps. It can generate all outputs at once
+        with :func:`get_output_trajectory`.
+
+        Returns
+        -------
+        open_loop : bool
+            Can we call get_output_trajectory()?
+        """
+        return False
+
+    def get_output_trajectory(self):
+        """Get outputs of all steps.
+
+        The result must be the same as calling set_inputs() with the outputs
+        of the previous step, step() and get_outputs() as long as can_step()
+        returns True. set_inputs() will be called once with the initial
+        state before.
+
+        Returns
+        -------
+        outputs : array, shape (n_steps, n_outputs)
+            Outputs of each step, e.g. desired states
+        """
+        raise NotImplementedError("%s is not an open-loop behavior"
+                                  % type(self).__name__)
+
 
 class BehaviorTemplate(Base):
     """Behavior template interface."""
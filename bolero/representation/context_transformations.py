@@ -2,8 +2,13 @@ import itertools
 import numpy as np
 
 
-def constant(_):
-    return np.array([1.0])
+# All transformations map a context of shape (n_context_dims,) to features of
+# shape (n_features,) and a batch of contexts of shape
+# (n_samples, n_context_dims) to features of shape (n_samples, n_features).
+
+
+def constant(context):
+    return np.ones(np.shape(context)[:-1] + (1,))
 
 
 def linear(context):
@@ -22,18 +27,27 @@ def cubic(context):
     return polynomial(context, n_degrees=3)
 
 
-def polynomial(context, n_degrees=2):
+_POWERS = {}
+
+
+def _powers(n_features, n_degrees):
     # From sklearn.preprocessing.PolynomialFeatures
     # Find permutations/combinations which add to degree or less
+    key = (n_features, n_degrees)
+    if key not in _POWERS:
+        powers = itertools.product(*(range(n_degrees + 1)
+                                     for i in range(n_features)))
+        powers = np.array([c for c in powers if 0 <= np.sum(c) <= n_degrees])
+        # Sort so that the order of the powers makes sense
+        i = np.lexsort(np.vstack([powers.T, powers.sum(axis=1)]))
+        _POWERS[key] = powers[i][::-1]
+    return _POWERS[key]
+
+
+def polynomial(context, n_degrees=2):
     context = np.asarray(context)
-    n_features = context.shape[0]
-    powers = itertools.product(*(range(n_degrees + 1)
-                                 for i in range(n_features)))
-    powers = np.array([c for c in powers if 0 <= np.sum(c) <= n_degrees])
-    # Sort so that the order of the powers makes sense
-    i = np.lexsort(np.vstack([powers.T, powers.sum(axis=1)]))
-    powers = powers[i][::-1]
-    return (context ** powers).prod(-1)
+    powers = _powers(context.shape[-1], n_degrees)
+    return (context[..., np.newaxis, :] ** powers).prod(-1)
 
 
 CONTEXT_TRANSFORMATIONS = {
@@ -1,11 +1,10 @@
 # Authors: Jan Hendrik Metzen <jhm@informatik.uni-bremen.de>
 #          Alexander Fabisch <afabisch@informatik.uni-bremen.de>
 
-import yaml
-import StringIO
 import numpy as np
 from .behavior import BlackBoxBehavior
-from .dmp_behavior import load_dmp_model, save_dmp_model
+from .dmp_behavior import (load_dmp_model, save_dmp_model, read_dmp_config,
+                           write_dmp_config, _cached_activation_table)
 import dmp
 
 
@@ -46,16 +45,23 @@ class CartesianDMPBehavior(BlackBoxBehavior):
 
     configuration_file : string, optional (default: None)
         Name of a configuration file that should be used to initialize the DMP.
-        If it is set all other arguments will be ignored.
+        If it is set all other arguments will be ignored. It can be a YAML
+        file or a binary file (see :func:`write_binary_dmp_file`).
+
+    mmap_mode : {None, 'r', 'r+', 'c'}, optional (default: None)
+        Memory-map the weights of a binary configuration file instead of
+        reading them. Use 'c' (copy-on-write) to be able to set the weights
+        without modifying the file.
     """
     def __init__(self, execution_time=1.0, dt=0.01, n_features=50,
-                 configuration_file=None):
+                 configuration_file=None, mmap_mode=None):
         if configuration_file is None:
             self.execution_time = execution_time
             self.dt = dt
             self.n_features = n_features
         else:
             self.configuration_file = configuration_file
+        self.mmap_mode = mmap_mode
 
     def init(self, n_inputs, n_outputs):
         """Initialize the behavior.
@@ -78,7 +84,8 @@ class CartesianDMPBehavior(BlackBoxBehavior):
         self.n_task_dims = 6
 
         if hasattr(self, "configuration_file"):
-            load_dmp_model(self, self.configuration_file)
+            load_dmp_model(self, self.configuration_file,
+                           self.mmap_mode)
         else:
             self.name = "Python CSDMP"
             self.alpha_z = dmp.calculate_alpha(0.01, self.execution_time, 0.0)
@@ -120,6 +127,7 @@ class CartesianDMPBehavior(BlackBoxBehavior):
         if not hasattr(self, "qgdd"):
             self.qgdd = np.zeros(3)
 
+        self.activations_key_ = None
         self.reset()
 
     def get_weights(self):
@@ -204,39 +212,71 @@ class CartesianDMPBehavior(BlackBoxBehavior):
 
     def step(self):
         """Compute desired position, velocity and acceleration."""
-        dmp.dmp_step(
-            self.last_t, self.t,
-            self.last_y, self.last_yd, self.last_ydd,
-            self.y, self.yd, self.ydd,
-            self.g, self.gd, self.gdd,
-            self.x0, self.x0d, self.x0dd,
-            self.execution_time, 0.0,
-            self.position_weights,
-            self.widths,
-            self.centers,
-            self.alpha_y, self.beta_y, self.alpha_z,
-            0.001
-        )
-
-        dmp.quaternion_dmp_step(
-            self.last_t, self.t,
-            self.last_r, self.last_rd, self.last_rdd,
-            self.r, self.rd, self.rdd,
-            self.qg, self.qgd, self.qgdd,
-            self.q0, self.q0d, self.q0dd,
-            self.execution_time, 0.0,
-            self.orientation_weights,
-            self.widths,
-            self.centers,
-            self.alpha_y, self.beta_y, self.alpha_z,
-            0.001
-        )
+        T, phases, activations = _cached_activation_table(self)
+        i = self.step_idx
+        if 0 < i < len(T) and T[i - 1] == self.last_t and T[i] == self.t:
+            dmp.dmp_step_precomputed(
+                self.last_t, self.t,
+                self.last_y, self.last_yd, self.last_ydd,
+                self.y, self.yd, self.ydd,
+                self.g, self.gd, self.gdd,
+                self.x0, self.x0d, self.x0dd,
+                self.execution_time, 0.0,
+                self.position_weights,
+                phases[i],
+                activations[i],
+                self.alpha_y, self.beta_y,
+                0.001
+            )
+
+            dmp.quaternion_dmp_step_precomputed(
+                self.last_t, self.t,
+                self.last_r, self.last_rd, self.last_rdd,
+                self.r, self.rd, self.rdd,
+                self.qg, self.qgd, self.qgdd,
+                self.q0, self.q0d, self.q0dd,
+                self.execution_time, 0.0,
+                self.orientation_weights,
+                phases[i],
+                activations[i],
+                self.alpha_y, self.beta_y,
+                0.001
+            )
+        else:
+            dmp.dmp_step(
+                self.last_t, self.t,
+                self.last_y, self.last_yd, self.last_ydd,
+                self.y, self.yd, self.ydd,
+                self.g, self.gd, self.gdd,
+                self.x0, self.x0d, self.x0dd,
+                self.execution_time, 0.0,
+                self.position_weights,
+                self.widths,
+                self.centers,
+                self.alpha_y, self.beta_y, self.alpha_z,
+                0.001
+            )
+
+            dmp.quaternion_dmp_step(
+                self.last_t, self.t,
+                self.last_r, self.last_rd, self.last_rdd,
+                self.r, self.rd, self.rdd,
+                self.qg, self.qgd, self.qgdd,
+                self.q0, self.q0d, self.q0dd,
+                self.execution_time, 0.0,
+                self.orientation_weights,
+                self.widths,
+                self.centers,
+                self.alpha_y, self.beta_y, self.alpha_z,
+                0.001
+            )
 
         if self.t == self.last_t:
             self.last_t = -1.0
         else:
             self.last_t = self.t
             self.t += self.dt
+            self.step_idx += 1
 
     def can_step(self):
         """Returns if step() can be called again.
@@ -302,6 +342,7 @@ class CartesianDMPBehavior(BlackBoxBehavior):
 
         self.last_t = 0.0
         self.t = 0.0
+        self.step_idx = 0
 
     def imitate(self, X, alpha=0.0, allow_final_velocity=True):
         """Learn weights of the DMP from demonstrations.
@@ -343,97 +384,72 @@ class CartesianDMPBehavior(BlackBoxBehavior):
         X : array, shape (n_steps, 7)
             Positions and rotations (order: x, y, z, w, rx, ry, rz)
         """
-        last_t = 0.0
-
-        last_y = np.copy(self.x0)
-        last_yd = np.copy(self.x0d)
-        last_ydd = np.copy(self.x0dd)
+        return self.trajectories(self.weights[np.newaxis])[0]
 
-        y = np.empty(3)
-        yd = np.empty(3)
-        ydd = np.empty(3)
+    def trajectories(self, weights_batch):
+        """Generate trajectories for multiple weight matrices in open loop.
 
-        last_r = np.copy(self.q0)
-        last_rd = np.copy(self.q0d)
-        last_rdd = np.copy(self.q0dd)
+        Positions and rotations of all trajectories will be computed in one
+        call to the DMP module, which is much faster than calling
+        :func:`trajectory` for each weight matrix, e.g. to evaluate a whole
+        population of an optimizer.
 
-        r = np.empty(4)
-        rd = np.empty(3)
-        rdd = np.empty(3)
-
-        Y = []
-        R = []
-        for t in np.arange(0, self.execution_time + self.dt, self.dt):
-            dmp.dmp_step(
-                last_t, t,
-                last_y, last_yd, last_ydd,
-                y, yd, ydd,
-                self.g, self.gd, self.gdd,
-                self.x0, self.x0d, self.x0dd,
-                self.execution_time, 0.0,
-                self.position_weights,
-                self.widths,
-                self.centers,
-                self.alpha_y, self.beta_y, self.alpha_z,
-                0.001
-            )
-
-            dmp.quaternion_dmp_step(
-                last_t, t,
-                last_r, last_rd, last_rdd,
-                r, rd, rdd,
-                self.qg, self.qgd, self.qgdd,
-                self.q0, self.q0d, self.q0dd,
-                self.execution_time, 0.0,
-                self.orientation_weights,
-                self.widths,
-                self.centers,
-                self.alpha_y, self.beta_y, self.alpha_z,
-                0.001
-            )
-
-            last_t = t
-            last_y[:] = y
-            last_yd[:] = yd
-            last_ydd[:] = ydd
-            last_r[:] = r
-            last_rd[:] = rd
-            last_rdd[:] = rdd
-            Y.append(y.copy())
-            R.append(r.copy())
+        Parameters
+        ----------
+        weights_batch : array-like, shape (n_samples, n_features, 6)
+            Weight matrices, each row can also be flattened to a parameter
+            vector of shape (n_params,)
 
-        return np.hstack((Y, R))
+        Returns
+        -------
+        X : array, shape (n_samples, n_steps, 7)
+            Positions and rotations (order: x, y, z, w, rx, ry, rz)
+        """
+        weights_batch = np.asarray(weights_batch, dtype=np.float64)
+        n_samples = weights_batch.shape[0]
+        weights_batch = np.ascontiguousarray(weights_batch.reshape(
+            n_samples, self.n_features, 6))
+
+        T = np.arange(0, self.execution_time + self.dt, self.dt)
+        X = np.empty((n_samples, len(T), 7))
+        if n_samples == 0:
+            return X
+
+        dmp.cartesian_dmp_trajectories(
+            T, self.g, self.gd, self.gdd, self.x0, self.x0d, self.x0dd,
+            self.qg, self.q0, self.q0d, self.q0dd, self.execution_time, 0.0,
+            weights_batch, self.widths, self.centers, X, self.alpha_y,
+            self.beta_y, self.alpha_z, 0.001)
+        return X
 
     save = save_dmp_model
 
-    def save_config(self, filename):
+    def save_config(self, filename, binary=None):
         """Save DMP configuration.
 
         Parameters
         ----------
         filename : string
-            Name of YAML file
+            Name of YAML file or binary file
+
+        binary : bool, optional (default: None)
+            Write the binary format, by default it will be used if the
+            extension of the file is '.bdmp'
         """
         config = {}
         config["name"] = self.name
         config["executionTime"] = self.execution_time
-        config["startPosition"] = self.x0.tolist()
-        config["startVelocity"] = self.x0d.tolist()
-        config["startAcceleration"] = self.x0dd.tolist()
-        config["startRotation"] = self.q0.tolist()
-        config["startAngularVelocity"] = self.q0d.tolist()
-        config["endPosition"] = self.g.tolist()
-        config["endVelocity"] = self.gd.tolist()
-        config["endAcceleration"] = self.gdd.tolist()
-        config["endRotation"] = self.qg.tolist()
-
-        config_content = StringIO.StringIO()
-        yaml.dump(config, config_content)
-        with open(filename, "w") as f:
-            f.write("---\n")
-            f.write(config_content.getvalue())
-            f.write("...\n")
-        config_content.close()
+        config["startPosition"] = self.x0
+        config["startVelocity"] = self.x0d
+        config["startAcceleration"] = self.x0dd
+        config["startRotation"] = self.q0
+        config["startAngularVelocity"] = self.q0d
+        config["endPosition"] = self.g
+        config["endVelocity"] = self.gd
+        config["endAcceleration"] = self.gdd
+        config["endRotation"] = self.qg
+
+        write_dmp_config(config, filename, binary)
 
     def load_config(self, filename):
         """Load DMP configuration.
@@ -441,9 +457,9 @@ class CartesianDMPBehavior(BlackBoxBehavior):
         Parameters
         ----------
         filename : string
-            Name of YAML file
+            Name of YAML file or binary file
         """
-        config = yaml.load(open(filename, "r"))
+        config = read_dmp_config(filename)
         self.execution_time = config["executionTime"]
         self.x0 = np.array(config["startPosition"], dtype=np.float)
         self.x0d = np.array(config["startVelocity"], dtype=np.float)
@@ -1,6 +1,8 @@
 # Authors: Jan Hendrik Metzen <jhm@informatik.uni-bremen.de>
 #          Alexander Fabisch <afabisch@informatik.uni-bremen.de>
 
+import os
+import struct
 import yaml
 import warnings
 import StringIO
@@ -12,7 +14,309 @@ import dmp
 PERMITTED_DMP_METAPARAMETERS = ["x0", "g", "gd", "execution_time"]
 
 
-def load_dmp_model(dmp, filename):
+BINARY_MAGIC = b"BDMP"
+BINARY_VERSION = 1
+BINARY_EXTENSIONS = (".bdmp",)
+_BINARY_HEADER = struct.Struct("<4sIII")
+_BINARY_ENTRY = struct.Struct("<IIQQQ")
+_BINARY_DTYPE = np.dtype("<f8")
+
+
+def _padded(n_bytes, alignment=8):
+    return n_bytes + (-n_bytes % alignment)
+
+
+def _as_native_str(data):
+    if str is bytes:  # Python 2
+        return data
+    return data.decode("utf-8")
+
+
+def is_binary_dmp_file(filename):
+    """Check if a file is stored in the binary DMP format.
+
+    Parameters
+    ----------
+    filename : string
+        Name of the file
+
+    Returns
+    -------
+    binary : bool
+        The file starts with the magic number of the binary DMP format
+    """
+    with open(filename, "rb") as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def write_binary_dmp_file(filename, name, arrays):
+    """Write named arrays to a file in the binary DMP format.
+
+    All values are stored as little-endian 64 bit floats in C order. A file
+    consists of a header (magic number 'BDMP', format version, number of
+    arrays and length of the name as uint32), the UTF-8 encoded name,
+    one entry for each array (length of the key and number of dimensions as
+    uint32, two dimensions and the absolute offset of the data in bytes as
+    uint64, the key) and the data of all arrays. The name, each key and the
+    data of each array are zero-padded to multiples of 8 bytes so that the
+    arrays can be memory-mapped.
+
+    Parameters
+    ----------
+    filename : string
+        Name of the file
+
+    name : string
+        Name of the model or configuration
+
+    arrays : list of tuples (string, array-like)
+        Keys and values, values can have at most two dimensions
+    """
+    name = name.encode("utf-8")
+    arrays = [(key.encode("utf-8"), np.asarray(value, dtype=_BINARY_DTYPE))
+              for key, value in arrays]
+
+    offset = _padded(_BINARY_HEADER.size + len(name))
+    offset += sum(_BINARY_ENTRY.size + _padded(len(key)) for key, _ in arrays)
+    entries = []
+    for key, value in arrays:
+        if value.ndim > 2:
+            raise ValueError("Array '%s' has %d dimensions, at most 2 are "
+                             "allowed" % (key, value.ndim))
+        shape = value.shape + (1,) * (2 - value.ndim)
+        entries.append(_BINARY_ENTRY.pack(len(key), value.ndim, shape[0],
+                                          shape[1], offset) +
+                       key.ljust(_padded(len(key)), b"\0"))
+        offset += _padded(value.nbytes)
+
+    with open(filename, "wb") as f:
+        f.write(_BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION,
+                                    len(arrays), len(name)))
+        f.write(name.ljust(_padded(len(name)), b"\0"))
+        for entry in entries:
+            f.write(entry)
+        for _, value in arrays:
+            data = np.ascontiguousarray(value).tostring()
+            f.write(data.ljust(_padded(len(data)), b"\0"))
+
+
+def read_binary_dmp_file(filename, mmap_mode=None):
+    """Read named arrays from a file in the binary DMP format.
+
+    Parameters
+    ----------
+    filename : string
+        Name of the file
+
+    mmap_mode : {None, 'r', 'r+', 'c'}, optional (default: None)
+        If not None, arrays with at least one dimension will be memory-mapped
+        with the given mode (see :class:`numpy.memmap`) so that they are only
+        loaded on demand. Otherwise all arrays will be read to memory.
+
+    Returns
+    -------
+    name : string
+        Name of the model or configuration
+
+    arrays : dict
+        Maps keys to arrays, 0-dimensional arrays will be converted to float
+    """
+    with open(filename, "rb") as f:
+        header = f.read(_BINARY_HEADER.size)
+        if len(header) < _BINARY_HEADER.size:
+            raise IOError("'%s' is not a binary DMP file" % filename)
+        magic, version, n_arrays, name_length = _BINARY_HEADER.unpack(header)
+        if magic != BINARY_MAGIC:
+            raise IOError("'%s' is not a binary DMP file" % filename)
+        if version != BINARY_VERSION:
+            raise IOError("Unsupported version of binary DMP file '%s': %d"
+                          % (filename, version))
+        name = _as_native_str(f.read(_padded(name_length))[:name_length])
+
+        entries = []
+        for _ in range(n_arrays):
+            key_length, ndim, rows, cols, offset = _BINARY_ENTRY.unpack(
+                f.read(_BINARY_ENTRY.size))
+            key = _as_native_str(f.read(_padded(key_length))[:key_length])
+            entries.append((key, (rows, cols)[:ndim], offset))
+
+        arrays = {}
+        for key, shape, offset in entries:
+            count = int(np.prod(shape))
+            if mmap_mode is not None and len(shape) > 0 and count > 0:
+                value = np.memmap(filename, dtype=_BINARY_DTYPE,
+                                  mode=mmap_mode, offset=offset, shape=shape)
+            else:
+                f.seek(offset)
+                value = np.fromfile(f, dtype=_BINARY_DTYPE, count=count)
+                value = value.reshape(shape)
+            if value.ndim == 0:
+                value = float(value)
+            arrays[key] = value
+    return name, arrays
+
+
+def _write_yaml(filename, content):
+    content_stream = StringIO.StringIO()
+    yaml.dump(content, content_stream)
+    with open(filename, "w") as f:
+        f.write("---\n")
+        f.write(content_stream.getvalue())
+        f.write("...\n")
+    content_stream.close()
+
+
+def _is_binary_filename(filename, binary):
+    if binary is None:
+        return os.path.splitext(filename)[1] in BINARY_EXTENSIONS
+    return binary
+
+
+def read_dmp_model(filename, mmap_mode=None):
+    """Read DMP model from a YAML or binary file.
+
+    Parameters
+    ----------
+    filename : string
+        Name of YAML file or binary file
+
+    mmap_mode : {None, 'r', 'r+', 'c'}, optional (default: None)
+        Memory-map the arrays of a binary file, will be ignored for YAML files
+
+    Returns
+    -------
+    model : dict
+        DMP model, contains the entries of the YAML schema ('name',
+        'cs_alpha', 'cs_execution_time', 'cs_dt', 'rbf_widths', 'rbf_centers',
+        'ts_alpha_z', 'ts_beta_z', 'ts_tau', 'ts_dt', 'ft_weights'), the
+        weights have the shape (n_task_dims, n_features)
+    """
+    if not is_binary_dmp_file(filename):
+        return yaml.load(open(filename, "r"))
+
+    name, model = read_binary_dmp_file(filename, mmap_mode)
+    model["name"] = name
+    # The binary format stores the weights in the layout that is used by
+    # the behaviors so that they can be memory-mapped without a copy.
+    model["ft_weights"] = model.pop("weights").T
+    return model
+
+
+def write_dmp_model(model, filename, binary=None):
+    """Write DMP model to a YAML or binary file.
+
+    Parameters
+    ----------
+    model : dict
+        DMP model with the entries of the YAML schema, see
+        :func:`read_dmp_model`
+
+    filename : string
+        Name of the file
+
+    binary : bool, optional (default: None)
+        Write the binary format, by default it will be used if the extension
+        of the file is '.bdmp'
+    """
+    if _is_binary_filename(filename, binary):
+        arrays = [(key, model[key])
+                  for key in ["cs_alpha", "cs_execution_time", "cs_dt",
+                              "ts_alpha_z", "ts_beta_z", "ts_tau", "ts_dt",
+                              "rbf_widths", "rbf_centers"]]
+        weights = np.asarray(model["ft_weights"], dtype=np.float64)
+        weights = weights.reshape(-1, len(model["rbf_widths"]))
+        arrays.append(("weights", weights.T))
+        write_binary_dmp_file(filename, model["name"], arrays)
+    else:
+        model = dict((key, value.tolist() if isinstance(value, np.ndarray)
+                      else value) for key, value in model.items())
+        _write_yaml(filename, model)
+
+
+def convert_dmp_model(src_filename, dst_filename, binary=None):
+    """Convert a DMP model between the YAML and the binary format.
+
+    Parameters
+    ----------
+    src_filename : string
+        Name of the YAML or binary file that should be read
+
+    dst_filename : string
+        Name of the file that should be written
+
+    binary : bool, optional (default: None)
+        Write the binary format, by default it will be used if the extension
+        of the file is '.bdmp'
+    """
+    write_dmp_model(read_dmp_model(src_filename), dst_filename, binary)
+
+
+def read_dmp_config(filename):
+    """Read DMP configuration from a YAML or binary file.
+
+    Parameters
+    ----------
+    filename : string
+        Name of YAML file or binary file
+
+    Returns
+    -------
+    config : dict
+        DMP configuration, contains the same entries as the YAML file
+    """
+    if not is_binary_dmp_file(filename):
+        return yaml.load(open(filename, "r"))
+
+    name, config = read_binary_dmp_file(filename)
+    config["name"] = name
+    return config
+
+
+def write_dmp_config(config, filename, binary=None):
+    """Write DMP configuration to a YAML or binary file.
+
+    Parameters
+    ----------
+    config : dict
+        DMP configuration, all entries except 'name' must be numbers or
+        vectors
+
+    filename : string
+        Name of the file
+
+    binary : bool, optional (default: None)
+        Write the binary format, by default it will be used if the extension
+        of the file is '.bdmp'
+    """
+    if _is_binary_filename(filename, binary):
+        arrays = [(key, value) for key, value in sorted(config.items())
+                  if key != "name"]
+        write_binary_dmp_file(filename, config["name"], arrays)
+    else:
+        config = dict((key, value.tolist() if isinstance(value, np.ndarray)
+                       else value) for key, value in config.items())
+        _write_yaml(filename, config)
+
+
+def convert_dmp_config(src_filename, dst_filename, binary=None):
+    """Convert a DMP configuration between the YAML and the binary format.
+
+    Parameters
+    ----------
+    src_filename : string
+        Name of the YAML or binary file that should be read
+
+    dst_filename : string
+        Name of the file that should be written
+
+    binary : bool, optional (default: None)
+        Write the binary format, by default it will be used if the extension
+        of the file is '.bdmp'
+    """
+    write_dmp_config(read_dmp_config(src_filename), dst_filename, binary)
+
+
+def load_dmp_model(dmp, filename, mmap_mode=None):
     """Load DMP model.
 
     Parameters
@@ -21,9 +325,14 @@ def load_dmp_model(dmp, filename):
         DMP
 
     filename : string
-        Name of YAML file
+        Name of YAML file or binary file
+
+    mmap_mode : {None, 'r', 'r+', 'c'}, optional (default: None)
+        Memory-map the weights of a binary file instead of reading them, will
+        be ignored for YAML files. Use 'c' (copy-on-write) if the weights will
+        be modified but the file should not be changed.
     """
-    model = yaml.load(open(filename, "r"))
+    model = read_dmp_model(filename, mmap_mode)
     dmp.name = model["name"]
     dmp.alpha_z = model["cs_alpha"]
     dmp.widths = np.array(model["rbf_widths"], dtype=np.float)
@@ -33,8 +342,10 @@ def load_dmp_model(dmp, filename):
     dmp.execution_time = model["ts_tau"]
     dmp.dt = model["ts_dt"]
     dmp.n_features = dmp.widths.shape[0]
-    dmp.weights = np.array(model["ft_weights"], dtype=np.float
-        ).reshape(dmp.n_task_dims, dmp.n_features).T
+    # For memory-mapped weights of a binary file this is only a view
+    dmp.weights = np.ascontiguousarray(np.asarray(
+        model["ft_weights"], dtype=np.float
+    ).reshape(dmp.n_task_dims, dmp.n_features).T)
 
     if dmp.execution_time != model["cs_execution_time"]:
         raise ValueError("Inconsistent execution times: %g != %g"
@@ -45,7 +356,7 @@ def load_dmp_model(dmp, filename):
                          % (model["ts_dt"], model["cs_dt"]))
 
 
-def save_dmp_model(dmp, filename):
+def save_dmp_model(dmp, filename, binary=None):
     """Save DMP model.
 
     Parameters
@@ -54,28 +365,139 @@ def save_dmp_model(dmp, filename):
         DMP
 
     filename : string
-        Name of YAML file
+        Name of YAML file or binary file
+
+    binary : bool, optional (default: None)
+        Write the binary format, by default it will be used if the extension
+        of the file is '.bdmp'
     """
     model = {}
     model["name"] = dmp.name
     model["cs_alpha"] = dmp.alpha_z
     model["cs_execution_time"] = dmp.execution_time
     model["cs_dt"] = dmp.dt
-    model["rbf_widths"] = dmp.widths.tolist()
-    model["rbf_centers"] = dmp.centers.tolist()
+    model["rbf_widths"] = dmp.widths
+    model["rbf_centers"] = dmp.centers
     model["ts_alpha_z"] = dmp.alpha_y
     model["ts_beta_z"] = dmp.beta_y
     model["ts_tau"] = dmp.execution_time
     model["ts_dt"] = dmp.dt
-    model["ft_weights"] = dmp.weights.T.tolist()
+    model["ft_weights"] = dmp.weights.T
+    write_dmp_model(model, filename, binary)
 
-    model_content = StringIO.StringIO()
-    yaml.dump(model, model_content)
-    with open(filename, "w") as f:
-        f.write("---\n")
-        f.write(model_content.getvalue())
-        f.write("...\n")
-    model_content.close()
+
+def step_times(dt, end_t):
+    """Times of the steps of a DMP that is executed step by step.
+
+    The times are accumulated exactly like in the step function of the DMP
+    behaviors so that they can be compared with the current time.
+
+    Parameters
+    ----------
+    dt : float
+        Time between successive steps
+
+    end_t : float
+        Maximum time
+
+    Returns
+    -------
+    T : array, shape (n_steps,)
+        Time of each step, starting with 0
+    """
+    T = [0.0]
+    t = dt
+    while t <= end_t:
+        T.append(t)
+        t += dt
+    return np.array(T)
+
+
+def activation_table(T, widths, centers, goal_t, start_t, alpha_z,
+                     integration_dt=0.001):
+    """Precompute phases and normalized RBF activations for DMP steps.
+
+    The phase and the activations of the RBFs only depend on the time, hence,
+    we can compute them once for all executions of a DMP with the same times,
+    execution time and decay rate of the phase variable.
+
+    Parameters
+    ----------
+    T : array, shape (n_steps,)
+        Time of each step
+
+    widths : array, shape (n_features,)
+        Widths of the RBFs
+
+    centers : array, shape (n_features,)
+        Centers of the RBFs
+
+    goal_t : float
+        Time at the end of the DMP
+
+    start_t : float
+        Time at the start of the DMP
+
+    alpha_z : float
+        Decay rate of the phase variable
+
+    integration_dt : float, optional (default: 0.001)
+        Step size of the numerical integration
+
+    Returns
+    -------
+    phases : array, shape (n_steps, n_substeps)
+        Phase of each integration step from T[i - 1] to T[i] in row i
+
+    activations : array, shape (n_steps, n_substeps, n_features)
+        Normalized activations of the RBFs of each integration step from
+        T[i - 1] to T[i] in row i
+    """
+    T = np.ascontiguousarray(T, dtype=np.float64)
+    if len(T) > 1:
+        n_substeps = int(np.ceil(np.max(np.diff(T)) / integration_dt)) + 1
+    else:
+        n_substeps = 1
+    phases = np.empty((len(T), n_substeps))
+    activations = np.empty((len(T), n_substeps, len(widths)))
+    dmp.rbf_activation_table(T, phases, activations, widths, centers,
+                             goal_t, start_t, alpha_z, integration_dt)
+    return phases, activations
+
+
+def _cached_activation_table(behavior):
+    """Get times, phases and RBF activations of each step of a DMP (cached).
+
+    The table is stored in the attribute `activations_` of the behavior and
+    will be recomputed when the step size, the execution time or the decay
+    rate of the phase variable change, i.e. it is computed once and reused for
+    each execution of the DMP.
+
+    Parameters
+    ----------
+    behavior : DMPBehavior or CartesianDMPBehavior
+        Initialized DMP behavior
+
+    Returns
+    -------
+    T : array, shape (n_steps,)
+        Time of each step, see :func:`step_times`
+
+    phases : array, shape (n_steps, n_substeps)
+        Phases of the integration steps, see :func:`activation_table`
+
+    activations : array, shape (n_steps, n_substeps, n_features)
+        Activations of the integration steps, see :func:`activation_table`
+    """
+    key = (float(behavior.dt), float(behavior.execution_time),
+           float(behavior.alpha_z))
+    if getattr(behavior, "activations_key_", None) != key:
+        T = step_times(behavior.dt, behavior.execution_time)
+        behavior.activations_ = (T,) + activation_table(
+            T, behavior.widths, behavior.centers, behavior.execution_time,
+            0.0, behavior.alpha_z)
+        behavior.activations_key_ = key
+    return behavior.activations_
 
 
 class DMPBehavior(BlackBoxBehavior):
@@ -105,16 +527,23 @@ class DMPBehavior(BlackBoxBehavior):
 
     configuration_file : string, optional (default: None)
         Name of a configuration file that should be used to initialize the DMP.
-        If it is set all other arguments will be ignored.
+        If it is set all other arguments will be ignored. It can be a YAML
+        file or a binary file (see :func:`write_binary_dmp_file`).
+
+    mmap_mode : {None, 'r', 'r+', 'c'}, optional (default: None)
+        Memory-map the weights of a binary configuration file instead of
+        reading them. Use 'c' (copy-on-write) to be able to set the weights
+        without modifying the file.
     """
     def __init__(self, execution_time=1.0, dt=0.01, n_features=50,
-                 configuration_file=None):
+                 configuration_file=None, mmap_mode=None):
         if configuration_file is None:
             self.execution_time = execution_time
             self.dt = dt
             self.n_features = n_features
         else:
             self.configuration_file = configuration_file
+        self.mmap_mode = mmap_mode
 
     def init(self, n_inputs, n_outputs):
         """Initialize the behavior.
@@ -136,7 +565,8 @@ class DMPBehavior(BlackBoxBehavior):
         self.n_task_dims = self.n_inputs / 3
 
         if hasattr(self, "configuration_file"):
-            load_dmp_model(self, self.configuration_file)
+            load_dmp_model(self, self.configuration_file,
+                           self.mmap_mode)
         else:
             self.name = "Python DMP"
             self.alpha_z = dmp.calculate_alpha(0.01, self.execution_time, 0.0)
@@ -161,6 +591,7 @@ class DMPBehavior(BlackBoxBehavior):
         if not hasattr(self, "gdd"):
             self.gdd = np.zeros(self.n_task_dims)
 
+        self.activations_key_ = None
         self.reset()
 
 
@@ -235,25 +666,43 @@ class DMPBehavior(BlackBoxBehavior):
         if self.n_task_dims == 0:
             return
 
-        dmp.dmp_step(
-            self.last_t, self.t,
-            self.last_y, self.last_yd, self.last_ydd,
-            self.y, self.yd, self.ydd,
-            self.g, self.gd, self.gdd,
-            self.x0, self.x0d, self.x0dd,
-            self.execution_time, 0.0,
-            self.weights,
-            self.widths,
-            self.centers,
-            self.alpha_y, self.beta_y, self.alpha_z,
-            0.001
-        )
+        T, phases, activations = _cached_activation_table(self)
+        i = self.step_idx
+        if 0 < i < len(T) and T[i - 1] == self.last_t and T[i] == self.t:
+            dmp.dmp_step_precomputed(
+                self.last_t, self.t,
+                self.last_y, self.last_yd, self.last_ydd,
+                self.y, self.yd, self.ydd,
+                self.g, self.gd, self.gdd,
+                self.x0, self.x0d, self.x0dd,
+                self.execution_time, 0.0,
+                self.weights,
+                phases[i],
+                activations[i],
+                self.alpha_y, self.beta_y,
+                0.001
+            )
+        else:
+            dmp.dmp_step(
+                self.last_t, self.t,
+                self.last_y, self.last_yd, self.last_ydd,
+                self.y, self.yd, self.ydd,
+                self.g, self.gd, self.gdd,
+                self.x0, self.x0d, self.x0dd,
+                self.execution_time, 0.0,
+                self.weights,
+                self.widths,
+                self.centers,
+                self.alpha_y, self.beta_y, self.alpha_z,
+                0.001
+            )
 
         if self.t == self.last_t:
             self.last_t = -1.0
         else:
             self.last_t = self.t
             self.t += self.dt
+            self.step_idx += 1
 
     def can_step(self):
         """Returns if step() can be called again.
@@ -269,6 +718,49 @@ class DMPBehavior(BlackBoxBehavior):
         """
         return self.t <= self.execution_time
 
+    def is_open_loop(self):
+        """Returns if the outputs can be generated without inputs.
+
+        Returns
+        -------
+        open_loop : bool
+            Always true, the DMP only uses the initial state if the desired
+            states are reached
+        """
+        return True
+
+    def get_output_trajectory(self):
+        """Get outputs of all steps after reset in open loop.
+
+        All steps will be computed in one call to the DMP module. Like
+        :func:`step`, the start state is repeated in the first two steps.
+
+        Returns
+        -------
+        outputs : array, shape (n_steps, 3 * n_task_dims)
+            Positions, velocities and accelerations of each step, each type
+            is stored contiguously
+        """
+        T = _cached_activation_table(self)[0]
+        outputs = np.empty((len(T) + 1, 3 * self.n_task_dims))
+        if self.n_task_dims == 0:
+            return outputs
+
+        shape = (1, len(T), self.n_task_dims)
+        Y = np.empty(shape)
+        Yd = np.empty(shape)
+        Ydd = np.empty(shape)
+        dmp.dmp_trajectories(
+            T, self.g, self.gd, self.gdd, self.x0, self.x0d, self.x0dd,
+            self.execution_time, 0.0, self.weights[np.newaxis], self.widths,
+            self.centers, Y, Yd, Ydd, self.alpha_y, self.beta_y, self.alpha_z,
+            0.001)
+        outputs[1:, :self.n_task_dims] = Y[0]
+        outputs[1:, self.n_task_dims:-self.n_task_dims] = Yd[0]
+        outputs[1:, -self.n_task_dims:] = Ydd[0]
+        outputs[0] = outputs[1]
+        return outputs
+
     def get_n_params(self):
         """Get number of weights.
 
@@ -314,11 +806,16 @@ class DMPBehavior(BlackBoxBehavior):
 
         self.last_t = 0.0
         self.t = 0.0
+        self.step_idx = 0
 
     def imitate(self, X, Xd=None, Xdd=None, alpha=0.0,
                 allow_final_velocity=True):
         """Learn weights of the DMP from demonstrations.
 
+        Multiple demonstrations will be represented by one weight matrix that
+        is fitted to all of them with one ridge regression. Use
+        :func:`imitate_batch` to learn one weight matrix per demonstration.
+
         Parameters
         ----------
         X : array, shape (n_task_dims, n_steps, n_demos)
@@ -338,18 +835,59 @@ class DMPBehavior(BlackBoxBehavior):
         allow_final_velocity : bool, optional (default: True)
             Allow the final velocity to be greater than 0
         """
-        if X.shape[2] > 1:
-            warnings.warn("Imitation only accepts one demonstration.")
         if Xd is not None:
             warnings.warn("Xd is deprecated")
         if Xdd is not None:
             warnings.warn("Xdd is deprecated")
 
-        X = X[:, :, 0].T.copy()
-        dmp.imitate(np.arange(0, self.execution_time + self.dt, self.dt),
-                    X, self.weights, self.widths, self.centers,
-                    alpha, self.alpha_y, self.beta_y, self.alpha_z,
-                    allow_final_velocity)
+        T = np.arange(0, self.execution_time + self.dt, self.dt)
+        if X.shape[2] == 1:
+            dmp.imitate(T, X[:, :, 0].T.copy(), self.weights, self.widths,
+                        self.centers, alpha, self.alpha_y, self.beta_y,
+                        self.alpha_z, allow_final_velocity)
+        else:
+            dmp.imitate_batch(
+                T, np.ascontiguousarray(X.transpose(2, 1, 0),
+                                        dtype=np.float64),
+                self.weights[np.newaxis], self.widths, self.centers, alpha,
+                self.alpha_y, self.beta_y, self.alpha_z, allow_final_velocity)
+
+    def imitate_batch(self, X, alpha=0.0, allow_final_velocity=True):
+        """Learn weights of one DMP for each demonstration.
+
+        The DMPs share all parameters except for the weights, which will not
+        be modified. The design matrix of the RBFs is computed and factorized
+        only once, which is much faster than calling :func:`imitate` for each
+        demonstration, e.g. to build a library of movements.
+
+        Parameters
+        ----------
+        X : array, shape (n_task_dims, n_steps, n_demos)
+            The demonstrated trajectories to be imitated.
+
+        alpha : float >= 0, optional (default: 0)
+            The ridge parameter of linear regression.
+
+        allow_final_velocity : bool, optional (default: True)
+            Allow the final velocity to be greater than 0
+
+        Returns
+        -------
+        weights : array, shape (n_demos, n_features, n_task_dims)
+            Weight matrix of each demonstration, can be passed to
+            :func:`trajectories`
+        """
+        n_demos = X.shape[2]
+        weights = np.empty((n_demos, self.n_features, self.n_task_dims))
+        if n_demos == 0 or self.n_task_dims == 0:
+            return weights
+
+        T = np.arange(0, self.execution_time + self.dt, self.dt)
+        dmp.imitate_batch(
+            T, np.ascontiguousarray(X.transpose(2, 1, 0), dtype=np.float64),
+            weights, self.widths, self.centers, alpha, self.alpha_y,
+            self.beta_y, self.alpha_z, allow_final_velocity)
+        return weights
 
     def trajectory(self):
         """Generate trajectory represented by the DMP in open loop.
@@ -367,69 +905,78 @@ class DMPBehavior(BlackBoxBehavior):
         Xdd : array, shape (n_steps, n_task_dims)
             Accelerations
         """
-        last_t = 0.0
-        last_y = np.copy(self.x0)
-        last_yd = np.copy(self.x0d)
-        last_ydd = np.copy(self.x0dd)
-
-        y = np.empty(self.n_task_dims)
-        yd = np.empty(self.n_task_dims)
-        ydd = np.empty(self.n_task_dims)
-
-        Y = []
-        Yd = []
-        Ydd = []
-        for t in np.arange(0, self.execution_time + self.dt, self.dt):
-            dmp.dmp_step(
-                last_t, t,
-                last_y, last_yd, last_ydd,
-                y, yd, ydd,
-                self.g, self.gd, self.gdd,
-                self.x0, self.x0d, self.x0dd,
-                self.execution_time, 0.0,
-                self.weights,
-                self.widths,
-                self.centers,
-                self.alpha_y, self.beta_y, self.alpha_z,
-                0.001
-            )
-            last_t = t
-            last_y[:] = y
-            last_yd[:] = yd
-            last_ydd[:] = ydd
-            Y.append(y.copy())
-            Yd.append(yd.copy())
-            Ydd.append(ydd.copy())
+        Y, Yd, Ydd = self.trajectories(self.weights[np.newaxis])
+        return Y[0], Yd[0], Ydd[0]
+
+    def trajectories(self, weights_batch):
+        """Generate trajectories for multiple weight matrices in open loop.
+
+        All trajectories will be computed in one call to the DMP module, which
+        is much faster than calling :func:`trajectory` for each weight
+        matrix, e.g. to evaluate a whole population of an optimizer.
+
+        Parameters
+        ----------
+        weights_batch : array-like, shape (n_samples, n_features, n_task_dims)
+            Weight matrices, each row can also be flattened to a parameter
+            vector of shape (n_params,)
+
+        Returns
+        -------
+        X : array, shape (n_samples, n_steps, n_task_dims)
+            Positions
 
-        return np.asarray(Y), np.asarray(Yd), np.asarray(Ydd)
+        Xd : array, shape (n_samples, n_steps, n_task_dims)
+            Velocities
+
+        Xdd : array, shape (n_samples, n_steps, n_task_dims)
+            Accelerations
+        """
+        weights_batch = np.asarray(weights_batch, dtype=np.float64)
+        n_samples = weights_batch.shape[0]
+        weights_batch = np.ascontiguousarray(weights_batch.reshape(
+            n_samples, self.n_features, self.n_task_dims))
+
+        T = np.arange(0, self.execution_time + self.dt, self.dt)
+        shape = (n_samples, len(T), self.n_task_dims)
+        Y = np.empty(shape)
+        Yd = np.empty(shape)
+        Ydd = np.empty(shape)
+        if n_samples == 0 or self.n_task_dims == 0:
+            return Y, Yd, Ydd
+
+        dmp.dmp_trajectories(
+            T, self.g, self.gd, self.gdd, self.x0, self.x0d, self.x0dd,
+            self.execution_time, 0.0, weights_batch, self.widths,
+            self.centers, Y, Yd, Ydd, self.alpha_y, self.beta_y, self.alpha_z,
+            0.001)
+        return Y, Yd, Ydd
 
     save = save_dmp_model
 
-    def save_config(self, filename):
+    def save_config(self, filename, binary=None):
         """Save DMP configuration.
 
         Parameters
         ----------
         filename : string
-            Name of YAML file
+            Name of YAML file or binary file
+
+        binary : bool, optional (default: None)
+            Write the binary format, by default it will be used if the
+            extension of the file is '.bdmp'
         """
         config = {}
         config["name"] = self.name
         config["dmp_execution_time"] = self.execution_time
-        config["dmp_startPosition"] = self.x0.tolist()
-        config["dmp_startVelocity"] = self.x0d.tolist()
-        config["dmp_startAcceleration"] = self.x0dd.tolist()
-        config["dmp_endPosition"] = self.g.tolist()
-        config["dmp_endVelocity"] = self.gd.tolist()
-        config["dmp_endAcceleration"] = self.gdd.tolist()
-
-        config_content = StringIO.StringIO()
-        yaml.dump(config, config_content)
-        with open(filename, "w") as f:
-            f.write("---\n")
-            f.write(config_content.getvalue())
-            f.write("...\n")
-        config_content.close()
+        config["dmp_startPosition"] = self.x0
+        config["dmp_startVelocity"] = self.x0d
+        config["dmp_startAcceleration"] = self.x0dd
+        config["dmp_endPosition"] = self.g
+        config["dmp_endVelocity"] = self.gd
+        config["dmp_endAcceleration"] = self.gdd
+
+        write_dmp_config(config, filename, binary)
 
     def load_config(self, filename):
         """Load DMP configuration.
@@ -437,9 +984,9 @@ class DMPBehavior(BlackBoxBehavior):
         Parameters
         ----------
         filename : string
-            Name of YAML file
+            Name of YAML file or binary file
         """
-        config = yaml.load(open(filename, "r"))
+        config = read_dmp_config(filename)
         self.execution_time = config["dmp_execution_time"]
         self.x0 = np.array(config["dmp_startPosition"], dtype=np.float)
         self.x0d = np.array(config["dmp_startVelocity"], dtype=np.float)
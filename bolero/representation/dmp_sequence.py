@@ -2,6 +2,7 @@
 
 import numpy as np
 from .behavior import BlackBoxBehavior
+from .dmp_behavior import step_times, activation_table
 import dmp
 
 
@@ -11,6 +12,11 @@ class DMPSequence(BlackBoxBehavior):
     Each DMP is initialized at the last phase of its predecessor to ensure
     smooth transitions.
 
+    The start and end times of the DMPs are cached together with the
+    activations of the RBFs of each step and the current DMP is tracked
+    during the execution, hence, a step of a sequence costs as much as a step
+    of a single DMP.
+
     Parameters
     ----------
     n_dmps : int, optional (default: 1)
@@ -113,6 +119,8 @@ class DMPSequence(BlackBoxBehavior):
         self.x0 = None
         self.g = None
 
+        self.zeros_ = np.zeros(self.n_task_dims)
+        self.activations_key_ = None
         self.reset()
 
     def set_meta_parameters(self, keys, meta_parameters):
@@ -171,35 +179,101 @@ class DMPSequence(BlackBoxBehavior):
         if self.n_task_dims == 0:
             return
 
-        dmp_idx = np.where(self.steps <= self.split_steps)[0][0]
-
-        dmp.dmp_step(
-            self.last_t, self.t,
-            self.last_y, self.last_yd, self.last_ydd,
-            self.y, self.yd, self.ydd,
-            self.subgoals[dmp_idx + 1],
-            self.subgoal_velocities[dmp_idx + 1],
-            np.zeros(self.n_task_dims),
-            self.subgoals[dmp_idx],
-            self.subgoal_velocities[dmp_idx],
-            np.zeros(self.n_task_dims),
-            np.sum(self.execution_times[:dmp_idx + 1]),
-            np.sum(self.execution_times[:dmp_idx]),
-            self.weights[dmp_idx],
-            self.widths[dmp_idx],
-            self.centers[dmp_idx],
-            self.alpha_y, self.beta_y, self.alpha_z[dmp_idx],
-            0.001
-        )
+        # step() is called with steps == i + 1 in step i, additional steps
+        # will be executed with the last DMP
+        while (self.dmp_idx < self.n_dmps - 1 and
+               self.split_steps[self.dmp_idx] < self.steps):
+            self.dmp_idx += 1
+        dmp_idx = self.dmp_idx
+
+        T, tables = self._activation_tables()
+        offset, phases, activations = tables[dmp_idx]
+        i = self.step_idx
+        if (0 < i - offset < len(phases) and T[i - 1] == self.last_t and
+                T[i] == self.t):
+            dmp.dmp_step_precomputed(
+                self.last_t, self.t,
+                self.last_y, self.last_yd, self.last_ydd,
+                self.y, self.yd, self.ydd,
+                self.subgoals[dmp_idx + 1],
+                self.subgoal_velocities[dmp_idx + 1],
+                self.zeros_,
+                self.subgoals[dmp_idx],
+                self.subgoal_velocities[dmp_idx],
+                self.zeros_,
+                self.goal_times_[dmp_idx],
+                self.start_times_[dmp_idx],
+                self.weights[dmp_idx],
+                phases[i - offset],
+                activations[i - offset],
+                self.alpha_y, self.beta_y,
+                0.001
+            )
+        else:
+            dmp.dmp_step(
+                self.last_t, self.t,
+                self.last_y, self.last_yd, self.last_ydd,
+                self.y, self.yd, self.ydd,
+                self.subgoals[dmp_idx + 1],
+                self.subgoal_velocities[dmp_idx + 1],
+                self.zeros_,
+                self.subgoals[dmp_idx],
+                self.subgoal_velocities[dmp_idx],
+                self.zeros_,
+                self.goal_times_[dmp_idx],
+                self.start_times_[dmp_idx],
+                self.weights[dmp_idx],
+                self.widths[dmp_idx],
+                self.centers[dmp_idx],
+                self.alpha_y, self.beta_y, self.alpha_z[dmp_idx],
+                0.001
+            )
 
         if self.t == self.last_t:
             self.last_t = -1.0
         else:
             self.last_t = self.t
             self.t += self.dt
+            self.step_idx += 1
 
         self.steps += 1
 
+    def _activation_tables(self):
+        """Get phases and RBF activations of each step for each DMP (cached).
+
+        The table of a DMP only contains the steps in which it will be
+        executed. Step i of the sequence corresponds to row i - offset.
+        The start and end times of the DMPs will be updated as well.
+        """
+        key = (float(self.dt), self.execution_times.tobytes(),
+               tuple(self.alpha_z))
+        if getattr(self, "activations_key_", None) != key:
+            self.start_times_ = np.array(
+                [np.sum(self.execution_times[:dmp_idx])
+                 for dmp_idx in range(self.n_dmps)])
+            self.goal_times_ = np.array(
+                [np.sum(self.execution_times[:dmp_idx + 1])
+                 for dmp_idx in range(self.n_dmps)])
+            T = step_times(self.dt, np.sum(self.execution_times))
+            tables = []
+            for dmp_idx in range(self.n_dmps):
+                # step() is called with steps == i + 1 in step i
+                first_step = self.split_steps[dmp_idx - 1] if dmp_idx > 0 else 1
+                last_step = self.split_steps[dmp_idx] - 1
+                offset = max(first_step - 1, 0)
+                T_dmp = T[offset:last_step + 1]
+                if len(T_dmp) < 2:
+                    tables.append((offset, np.empty((0, 0)), None))
+                    continue
+                phases, activations = activation_table(
+                    T_dmp, self.widths[dmp_idx], self.centers[dmp_idx],
+                    self.goal_times_[dmp_idx], self.start_times_[dmp_idx],
+                    self.alpha_z[dmp_idx])
+                tables.append((offset, phases, activations))
+            self.activations_ = (T, tables)
+            self.activations_key_ = key
+        return self.activations_
+
     def get_n_params(self):
         """Get number of parameters."""
         n_params = self.n_weights + (self.n_dmps - 1) * self.n_task_dims
@@ -219,21 +293,30 @@ class DMPSequence(BlackBoxBehavior):
 
     def set_params(self, params):
         """Utility function: set currently optimizable parameters."""
+        self.weights, self.subgoals, self.subgoal_velocities = \
+            self._split_params(params)
+
+    def _split_params(self, params):
+        """Get weights, subgoals and subgoal velocities from parameters."""
         weights, goals, goal_vels = np.split(params, (self.n_weights,
             self.n_weights + (self.n_dmps - 1) * self.n_task_dims))
         G = np.split(goals, [i * self.n_task_dims
                              for i in range(1, self.n_dmps - 1)])
-        self.weights = [w.reshape(self.n_weights_per_dmp[i], self.n_task_dims)
-                        for i, w in enumerate(np.split(
-                            weights, self.split_weights * self.n_task_dims)[
-                                :self.n_dmps])]
+        weights = [w.reshape(self.n_weights_per_dmp[i], self.n_task_dims)
+                   for i, w in enumerate(np.split(
+                       weights, self.split_weights * self.n_task_dims)[
+                           :self.n_dmps])]
 
+        subgoals = list(self.subgoals)
         for i in range(self.n_dmps - 1):
-            self.subgoals[i + 1] = G[i]
+            subgoals[i + 1] = G[i]
         if self.learn_goal_velocities:
-            self.subgoal_velocities = np.split(
+            subgoal_velocities = np.split(
                 goal_vels, [i * self.n_task_dims
                             for i in xrange(1, self.n_dmps+1)])
+        else:
+            subgoal_velocities = self.subgoal_velocities
+        return weights, subgoals, subgoal_velocities
 
     def set_subgoal(self, idx, subgoal):
         """Set subgoal manually.
@@ -317,10 +400,12 @@ class DMPSequence(BlackBoxBehavior):
         self.last_t = 0.0
         self.t = 0.0
         self.steps = 0
+        self.step_idx = 0
+        self.dmp_idx = 0
 
     def can_step(self):
         """Returns true if step() can be called again, false otherwise."""
-        return len(np.where(self.steps <= self.split_steps)[0]) > 0
+        return self.steps <= self.split_steps[-1]
 
     def trajectory(self):
         """Generate trajectory represented by the sequence of DMPs in open loop.
@@ -338,50 +423,143 @@ class DMPSequence(BlackBoxBehavior):
         Xdd : array, shape (n_steps, n_task_dims)
             Accelerations
         """
-        last_t = 0.0
-        last_y = np.copy(self.subgoals[0])
-        last_yd = np.copy(self.subgoal_velocities[0])
-        last_ydd = np.zeros(self.n_task_dims)
+        if self.n_task_dims == 0:
+            n_steps = int(sum(self.execution_times) / self.dt) + 1
+            return (np.empty((n_steps, 0)), np.empty((n_steps, 0)),
+                    np.empty((n_steps, 0)))
 
-        y = np.empty(self.n_task_dims)
-        yd = np.empty(self.n_task_dims)
-        ydd = np.empty(self.n_task_dims)
+        weights = [w[np.newaxis] for w in self.weights]
+        subgoals = np.asarray(self.subgoals, dtype=np.float64)[:, np.newaxis]
+        subgoal_velocities = np.asarray(
+            self.subgoal_velocities, dtype=np.float64)[:, np.newaxis]
+        Y, Yd, Ydd = self._rollouts(weights, subgoals, subgoal_velocities)
+        return Y[0], Yd[0], Ydd[0]
 
-        n_steps = int(sum(self.execution_times) / self.dt) + 1
-        Y = np.empty([n_steps, self.n_task_dims])
-        Yd = np.empty([n_steps, self.n_task_dims])
-        Ydd = np.empty([n_steps, self.n_task_dims])
+    def trajectories(self, params_batch):
+        """Generate trajectories for multiple parameter vectors in open loop.
 
-        steps = 0
-        for t in np.arange(0, sum(self.execution_times) + self.dt, self.dt):
-            dmp_idx = np.where(steps <= self.split_steps)[0][0]
+        The DMPs of the sequence are executed one after another and each DMP
+        is executed for all parameter vectors in one call to the C++
+        implementation. The last states of a DMP are the initial states of its
+        successor. The parameters of the sequence will not be modified.
 
-            dmp.dmp_step(
-                last_t, t,
-                last_y, last_yd, last_ydd,
-                y, yd, ydd,
-                self.subgoals[dmp_idx + 1],
-                self.subgoal_velocities[dmp_idx + 1],
-                np.zeros(self.n_task_dims),
-                self.subgoals[dmp_idx],
-                self.subgoal_velocities[dmp_idx],
-                np.zeros(self.n_task_dims),
-                np.sum(self.execution_times[:dmp_idx + 1]),
-                np.sum(self.execution_times[:dmp_idx]),
-                self.weights[dmp_idx],
-                self.widths[dmp_idx],
-                self.centers[dmp_idx],
-                self.alpha_y, self.beta_y, self.alpha_z[dmp_idx],
-                0.001
-            )
+        Parameters
+        ----------
+        params_batch : array-like, shape (n_samples, n_params)
+            Parameter vectors, see :func:`set_params`
 
-            last_t = t
-            last_y[:] = y
-            last_yd[:] = yd
-            last_ydd[:] = ydd
-            Y[steps, :] = y.copy()
-            Yd[steps, :] = yd.copy()
-            Ydd[steps, :] = ydd.copy()
-            steps += 1
+        Returns
+        -------
+        X : array, shape (n_samples, n_steps, n_task_dims)
+            Positions
+
+        Xd : array, shape (n_samples, n_steps, n_task_dims)
+            Velocities
+
+        Xdd : array, shape (n_samples, n_steps, n_task_dims)
+            Accelerations
+        """
+        params_batch = np.asarray(params_batch, dtype=np.float64)
+        n_samples = params_batch.shape[0]
+        if self.n_task_dims == 0:
+            n_steps = int(sum(self.execution_times) / self.dt) + 1
+            shape = (n_samples, n_steps, 0)
+            return np.empty(shape), np.empty(shape), np.empty(shape)
+
+        # Same layout as in _split_params, subgoals and their velocities
+        # are stored per DMP so that each one is contiguous
+        weights = np.split(params_batch[:, :self.n_weights],
+                           self.split_weights * self.n_task_dims, axis=1)
+        weights = [w.reshape(n_samples, self.n_weights_per_dmp[i],
+                             self.n_task_dims)
+                   for i, w in enumerate(weights[:self.n_dmps])]
+        split_goals = self.n_weights + (self.n_dmps - 1) * self.n_task_dims
+        subgoals = np.empty((self.n_dmps + 1, n_samples, self.n_task_dims))
+        subgoals[:] = np.asarray(self.subgoals)[:, np.newaxis]
+        subgoals[1:-1] = np.rollaxis(
+            params_batch[:, self.n_weights:split_goals].reshape(
+                n_samples, self.n_dmps - 1, self.n_task_dims), 1)
+        subgoal_velocities = np.empty_like(subgoals)
+        if self.learn_goal_velocities:
+            subgoal_velocities[:] = np.rollaxis(
+                params_batch[:, split_goals:].reshape(
+                    n_samples, self.n_dmps + 1, self.n_task_dims), 1)
+        else:
+            subgoal_velocities[:] = np.asarray(
+                self.subgoal_velocities)[:, np.newaxis]
+        return self._rollouts(weights, subgoals, subgoal_velocities)
 
+    def _rollouts(self, weights, subgoals, subgoal_velocities):
+        """Execute the sequence in open loop for multiple samples.
+
+        Step i is executed at i * dt. In contrast to step(), the times are
+        not accumulated so that the steps at the end of the DMPs coincide
+        with their goal times.
+
+        Parameters
+        ----------
+        weights : list of arrays, shape (n_samples, n_weights, n_task_dims)
+            Weights of each DMP for each sample
+
+        subgoals : array, shape (n_dmps + 1, n_samples, n_task_dims)
+            Subgoals of each sample
+
+        subgoal_velocities : array, shape (n_dmps + 1, n_samples, n_task_dims)
+            Velocities at the subgoals of each sample
+
+        Returns
+        -------
+        X : array, shape (n_samples, n_steps, n_task_dims)
+            Positions
+
+        Xd : array, shape (n_samples, n_steps, n_task_dims)
+            Velocities
+
+        Xdd : array, shape (n_samples, n_steps, n_task_dims)
+            Accelerations
+        """
+        n_samples = subgoals.shape[1]
+        n_steps = int(sum(self.execution_times) / self.dt) + 1
+        shape = (n_samples, n_steps, self.n_task_dims)
+        Y = np.empty(shape)
+        Yd = np.empty(shape)
+        Ydd = np.empty(shape)
+        zeros = np.zeros((n_samples, self.n_task_dims))
+        T = np.arange(n_steps) * self.dt
+        self._activation_tables()
+
+        Y[:, 0] = subgoals[0]
+        Yd[:, 0] = subgoal_velocities[0]
+        Ydd[:, 0] = 0.0
+        for dmp_idx in range(self.n_dmps):
+            first = self.split_steps[dmp_idx - 1] if dmp_idx > 0 else 0
+            if dmp_idx < self.n_dmps - 1:
+                last = min(self.split_steps[dmp_idx], n_steps - 1)
+            else:
+                last = n_steps - 1
+            if first >= last:
+                continue
+            # The kernel integrates from the first step of each DMP which
+            # is the last step of its predecessor
+            segment_shape = (n_samples, last - first + 1, self.n_task_dims)
+            Y_dmp = np.empty(segment_shape)
+            Yd_dmp = np.empty(segment_shape)
+            Ydd_dmp = np.empty(segment_shape)
+            Y_dmp[:, 0] = Y[:, first]
+            Yd_dmp[:, 0] = Yd[:, first]
+            Ydd_dmp[:, 0] = Ydd[:, first]
+            dmp.dmp_segment_trajectories(
+                T[first:last + 1],
+                np.ascontiguousarray(subgoals[dmp_idx + 1]),
+                np.ascontiguousarray(subgoal_velocities[dmp_idx + 1]), zeros,
+                np.ascontiguousarray(subgoals[dmp_idx]),
+                np.ascontiguousarray(subgoal_velocities[dmp_idx]), zeros,
+                self.goal_times_[dmp_idx], self.start_times_[dmp_idx],
+                np.ascontiguousarray(weights[dmp_idx]),
+                self.widths[dmp_idx], self.centers[dmp_idx],
+                Y_dmp, Yd_dmp, Ydd_dmp,
+                self.alpha_y, self.beta_y, self.alpha_z[dmp_idx], 0.001)
+            Y[:, first + 1:last + 1] = Y_dmp[:, 1:]
+            Yd[:, first + 1:last + 1] = Yd_dmp[:, 1:]
+            Ydd[:, first + 1:last + 1] = Ydd_dmp[:, 1:]
         return Y, Yd, Ydd
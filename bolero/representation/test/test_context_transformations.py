@@ -69,3 +69,12 @@ def test_polynomial():
     context = np.array([3.0, 2.0])
     assert_array_equal(quadratic(context), polynomial(context, n_degrees=2))
     assert_array_equal(cubic(context), polynomial(context, n_degrees=3))
+
+
+def test_batch():
+    contexts = np.random.RandomState(0).randn(10, 3)
+    for transformation in [constant, linear, affine, quadratic, cubic]:
+        features = transformation(contexts)
+        assert_equal(features.shape[0], 10)
+        assert_array_equal(
+            features, [transformation(context) for context in contexts])
@@ -6,7 +6,8 @@ except ImportError:
     from nose import SkipTest
     raise SkipTest("dmp is not installed")
 from bolero.datasets import make_minimum_jerk
-from nose.tools import assert_equal, assert_raises_regexp
+from nose.tools import (assert_equal, assert_almost_equal,
+                        assert_raises_regexp, assert_true, assert_false)
 from numpy.testing import assert_array_equal, assert_array_almost_equal
 
 
@@ -154,6 +155,51 @@ def test_csdmp_change_weights():
     assert_array_almost_equal(x, zeroq, decimal=3)
 
 
+def test_csdmp_trajectories():
+    beh = CartesianDMPBehavior(execution_time=1.0, dt=0.01, n_features=10)
+    beh.init(7, 7)
+    q0 = np.array([1.0, 2.0, 3.0, 4.0])
+    q0 /= np.linalg.norm(q0)
+    beh.set_meta_parameters(["x0", "g", "q0"],
+                            [np.zeros(3), np.ones(3), q0])
+
+    random_state = np.random.RandomState(0)
+    weights_batch = 100.0 * random_state.randn(4, 10, 6)
+    X = beh.trajectories(weights_batch)
+    assert_equal(X.shape, (4, 101, 7))
+    assert_array_almost_equal(X[:, 0], np.tile(np.hstack((np.zeros(3), q0)),
+                                               (4, 1)))
+
+    for i, weights in enumerate(weights_batch):
+        beh.set_params(weights.ravel())
+        assert_array_equal(beh.trajectory(), X[i])
+    assert_array_equal(
+        beh.trajectories(weights_batch.reshape(4, -1)), X)
+
+
+def test_csdmp_activation_table_cached():
+    beh = CartesianDMPBehavior()
+    beh.init(7, 7)
+
+    x = np.copy(zeroq)
+    beh.reset()
+    while beh.can_step():
+        eval_loop(beh, x)
+    activations = beh.activations_
+
+    beh.reset()
+    while beh.can_step():
+        eval_loop(beh, x)
+    assert_true(beh.activations_ is activations)
+
+    beh.set_meta_parameters(["execution_time"], [2.0])
+    beh.reset()
+    while beh.can_step():
+        eval_loop(beh, x)
+    assert_false(beh.activations_ is activations)
+    assert_almost_equal(beh.activations_[0][-1], 2.0, delta=0.011)
+
+
 def test_csdmp_set_meta_params_before_init():
     beh = CartesianDMPBehavior()
 
@@ -269,3 +315,30 @@ def test_csdmp_save_and_load():
     assert_array_almost_equal(x, np.hstack((g, qg)), decimal=2)
     assert_equal(t, 854)
     assert_equal(beh_loaded.get_n_params(), 6 * 10)
+
+
+def test_csdmp_save_and_load_binary():
+    beh_original = CartesianDMPBehavior(
+        execution_time=0.853, dt=0.001, n_features=10)
+    beh_original.init(7, 7)
+    q0 = np.array([1.23, 2.33, 8.32, 9.29])
+    q0 /= np.linalg.norm(q0)
+    beh_original.set_meta_parameters(
+        ["x0", "q0", "g"], [np.ones(3), q0, np.zeros(3)])
+    beh_original.set_params(np.random.RandomState(0).randn(60))
+
+    try:
+        beh_original.save("csdmp_tmp.bdmp")
+        beh_original.save_config("tmp_csdmp_config.bdmp")
+
+        beh_loaded = CartesianDMPBehavior(configuration_file="csdmp_tmp.bdmp")
+        beh_loaded.init(7, 7)
+        beh_loaded.load_config("tmp_csdmp_config.bdmp")
+    finally:
+        for filename in ["csdmp_tmp.bdmp", "tmp_csdmp_config.bdmp"]:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    assert_array_equal(beh_loaded.get_params(), beh_original.get_params())
+    assert_array_equal(beh_loaded.q0, beh_original.q0)
+    assert_array_equal(beh_loaded.trajectory(), beh_original.trajectory())
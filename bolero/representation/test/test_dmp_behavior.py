@@ -2,11 +2,14 @@ import os
 import numpy as np
 try:
     from bolero.representation import DMPBehavior
+    from bolero.representation.dmp_behavior import (
+        is_binary_dmp_file, read_dmp_model, convert_dmp_model)
 except ImportError:
     from nose import SkipTest
     raise SkipTest("dmp is not installed")
 from bolero.datasets import make_minimum_jerk
-from nose.tools import assert_equal, assert_raises_regexp
+from nose.tools import (assert_equal, assert_almost_equal,
+                        assert_raises_regexp, assert_true, assert_false)
 from numpy.testing import assert_array_equal, assert_array_almost_equal
 
 
@@ -262,6 +265,56 @@ def test_dmp_imitate_2d():
     assert_array_almost_equal(X2, X, decimal=3)
 
 
+def test_dmp_imitate_multiple_demonstrations():
+    x0, g, execution_time, dt = np.zeros(2), np.ones(2), 1.0, 0.001
+
+    beh = DMPBehavior(execution_time, dt, 20)
+    beh.init(6, 6)
+    beh.set_meta_parameters(["x0", "g"], [x0, g])
+
+    X_demo = make_minimum_jerk(x0, g, execution_time, dt)[0]
+    T = np.linspace(0, 1, X_demo.shape[1])
+    offset = 0.05 * np.sin(2 * np.pi * T)
+    X_demos = np.concatenate((X_demo + offset[np.newaxis, :, np.newaxis],
+                              X_demo - offset[np.newaxis, :, np.newaxis]),
+                             axis=2)
+
+    beh.imitate(X_demos)
+    X = beh.trajectory()[0]
+    assert_array_almost_equal(X_demo.T[0], X, decimal=2)
+
+    # Without regularization this is equivalent to imitating the mean
+    weights = beh.get_params().copy()
+    beh.imitate(X_demos.mean(axis=2)[:, :, np.newaxis])
+    assert_array_almost_equal(beh.get_params(), weights)
+
+
+def test_dmp_imitate_batch():
+    x0, g, execution_time, dt = np.zeros(2), np.ones(2), 1.0, 0.001
+
+    beh = DMPBehavior(execution_time, dt, 20)
+    beh.init(6, 6)
+    beh.set_meta_parameters(["x0", "g"], [x0, g])
+
+    X_demo = make_minimum_jerk(x0, g, execution_time, dt)[0]
+    T = np.linspace(0, 1, X_demo.shape[1])
+    X_demos = np.concatenate(
+        [X_demo + a * np.sin(np.pi * T)[np.newaxis, :, np.newaxis]
+         for a in [0.0, 0.1, 0.2]], axis=2)
+
+    weights_before = beh.get_params().copy()
+    weights = beh.imitate_batch(X_demos, alpha=1.0)
+    assert_equal(weights.shape, (3, 20, 2))
+    assert_array_equal(beh.get_params(), weights_before)
+
+    for d in range(3):
+        beh.imitate(X_demos[:, :, d:d + 1], alpha=1.0)
+        assert_array_almost_equal(weights[d].ravel(), beh.get_params())
+
+    X = beh.trajectories(weights)[0]
+    assert_array_almost_equal(X[0], X_demo.T[0], decimal=3)
+
+
 def test_dmp_save_and_load():
     beh_original = DMPBehavior(execution_time=0.853, dt=0.001, n_features=10)
     beh_original.init(3 * n_task_dims, 3 * n_task_dims)
@@ -310,3 +363,147 @@ def test_dmp_save_and_load():
     assert_array_almost_equal(xva[:n_task_dims], g, decimal=3)
     assert_equal(t, 854)
     assert_equal(beh_loaded.get_n_params(), n_task_dims * 10)
+
+
+def test_dmp_save_and_load_binary():
+    beh_original = DMPBehavior(execution_time=0.853, dt=0.001, n_features=10)
+    beh_original.init(6, 6)
+    beh_original.set_meta_parameters(["x0", "g"], [np.ones(2), np.zeros(2)])
+    beh_original.set_params(np.random.RandomState(0).randn(20))
+
+    try:
+        beh_original.save("tmp_dmp_model.bdmp")
+        beh_original.save_config("tmp_dmp_config.bdmp")
+        assert_true(is_binary_dmp_file("tmp_dmp_model.bdmp"))
+        assert_true(is_binary_dmp_file("tmp_dmp_config.bdmp"))
+
+        beh_loaded = DMPBehavior(configuration_file="tmp_dmp_model.bdmp",
+                                 mmap_mode="c")
+        beh_loaded.init(6, 6)
+        beh_loaded.load_config("tmp_dmp_config.bdmp")
+        assert_equal(beh_loaded.name, beh_original.name)
+        assert_array_equal(beh_loaded.get_params(),
+                           beh_original.get_params())
+        assert_array_equal(beh_loaded.trajectory()[0],
+                           beh_original.trajectory()[0])
+        beh_loaded.set_params(np.zeros(20))
+        del beh_loaded
+    finally:
+        for filename in ["tmp_dmp_model.bdmp", "tmp_dmp_config.bdmp"]:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+
+def test_dmp_convert_model():
+    try:
+        convert_dmp_model(DMP_CONFIG_FILE, "tmp_dmp_model.bdmp")
+        convert_dmp_model("tmp_dmp_model.bdmp", "tmp_dmp_model.yaml")
+        yaml_model = read_dmp_model(DMP_CONFIG_FILE)
+        binary_model = read_dmp_model("tmp_dmp_model.bdmp", mmap_mode="r")
+        converted_model = read_dmp_model("tmp_dmp_model.yaml")
+        for model in [binary_model, converted_model]:
+            assert_equal(sorted(model.keys()), sorted(yaml_model.keys()))
+            for key in yaml_model.keys():
+                if key == "name":
+                    assert_equal(model[key], yaml_model[key])
+                else:
+                    assert_array_equal(model[key], yaml_model[key])
+        del binary_model
+    finally:
+        for filename in ["tmp_dmp_model.bdmp", "tmp_dmp_model.yaml"]:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+
+def test_dmp_trajectories():
+    x0, g = np.zeros(2), np.ones(2)
+    beh = DMPBehavior(execution_time=1.0, dt=0.01, n_features=10)
+    beh.init(6, 6)
+    beh.set_meta_parameters(["x0", "g"], [x0, g])
+
+    random_state = np.random.RandomState(0)
+    weights_batch = 100.0 * random_state.randn(5, 10, 2)
+    X, Xd, Xdd = beh.trajectories(weights_batch)
+    assert_equal(X.shape, (5, 101, 2))
+    assert_equal(Xd.shape, (5, 101, 2))
+    assert_equal(Xdd.shape, (5, 101, 2))
+
+    assert_array_equal(X[:, 0], np.tile(x0, (5, 1)))
+    assert_array_almost_equal(X[:, -1], np.tile(g, (5, 1)), decimal=2)
+
+    for i, weights in enumerate(weights_batch):
+        beh.set_params(weights.ravel())
+        X_single, Xd_single, Xdd_single = beh.trajectory()
+        assert_array_equal(X_single, X[i])
+        assert_array_equal(Xd_single, Xd[i])
+        assert_array_equal(Xdd_single, Xdd[i])
+
+
+def test_dmp_trajectories_flat_params():
+    beh = DMPBehavior(execution_time=1.0, dt=0.01, n_features=10)
+    beh.init(3, 3)
+    beh.set_meta_parameters(["x0", "g"], [np.zeros(1), np.ones(1)])
+    params = np.random.RandomState(0).randn(3, 10)
+    X = beh.trajectories(params)[0]
+    assert_array_equal(X, beh.trajectories(params[:, :, np.newaxis])[0])
+
+
+def test_dmp_steps_match_trajectory():
+    beh = DMPBehavior(execution_time=1.0, dt=0.01, n_features=10)
+    beh.init(6, 6)
+    beh.set_meta_parameters(["x0", "g"], [np.zeros(2), np.ones(2)])
+    beh.set_params(100.0 * np.random.RandomState(0).randn(20))
+    X_open_loop = beh.trajectory()[0]
+
+    xva = np.zeros(6)
+    beh.reset()
+    X = []
+    while beh.can_step():
+        eval_loop(beh, xva)
+        X.append(xva[:2].copy())
+    # The first step is executed twice
+    assert_array_almost_equal(X[1:], X_open_loop[:-1], decimal=12)
+
+
+def test_dmp_output_trajectory_matches_steps():
+    beh = DMPBehavior(execution_time=1.0, dt=0.01, n_features=10)
+    beh.init(6, 6)
+    beh.set_meta_parameters(["x0", "g"], [np.zeros(2), np.ones(2)])
+    beh.set_params(100.0 * np.random.RandomState(0).randn(20))
+    assert_true(beh.is_open_loop())
+    outputs = beh.get_output_trajectory()
+
+    xva = np.zeros(6)
+    beh.reset()
+    X = []
+    while beh.can_step():
+        eval_loop(beh, xva)
+        X.append(xva.copy())
+    assert_array_almost_equal(outputs, X, decimal=12)
+
+
+def test_dmp_activation_table_cached():
+    beh = DMPBehavior()
+    beh.init(3 * n_task_dims, 3 * n_task_dims)
+
+    xva = np.zeros(3 * n_task_dims)
+    beh.reset()
+    while beh.can_step():
+        eval_loop(beh, xva)
+    activations = beh.activations_
+
+    beh.reset()
+    while beh.can_step():
+        eval_loop(beh, xva)
+    assert_true(beh.activations_ is activations)
+
+    beh.set_meta_parameters(["execution_time"], [2.0])
+    beh.reset()
+    while beh.can_step():
+        eval_loop(beh, xva)
+    assert_false(beh.activations_ is activations)
+    T, phases, activations = beh.activations_
+    assert_almost_equal(T[-1], 2.0, delta=0.011)
+    assert_equal(phases.shape[0], len(T))
+    assert_equal(activations.shape[0], len(T))
+    assert_equal(activations.shape[2], 50)
@@ -1,12 +1,14 @@
 import numpy as np
 try:
     from bolero.representation import DMPSequence
+    import dmp
 except ImportError:
     from nose import SkipTest
     raise SkipTest("dmp is not installed")
 from bolero.controller import Controller
 from numpy.testing import assert_array_almost_equal
-from nose.tools import assert_equal, assert_almost_equal, assert_raises_regexp
+from nose.tools import (assert_equal, assert_almost_equal,
+                        assert_raises_regexp, assert_true)
 
 
 def create_dmp_seq(n_task_dims=1):
@@ -163,6 +165,92 @@ def test_trajectory_generation():
     assert_almost_equal(traj[100, 0], subgoal, places=2)
 
 
+def test_trajectories_batch():
+    dmp_seq, _ = create_dmp_seq(n_task_dims=2)
+    params = dmp_seq.get_params()
+    random_state = np.random.RandomState(0)
+    params_batch = params + random_state.randn(4, len(params))
+
+    X, Xd, Xdd = dmp_seq.trajectories(params_batch)
+    assert_equal(X.shape, (4, 101, 2))
+    assert_array_almost_equal(dmp_seq.get_params(), params)
+
+    for i in range(len(params_batch)):
+        dmp_seq.set_params(params_batch[i])
+        X_single, Xd_single, Xdd_single = dmp_seq.trajectory()
+        assert_array_almost_equal(X_single, X[i], decimal=12)
+        assert_array_almost_equal(Xd_single, Xd[i], decimal=12)
+        assert_array_almost_equal(Xdd_single, Xdd[i], decimal=12)
+
+
+def test_trajectory_matches_dmp_steps():
+    dmp_seq = DMPSequence(2, [1.0, 1.0], 0.01, [5, 5],
+                          [[0.0, 0.0], [0.5, -0.5], [1.0, 1.0]],
+                          learn_goal_velocities=True)
+    dmp_seq.init(6, 6)
+    random_state = np.random.RandomState(0)
+    params = 10.0 * random_state.randn(dmp_seq.get_n_params())
+    dmp_seq.set_params(params)
+    X, Xd, Xdd = dmp_seq.trajectory()
+    X_batch, Xd_batch, Xdd_batch = dmp_seq.trajectories(params[np.newaxis])
+
+    # Open-loop rollout with one call to dmp_step per step at i * dt
+    zeros = np.zeros(2)
+    last_t = 0.0
+    last_y = np.copy(dmp_seq.subgoals[0])
+    last_yd = np.copy(dmp_seq.subgoal_velocities[0])
+    last_ydd = np.zeros(2)
+    y = np.empty(2)
+    yd = np.empty(2)
+    ydd = np.empty(2)
+    assert_equal(len(X), 201)
+    for i in range(len(X)):
+        t = i * 0.01
+        dmp_idx = 0 if i <= 100 else 1
+        dmp.dmp_step(
+            last_t, t, last_y, last_yd, last_ydd, y, yd, ydd,
+            dmp_seq.subgoals[dmp_idx + 1],
+            dmp_seq.subgoal_velocities[dmp_idx + 1], zeros,
+            dmp_seq.subgoals[dmp_idx],
+            dmp_seq.subgoal_velocities[dmp_idx], zeros,
+            dmp_idx + 1.0, float(dmp_idx), dmp_seq.weights[dmp_idx],
+            dmp_seq.widths[dmp_idx], dmp_seq.centers[dmp_idx],
+            dmp_seq.alpha_y, dmp_seq.beta_y, dmp_seq.alpha_z[dmp_idx], 0.001)
+        last_t = t
+        last_y[:] = y
+        last_yd[:] = yd
+        last_ydd[:] = ydd
+        assert_array_almost_equal(X[i], y, decimal=12)
+        assert_array_almost_equal(Xd[i], yd, decimal=12)
+        assert_array_almost_equal(Xdd[i], ydd, decimal=12)
+        assert_array_almost_equal(X_batch[0, i], y, decimal=12)
+        assert_array_almost_equal(Xd_batch[0, i], yd, decimal=12)
+        assert_array_almost_equal(Xdd_batch[0, i], ydd, decimal=12)
+
+
+def test_activation_tables_cover_all_steps():
+    dmp_seq, _ = create_dmp_seq(n_task_dims=1)
+    xva = np.zeros(3)
+    dmp_seq.reset()
+    n_steps = 0
+    while dmp_seq.can_step():
+        dmp_seq.set_inputs(xva)
+        dmp_seq.step()
+        dmp_seq.get_outputs(xva)
+        n_steps += 1
+    T, tables = dmp_seq.activations_
+    assert_equal(len(tables), 3)
+    assert_equal([offset for offset, _, _ in tables], [0, 19, 49])
+    # The first step of each table belongs to its predecessor and the first
+    # two steps of the sequence do not require any activations
+    assert_equal(sum(len(phases) - 1 for _, phases, _ in tables),
+                 n_steps - 2)
+
+    dmp_seq.reset()
+    dmp_seq.set_inputs(xva)
+    dmp_seq.step()
+    assert_true(dmp_seq.activations_[1] is tables)
+
 def test_set_params_with_subgoal_velocities():
     test_task_dims = range(1, 100, 1)
     for n_task_dims in test_task_dims:
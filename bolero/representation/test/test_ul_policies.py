@@ -5,7 +5,8 @@ from bolero.representation.ul_policies import (LinearGaussianPolicy,
                                                BoundedScalingPolicy)
 from bolero.representation.context_transformations import quadratic
 from numpy.testing import assert_array_almost_equal, assert_array_equal
-from nose.tools import assert_almost_equal, assert_raises_regexp, assert_greater
+from nose.tools import (assert_almost_equal, assert_raises_regexp,
+                        assert_greater, assert_equal)
 
 
 def test_linear_gaussian():
@@ -31,6 +32,37 @@ def test_linear_gaussian():
     assert_almost_equal(np.std(Y_sampled), 1.0, places=1)
 
 
+def test_linear_gaussian_weighted_fit():
+    random_state = np.random.RandomState(0)
+    n_samples, n_context_dims, n_params = 30, 4, 6
+    X = random_state.randn(n_samples, n_context_dims)
+    Y = random_state.randn(n_samples, n_params)
+    weights = random_state.rand(n_samples)
+
+    ulp = LinearGaussianPolicy(n_params, n_context_dims, gamma=0.1)
+    ulp.W = random_state.randn(n_params, n_context_dims)
+    residuals = Y - X.dot(ulp.W.T)
+    D = np.diag(weights)
+    Z = (weights.sum() ** 2 - (weights ** 2).sum()) / weights.sum()
+    Sigma = residuals.T.dot(D).dot(residuals) / Z
+    W = np.linalg.pinv(X.T.dot(D).dot(X) + 0.1 * np.eye(n_context_dims)).dot(
+        X.T).dot(D).dot(Y).T
+
+    ulp.fit(X, Y, weights)
+    assert_array_almost_equal(ulp.Sigma, Sigma)
+    assert_array_equal(ulp.Sigma, ulp.Sigma.T)
+    assert_array_almost_equal(ulp.W, W)
+
+
+def test_linear_gaussian_fit_singular():
+    random_state = np.random.RandomState(0)
+    X = np.ones((10, 2))
+    Y = random_state.randn(10, 3)
+    ulp = LinearGaussianPolicy(3, 2)
+    ulp.fit(X, Y, np.ones(10))
+    assert_array_almost_equal(ulp.W, np.tile(Y.mean(axis=0) / 2.0, (2, 1)).T)
+
+
 def test_constant_gaussian_full_covariance():
     random_state = np.random.RandomState(0)
 
@@ -70,6 +102,27 @@ def test_constant_gaussian_diag_covariance():
     assert_greater(p, p2)
 
 
+def test_constant_gaussian_weighted_fit():
+    random_state = np.random.RandomState(0)
+    n_samples, n_weights = 20, 5
+    Y = random_state.randn(n_samples, n_weights)
+    weights = random_state.rand(n_samples)
+    mean = weights.dot(Y) / weights.sum()
+    deviations = Y - mean
+    Z = (weights.sum() ** 2 - (weights ** 2).sum()) / weights.sum()
+    Sigma = deviations.T.dot(np.diag(weights)).dot(deviations) / (1e-10 + Z)
+
+    for covariance in ["full", "diag"]:
+        ulp = ConstantGaussianPolicy(n_weights, covariance=covariance)
+        ulp.fit(None, Y, weights)
+        assert_array_almost_equal(ulp.mean, mean)
+        if covariance == "full":
+            assert_array_almost_equal(ulp.Sigma, Sigma)
+            assert_array_equal(ulp.Sigma, ulp.Sigma.T)
+        else:
+            assert_array_almost_equal(ulp.Sigma, np.diag(np.diag(Sigma)))
+
+
 def test_context_transformation():
     random_state = np.random.RandomState(0)
 
@@ -98,6 +151,20 @@ def test_context_transformation():
     assert_array_equal(Y_pred, Y_pred3)
 
 
+def test_transform_contexts():
+    contexts = np.random.RandomState(0).randn(10, 2)
+    for context_transformation in ["quadratic", quadratic,
+                                   lambda s: np.hstack((s, s ** 2))]:
+        ulp = ContextTransformationPolicy(LinearGaussianPolicy, 1, 2,
+                                          context_transformation)
+        bsp = BoundedScalingPolicy(ulp, "none")
+        features = bsp.transform_contexts(contexts)
+        assert_equal(features.shape, (10, ulp.n_features))
+        assert_array_equal(
+            features, [ulp.transform_context(s) for s in contexts])
+    assert_equal(ulp.transform_contexts(np.empty((0, 2))).shape, (0, 4))
+
+
 def test_bounded_scaling():
     random_state = np.random.RandomState(0)
 
@@ -119,3 +186,20 @@ def test_bounded_scaling():
     assert_array_almost_equal(Y_pred, np.clip(Y, 10.0, 12.0))
     assert_almost_equal(ulp.W[0, 0], 3.0)
     assert_almost_equal(ulp.W[0, 1], 10.0)
+
+
+def test_evaluate_batch():
+    random_state = np.random.RandomState(0)
+    contexts = random_state.rand(5, 2)
+
+    ulp = LinearGaussianPolicy(3, 2, random_state=0)
+    ulp.W = random_state.randn(3, 2)
+    params = ulp.evaluate_batch(contexts, explore=False)
+    assert_array_almost_equal(params, [ulp(s, explore=False)
+                                       for s in contexts])
+    assert_equal(ulp.evaluate_batch(contexts).shape, (5, 3))
+
+    ulp = ConstantGaussianPolicy(3, mean=np.ones(3), random_state=0)
+    assert_array_equal(ulp.evaluate_batch(contexts, explore=False),
+                       np.ones((5, 3)))
+    assert_equal(ulp.evaluate_batch(contexts).shape, (5, 3))
@@ -4,12 +4,31 @@
 
 from abc import ABCMeta, abstractmethod
 import numpy as np
+from scipy.linalg import cho_factor, cho_solve
 from ..representation.context_transformations import CONTEXT_TRANSFORMATIONS
 from ..utils.scaling import Scaling, NoScaling
 from ..utils.validation import check_random_state
 from ..utils.dependency import compatible_version
 
 
+def _weighted_gram(A, weights):
+    """Weighted Gram matrix A^T diag(weights) A, exactly symmetric."""
+    A_weighted = A * np.sqrt(weights)[:, np.newaxis]
+    return A_weighted.T.dot(A_weighted)
+
+
+def _solve_spd(A, B):
+    """Solve A X = B for a symmetric positive semi-definite matrix A.
+
+    We use the Cholesky decomposition and only fall back to the
+    pseudo-inverse if A is singular.
+    """
+    try:
+        return cho_solve(cho_factor(A), B)
+    except np.linalg.LinAlgError:
+        return np.linalg.pinv(A).dot(B)
+
+
 class UpperLevelPolicy(object):
     """Upper-level policy interface."""
     __metaclass__ = ABCMeta
@@ -31,6 +50,26 @@ class UpperLevelPolicy(object):
             distribution's mean is returned
         """
 
+    def evaluate_batch(self, contexts, explore=True):
+        """Evaluates policy for multiple contexts.
+
+        Parameters
+        ----------
+        contexts : array-like, shape (n_samples, n_context_dims)
+            Context vectors (ignored by non-contextual policies except for
+            the number of samples)
+
+        explore : bool
+            if true, weight vectors are sampled from distribution. otherwise
+            the distribution's mean is returned
+
+        Returns
+        -------
+        params : array, shape (n_samples, n_params)
+            Parameters
+        """
+        return np.array([self(context, explore) for context in contexts])
+
     @abstractmethod
     def fit(self, X, Y, weights, context_transform=True):
         """Trains policy by weighted maximum likelihood.
@@ -53,6 +92,21 @@ class UpperLevelPolicy(object):
         """Transform context based on internal context transformation. """
         return context  # no transformation as default
 
+    def transform_contexts(self, contexts):
+        """Transform multiple contexts based on internal context transformation.
+
+        Parameters
+        ----------
+        contexts : array-like, shape (n_samples, n_context_dims)
+            Context vectors
+
+        Returns
+        -------
+        context_features : array, shape (n_samples, n_features)
+            The features obtained by the context transformation
+        """
+        return np.asarray(contexts)  # no transformation as default
+
 
 class BoundedScalingPolicy(UpperLevelPolicy):
     """Combines a scaling operation, an upper-level policy, and applies limits.
@@ -104,6 +158,21 @@ class BoundedScalingPolicy(UpperLevelPolicy):
         """
         return self.upper_level_policy.transform_context(context)
 
+    def transform_contexts(self, contexts):
+        """Transform multiple contexts based on internal context transformation.
+
+        Parameters
+        ----------
+        contexts : array-like, shape (n_samples, n_context_dims)
+            Context vectors
+
+        Returns
+        -------
+        context_features : array, shape (n_samples, n_features)
+            The features obtained by the context transformation
+        """
+        return self.upper_level_policy.transform_contexts(contexts)
+
     @property
     def W(self):
         return self.upper_level_policy.W
@@ -138,6 +207,29 @@ class BoundedScalingPolicy(UpperLevelPolicy):
             np.clip(params, self.bounds[:, 0], self.bounds[:, 1], out=params)
         return params
 
+    def evaluate_batch(self, contexts, explore=True):
+        """Evaluates policy for multiple contexts.
+
+        Parameters
+        ----------
+        contexts : array-like, shape (n_samples, n_context_dims)
+            Context vectors
+
+        explore : bool
+            if true, weight vectors are sampled from distribution. otherwise
+            the distribution's mean is returned
+
+        Returns
+        -------
+        params : array, shape (n_samples, n_params)
+            Parameters
+        """
+        params = self.upper_level_policy.evaluate_batch(contexts, explore)
+        params = self.scaling.scale(params.T).T
+        if self.bounds is not None:
+            np.clip(params, self.bounds[:, 0], self.bounds[:, 1], out=params)
+        return params
+
     def fit(self, X, Y, weights=None, context_transform=True):
         """Trains policy by weighted maximum likelihood.
 
@@ -229,6 +321,31 @@ class ConstantGaussianPolicy(UpperLevelPolicy):
             return self.random_state.multivariate_normal(
                 mean=self.mean, cov=self.Sigma, size=1)[0]
 
+    def evaluate_batch(self, contexts, explore=True):
+        """Evaluates policy multiple times.
+
+        Parameters
+        ----------
+        contexts : array-like, shape (n_samples, ...)
+            context vectors (ignored by this policy except for the number of
+            samples)
+
+        explore : bool
+            if true, weight vectors are sampled from distribution. otherwise
+            the distribution's mean is returned
+
+        Returns
+        -------
+        parameter_vectors: array, shape (n_samples, n_weights)
+            the selected parameters
+        """
+        n_samples = len(contexts)
+        if not explore:
+            return np.tile(self.mean, (n_samples, 1))
+        else:
+            return self.random_state.multivariate_normal(
+                mean=self.mean, cov=self.Sigma, size=n_samples)
+
     def fit(self, X, Y, weights, *_):
         """Trains policy by weighted maximum likelihood.
 
@@ -249,16 +366,12 @@ class ConstantGaussianPolicy(UpperLevelPolicy):
 
         # Estimate covariance matrix (either full or diagonal)
         Z = (weights.sum() ** 2 - (weights ** 2).sum()) / weights.sum()
+        deviations = Y - self.mean
         if self.covariance == 'full':
-            nominator = np.zeros_like(self.Sigma)
-            for i in range(Y.shape[0]):
-                temp = Y[i] - self.mean
-                nominator += weights[i] * np.outer(temp, temp)
+            nominator = _weighted_gram(deviations, weights)
             self.Sigma = nominator / (1e-10 + Z)
         elif self.covariance == 'diag':
-            nominator = np.zeros(self.Sigma.shape[0])
-            for i in range(Y.shape[0]):
-                nominator += weights[i] * (Y[i] - self.mean) ** 2
+            nominator = weights.dot(deviations ** 2)
             self.Sigma = np.diag(nominator / (1e-10 + Z))
 
         if not np.isfinite(self.Sigma).all():
@@ -302,7 +415,9 @@ class ContextTransformationPolicy(UpperLevelPolicy):
         dimensionality of context vector
 
     context_transformation : string or callable
-        (Nonlinear) transformation for the context.
+        (Nonlinear) transformation for the context. The transformations from
+        CONTEXT_TRANSFORMATIONS transform multiple contexts at once, custom
+        functions will be called for each context.
     """
     def __init__(self, PolicyClass, n_params, n_context_dims,
                  context_transformation, *args, **kwargs):
@@ -314,6 +429,7 @@ class ContextTransformationPolicy(UpperLevelPolicy):
             self.ct = CONTEXT_TRANSFORMATIONS[self.context_transformation]
         else:
             self.ct = self.context_transformation
+        self.vectorized_ct = self.ct in CONTEXT_TRANSFORMATIONS.values()
 
         # Determine dimensionality of context feature vector
         self.n_features = self.transform_context(
@@ -347,6 +463,26 @@ class ContextTransformationPolicy(UpperLevelPolicy):
         """
         return self.ct(context)
 
+    def transform_contexts(self, contexts):
+        """Transform multiple contexts based on internal context transformation.
+
+        Parameters
+        ----------
+        contexts : array-like, shape (n_samples, n_context_dims)
+            Context vectors
+
+        Returns
+        -------
+        context_features : array, shape (n_samples, self.n_features)
+            The features obtained by the context transformation
+        """
+        contexts = np.asarray(contexts)
+        if self.vectorized_ct:
+            return self.ct(contexts).reshape(len(contexts), self.n_features)
+        else:
+            return np.array([self.ct(context) for context in contexts]
+                            ).reshape(len(contexts), self.n_features)
+
     def __call__(self, context, explore=True):
         """Evaluates policy for given context.
 
@@ -370,6 +506,26 @@ class ContextTransformationPolicy(UpperLevelPolicy):
         context_features = self.transform_context(context)
         return self.policy(context_features, explore)
 
+    def evaluate_batch(self, contexts, explore=True):
+        """Evaluates policy for multiple contexts.
+
+        Parameters
+        ----------
+        contexts : array-like, shape (n_samples, n_context_dims)
+            Context vectors
+
+        explore : bool
+            if true, weight vectors are sampled from distribution. otherwise
+            the distribution's mean is returned
+
+        Returns
+        -------
+        params : array, shape (n_samples, n_params)
+            Parameters
+        """
+        context_features = self.transform_contexts(contexts)
+        return self.policy.evaluate_batch(context_features, explore)
+
     def fit(self, X, Y, weights=None, context_transform=True):
         """Trains policy by weighted maximum likelihood.
 
@@ -391,7 +547,7 @@ class ContextTransformationPolicy(UpperLevelPolicy):
         """
         if context_transform:
             # Perform context transformation
-            X = np.array([self.transform_context(X[i]) for i in range(X.shape[0])])
+            X = self.transform_contexts(X)
         self.policy.fit(X, Y, weights)
 
 
@@ -470,6 +626,29 @@ class LinearGaussianPolicy(UpperLevelPolicy):
         else:
             return self.W.dot(context)
 
+    def evaluate_batch(self, contexts, explore=True):
+        """Evaluates policy for multiple contexts.
+
+        Parameters
+        ----------
+        contexts : array-like, shape (n_samples, n_context_dims)
+            Context vectors
+
+        explore : bool
+            if true, weight vectors are sampled from distribution. otherwise
+            the distribution's mean is returned
+
+        Returns
+        -------
+        params : array, shape (n_samples, n_params)
+            Parameters
+        """
+        means = np.asarray(contexts).dot(self.W.T)
+        if explore:
+            means += self.random_state.multivariate_normal(
+                np.zeros(self.n_params), self.Sigma, size=len(means))
+        return means
+
     def fit(self, X, Y, weights, context_transform=True):
         """Trains policy by weighted maximum likelihood.
 
@@ -493,15 +672,13 @@ class LinearGaussianPolicy(UpperLevelPolicy):
         weights[weights == 0] = np.finfo(np.float).eps
         Z = (weights.sum() ** 2 - (weights ** 2).sum()) / weights.sum()
 
-        nominator = np.zeros_like(self.Sigma)
-        for i in range(Y.shape[0]):
-            temp = Y[i] - self.W.dot(X[i])
-            nominator += weights[i] * np.outer(temp, temp)
+        nominator = _weighted_gram(Y - X.dot(self.W.T), weights)
         self.Sigma = nominator / Z
 
         if not np.isfinite(self.Sigma).all():
             raise ValueError("Computed non-finite covariance matrix.")
 
-        D = np.diag(weights)
-        self.W = np.linalg.pinv(X.T.dot(D).dot(X) + np.eye(X.shape[1]) *
-                                self.gamma).dot(X.T).dot(D).dot(Y).T
+        # Weighted ridge regression: W^T = (X^T D X + gamma I)^-1 X^T D Y
+        self.W = _solve_spd(
+            _weighted_gram(X, weights) + np.eye(X.shape[1]) * self.gamma,
+            (X.T * weights).dot(Y)).T
@@ -0,0 +1,344 @@
+# Author: Alexander Fabisch <afabisch@informatik.uni-bremen.de>
+
+import os
+import numpy as np
+
+
+class TrajectoryBuffer(object):
+    """Growable array that stores trajectories of multiple episodes.
+
+    All trajectories are stored in one preallocated array of shape
+    (n_episodes, n_steps, n_dims). Its capacity is doubled whenever there are
+    more episodes or steps than expected. Episodes can have different lengths.
+    Indexing a buffer returns a view of the corresponding trajectory. A view
+    is invalidated when the buffer has to grow: it keeps its content but will
+    not reflect later modifications.
+
+    The buffer can be used like a list of trajectories, i.e. trajectories
+    can be appended with :func:`append`, it can be iterated and indexed, and
+    `np.asarray(buffer)` returns an array of shape (n_episodes, n_steps,
+    n_dims) if all episodes have the same length.
+
+    Parameters
+    ----------
+    n_dims : int
+        Number of dimensions of each step
+
+    n_episodes : int, optional (default: 10)
+        Initial capacity for episodes
+
+    n_steps : int, optional (default: 100)
+        Initial capacity for steps per episode
+
+    filename : string, optional (default: None)
+        Store the trajectories in a memory-mapped .npy file, it will be
+        located in the $BL_LOG_PATH. The file contains the whole array
+        including unused capacity (filled with zeros). When the buffer grows,
+        the file is replaced by a larger one. Views of trajectories that
+        have been obtained before remain attached to the old file, which
+        prevents its replacement on Windows, hence, they should not be kept.
+    """
+    def __init__(self, n_dims, n_episodes=10, n_steps=100, filename=None):
+        self.n_dims = n_dims
+        self.filename = filename
+
+        self.n_episodes = 0
+        self.lengths = np.zeros(max(n_episodes, 1), dtype=int)
+        self.data = self._allocate(
+            (max(n_episodes, 1), max(n_steps, 1), n_dims))
+
+    def _allocate(self, shape):
+        """Allocate an array and copy the current content to it."""
+        old_data = getattr(self, "data", None)
+        if self.filename is None:
+            data = np.zeros(shape)
+            if old_data is not None:
+                data[tuple(slice(0, n) for n in old_data.shape)] = old_data
+            return data
+
+        path = os.path.join(os.environ.get("BL_LOG_PATH", "."), self.filename)
+        if old_data is None:
+            return np.lib.format.open_memmap(
+                path, mode="w+", dtype=np.float64, shape=shape)
+        # The old content is copied to a new file before it replaces the
+        # current one. Mapped files cannot be replaced on all platforms,
+        # hence, both maps are closed before.
+        tmp_path = path + ".tmp"
+        data = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=np.float64, shape=shape)
+        data[tuple(slice(0, n) for n in old_data.shape)] = old_data
+        data.flush()
+        del data, old_data
+        self.data = None
+        os.remove(path)
+        os.rename(tmp_path, path)
+        return np.lib.format.open_memmap(path, mode="r+")
+
+    def _grow(self, n_episodes, n_steps):
+        """Ensure capacity for n_episodes episodes with n_steps steps."""
+        old_n_episodes, old_n_steps, _ = self.data.shape
+        if n_episodes <= old_n_episodes and n_steps <= old_n_steps:
+            return
+        new_n_episodes = old_n_episodes
+        while new_n_episodes < n_episodes:
+            new_n_episodes *= 2
+        new_n_steps = old_n_steps
+        while new_n_steps < n_steps:
+            new_n_steps *= 2
+
+        self.data = self._allocate(
+            (new_n_episodes, new_n_steps, self.n_dims))
+
+        lengths = np.zeros(new_n_episodes, dtype=int)
+        lengths[:old_n_episodes] = self.lengths
+        self.lengths = lengths
+
+    def start_episode(self):
+        """Start a new, empty episode."""
+        self._grow(self.n_episodes + 1, 1)
+        self.lengths[self.n_episodes] = 0
+        self.n_episodes += 1
+
+    def append_step(self, x):
+        """Append a step to the current episode.
+
+        Parameters
+        ----------
+        x : array-like, shape (n_dims,)
+            Values of the step, will be copied
+        """
+        episode = self.n_episodes - 1
+        step = self.lengths[episode]
+        self._grow(self.n_episodes, step + 1)
+        self.data[episode, step] = x
+        self.lengths[episode] = step + 1
+
+    def append(self, trajectory):
+        """Append a trajectory as a new episode.
+
+        Parameters
+        ----------
+        trajectory : array-like, shape (n_steps, n_dims)
+            Trajectory, will be copied
+        """
+        trajectory = np.asarray(trajectory, dtype=np.float64).reshape(
+            -1, self.n_dims)
+        n_steps = len(trajectory)
+        self._grow(self.n_episodes + 1, n_steps)
+        self.data[self.n_episodes, :n_steps] = trajectory
+        self.lengths[self.n_episodes] = n_steps
+        self.n_episodes += 1
+
+    def __len__(self):
+        return self.n_episodes
+
+    def __getitem__(self, episode):
+        if isinstance(episode, slice):
+            return [self[i] for i in range(*episode.indices(self.n_episodes))]
+        if episode < 0:
+            episode += self.n_episodes
+        if not 0 <= episode < self.n_episodes:
+            raise IndexError("Episode index out of range")
+        return self.data[episode, :self.lengths[episode]]
+
+    def __iter__(self):
+        for episode in range(self.n_episodes):
+            yield self[episode]
+
+    def __array__(self, dtype=None):
+        lengths = self.lengths[:self.n_episodes]
+        if self.n_episodes == 0 or np.all(lengths == lengths[0]):
+            n_steps = lengths[0] if self.n_episodes > 0 else 0
+            array = self.data[:self.n_episodes, :n_steps]
+        else:
+            array = np.empty(self.n_episodes, dtype=object)
+            for episode in range(self.n_episodes):
+                array[episode] = self[episode]
+        if dtype is not None:
+            array = array.astype(dtype)
+        return array
+
+
+class RingBuffer(object):
+    """Stores the last maxlen arrays of the same shape in a contiguous array.
+
+    The buffer can be used like a deque with a maximum length. When it is
+    full, appending an item will discard the oldest one. All items are
+    stored in one preallocated array, twice: the item at position i is
+    also stored at position i + maxlen. Hence, all items in chronological
+    order are always a contiguous view of the array, i.e.
+    `np.asarray(buffer)` returns an array of shape (len(buffer),) + shape
+    without copying. The array will be allocated with the first item.
+
+    Parameters
+    ----------
+    maxlen : int
+        Maximum number of items
+
+    dtype : data-type, optional (default: float64)
+        Type of the items
+    """
+    def __init__(self, maxlen, dtype=np.float64):
+        self.maxlen = maxlen
+        self.dtype = dtype
+
+        self.data = None
+        self.start = 0
+        self.n_items = 0
+
+    def append(self, x):
+        """Append an item.
+
+        Parameters
+        ----------
+        x : array-like
+            Item, will be copied
+        """
+        if self.maxlen == 0:
+            return
+        x = np.asarray(x, dtype=self.dtype)
+        if self.data is None:
+            self.data = np.empty((2 * self.maxlen,) + x.shape,
+                                 dtype=self.dtype)
+
+        if self.n_items < self.maxlen:
+            i = self.n_items
+            self.n_items += 1
+        else:
+            # Overwrite the oldest item
+            i = self.start
+            self.start = (self.start + 1) % self.maxlen
+        self.data[i] = x
+        self.data[i + self.maxlen] = x
+
+    def extend(self, X):
+        """Append multiple items.
+
+        Parameters
+        ----------
+        X : array-like, shape (n_items,) + shape
+            Items, will be copied
+        """
+        X = np.asarray(X, dtype=self.dtype)
+        n_new_items = min(len(X), self.maxlen)
+        if n_new_items == 0:
+            return
+        X = X[len(X) - n_new_items:]
+        if self.data is None:
+            self.data = np.empty((2 * self.maxlen,) + X.shape[1:],
+                                 dtype=self.dtype)
+
+        indices = (self.start + self.n_items +
+                   np.arange(n_new_items)) % self.maxlen
+        self.data[indices] = X
+        self.data[indices + self.maxlen] = X
+        n_items = min(self.n_items + n_new_items, self.maxlen)
+        self.start = ((self.start + self.n_items + n_new_items - n_items)
+                      % self.maxlen)
+        self.n_items = n_items
+
+    def __len__(self):
+        return self.n_items
+
+    def __getitem__(self, index):
+        return np.asarray(self)[index]
+
+    def __iter__(self):
+        return iter(np.asarray(self))
+
+    def __array__(self, dtype=None):
+        if self.data is None:
+            array = np.empty(0, dtype=self.dtype)
+        else:
+            array = self.data[self.start:self.start + self.n_items]
+        if dtype is not None:
+            array = array.astype(dtype)
+        return array
+
+
+class SampleHistory(object):
+    """Window of the last samples that an optimizer uses for its update.
+
+    Parameter vectors, returns, contexts and context features are stored in
+    ring buffers (see :class:`RingBuffer`). Each of them can be converted to
+    an array of all samples in chronological order without copying, e.g.
+    `np.asarray(history.params)`.
+
+    Parameters
+    ----------
+    maxlen : int
+        Maximum number of samples
+
+    Attributes
+    ----------
+    params : RingBuffer
+        Parameter vectors, shape (n_samples, n_params)
+
+    returns : RingBuffer
+        Returns, shape (n_samples,)
+
+    contexts : RingBuffer
+        Contexts, shape (n_samples, n_context_dims), only for contextual
+        optimizers
+
+    context_features : RingBuffer
+        Context features, shape (n_samples, n_features), only for contextual
+        optimizers
+    """
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self.params = RingBuffer(maxlen)
+        self.returns = RingBuffer(maxlen)
+        self.contexts = RingBuffer(maxlen)
+        self.context_features = RingBuffer(maxlen)
+
+    def append(self, params, ret, context=None, context_features=None):
+        """Append a sample.
+
+        Parameters
+        ----------
+        params : array-like, shape (n_params,)
+            Parameter vector
+
+        ret : float
+            Return
+
+        context : array-like, shape (n_context_dims,), optional
+            Context
+
+        context_features : array-like, shape (n_features,), optional
+            Context features
+        """
+        self.params.append(params)
+        self.returns.append(ret)
+        if context is not None:
+            self.contexts.append(context)
+        if context_features is not None:
+            self.context_features.append(context_features)
+
+    def extend(self, params, returns, contexts=None, context_features=None):
+        """Append multiple samples.
+
+        Parameters
+        ----------
+        params : array-like, shape (n_samples, n_params)
+            Parameter vectors
+
+        returns : array-like, shape (n_samples,)
+            Returns
+
+        contexts : array-like, shape (n_samples, n_context_dims), optional
+            Contexts
+
+        context_features : array-like, shape (n_samples, n_features), optional
+            Context features
+        """
+        self.params.extend(params)
+        self.returns.extend(returns)
+        if contexts is not None:
+            self.contexts.extend(contexts)
+        if context_features is not None:
+            self.context_features.extend(context_features)
+
+    def __len__(self):
+        return len(self.returns)
@@ -4,6 +4,10 @@ import numpy as np
 # Make product functions pickable
 
 def multiply(a, b):
+    a = np.asarray(a)
+    if a.ndim == 1 and np.ndim(b) == 2:
+        # b contains one vector per column
+        a = a[:, np.newaxis]
     return np.multiply(a, b)
 
 
@@ -0,0 +1,130 @@
+import os
+import shutil
+import tempfile
+import pickle
+import numpy as np
+from bolero.utils.recording import TrajectoryBuffer, RingBuffer, SampleHistory
+from numpy.testing import assert_array_equal
+from nose.tools import assert_equal, assert_true, assert_raises
+
+
+def test_append_steps():
+    buf = TrajectoryBuffer(2, n_episodes=1, n_steps=1)
+    for episode in range(5):
+        buf.start_episode()
+        for step in range(7):
+            buf.append_step([episode, step])
+    assert_equal(len(buf), 5)
+    assert_equal(buf.data.shape, (8, 8, 2))
+    X = np.asarray(buf)
+    assert_equal(X.shape, (5, 7, 2))
+    assert_array_equal(X[3, :, 0], 3 * np.ones(7))
+    assert_array_equal(X[3, :, 1], np.arange(7))
+
+
+def test_views():
+    buf = TrajectoryBuffer(1)
+    buf.append(np.arange(3)[:, np.newaxis])
+    assert_true(np.may_share_memory(buf[0], buf.data))
+    assert_true(np.may_share_memory(np.asarray(buf), buf.data))
+
+
+def test_list_interface():
+    buf = TrajectoryBuffer(1, n_episodes=2, n_steps=2)
+    trajectories = [np.arange(n, dtype=np.float)[:, np.newaxis]
+                    for n in [1, 4, 2]]
+    for trajectory in trajectories:
+        buf.append(trajectory)
+    assert_equal(len(buf), 3)
+    for trajectory, recorded in zip(trajectories, buf):
+        assert_array_equal(trajectory, recorded)
+    assert_array_equal(buf[-1], trajectories[-1])
+    assert_equal(len(buf[1:]), 2)
+    assert_raises(IndexError, buf.__getitem__, 3)
+    assert_equal(np.asarray(buf).shape, (3,))
+
+
+def test_memmap():
+    log_path = tempfile.mkdtemp()
+    old_log_path = os.environ.get("BL_LOG_PATH")
+    os.environ["BL_LOG_PATH"] = log_path
+    try:
+        buf = TrajectoryBuffer(3, n_episodes=1, n_steps=1,
+                               filename="test.npy")
+        for episode in range(3):
+            buf.append(np.ones((10, 3)) * episode)
+        assert_true(isinstance(buf.data, np.memmap))
+        assert_equal(os.listdir(log_path), ["test.npy"])
+        buf.data.flush()
+        data = np.load(os.path.join(log_path, "test.npy"))
+        assert_array_equal(data[:3, :10], np.asarray(buf))
+    finally:
+        if old_log_path is None:
+            del os.environ["BL_LOG_PATH"]
+        else:
+            os.environ["BL_LOG_PATH"] = old_log_path
+        shutil.rmtree(log_path)
+
+
+def test_ring_buffer():
+    buf = RingBuffer(3)
+    assert_equal(np.asarray(buf).shape, (0,))
+    items = []
+    for i in range(8):
+        buf.append([i, -i])
+        items.append([i, -i])
+        assert_array_equal(buf, items[-3:])
+        assert_true(np.may_share_memory(np.asarray(buf), buf.data))
+    assert_equal(len(buf), 3)
+    assert_array_equal(buf[-1], [7, -7])
+    assert_equal(buf.data.shape, (6, 2))
+
+
+def test_ring_buffer_extend():
+    items = np.arange(20.0).reshape(10, 2)
+    for n_items in range(5):
+        buf = RingBuffer(4)
+        buf.extend(items[:n_items])
+        buf.extend(items[n_items:n_items + 3])
+        assert_array_equal(buf, items[:n_items + 3][-4:])
+        buf.extend(items)
+        assert_array_equal(buf, items[-4:])
+
+
+def test_ring_buffer_pickle():
+    buf = RingBuffer(2)
+    buf.extend(np.eye(3))
+    buf2 = pickle.loads(pickle.dumps(buf))
+    assert_array_equal(buf2, np.eye(3)[1:])
+    buf2.append(np.ones(3))
+    assert_array_equal(buf2, [[0, 0, 1], [1, 1, 1]])
+
+
+def test_sample_history():
+    history = SampleHistory(3)
+    for i in range(5):
+        history.append(i * np.ones(2), float(i), np.array([i]),
+                       np.array([1.0, i]))
+    assert_equal(len(history), 3)
+    assert_array_equal(history.params, [[2, 2], [3, 3], [4, 4]])
+    assert_array_equal(history.returns, [2, 3, 4])
+    assert_array_equal(history.contexts, [[2], [3], [4]])
+    assert_array_equal(history.context_features, [[1, 2], [1, 3], [1, 4]])
+
+    history = pickle.loads(pickle.dumps(history))
+    history.append(np.zeros(2), 5.0)
+    assert_array_equal(history.returns, [3, 4, 5])
+    assert_array_equal(history.params, [[3, 3], [4, 4], [0, 0]])
+
+
+def test_sample_history_extend():
+    history = SampleHistory(3)
+    history.append(np.zeros(2), 0.0, np.array([0]), np.array([1.0, 0]))
+    i = np.arange(1, 5)
+    history.extend(np.column_stack((i, i)), i.astype(float), i[:, np.newaxis],
+                   np.column_stack((np.ones(4), i)))
+    assert_equal(len(history), 3)
+    assert_array_equal(history.params, [[2, 2], [3, 3], [4, 4]])
+    assert_array_equal(history.returns, [2, 3, 4])
+    assert_array_equal(history.contexts, [[2], [3], [4]])
+    assert_array_equal(history.context_features, [[1, 2], [1, 3], [1, 4]])
@@ -92,3 +92,12 @@ def test_no_scaling():
     assert_array_equal(params, scaled_params)
     inv_scaled_params = scaling.inv_scale(scaled_params)
     assert_array_equal(scaled_params, params)
+
+
+def test_diagonal_covariance_scaling_of_multiple_params():
+    s = Scaling(covariance=np.arange(1, 11), compute_inverse=True)
+    P = np.column_stack((params, 2.0 * params))
+    scaled_P = s.scale(P)
+    assert_array_almost_equal(scaled_P[:, 0], s.scale(params))
+    assert_array_almost_equal(scaled_P[:, 1], s.scale(2.0 * params))
+    assert_array_almost_equal(P, s.inv_scale(scaled_P))
@@ -816,6 +816,13 @@ cdef class CppBehavior:
         """
         return self.thisptr.canStep()
 
+    def is_open_loop(self):
+        """Determine if all outputs can be generated at once.
+
+        C++ behaviors can only be executed step by step.
+        """
+        return False
+
 
 cdef class CppLoadableBehavior(CppBehavior):
     cdef LoadableBehavior *behaviorPtr
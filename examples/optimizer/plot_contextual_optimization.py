@@ -105,7 +105,7 @@ for it in range(n_generations):
         else:
             marker = "|"
             weights = opt.weights / np.sum(opt.weights)
-        plt.scatter(contexts.ravel(), np.array(opt.history_theta).ravel(),
+        plt.scatter(contexts.ravel(), np.asarray(opt.history.params).ravel(),
                     c=weights, cmap=plt.cm.gray, marker=marker, s=100,
                     label=opt_name + " samples")
         if it == 0:
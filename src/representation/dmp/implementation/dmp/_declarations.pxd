@@ -1,26 +1,47 @@
 from libcpp cimport bool
 
 
-cdef extern from "../src/Dmp.h" namespace "Dmp":
+cdef extern from "../src/Dmp.h" namespace "Dmp" nogil:
     double calculateAlpha(double goal_z, double goal_t, double start_t) except +
 
-cdef extern from "../src/Dmp.h" namespace "Dmp":
+cdef extern from "../src/Dmp.h" namespace "Dmp" nogil:
     void initializeRbf(double * widths, int num_widths, double * centers, int num_centers, double goal_t, double start_t, double overlap, double alpha) except +
 
-cdef extern from "../src/Dmp.h" namespace "Dmp":
-    void imitate(double * T, int num_T, double * Y, int num_steps, int num_task_dims, double * weights, int num_weights_per_dim, int num_weight_dims, double * widths, int num_widths, double * centers, int num_centers, double regularization_coefficient, double alpha_y, double beta_y, double alpha_z, bool allow_final_velocity) except +
+cdef extern from "../src/Dmp.h" namespace "Dmp" nogil:
+    void imitate(const double * T, int num_T, const double * Y, int num_steps, int num_task_dims, double * weights, int num_weights_per_dim, int num_weight_dims, const double * widths, int num_widths, const double * centers, int num_centers, double regularization_coefficient, double alpha_y, double beta_y, double alpha_z, bool allow_final_velocity) except +
 
-cdef extern from "../src/Dmp.h" namespace "Dmp":
-    void dmpStep(double last_t, double t, double * last_y, int num_last_y, double * last_yd, int num_last_yd, double * last_ydd, int num_last_ydd, double * y, int num_y, double * yd, int num_yd, double * ydd, int num_ydd, double * goal_y, int num_goal_y, double * goal_yd, int num_goal_yd, double * goal_ydd, int num_goal_ydd, double * start_y, int num_start_y, double * start_yd, int num_start_yd, double * start_ydd, int num_start_ydd, double goal_t, double start_t, double * weights, int num_weights_per_dim, int num_weight_dims, double * widths, int num_widths, double * centers, int num_centers, double alpha_y, double beta_y, double alpha_z, double integration_dt) except +
+cdef extern from "../src/Dmp.h" namespace "Dmp" nogil:
+    void imitateBatch(const double * T, int num_T, const double * Y, int num_demos, int num_steps, int num_task_dims, double * weights, int num_samples, int num_weights_per_dim, int num_weight_dims, const double * widths, int num_widths, const double * centers, int num_centers, double regularization_coefficient, double alpha_y, double beta_y, double alpha_z, bool allow_final_velocity) except +
 
-cdef extern from "../src/Dmp.h" namespace "Dmp":
-    void quaternionImitate(double * T, int num_T, double * R, int num_steps, int num_task_dims, double * weights, int num_weights_per_dim, int num_weight_dims, double * widths, int num_widths, double * centers, int num_centers, double regularization_coefficient, double alpha_r, double beta_r, double alpha_z, bool allow_final_velocity) except +
+cdef extern from "../src/Dmp.h" namespace "Dmp" nogil:
+    void dmpStep(double last_t, double t, const double * last_y, int num_last_y, const double * last_yd, int num_last_yd, const double * last_ydd, int num_last_ydd, double * y, int num_y, double * yd, int num_yd, double * ydd, int num_ydd, const double * goal_y, int num_goal_y, const double * goal_yd, int num_goal_yd, const double * goal_ydd, int num_goal_ydd, const double * start_y, int num_start_y, const double * start_yd, int num_start_yd, const double * start_ydd, int num_start_ydd, double goal_t, double start_t, const double * weights, int num_weights_per_dim, int num_weight_dims, const double * widths, int num_widths, const double * centers, int num_centers, double alpha_y, double beta_y, double alpha_z, double integration_dt) except +
 
-cdef extern from "../src/Dmp.h" namespace "Dmp":
-    void quaternionDmpStep(double last_t, double t, double * last_r, int num_last_r, double * last_rd, int num_last_rd, double * last_rdd, int num_last_rdd, double * r, int num_r, double * rd, int num_rd, double * rdd, int num_rdd, double * goal_r, int num_goal_r, double * goal_rd, int num_goal_rd, double * goal_rdd, int num_goal_rdd, double * start_r, int num_start_r, double * start_rd, int num_start_rd, double * start_rdd, int num_start_rdd, double goal_t, double start_t, double * weights, int num_weights_per_dim, int num_weight_dims, double * widths, int num_widths, double * centers, int num_centers, double alpha_r, double beta_r, double alpha_z, double integration_dt) except +
+cdef extern from "../src/Dmp.h" namespace "Dmp" nogil:
+    void dmpTrajectories(const double * T, int num_T, const double * goal_y, int num_goal_y, const double * goal_yd, int num_goal_yd, const double * goal_ydd, int num_goal_ydd, const double * start_y, int num_start_y, const double * start_yd, int num_start_yd, const double * start_ydd, int num_start_ydd, double goal_t, double start_t, const double * weights, int num_samples, int num_weights_per_dim, int num_weight_dims, const double * widths, int num_widths, const double * centers, int num_centers, double * Y, int num_Y_samples, int num_Y_steps, int num_Y_dims, double * Yd, int num_Yd_samples, int num_Yd_steps, int num_Yd_dims, double * Ydd, int num_Ydd_samples, int num_Ydd_steps, int num_Ydd_dims, double alpha_y, double beta_y, double alpha_z, double integration_dt) except +
 
-cdef extern from "../src/Dmp.h" namespace "Dmp::internal":
-    void compute_gradient(double * _in, int num_in_steps, int num_in_dims, double * out, int num_out_steps, int num_out_dims, double * time, int num_time, bool allow_final_velocity) except +
+cdef extern from "../src/Dmp.h" namespace "Dmp" nogil:
+    void dmpSegmentTrajectories(const double * T, int num_T, const double * goal_y, int num_goal_y_samples, int num_goal_y_dims, const double * goal_yd, int num_goal_yd_samples, int num_goal_yd_dims, const double * goal_ydd, int num_goal_ydd_samples, int num_goal_ydd_dims, const double * start_y, int num_start_y_samples, int num_start_y_dims, const double * start_yd, int num_start_yd_samples, int num_start_yd_dims, const double * start_ydd, int num_start_ydd_samples, int num_start_ydd_dims, double goal_t, double start_t, const double * weights, int num_samples, int num_weights_per_dim, int num_weight_dims, const double * widths, int num_widths, const double * centers, int num_centers, double * Y, int num_Y_samples, int num_Y_steps, int num_Y_dims, double * Yd, int num_Yd_samples, int num_Yd_steps, int num_Yd_dims, double * Ydd, int num_Ydd_samples, int num_Ydd_steps, int num_Ydd_dims, double alpha_y, double beta_y, double alpha_z, double integration_dt) except +
 
-cdef extern from "../src/Dmp.h" namespace "Dmp::internal":
-    void compute_quaternion_gradient(double * _in, int num_in_steps, int num_in_dims, double * out, int num_out_steps, int num_out_dims, double * time, int num_time, bool allow_final_velocity) except +
+cdef extern from "../src/Dmp.h" namespace "Dmp" nogil:
+    void rbfActivationTable(const double * T, int num_T, double * phases, int num_phases_steps, int num_phases_substeps, double * activations, int num_activations_steps, int num_activations_substeps, int num_activations_features, const double * widths, int num_widths, const double * centers, int num_centers, double goal_t, double start_t, double alpha_z, double integration_dt) except +
+
+cdef extern from "../src/Dmp.h" namespace "Dmp" nogil:
+    void dmpStepPrecomputed(double last_t, double t, const double * last_y, int num_last_y, const double * last_yd, int num_last_yd, const double * last_ydd, int num_last_ydd, double * y, int num_y, double * yd, int num_yd, double * ydd, int num_ydd, const double * goal_y, int num_goal_y, const double * goal_yd, int num_goal_yd, const double * goal_ydd, int num_goal_ydd, const double * start_y, int num_start_y, const double * start_yd, int num_start_yd, const double * start_ydd, int num_start_ydd, double goal_t, double start_t, const double * weights, int num_weights_per_dim, int num_weight_dims, const double * phases, int num_phases, const double * activations, int num_activations_substeps, int num_activations_features, double alpha_y, double beta_y, double integration_dt) except +
+
+cdef extern from "../src/Dmp.h" namespace "Dmp" nogil:
+    void quaternionImitate(const double * T, int num_T, const double * R, int num_steps, int num_task_dims, double * weights, int num_weights_per_dim, int num_weight_dims, const double * widths, int num_widths, const double * centers, int num_centers, double regularization_coefficient, double alpha_r, double beta_r, double alpha_z, bool allow_final_velocity) except +
+
+cdef extern from "../src/Dmp.h" namespace "Dmp" nogil:
+    void quaternionDmpStep(double last_t, double t, const double * last_r, int num_last_r, const double * last_rd, int num_last_rd, const double * last_rdd, int num_last_rdd, double * r, int num_r, double * rd, int num_rd, double * rdd, int num_rdd, const double * goal_r, int num_goal_r, const double * goal_rd, int num_goal_rd, const double * goal_rdd, int num_goal_rdd, const double * start_r, int num_start_r, const double * start_rd, int num_start_rd, const double * start_rdd, int num_start_rdd, double goal_t, double start_t, const double * weights, int num_weights_per_dim, int num_weight_dims, const double * widths, int num_widths, const double * centers, int num_centers, double alpha_r, double beta_r, double alpha_z, double integration_dt) except +
+
+cdef extern from "../src/Dmp.h" namespace "Dmp" nogil:
+    void quaternionDmpStepPrecomputed(double last_t, double t, const double * last_r, int num_last_r, const double * last_rd, int num_last_rd, const double * last_rdd, int num_last_rdd, double * r, int num_r, double * rd, int num_rd, double * rdd, int num_rdd, const double * goal_r, int num_goal_r, const double * goal_rd, int num_goal_rd, const double * goal_rdd, int num_goal_rdd, const double * start_r, int num_start_r, const double * start_rd, int num_start_rd, const double * start_rdd, int num_start_rdd, double goal_t, double start_t, const double * weights, int num_weights_per_dim, int num_weight_dims, const double * phases, int num_phases, const double * activations, int num_activations_substeps, int num_activations_features, double alpha_r, double beta_r, double integration_dt) except +
+
+cdef extern from "../src/Dmp.h" namespace "Dmp" nogil:
+    void cartesianDmpTrajectories(const double * T, int num_T, const double * goal_y, int num_goal_y, const double * goal_yd, int num_goal_yd, const double * goal_ydd, int num_goal_ydd, const double * start_y, int num_start_y, const double * start_yd, int num_start_yd, const double * start_ydd, int num_start_ydd, const double * goal_r, int num_goal_r, const double * start_r, int num_start_r, const double * start_rd, int num_start_rd, const double * start_rdd, int num_start_rdd, double goal_t, double start_t, const double * weights, int num_samples, int num_weights_per_dim, int num_weight_dims, const double * widths, int num_widths, const double * centers, int num_centers, double * X, int num_X_samples, int num_X_steps, int num_X_dims, double alpha_y, double beta_y, double alpha_z, double integration_dt) except +
+
+cdef extern from "../src/Dmp.h" namespace "Dmp::internal" nogil:
+    void compute_gradient(const double * _in, int num_in_steps, int num_in_dims, double * out, int num_out_steps, int num_out_dims, const double * time, int num_time, bool allow_final_velocity) except +
+
+cdef extern from "../src/Dmp.h" namespace "Dmp::internal" nogil:
+    void compute_quaternion_gradient(const double * _in, int num_in_steps, int num_in_dims, double * out, int num_out_steps, int num_out_dims, const double * time, int num_time, bool allow_final_velocity) except +
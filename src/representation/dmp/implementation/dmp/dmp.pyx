@@ -18,7 +18,7 @@ cpdef calculate_alpha(double goal_z, double goal_t, double start_t):
     cdef double result = cpp.calculateAlpha(cpp_goal_z, cpp_goal_t, cpp_start_t)
     return result
 
-cpdef initialize_rbf(np.ndarray[double, ndim=1] widths, np.ndarray[double, ndim=1] centers, double goal_t, double start_t, double overlap, double alpha):
+cpdef initialize_rbf(double[::1] widths, double[::1] centers, double goal_t, double start_t, double overlap, double alpha):
     """Initialize radial basis functions.
     
     \param widths widths of the RBFs, will be initialized
@@ -34,9 +34,10 @@ cpdef initialize_rbf(np.ndarray[double, ndim=1] widths, np.ndarray[double, ndim=
     cdef double cpp_start_t = start_t
     cdef double cpp_overlap = overlap
     cdef double cpp_alpha = alpha
-    cpp.initializeRbf(&widths[0], widths.shape[0], &centers[0], centers.shape[0], cpp_goal_t, cpp_start_t, cpp_overlap, cpp_alpha)
+    with nogil:
+        cpp.initializeRbf(&widths[0], widths.shape[0], &centers[0], centers.shape[0], cpp_goal_t, cpp_start_t, cpp_overlap, cpp_alpha)
 
-cpdef imitate(np.ndarray[double, ndim=1] T, np.ndarray[double, ndim=2] Y, np.ndarray[double, ndim=2] weights, np.ndarray[double, ndim=1] widths, np.ndarray[double, ndim=1] centers, double regularization_coefficient, double alpha_y, double beta_y, double alpha_z, bool allow_final_velocity):
+cpdef imitate(const double[::1] T, const double[:, ::1] Y, double[:, ::1] weights, const double[::1] widths, const double[::1] centers, double regularization_coefficient, double alpha_y, double beta_y, double alpha_z, bool allow_final_velocity):
     """Represent trajectory as DMP.
     
     \note The final velocity will be calculated by numeric differentiation
@@ -74,9 +75,57 @@ cpdef imitate(np.ndarray[double, ndim=1] T, np.ndarray[double, ndim=2] Y, np.nda
     cdef double cpp_beta_y = beta_y
     cdef double cpp_alpha_z = alpha_z
     cdef bool cpp_allow_final_velocity = allow_final_velocity
-    cpp.imitate(&T[0], T.shape[0], &Y[0, 0], Y.shape[0], Y.shape[1], &weights[0, 0], weights.shape[0], weights.shape[1], &widths[0], widths.shape[0], &centers[0], centers.shape[0], cpp_regularization_coefficient, cpp_alpha_y, cpp_beta_y, cpp_alpha_z, cpp_allow_final_velocity)
+    with nogil:
+        cpp.imitate(&T[0], T.shape[0], &Y[0, 0], Y.shape[0], Y.shape[1], &weights[0, 0], weights.shape[0], weights.shape[1], &widths[0], widths.shape[0], &centers[0], centers.shape[0], cpp_regularization_coefficient, cpp_alpha_y, cpp_beta_y, cpp_alpha_z, cpp_allow_final_velocity)
 
-cpdef dmp_step(double last_t, double t, np.ndarray[double, ndim=1] last_y, np.ndarray[double, ndim=1] last_yd, np.ndarray[double, ndim=1] last_ydd, np.ndarray[double, ndim=1] y, np.ndarray[double, ndim=1] yd, np.ndarray[double, ndim=1] ydd, np.ndarray[double, ndim=1] goal_y, np.ndarray[double, ndim=1] goal_yd, np.ndarray[double, ndim=1] goal_ydd, np.ndarray[double, ndim=1] start_y, np.ndarray[double, ndim=1] start_yd, np.ndarray[double, ndim=1] start_ydd, double goal_t, double start_t, np.ndarray[double, ndim=2] weights, np.ndarray[double, ndim=1] widths, np.ndarray[double, ndim=1] centers, double alpha_y, double beta_y, double alpha_z, double integration_dt):
+cpdef imitate_batch(const double[::1] T, const double[:, :, ::1] Y, double[:, :, ::1] weights, const double[::1] widths, const double[::1] centers, double regularization_coefficient, double alpha_y, double beta_y, double alpha_z, bool allow_final_velocity):
+    """Represent multiple demonstrations as DMPs.
+    
+    All demonstrations must have the same time steps. The design matrix of the
+    radial basis functions and its factorization are computed only once.
+    There are two modes that will be selected based on the shape of weights:
+    
+    - num_samples == 1: fit one weight matrix to all demonstrations (stacked
+    ridge regression)
+    - num_samples == num_demos: fit one weight matrix to each demonstration
+    independently, the result is the same as calling imitate for each
+    demonstration
+    
+    \param T time for each step of the trajectories
+    \param num_T number of steps
+    \param Y positions, contains num_demos * num_T * num_dimensions entries in
+    row-major order
+    \param num_demos number of demonstrations
+    \param num_steps number of steps
+    \param num_task_dims number of dimensions
+    \param weights weights that reproduce the trajectories (will be updated),
+    contains num_samples * num_weights_per_dim * num_weight_dims
+    entries in row-major order
+    \param num_samples number of weight matrices (1 or num_demos)
+    \param num_weights_per_dim number of features per dimension
+    \param num_weight_dims number of dimensions
+    \param widths widths of the radial basis functions (shared among DOFs)
+    \param num_widths number of RBFs
+    \param centers centers of the radial basis functions (shared among DOFs)
+    \param num_centers number of RBFs
+    \param regularization_coefficient can be set to solve instable problems
+    where there are more weights that have to be learned than samples
+    in the demonstrated trajectory (default: 1e-10)
+    \param alpha_y constant that has to be set for critical damping (default: 25)
+    \param beta_y constant that has to be set for critical damping (default: 25 / 4.0)
+    \param alpha_z decay rate of the phase variable (default: 25.0 / 3.0)
+    \param allow_final_velocity compute the final velocity from the data,
+    otherwise we will assume it to be zero
+    """
+    cdef double cpp_regularization_coefficient = regularization_coefficient
+    cdef double cpp_alpha_y = alpha_y
+    cdef double cpp_beta_y = beta_y
+    cdef double cpp_alpha_z = alpha_z
+    cdef bool cpp_allow_final_velocity = allow_final_velocity
+    with nogil:
+        cpp.imitateBatch(&T[0], T.shape[0], &Y[0, 0, 0], Y.shape[0], Y.shape[1], Y.shape[2], &weights[0, 0, 0], weights.shape[0], weights.shape[1], weights.shape[2], &widths[0], widths.shape[0], &centers[0], centers.shape[0], cpp_regularization_coefficient, cpp_alpha_y, cpp_beta_y, cpp_alpha_z, cpp_allow_final_velocity)
+
+cpdef dmp_step(double last_t, double t, const double[::1] last_y, const double[::1] last_yd, const double[::1] last_ydd, double[::1] y, double[::1] yd, double[::1] ydd, const double[::1] goal_y, const double[::1] goal_yd, const double[::1] goal_ydd, const double[::1] start_y, const double[::1] start_yd, const double[::1] start_ydd, double goal_t, double start_t, const double[:, ::1] weights, const double[::1] widths, const double[::1] centers, double alpha_y, double beta_y, double alpha_z, double integration_dt):
     """Execute one step of the DMP.
     
     source: http://ijr.sagepub.com/content/32/3/263.full.pdf
@@ -132,9 +181,251 @@ cpdef dmp_step(double last_t, double t, np.ndarray[double, ndim=1] last_y, np.nd
     cdef double cpp_beta_y = beta_y
     cdef double cpp_alpha_z = alpha_z
     cdef double cpp_integration_dt = integration_dt
-    cpp.dmpStep(cpp_last_t, cpp_t, &last_y[0], last_y.shape[0], &last_yd[0], last_yd.shape[0], &last_ydd[0], last_ydd.shape[0], &y[0], y.shape[0], &yd[0], yd.shape[0], &ydd[0], ydd.shape[0], &goal_y[0], goal_y.shape[0], &goal_yd[0], goal_yd.shape[0], &goal_ydd[0], goal_ydd.shape[0], &start_y[0], start_y.shape[0], &start_yd[0], start_yd.shape[0], &start_ydd[0], start_ydd.shape[0], cpp_goal_t, cpp_start_t, &weights[0, 0], weights.shape[0], weights.shape[1], &widths[0], widths.shape[0], &centers[0], centers.shape[0], cpp_alpha_y, cpp_beta_y, cpp_alpha_z, cpp_integration_dt)
+    with nogil:
+        cpp.dmpStep(cpp_last_t, cpp_t, &last_y[0], last_y.shape[0], &last_yd[0], last_yd.shape[0], &last_ydd[0], last_ydd.shape[0], &y[0], y.shape[0], &yd[0], yd.shape[0], &ydd[0], ydd.shape[0], &goal_y[0], goal_y.shape[0], &goal_yd[0], goal_yd.shape[0], &goal_ydd[0], goal_ydd.shape[0], &start_y[0], start_y.shape[0], &start_yd[0], start_yd.shape[0], &start_ydd[0], start_ydd.shape[0], cpp_goal_t, cpp_start_t, &weights[0, 0], weights.shape[0], weights.shape[1], &widths[0], widths.shape[0], &centers[0], centers.shape[0], cpp_alpha_y, cpp_beta_y, cpp_alpha_z, cpp_integration_dt)
+
+cpdef dmp_trajectories(const double[::1] T, const double[::1] goal_y, const double[::1] goal_yd, const double[::1] goal_ydd, const double[::1] start_y, const double[::1] start_yd, const double[::1] start_ydd, double goal_t, double start_t, const double[:, :, ::1] weights, const double[::1] widths, const double[::1] centers, double[:, :, ::1] Y, double[:, :, ::1] Yd, double[:, :, ::1] Ydd, double alpha_y, double beta_y, double alpha_z, double integration_dt):
+    """Generate open-loop trajectories of a DMP for multiple weight matrices.
+    
+    This is equivalent to calling dmpStep for each time step and each weight
+    matrix, where the outputs of the previous step are the inputs of the next
+    step. The goal trajectory and the activations of the RBFs are computed
+    only once per integration step for all weight matrices.
+    
+    \param T time for each step of the trajectories, the state at T[0] will be
+    the start state if T[0] <= start_t
+    \param num_T number of steps
+    \param goal_y goal position
+    \param num_goal_y number of dimensions
+    \param goal_yd goal velocity
+    \param num_goal_yd number of dimensions
+    \param goal_ydd goal acceleration
+    \param num_goal_ydd number of dimensions
+    \param start_y start position
+    \param num_start_y number of dimensions
+    \param start_yd start velocity
+    \param num_start_yd number of dimensions
+    \param start_ydd start acceleration
+    \param num_start_ydd number of dimensions
+    \param goal_t time at the end of the DMP
+    \param start_t time at the start of the DMP
+    \param weights weights of the forcing term for each sample, contains
+    num_samples * num_weights_per_dim * num_weight_dims entries in
+    row-major order
+    \param num_samples number of weight matrices
+    \param num_weights_per_dim number of features per dimension
+    \param num_weight_dims number of dimensions
+    \param widths widths of the radial basis functions (shared among DOFs)
+    \param num_widths number of RBFs
+    \param centers centers of the radial basis functions (shared among DOFs)
+    \param num_centers number of RBFs
+    \param Y positions (will be updated), contains
+    num_samples * num_T * num_dimensions entries in row-major order
+    \param num_Y_samples number of weight matrices
+    \param num_Y_steps number of steps
+    \param num_Y_dims number of dimensions
+    \param Yd velocities (will be updated)
+    \param num_Yd_samples number of weight matrices
+    \param num_Yd_steps number of steps
+    \param num_Yd_dims number of dimensions
+    \param Ydd accelerations (will be updated)
+    \param num_Ydd_samples number of weight matrices
+    \param num_Ydd_steps number of steps
+    \param num_Ydd_dims number of dimensions
+    \param alpha_y constant that has to be set for critical damping (default: 25)
+    \param beta_y constant that has to be set for critical damping (default: 25 / 4.0)
+    \param alpha_z decay rate of the phase variable (default: 25.0 / 3.0)
+    \param integration_dt temporal step-size that will be used to integrate the
+    velocity and position of the trajectory from the acceleration,
+    smaller values will require more computation but will reproduce the
+    demonstration more accurately
+    """
+    cdef double cpp_goal_t = goal_t
+    cdef double cpp_start_t = start_t
+    cdef double cpp_alpha_y = alpha_y
+    cdef double cpp_beta_y = beta_y
+    cdef double cpp_alpha_z = alpha_z
+    cdef double cpp_integration_dt = integration_dt
+    with nogil:
+        cpp.dmpTrajectories(&T[0], T.shape[0], &goal_y[0], goal_y.shape[0], &goal_yd[0], goal_yd.shape[0], &goal_ydd[0], goal_ydd.shape[0], &start_y[0], start_y.shape[0], &start_yd[0], start_yd.shape[0], &start_ydd[0], start_ydd.shape[0], cpp_goal_t, cpp_start_t, &weights[0, 0, 0], weights.shape[0], weights.shape[1], weights.shape[2], &widths[0], widths.shape[0], &centers[0], centers.shape[0], &Y[0, 0, 0], Y.shape[0], Y.shape[1], Y.shape[2], &Yd[0, 0, 0], Yd.shape[0], Yd.shape[1], Yd.shape[2], &Ydd[0, 0, 0], Ydd.shape[0], Ydd.shape[1], Ydd.shape[2], cpp_alpha_y, cpp_beta_y, cpp_alpha_z, cpp_integration_dt)
+
+cpdef dmp_segment_trajectories(const double[::1] T, const double[:, ::1] goal_y, const double[:, ::1] goal_yd, const double[:, ::1] goal_ydd, const double[:, ::1] start_y, const double[:, ::1] start_yd, const double[:, ::1] start_ydd, double goal_t, double start_t, const double[:, :, ::1] weights, const double[::1] widths, const double[::1] centers, double[:, :, ::1] Y, double[:, :, ::1] Yd, double[:, :, ::1] Ydd, double alpha_y, double beta_y, double alpha_z, double integration_dt):
+    """Generate open-loop trajectories of one DMP of a sequence for multiple
+    samples.
+    
+    In contrast to dmpTrajectories, each sample has its own start and goal and
+    the trajectories do not begin in the start state. The state of each sample
+    at T[0], e.g. the last state of the previous DMP of the sequence, has to
+    be set in the first step of Y, Yd, and Ydd and the remaining steps will be
+    integrated from it. This is equivalent to calling dmpStep for each of the
+    remaining time steps and each sample, where the outputs of the previous
+    step are the inputs of the next step. The activations of the RBFs are
+    computed only once per integration step for all samples.
+    
+    \param T time for each step of the trajectories
+    \param num_T number of steps
+    \param goal_y goal position of each sample
+    \param num_goal_y_samples number of samples
+    \param num_goal_y_dims number of dimensions
+    \param goal_yd goal velocity of each sample
+    \param num_goal_yd_samples number of samples
+    \param num_goal_yd_dims number of dimensions
+    \param goal_ydd goal acceleration of each sample
+    \param num_goal_ydd_samples number of samples
+    \param num_goal_ydd_dims number of dimensions
+    \param start_y start position of each sample
+    \param num_start_y_samples number of samples
+    \param num_start_y_dims number of dimensions
+    \param start_yd start velocity of each sample
+    \param num_start_yd_samples number of samples
+    \param num_start_yd_dims number of dimensions
+    \param start_ydd start acceleration of each sample
+    \param num_start_ydd_samples number of samples
+    \param num_start_ydd_dims number of dimensions
+    \param goal_t time at the end of the DMP
+    \param start_t time at the start of the DMP
+    \param weights weights of the forcing term for each sample, contains
+    num_samples * num_weights_per_dim * num_weight_dims entries in
+    row-major order
+    \param num_samples number of weight matrices
+    \param num_weights_per_dim number of features per dimension
+    \param num_weight_dims number of dimensions
+    \param widths widths of the radial basis functions (shared among DOFs)
+    \param num_widths number of RBFs
+    \param centers centers of the radial basis functions (shared among DOFs)
+    \param num_centers number of RBFs
+    \param Y positions (the first step has to be set, the others will be
+    updated), contains num_samples * num_T * num_dimensions entries in
+    row-major order
+    \param num_Y_samples number of samples
+    \param num_Y_steps number of steps
+    \param num_Y_dims number of dimensions
+    \param Yd velocities (the first step has to be set, the others will be
+    updated)
+    \param num_Yd_samples number of samples
+    \param num_Yd_steps number of steps
+    \param num_Yd_dims number of dimensions
+    \param Ydd accelerations (the first step has to be set, the others will be
+    updated)
+    \param num_Ydd_samples number of samples
+    \param num_Ydd_steps number of steps
+    \param num_Ydd_dims number of dimensions
+    \param alpha_y constant that has to be set for critical damping (default: 25)
+    \param beta_y constant that has to be set for critical damping (default: 25 / 4.0)
+    \param alpha_z decay rate of the phase variable (default: 25.0 / 3.0)
+    \param integration_dt temporal step-size that will be used to integrate the
+    velocity and position of the trajectory from the acceleration,
+    smaller values will require more computation but will reproduce the
+    demonstration more accurately
+    """
+    cdef double cpp_goal_t = goal_t
+    cdef double cpp_start_t = start_t
+    cdef double cpp_alpha_y = alpha_y
+    cdef double cpp_beta_y = beta_y
+    cdef double cpp_alpha_z = alpha_z
+    cdef double cpp_integration_dt = integration_dt
+    with nogil:
+        cpp.dmpSegmentTrajectories(&T[0], T.shape[0], &goal_y[0, 0], goal_y.shape[0], goal_y.shape[1], &goal_yd[0, 0], goal_yd.shape[0], goal_yd.shape[1], &goal_ydd[0, 0], goal_ydd.shape[0], goal_ydd.shape[1], &start_y[0, 0], start_y.shape[0], start_y.shape[1], &start_yd[0, 0], start_yd.shape[0], start_yd.shape[1], &start_ydd[0, 0], start_ydd.shape[0], start_ydd.shape[1], cpp_goal_t, cpp_start_t, &weights[0, 0, 0], weights.shape[0], weights.shape[1], weights.shape[2], &widths[0], widths.shape[0], &centers[0], centers.shape[0], &Y[0, 0, 0], Y.shape[0], Y.shape[1], Y.shape[2], &Yd[0, 0, 0], Yd.shape[0], Yd.shape[1], Yd.shape[2], &Ydd[0, 0, 0], Ydd.shape[0], Ydd.shape[1], Ydd.shape[2], cpp_alpha_y, cpp_beta_y, cpp_alpha_z, cpp_integration_dt)
+
+cpdef rbf_activation_table(const double[::1] T, double[:, ::1] phases, double[:, :, ::1] activations, const double[::1] widths, const double[::1] centers, double goal_t, double start_t, double alpha_z, double integration_dt):
+    """Precompute the phase and the normalized RBF activations for each
+    integration step of a sequence of DMP steps.
+    
+    The activations only depend on the time, hence, they can be reused for
+    every execution of a DMP with the same step size, execution time, and
+    decay rate of the phase variable. The integration steps between T[i - 1]
+    and T[i] are determined exactly like in dmpStep.
+    
+    \param T time for each step, the entries for T[0] will be 0
+    \param num_T number of steps
+    \param phases phase value of each integration step (will be updated),
+    unused entries will be 0
+    \param num_phases_steps number of steps
+    \param num_phases_substeps maximum number of integration steps per step
+    \param activations normalized activations of the RBFs for each
+    integration step (will be updated), unused entries will be 0
+    \param num_activations_steps number of steps
+    \param num_activations_substeps maximum number of integration steps per
+    step
+    \param num_activations_features number of RBFs
+    \param widths widths of the radial basis functions (shared among DOFs)
+    \param num_widths number of RBFs
+    \param centers centers of the radial basis functions (shared among DOFs)
+    \param num_centers number of RBFs
+    \param goal_t time at the end of the DMP
+    \param start_t time at the start of the DMP
+    \param alpha_z decay rate of the phase variable (default: 25.0 / 3.0)
+    \param integration_dt temporal step-size that will be used to integrate the
+    velocity and position of the trajectory from the acceleration
+    """
+    cdef double cpp_goal_t = goal_t
+    cdef double cpp_start_t = start_t
+    cdef double cpp_alpha_z = alpha_z
+    cdef double cpp_integration_dt = integration_dt
+    with nogil:
+        cpp.rbfActivationTable(&T[0], T.shape[0], &phases[0, 0], phases.shape[0], phases.shape[1], &activations[0, 0, 0], activations.shape[0], activations.shape[1], activations.shape[2], &widths[0], widths.shape[0], &centers[0], centers.shape[0], cpp_goal_t, cpp_start_t, cpp_alpha_z, cpp_integration_dt)
 
-cpdef quaternion_imitate(np.ndarray[double, ndim=1] T, np.ndarray[double, ndim=2] R, np.ndarray[double, ndim=2] weights, np.ndarray[double, ndim=1] widths, np.ndarray[double, ndim=1] centers, double regularization_coefficient, double alpha_r, double beta_r, double alpha_z, bool allow_final_velocity):
+cpdef dmp_step_precomputed(double last_t, double t, const double[::1] last_y, const double[::1] last_yd, const double[::1] last_ydd, double[::1] y, double[::1] yd, double[::1] ydd, const double[::1] goal_y, const double[::1] goal_yd, const double[::1] goal_ydd, const double[::1] start_y, const double[::1] start_yd, const double[::1] start_ydd, double goal_t, double start_t, const double[:, ::1] weights, const double[::1] phases, const double[:, ::1] activations, double alpha_y, double beta_y, double integration_dt):
+    """Execute one step of the DMP with precomputed RBF activations.
+    
+    This is equivalent to dmpStep, but the phase and the activations of the
+    RBFs for each integration step are taken from a row of the tables that
+    have been computed by rbfActivationTable.
+    
+    \param last_t time of last step (should equal t initially)
+    \param t current time
+    \param last_y last position
+    \param num_last_y number of dimensions
+    \param last_yd last velocity
+    \param num_last_yd number of dimensions
+    \param last_ydd last acceleration
+    \param num_last_ydd number of dimensions
+    \param y current position (will be updated)
+    \param num_y number of dimensions
+    \param yd velocity (will be updated)
+    \param num_yd number of dimensions
+    \param ydd acceleration (will be updated)
+    \param num_ydd number of dimensions
+    \param goal_y goal position
+    \param num_goal_y number of dimensions
+    \param goal_yd goal velocity
+    \param num_goal_yd number of dimensions
+    \param goal_ydd goal acceleration
+    \param num_goal_ydd number of dimensions
+    \param start_y start position
+    \param num_start_y number of dimensions
+    \param start_yd start velocity
+    \param num_start_yd number of dimensions
+    \param start_ydd start acceleration
+    \param num_start_ydd number of dimensions
+    \param goal_t time at the end of the DMP
+    \param start_t time at the start of the DMP
+    \param weights weights of the forcing term
+    \param num_weights_per_dim number of features per dimension
+    \param num_weight_dims number of dimensions
+    \param phases phase value of each integration step of this step
+    \param num_phases maximum number of integration steps
+    \param activations normalized activations of the RBFs for each
+    integration step of this step
+    \param num_activations_substeps maximum number of integration steps
+    \param num_activations_features number of RBFs
+    \param alpha_y constant that has to be set for critical damping (default: 25)
+    \param beta_y constant that has to be set for critical damping (default: 25 / 4.0)
+    \param integration_dt temporal step-size that will be used to integrate the
+    velocity and position of the trajectory from the acceleration,
+    must be the same that has been used to compute the activations
+    """
+    cdef double cpp_last_t = last_t
+    cdef double cpp_t = t
+    cdef double cpp_goal_t = goal_t
+    cdef double cpp_start_t = start_t
+    cdef double cpp_alpha_y = alpha_y
+    cdef double cpp_beta_y = beta_y
+    cdef double cpp_integration_dt = integration_dt
+    with nogil:
+        cpp.dmpStepPrecomputed(cpp_last_t, cpp_t, &last_y[0], last_y.shape[0], &last_yd[0], last_yd.shape[0], &last_ydd[0], last_ydd.shape[0], &y[0], y.shape[0], &yd[0], yd.shape[0], &ydd[0], ydd.shape[0], &goal_y[0], goal_y.shape[0], &goal_yd[0], goal_yd.shape[0], &goal_ydd[0], goal_ydd.shape[0], &start_y[0], start_y.shape[0], &start_yd[0], start_yd.shape[0], &start_ydd[0], start_ydd.shape[0], cpp_goal_t, cpp_start_t, &weights[0, 0], weights.shape[0], weights.shape[1], &phases[0], phases.shape[0], &activations[0, 0], activations.shape[0], activations.shape[1], cpp_alpha_y, cpp_beta_y, cpp_integration_dt)
+
+cpdef quaternion_imitate(const double[::1] T, const double[:, ::1] R, double[:, ::1] weights, const double[::1] widths, const double[::1] centers, double regularization_coefficient, double alpha_r, double beta_r, double alpha_z, bool allow_final_velocity):
     """Represent trajectory as quaternion DMP.
     
     \note The final velocity will be calculated by numeric differentiation
@@ -171,9 +462,10 @@ cpdef quaternion_imitate(np.ndarray[double, ndim=1] T, np.ndarray[double, ndim=2
     cdef double cpp_beta_r = beta_r
     cdef double cpp_alpha_z = alpha_z
     cdef bool cpp_allow_final_velocity = allow_final_velocity
-    cpp.quaternionImitate(&T[0], T.shape[0], &R[0, 0], R.shape[0], R.shape[1], &weights[0, 0], weights.shape[0], weights.shape[1], &widths[0], widths.shape[0], &centers[0], centers.shape[0], cpp_regularization_coefficient, cpp_alpha_r, cpp_beta_r, cpp_alpha_z, cpp_allow_final_velocity)
+    with nogil:
+        cpp.quaternionImitate(&T[0], T.shape[0], &R[0, 0], R.shape[0], R.shape[1], &weights[0, 0], weights.shape[0], weights.shape[1], &widths[0], widths.shape[0], &centers[0], centers.shape[0], cpp_regularization_coefficient, cpp_alpha_r, cpp_beta_r, cpp_alpha_z, cpp_allow_final_velocity)
 
-cpdef quaternion_dmp_step(double last_t, double t, np.ndarray[double, ndim=1] last_r, np.ndarray[double, ndim=1] last_rd, np.ndarray[double, ndim=1] last_rdd, np.ndarray[double, ndim=1] r, np.ndarray[double, ndim=1] rd, np.ndarray[double, ndim=1] rdd, np.ndarray[double, ndim=1] goal_r, np.ndarray[double, ndim=1] goal_rd, np.ndarray[double, ndim=1] goal_rdd, np.ndarray[double, ndim=1] start_r, np.ndarray[double, ndim=1] start_rd, np.ndarray[double, ndim=1] start_rdd, double goal_t, double start_t, np.ndarray[double, ndim=2] weights, np.ndarray[double, ndim=1] widths, np.ndarray[double, ndim=1] centers, double alpha_r, double beta_r, double alpha_z, double integration_dt):
+cpdef quaternion_dmp_step(double last_t, double t, const double[::1] last_r, const double[::1] last_rd, const double[::1] last_rdd, double[::1] r, double[::1] rd, double[::1] rdd, const double[::1] goal_r, const double[::1] goal_rd, const double[::1] goal_rdd, const double[::1] start_r, const double[::1] start_rd, const double[::1] start_rdd, double goal_t, double start_t, const double[:, ::1] weights, const double[::1] widths, const double[::1] centers, double alpha_r, double beta_r, double alpha_z, double integration_dt):
     """Execute one step of the Quaternion DMP.
     
     source: http://ieeexplore.ieee.org/document/6907291/?arnumber=6907291
@@ -229,12 +521,146 @@ cpdef quaternion_dmp_step(double last_t, double t, np.ndarray[double, ndim=1] la
     cdef double cpp_beta_r = beta_r
     cdef double cpp_alpha_z = alpha_z
     cdef double cpp_integration_dt = integration_dt
-    cpp.quaternionDmpStep(cpp_last_t, cpp_t, &last_r[0], last_r.shape[0], &last_rd[0], last_rd.shape[0], &last_rdd[0], last_rdd.shape[0], &r[0], r.shape[0], &rd[0], rd.shape[0], &rdd[0], rdd.shape[0], &goal_r[0], goal_r.shape[0], &goal_rd[0], goal_rd.shape[0], &goal_rdd[0], goal_rdd.shape[0], &start_r[0], start_r.shape[0], &start_rd[0], start_rd.shape[0], &start_rdd[0], start_rdd.shape[0], cpp_goal_t, cpp_start_t, &weights[0, 0], weights.shape[0], weights.shape[1], &widths[0], widths.shape[0], &centers[0], centers.shape[0], cpp_alpha_r, cpp_beta_r, cpp_alpha_z, cpp_integration_dt)
+    with nogil:
+        cpp.quaternionDmpStep(cpp_last_t, cpp_t, &last_r[0], last_r.shape[0], &last_rd[0], last_rd.shape[0], &last_rdd[0], last_rdd.shape[0], &r[0], r.shape[0], &rd[0], rd.shape[0], &rdd[0], rdd.shape[0], &goal_r[0], goal_r.shape[0], &goal_rd[0], goal_rd.shape[0], &goal_rdd[0], goal_rdd.shape[0], &start_r[0], start_r.shape[0], &start_rd[0], start_rd.shape[0], &start_rdd[0], start_rdd.shape[0], cpp_goal_t, cpp_start_t, &weights[0, 0], weights.shape[0], weights.shape[1], &widths[0], widths.shape[0], &centers[0], centers.shape[0], cpp_alpha_r, cpp_beta_r, cpp_alpha_z, cpp_integration_dt)
+
+cpdef quaternion_dmp_step_precomputed(double last_t, double t, const double[::1] last_r, const double[::1] last_rd, const double[::1] last_rdd, double[::1] r, double[::1] rd, double[::1] rdd, const double[::1] goal_r, const double[::1] goal_rd, const double[::1] goal_rdd, const double[::1] start_r, const double[::1] start_rd, const double[::1] start_rdd, double goal_t, double start_t, const double[:, ::1] weights, const double[::1] phases, const double[:, ::1] activations, double alpha_r, double beta_r, double integration_dt):
+    """Execute one step of the Quaternion DMP with precomputed RBF activations.
+    
+    This is equivalent to quaternionDmpStep, but the phase and the activations
+    of the RBFs for each integration step are taken from a row of the tables
+    that have been computed by rbfActivationTable.
+    
+    \param last_t time of last step (should equal t initially)
+    \param t current time
+    \param last_r last rotation
+    \param num_last_r should be 4
+    \param last_rd last rotational velocity
+    \param num_last_rd should be 3
+    \param last_rdd last rotational acceleration
+    \param num_last_rdd should be 3
+    \param r current rotation (will be updated)
+    \param num_r should be 4
+    \param rd rotational velocity (will be updated)
+    \param num_rd should be 3
+    \param rdd rotational acceleration (will be updated)
+    \param num_rdd should be 3
+    \param goal_r final rotation
+    \param num_goal_r should be 4
+    \param goal_rd final rotational velocity
+    \param num_goal_rd should be 3
+    \param goal_rdd final rotational acceleration
+    \param num_goal_rdd should be 3
+    \param start_r first rotation
+    \param num_start_r should be 4
+    \param start_rd first rotational velocity
+    \param num_start_rd should be 3
+    \param start_rdd first rotational acceleration
+    \param num_start_rdd should be 3
+    \param goal_t time at the end of the DMP
+    \param start_t time at the start of the DMP
+    \param weights weights of the forcing term
+    \param num_weights_per_dim number of features per dimension
+    \param num_weight_dims should be 3
+    \param phases phase value of each integration step of this step
+    \param num_phases maximum number of integration steps
+    \param activations normalized activations of the RBFs for each
+    integration step of this step
+    \param num_activations_substeps maximum number of integration steps
+    \param num_activations_features number of RBFs
+    \param alpha_r constant that has to be set for critical damping (default: 25)
+    \param beta_r constant that has to be set for critical damping (default: 25 / 4.0)
+    \param integration_dt temporal step-size that will be used to integrate the
+    velocity and position of the trajectory from the acceleration,
+    must be the same that has been used to compute the activations
+    """
+    cdef double cpp_last_t = last_t
+    cdef double cpp_t = t
+    cdef double cpp_goal_t = goal_t
+    cdef double cpp_start_t = start_t
+    cdef double cpp_alpha_r = alpha_r
+    cdef double cpp_beta_r = beta_r
+    cdef double cpp_integration_dt = integration_dt
+    with nogil:
+        cpp.quaternionDmpStepPrecomputed(cpp_last_t, cpp_t, &last_r[0], last_r.shape[0], &last_rd[0], last_rd.shape[0], &last_rdd[0], last_rdd.shape[0], &r[0], r.shape[0], &rd[0], rd.shape[0], &rdd[0], rdd.shape[0], &goal_r[0], goal_r.shape[0], &goal_rd[0], goal_rd.shape[0], &goal_rdd[0], goal_rdd.shape[0], &start_r[0], start_r.shape[0], &start_rd[0], start_rd.shape[0], &start_rdd[0], start_rdd.shape[0], cpp_goal_t, cpp_start_t, &weights[0, 0], weights.shape[0], weights.shape[1], &phases[0], phases.shape[0], &activations[0, 0], activations.shape[0], activations.shape[1], cpp_alpha_r, cpp_beta_r, cpp_integration_dt)
+
+cpdef cartesian_dmp_trajectories(const double[::1] T, const double[::1] goal_y, const double[::1] goal_yd, const double[::1] goal_ydd, const double[::1] start_y, const double[::1] start_yd, const double[::1] start_ydd, const double[::1] goal_r, const double[::1] start_r, const double[::1] start_rd, const double[::1] start_rdd, double goal_t, double start_t, const double[:, :, ::1] weights, const double[::1] widths, const double[::1] centers, double[:, :, ::1] X, double alpha_y, double beta_y, double alpha_z, double integration_dt):
+    """Generate open-loop pose trajectories of a Cartesian DMP for multiple weight
+    matrices.
+    
+    A Cartesian DMP consists of a DMP for the position and a quaternion DMP
+    for the orientation that share the phase variable and the RBFs. This is
+    equivalent to calling dmpStep and quaternionDmpStep for each time step and
+    each weight matrix, where the outputs of the previous step are the inputs
+    of the next step. The goal trajectory of the position and the activations
+    of the RBFs are computed only once per integration step for all weight
+    matrices.
+    
+    \param T time for each step of the trajectories, the state at T[0] will be
+    the start state if T[0] <= start_t
+    \param num_T number of steps
+    \param goal_y goal position
+    \param num_goal_y should be 3
+    \param goal_yd goal velocity
+    \param num_goal_yd should be 3
+    \param goal_ydd goal acceleration
+    \param num_goal_ydd should be 3
+    \param start_y start position
+    \param num_start_y should be 3
+    \param start_yd start velocity
+    \param num_start_yd should be 3
+    \param start_ydd start acceleration
+    \param num_start_ydd should be 3
+    \param goal_r final rotation
+    \param num_goal_r should be 4
+    \param start_r first rotation
+    \param num_start_r should be 4
+    \param start_rd first rotational velocity
+    \param num_start_rd should be 3
+    \param start_rdd first rotational acceleration
+    \param num_start_rdd should be 3
+    \param goal_t time at the end of the DMP
+    \param start_t time at the start of the DMP
+    \param weights weights of the forcing term for each sample, contains
+    num_samples * num_weights_per_dim * 6 entries in row-major order,
+    the first three columns of each weight matrix belong to the
+    position and the last three columns belong to the orientation
+    \param num_samples number of weight matrices
+    \param num_weights_per_dim number of features per dimension
+    \param num_weight_dims should be 6
+    \param widths widths of the radial basis functions (shared among DOFs)
+    \param num_widths number of RBFs
+    \param centers centers of the radial basis functions (shared among DOFs)
+    \param num_centers number of RBFs
+    \param X poses (will be updated), contains num_samples * num_T * 7
+    entries in row-major order, each pose is represented by a position
+    and a quaternion (order: x, y, z, qw, qx, qy, qz)
+    \param num_X_samples number of weight matrices
+    \param num_X_steps number of steps
+    \param num_X_dims should be 7
+    \param alpha_y constant that has to be set for critical damping (default: 25)
+    \param beta_y constant that has to be set for critical damping (default: 25 / 4.0)
+    \param alpha_z decay rate of the phase variable (default: 25.0 / 3.0)
+    \param integration_dt temporal step-size that will be used to integrate the
+    velocity and position of the trajectory from the acceleration,
+    smaller values will require more computation but will reproduce the
+    demonstration more accurately
+    """
+    cdef double cpp_goal_t = goal_t
+    cdef double cpp_start_t = start_t
+    cdef double cpp_alpha_y = alpha_y
+    cdef double cpp_beta_y = beta_y
+    cdef double cpp_alpha_z = alpha_z
+    cdef double cpp_integration_dt = integration_dt
+    with nogil:
+        cpp.cartesianDmpTrajectories(&T[0], T.shape[0], &goal_y[0], goal_y.shape[0], &goal_yd[0], goal_yd.shape[0], &goal_ydd[0], goal_ydd.shape[0], &start_y[0], start_y.shape[0], &start_yd[0], start_yd.shape[0], &start_ydd[0], start_ydd.shape[0], &goal_r[0], goal_r.shape[0], &start_r[0], start_r.shape[0], &start_rd[0], start_rd.shape[0], &start_rdd[0], start_rdd.shape[0], cpp_goal_t, cpp_start_t, &weights[0, 0, 0], weights.shape[0], weights.shape[1], weights.shape[2], &widths[0], widths.shape[0], &centers[0], centers.shape[0], &X[0, 0, 0], X.shape[0], X.shape[1], X.shape[2], cpp_alpha_y, cpp_beta_y, cpp_alpha_z, cpp_integration_dt)
 
-cpdef compute_gradient(np.ndarray[double, ndim=2] _in, np.ndarray[double, ndim=2] out, np.ndarray[double, ndim=1] time, bool allow_final_velocity):
+cpdef compute_gradient(const double[:, ::1] _in, double[:, ::1] out, const double[::1] time, bool allow_final_velocity):
     cdef bool cpp_allow_final_velocity = allow_final_velocity
-    cpp.compute_gradient(&_in[0, 0], _in.shape[0], _in.shape[1], &out[0, 0], out.shape[0], out.shape[1], &time[0], time.shape[0], cpp_allow_final_velocity)
+    with nogil:
+        cpp.compute_gradient(&_in[0, 0], _in.shape[0], _in.shape[1], &out[0, 0], out.shape[0], out.shape[1], &time[0], time.shape[0], cpp_allow_final_velocity)
 
-cpdef compute_quaternion_gradient(np.ndarray[double, ndim=2] _in, np.ndarray[double, ndim=2] out, np.ndarray[double, ndim=1] time, bool allow_final_velocity):
+cpdef compute_quaternion_gradient(const double[:, ::1] _in, double[:, ::1] out, const double[::1] time, bool allow_final_velocity):
     cdef bool cpp_allow_final_velocity = allow_final_velocity
-    cpp.compute_quaternion_gradient(&_in[0, 0], _in.shape[0], _in.shape[1], &out[0, 0], out.shape[0], out.shape[1], &time[0], time.shape[0], cpp_allow_final_velocity)
+    with nogil:
+        cpp.compute_quaternion_gradient(&_in[0, 0], _in.shape[0], _in.shape[1], &out[0, 0], out.shape[0], out.shape[1], &time[0], time.shape[0], cpp_allow_final_velocity)
@@ -1,8 +1,45 @@
+import re
 from pywrap.cython import make_cython_wrapper, write_files, run_setup
 from pywrap.defaultconfig import Config
 from pywrap.type_conversion import AbstractTypeConverter
 
 
+class DoubleArray3dTypeConverter(AbstractTypeConverter):
+    def matches(self):
+        if self.context is None:
+            return False
+        args, index = self.context
+        next_args_are_int = (
+            len(args) >= index + 4
+            and all(args[index + i].tipe in ["int", "unsigned int"]
+                    for i in range(1, 4)))
+        return self.tname == "double *" and next_args_are_int
+
+    def n_cpp_args(self):
+        return 4
+
+    def add_includes(self, includes):
+        includes.add_include_for_numpy()
+
+    def python_to_cpp(self):
+        return ""
+
+    def cpp_call_args(self):
+        return ["&%s[0, 0, 0]" % self.python_argname,
+                self.python_argname + ".shape[0]",
+                self.python_argname + ".shape[1]",
+                self.python_argname + ".shape[2]"]
+
+    def return_output(self, copy=True):
+        raise NotImplementedError("Cannot return double array")
+
+    def python_type_decl(self):
+        return "np.ndarray[double, ndim=3] %s" % self.python_argname
+
+    def cpp_type_decl(self):
+        raise NotImplementedError("Double array must provide additional size")
+
+
 class DoubleArray2dTypeConverter(AbstractTypeConverter):
     def matches(self):
         if self.context is None:
@@ -41,14 +78,71 @@ class DoubleArray2dTypeConverter(AbstractTypeConverter):
         raise NotImplementedError("Double array must provide additional size")
 
 
+def const_pointers(header):
+    """Names of const pointer arguments of each function in the header."""
+    result = {}
+    for name, args in re.findall(r"\n\w+ (\w+)\(([^)]*)\);", header):
+        args = re.findall(r"const double\* (\w+)", args)
+        # pywrap renames arguments that are Python keywords
+        result[name] = args + ["_" + arg for arg in args]
+    return result
+
+
+def release_gil(results, header):
+    """Use typed memoryviews and release the GIL during C++ calls.
+
+    Arrays are passed as C-contiguous typed memoryviews. Arguments that are
+    const pointers in C++ become const memoryviews so that read-only arrays
+    are accepted.
+    """
+    const_args = const_pointers(header)
+    layouts = {"1": "::1", "2": ":, ::1", "3": ":, :, ::1"}
+
+    declarations = results["_declarations.pxd"].replace('":\n', '" nogil:\n')
+
+    def make_const(match):
+        args = const_args.get(match.group(1), [])
+        return re.sub(r"double \* (\w+)",
+                      lambda m: ("const " if m.group(1) in args else "") +
+                      m.group(0), match.group(0))
+    declarations = re.sub(r"(\w+)\(.*\) except \+", make_const,
+                          declarations)
+    results["_declarations.pxd"] = declarations
+
+    lines = []
+    for line in results["dmp.pyx"].split("\n"):
+        if line.startswith("    cpp."):
+            lines.append("    with nogil:")
+            line = "    " + line
+        lines.append(line)
+    # Function signatures precede the calls, hence, we need a second pass
+    pyx = "\n".join(lines)
+    for signature in re.findall(r"cpdef .*\n(?:.*\n)*?    with nogil:\n"
+                                r"        cpp\.\w+", pyx):
+        cpp_name = signature.split("cpp.")[-1]
+        args = const_args.get(cpp_name, [])
+        new_signature = re.sub(
+            r"np\.ndarray\[double, ndim=(\d)\] (\w+)",
+            lambda m: "%sdouble[%s] %s" % (
+                "const " if m.group(2) in args else "",
+                layouts[m.group(1)], m.group(2)),
+            signature)
+        pyx = pyx.replace(signature, new_signature)
+    results["dmp.pyx"] = pyx
+
+
 def main():
     config = Config()
+    # 3d arrays must be matched before 2d arrays
+    config.registered_converters.append(DoubleArray3dTypeConverter)
     config.registered_converters.append(DoubleArray2dTypeConverter)
 
     results = make_cython_wrapper(
         "../src/Dmp.h", ["../src/Dmp.cpp"], "dmp", ".", config,
         ["../src"], verbose=0)
     del results["setup.py"]
+    with open("../src/Dmp.h", "r") as f:
+        release_gil(results, f.read())
     write_files(results, ".")
     run_setup("setup.py")
 
@@ -1,7 +1,8 @@
 import numpy as np
 import dmp
-from numpy.testing import assert_array_almost_equal
-from nose.tools import assert_raises_regexp, assert_less, assert_almost_equal
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+from nose.tools import (assert_raises_regexp, assert_less, assert_almost_equal,
+                        assert_equal)
 
 
 def test_compute_gradient():
@@ -202,6 +203,286 @@ def test_step():
     assert_array_almost_equal(ydd, gdd, decimal=4)
 
 
+def test_trajectories():
+    n_weights = 10
+    execution_time = 1.0
+    alpha = 25.0
+    widths = np.empty(n_weights)
+    centers = np.empty(n_weights)
+    dmp.initialize_rbf(widths, centers, execution_time, 0.0, 0.8, alpha / 3.0)
+
+    random_state = np.random.RandomState(0)
+    weights = 100.0 * random_state.randn(3, n_weights, 2)
+    start_y = np.array([0.0, 1.0])
+    goal_y = np.array([1.0, -1.0])
+    zeros = np.zeros(2)
+
+    T = np.linspace(0.0, execution_time, 101)
+    Y = np.empty((3, 101, 2))
+    Yd = np.empty((3, 101, 2))
+    Ydd = np.empty((3, 101, 2))
+    dmp.dmp_trajectories(
+        T, goal_y, zeros, zeros, start_y, zeros, zeros, execution_time, 0.0,
+        weights, widths, centers, Y, Yd, Ydd,
+        alpha, alpha / 4.0, alpha / 3.0, 0.001)
+
+    for i in range(3):
+        last_t = 0.0
+        last_y = start_y.copy()
+        last_yd = np.zeros(2)
+        last_ydd = np.zeros(2)
+        y = np.empty(2)
+        yd = np.empty(2)
+        ydd = np.empty(2)
+        for j, t in enumerate(T):
+            dmp.dmp_step(
+                last_t, t,
+                last_y, last_yd, last_ydd,
+                y, yd, ydd,
+                goal_y, zeros, zeros,
+                start_y, zeros, zeros,
+                execution_time, 0.0,
+                weights[i],
+                widths,
+                centers,
+                alpha, alpha / 4.0, alpha / 3.0,
+                0.001
+            )
+            last_t = t
+            last_y[:] = y
+            last_yd[:] = yd
+            last_ydd[:] = ydd
+            assert_array_almost_equal(Y[i, j], y)
+            assert_array_almost_equal(Yd[i, j], yd)
+            assert_array_almost_equal(Ydd[i, j], ydd)
+
+
+def test_trajectories_wrong_shape():
+    n_weights = 10
+    widths = np.empty(n_weights)
+    centers = np.empty(n_weights)
+    dmp.initialize_rbf(widths, centers, 1.0, 0.0, 0.8, 25.0 / 3.0)
+    zeros = np.zeros(1)
+    T = np.linspace(0.0, 1.0, 101)
+    Y = np.empty((2, 100, 1))
+    assert_raises_regexp(
+        ValueError, "wrong shape", dmp.dmp_trajectories,
+        T, zeros, zeros, zeros, zeros, zeros, zeros, 1.0, 0.0,
+        np.zeros((2, n_weights, 1)), widths, centers, Y, Y.copy(), Y.copy(),
+        25.0, 25.0 / 4.0, 25.0 / 3.0, 0.001)
+
+
+def test_segment_trajectories():
+    n_weights = 10
+    execution_time = 1.0
+    alpha = 25.0
+    widths = np.empty(n_weights)
+    centers = np.empty(n_weights)
+    dmp.initialize_rbf(widths, centers, execution_time, 0.0, 0.8, alpha / 3.0)
+
+    random_state = np.random.RandomState(0)
+    weights = 100.0 * random_state.randn(3, n_weights, 2)
+    start_y = random_state.randn(3, 2)
+    start_yd = random_state.randn(3, 2)
+    goal_y = random_state.randn(3, 2)
+    goal_yd = random_state.randn(3, 2)
+    zeros = np.zeros((3, 2))
+
+    # The segment starts before the DMP in a state that differs from its start
+    T = np.linspace(-0.1, execution_time, 111)
+    Y = np.empty((3, 111, 2))
+    Yd = np.empty((3, 111, 2))
+    Ydd = np.empty((3, 111, 2))
+    Y[:, 0] = random_state.randn(3, 2)
+    Yd[:, 0] = random_state.randn(3, 2)
+    Ydd[:, 0] = random_state.randn(3, 2)
+    initial_states = (Y[:, 0].copy(), Yd[:, 0].copy(), Ydd[:, 0].copy())
+    dmp.dmp_segment_trajectories(
+        T, goal_y, goal_yd, zeros, start_y, start_yd, zeros, execution_time,
+        0.0, weights, widths, centers, Y, Yd, Ydd,
+        alpha, alpha / 4.0, alpha / 3.0, 0.001)
+
+    for i in range(3):
+        assert_array_almost_equal(Y[i, 0], initial_states[0][i])
+        assert_array_almost_equal(Yd[i, 0], initial_states[1][i])
+        assert_array_almost_equal(Ydd[i, 0], initial_states[2][i])
+        last_y = Y[i, 0].copy()
+        last_yd = Yd[i, 0].copy()
+        last_ydd = Ydd[i, 0].copy()
+        y = np.empty(2)
+        yd = np.empty(2)
+        ydd = np.empty(2)
+        for j in range(1, len(T)):
+            dmp.dmp_step(
+                T[j - 1], T[j],
+                last_y, last_yd, last_ydd,
+                y, yd, ydd,
+                goal_y[i], goal_yd[i], zeros[i],
+                start_y[i], start_yd[i], zeros[i],
+                execution_time, 0.0,
+                weights[i],
+                widths,
+                centers,
+                alpha, alpha / 4.0, alpha / 3.0,
+                0.001
+            )
+            last_y[:] = y
+            last_yd[:] = yd
+            last_ydd[:] = ydd
+            assert_array_almost_equal(Y[i, j], y)
+            assert_array_almost_equal(Yd[i, j], yd)
+            assert_array_almost_equal(Ydd[i, j], ydd)
+
+
+def test_segment_trajectories_wrong_number_of_samples():
+    n_weights = 10
+    widths = np.empty(n_weights)
+    centers = np.empty(n_weights)
+    dmp.initialize_rbf(widths, centers, 1.0, 0.0, 0.8, 25.0 / 3.0)
+    zeros = np.zeros((2, 1))
+    T = np.linspace(0.0, 1.0, 101)
+    Y = np.empty((2, 101, 1))
+    assert_raises_regexp(
+        ValueError, "number of samples", dmp.dmp_segment_trajectories,
+        T, zeros, zeros, zeros, np.zeros((3, 1)), zeros, zeros, 1.0, 0.0,
+        np.zeros((2, n_weights, 1)), widths, centers, Y, Y.copy(), Y.copy(),
+        25.0, 25.0 / 4.0, 25.0 / 3.0, 0.001)
+
+
+def test_step_read_only_inputs():
+    n_weights = 10
+    widths = np.empty(n_weights)
+    centers = np.empty(n_weights)
+    dmp.initialize_rbf(widths, centers, 1.0, 0.0, 0.8, 25.0 / 3.0)
+    weights = np.zeros((n_weights, 1))
+    inputs = [np.zeros(1), np.zeros(1), np.zeros(1), np.ones(1), np.zeros(1),
+              np.zeros(1), np.zeros(1), np.zeros(1), np.zeros(1),
+              weights, widths, centers]
+    for a in inputs:
+        a.setflags(write=False)
+    y = np.empty(1)
+    yd = np.empty(1)
+    ydd = np.empty(1)
+    last_y, last_yd, last_ydd, g, gd, gdd, y0, y0d, y0dd = inputs[:9]
+    dmp.dmp_step(0.0, 0.01, last_y, last_yd, last_ydd, y, yd, ydd,
+                 g, gd, gdd, y0, y0d, y0dd, 1.0, 0.0, weights, widths,
+                 centers, 25.0, 25.0 / 4.0, 25.0 / 3.0, 0.001)
+    assert_less(0.0, y[0])
+
+
+def test_step_non_contiguous():
+    n_weights = 10
+    widths = np.empty(n_weights)
+    centers = np.empty(n_weights)
+    dmp.initialize_rbf(widths, centers, 1.0, 0.0, 0.8, 25.0 / 3.0)
+    zeros = np.zeros(2)
+    y = np.empty(2)
+    assert_raises_regexp(
+        ValueError, "contiguous", dmp.dmp_step,
+        0.0, 0.01, zeros, zeros, zeros, y, y.copy(), y.copy(),
+        np.ones(2), zeros, zeros, zeros, zeros, zeros, 1.0, 0.0,
+        np.zeros((2, n_weights)).T, widths, centers,
+        25.0, 25.0 / 4.0, 25.0 / 3.0, 0.001)
+
+
+def _activation_table(T, widths, centers, alpha_z):
+    n_substeps = int(np.ceil(np.max(np.diff(T)) / 0.001)) + 1
+    phases = np.empty((len(T), n_substeps))
+    activations = np.empty((len(T), n_substeps, len(widths)))
+    dmp.rbf_activation_table(T, phases, activations, widths, centers,
+                             T[-1], T[0], alpha_z, 0.001)
+    return phases, activations
+
+
+def test_rbf_activation_table():
+    n_weights = 10
+    alpha_z = 25.0 / 3.0
+    widths = np.empty(n_weights)
+    centers = np.empty(n_weights)
+    dmp.initialize_rbf(widths, centers, 1.0, 0.0, 0.8, alpha_z)
+    T = np.linspace(0.0, 1.0, 101)
+    phases, activations = _activation_table(T, widths, centers, alpha_z)
+    n_substeps = phases.shape[1]
+    assert_equal(phases.shape, (101, n_substeps))
+    assert_equal(activations.shape, (101, n_substeps, n_weights))
+    assert_array_almost_equal(phases[0], np.zeros(n_substeps))
+    assert_array_almost_equal(activations[0], np.zeros((n_substeps, n_weights)))
+    # every step from T[i - 1] to T[i] consists of 10 integration steps
+    used = phases > 0.0
+    assert_array_almost_equal(used[1:].sum(axis=1), 10 * np.ones(100))
+    assert_array_almost_equal(activations[used].sum(axis=1), np.ones(1000))
+    assert_less(phases[-1, 9], phases[1, 0])
+
+
+def test_rbf_activation_table_not_enough_substeps():
+    n_weights = 10
+    widths = np.empty(n_weights)
+    centers = np.empty(n_weights)
+    dmp.initialize_rbf(widths, centers, 1.0, 0.0, 0.8, 25.0 / 3.0)
+    T = np.linspace(0.0, 1.0, 11)
+    assert_raises_regexp(
+        ValueError, "Not enough integration steps", dmp.rbf_activation_table,
+        T, np.empty((11, 5)), np.empty((11, 5, n_weights)), widths, centers,
+        1.0, 0.0, 25.0 / 3.0, 0.001)
+
+
+def test_step_precomputed():
+    n_weights = 10
+    alpha = 25.0
+    widths = np.empty(n_weights)
+    centers = np.empty(n_weights)
+    dmp.initialize_rbf(widths, centers, 1.0, 0.0, 0.8, alpha / 3.0)
+    T = np.linspace(0.0, 1.0, 101)
+    phases, activations = _activation_table(T, widths, centers, alpha / 3.0)
+    weights = 100.0 * np.random.RandomState(0).randn(n_weights, 2)
+
+    zeros = np.zeros(2)
+    g = np.array([1.0, -1.0])
+    last_y = np.zeros(2)
+    last_yd = np.zeros(2)
+    last_ydd = np.zeros(2)
+    y = np.empty(2)
+    yd = np.empty(2)
+    ydd = np.empty(2)
+    y_precomputed = np.empty(2)
+    yd_precomputed = np.empty(2)
+    ydd_precomputed = np.empty(2)
+    for i in range(1, len(T)):
+        dmp.dmp_step(
+            T[i - 1], T[i], last_y, last_yd, last_ydd, y, yd, ydd,
+            g, zeros, zeros, zeros, zeros, zeros, 1.0, 0.0,
+            weights, widths, centers, alpha, alpha / 4.0, alpha / 3.0, 0.001)
+        dmp.dmp_step_precomputed(
+            T[i - 1], T[i], last_y, last_yd, last_ydd,
+            y_precomputed, yd_precomputed, ydd_precomputed,
+            g, zeros, zeros, zeros, zeros, zeros, 1.0, 0.0,
+            weights, phases[i], activations[i], alpha, alpha / 4.0, 0.001)
+        assert_array_equal(y, y_precomputed)
+        assert_array_equal(yd, yd_precomputed)
+        assert_array_equal(ydd, ydd_precomputed)
+        last_y[:] = y
+        last_yd[:] = yd
+        last_ydd[:] = ydd
+
+
+def test_step_precomputed_not_enough_substeps():
+    n_weights = 10
+    alpha = 25.0
+    widths = np.empty(n_weights)
+    centers = np.empty(n_weights)
+    dmp.initialize_rbf(widths, centers, 1.0, 0.0, 0.8, alpha / 3.0)
+    T = np.linspace(0.0, 1.0, 101)
+    phases, activations = _activation_table(T, widths, centers, alpha / 3.0)
+    zeros = np.zeros(1)
+    assert_raises_regexp(
+        ValueError, "Not enough precomputed integration steps",
+        dmp.dmp_step_precomputed,
+        0.0, 0.1, zeros, zeros, zeros, np.empty(1), np.empty(1), np.empty(1),
+        np.ones(1), zeros, zeros, zeros, zeros, zeros, 1.0, 0.0,
+        np.zeros((n_weights, 1)), phases[1], activations[1],
+        alpha, alpha / 4.0, 0.001)
+
+
 def test_imitate():
     T = np.linspace(0, 2, 101)
     n_features = 9
@@ -262,6 +543,68 @@ def test_imitate():
     assert_less(np.mean(distances), 0.02)
 
 
+
+def test_imitate_batch_independent():
+    T = np.linspace(0, 2, 101)
+    n_features = 9
+    widths = np.empty(n_features)
+    centers = np.empty(n_features)
+    dmp.initialize_rbf(widths, centers, T[-1], T[0], 0.8, 25.0 / 3.0)
+    Y = np.empty((3, len(T), 2))
+    for d in range(3):
+        Y[d, :, 0] = (d + 1) * T
+        Y[d, :, 1] = np.cos((d + 1) * np.pi * T)
+    alpha = 25.0
+
+    weights = np.empty((3, n_features, 2))
+    dmp.imitate_batch(T, Y, weights, widths, centers, 1e-10, alpha,
+                      alpha / 4.0, alpha / 3.0, False)
+
+    for d in range(3):
+        weights_single = np.empty((n_features, 2))
+        dmp.imitate(T, Y[d], weights_single, widths, centers, 1e-10, alpha,
+                    alpha / 4.0, alpha / 3.0, False)
+        assert_array_almost_equal(weights[d], weights_single)
+
+
+def test_imitate_batch_stacked():
+    T = np.linspace(0, 2, 101)
+    n_features = 9
+    widths = np.empty(n_features)
+    centers = np.empty(n_features)
+    dmp.initialize_rbf(widths, centers, T[-1], T[0], 0.8, 25.0 / 3.0)
+    Y = np.empty((2, len(T), 2))
+    Y[:, :, 0] = T
+    Y[0, :, 1] = np.cos(np.pi * T)
+    Y[1, :, 1] = np.cos(np.pi * T) + 0.1 * np.sin(3 * np.pi * T)
+    alpha = 25.0
+
+    weights = np.empty((1, n_features, 2))
+    dmp.imitate_batch(T, Y, weights, widths, centers, 0.0, alpha,
+                      alpha / 4.0, alpha / 3.0, False)
+
+    # Without regularization the forcing term is linear in the
+    # demonstrations, hence, we fit the mean demonstration
+    weights_mean = np.empty((n_features, 2))
+    dmp.imitate(T, Y.mean(axis=0), weights_mean, widths, centers, 0.0,
+                alpha, alpha / 4.0, alpha / 3.0, False)
+    assert_array_almost_equal(weights[0], weights_mean)
+
+
+def test_imitate_batch_wrong_number_of_weights():
+    T = np.linspace(0, 2, 101)
+    n_features = 9
+    widths = np.empty(n_features)
+    centers = np.empty(n_features)
+    dmp.initialize_rbf(widths, centers, T[-1], T[0], 0.8, 25.0 / 3.0)
+    Y = np.zeros((3, len(T), 2))
+    weights = np.empty((2, n_features, 2))
+    alpha = 25.0
+    assert_raises_regexp(
+        ValueError, "Number of weight matrices",
+        dmp.imitate_batch, T, Y, weights, widths, centers, 1e-10, alpha,
+        alpha / 4.0, alpha / 3.0, False)
+
 def test_quaternion_step_invalid_times():
     last_r = np.array([0.0, 1.0, 0.0, 0.0])
     last_rd = np.array([0.0, 0.0, 0.0])
@@ -362,6 +705,122 @@ def test_quaternion_step():
     assert_array_almost_equal(rdd, gdd, decimal=2)
 
 
+def test_quaternion_step_precomputed():
+    n_weights = 10
+    alpha = 25.0
+    widths = np.empty(n_weights)
+    centers = np.empty(n_weights)
+    dmp.initialize_rbf(widths, centers, 1.0, 0.0, 0.8, alpha / 3.0)
+    T = np.linspace(0.0, 1.0, 101)
+    phases, activations = _activation_table(T, widths, centers, alpha / 3.0)
+    weights = 100.0 * np.random.RandomState(0).randn(n_weights, 3)
+
+    zeros = np.zeros(3)
+    r0 = np.array([0.0, 1.0, 0.0, 0.0])
+    g = np.array([0.0, 0.0, 7.07106781e-01, 7.07106781e-01])
+    last_r = r0.copy()
+    last_rd = np.zeros(3)
+    last_rdd = np.zeros(3)
+    r = np.empty(4)
+    rd = np.empty(3)
+    rdd = np.empty(3)
+    r_precomputed = np.empty(4)
+    rd_precomputed = np.empty(3)
+    rdd_precomputed = np.empty(3)
+    for i in range(1, len(T)):
+        dmp.quaternion_dmp_step(
+            T[i - 1], T[i], last_r, last_rd, last_rdd, r, rd, rdd,
+            g, zeros, zeros, r0, zeros, zeros, 1.0, 0.0,
+            weights, widths, centers, alpha, alpha / 4.0, alpha / 3.0, 0.001)
+        dmp.quaternion_dmp_step_precomputed(
+            T[i - 1], T[i], last_r, last_rd, last_rdd,
+            r_precomputed, rd_precomputed, rdd_precomputed,
+            g, zeros, zeros, r0, zeros, zeros, 1.0, 0.0,
+            weights, phases[i], activations[i], alpha, alpha / 4.0, 0.001)
+        assert_array_equal(r, r_precomputed)
+        assert_array_equal(rd, rd_precomputed)
+        assert_array_equal(rdd, rdd_precomputed)
+        last_r[:] = r
+        last_rd[:] = rd
+        last_rdd[:] = rdd
+
+
+def test_cartesian_trajectories():
+    n_weights = 10
+    execution_time = 1.0
+    alpha = 25.0
+    widths = np.empty(n_weights)
+    centers = np.empty(n_weights)
+    dmp.initialize_rbf(widths, centers, execution_time, 0.0, 0.8, alpha / 3.0)
+
+    random_state = np.random.RandomState(0)
+    weights = 100.0 * random_state.randn(3, n_weights, 6)
+    start_y = np.array([0.0, 1.0, 2.0])
+    goal_y = np.array([1.0, -1.0, 0.5])
+    start_r = np.array([1.0, 0.0, 0.0, 0.0])
+    goal_r = np.array([0.0, 0.0, 1.0, 0.0])
+    zeros = np.zeros(3)
+
+    T = np.linspace(0.0, execution_time, 101)
+    X = np.empty((3, 101, 7))
+    dmp.cartesian_dmp_trajectories(
+        T, goal_y, zeros, zeros, start_y, zeros, zeros,
+        goal_r, start_r, zeros, zeros, execution_time, 0.0,
+        weights, widths, centers, X, alpha, alpha / 4.0, alpha / 3.0, 0.001)
+
+    for i in range(3):
+        position_weights = weights[i, :, :3].copy()
+        orientation_weights = weights[i, :, 3:].copy()
+        last_t = 0.0
+        last_y = start_y.copy()
+        last_yd = np.zeros(3)
+        last_ydd = np.zeros(3)
+        last_r = start_r.copy()
+        last_rd = np.zeros(3)
+        last_rdd = np.zeros(3)
+        y = np.empty(3)
+        yd = np.empty(3)
+        ydd = np.empty(3)
+        r = np.empty(4)
+        rd = np.empty(3)
+        rdd = np.empty(3)
+        for j, t in enumerate(T):
+            dmp.dmp_step(
+                last_t, t, last_y, last_yd, last_ydd, y, yd, ydd,
+                goal_y, zeros, zeros, start_y, zeros, zeros,
+                execution_time, 0.0, position_weights, widths, centers,
+                alpha, alpha / 4.0, alpha / 3.0, 0.001)
+            dmp.quaternion_dmp_step(
+                last_t, t, last_r, last_rd, last_rdd, r, rd, rdd,
+                goal_r, zeros, zeros, start_r, zeros, zeros,
+                execution_time, 0.0, orientation_weights, widths, centers,
+                alpha, alpha / 4.0, alpha / 3.0, 0.001)
+            last_t = t
+            last_y[:] = y
+            last_yd[:] = yd
+            last_ydd[:] = ydd
+            last_r[:] = r
+            last_rd[:] = rd
+            last_rdd[:] = rdd
+            assert_array_equal(X[i, j, :3], y)
+            assert_array_equal(X[i, j, 3:], r)
+
+
+def test_cartesian_trajectories_wrong_shape():
+    n_weights = 10
+    widths = np.empty(n_weights)
+    centers = np.empty(n_weights)
+    dmp.initialize_rbf(widths, centers, 1.0, 0.0, 0.8, 25.0 / 3.0)
+    zeros = np.zeros(3)
+    q = np.array([1.0, 0.0, 0.0, 0.0])
+    T = np.linspace(0.0, 1.0, 101)
+    assert_raises_regexp(
+        ValueError, "wrong shape", dmp.cartesian_dmp_trajectories,
+        T, zeros, zeros, zeros, zeros, zeros, zeros, q, q, zeros, zeros,
+        1.0, 0.0, np.zeros((2, n_weights, 6)), widths, centers,
+        np.empty((2, 101, 6)), 25.0, 25.0 / 4.0, 25.0 / 3.0, 0.001)
+
+
 def test_quaternion_imitate():
     T = np.linspace(0, 2, 101)
     n_features = 20
@@ -176,6 +176,122 @@ const Eigen::ArrayXd forcingTerm(
 );
 
 
+/**
+ * Integrate the transformation system of a DMP from last_t to t.
+ *
+ * \param forces computes the forcing term of the i-th integration step at
+ *        the given time: forces(i, current_t)
+ */
+template <typename ForcingTerm>
+void integrate(
+  const double last_t,
+  const double t,
+  const double execution_time,
+  const Eigen::ArrayXd& goal_y,
+  const double goal_t,
+  const std::vector<Eigen::Matrix<double, 6, 1>, Eigen::aligned_allocator<Eigen::Matrix<double, 6, 1> > >& coefficients,
+  Eigen::Map<Eigen::ArrayXd>& y,
+  Eigen::Map<Eigen::ArrayXd>& yd,
+  Eigen::Map<Eigen::ArrayXd>& ydd,
+  const double alpha_y,
+  const double beta_y,
+  const double integration_dt,
+  ForcingTerm forces
+)
+{
+  Eigen::ArrayXd g(y.size());
+  Eigen::ArrayXd gd(y.size());
+  Eigen::ArrayXd gdd(y.size());
+  const double execution_time_squared = execution_time * execution_time;
+
+  // We use multiple integration steps to improve numerical precision
+  double current_t = last_t;
+  int i = 0;
+  while(current_t < t)
+  {
+    double dt_int = integration_dt;
+    if(t - current_t < dt_int)
+      dt_int = t - current_t;
+
+    current_t += dt_int;
+
+    const Eigen::ArrayXd f = forces(i++, current_t);
+
+    applyConstraints(current_t, goal_y, goal_t, coefficients, g, gd, gdd);
+    ydd = (alpha_y
+           * (beta_y * (g - y)
+              + execution_time * gd
+              - execution_time * yd)
+           + gdd * execution_time_squared + f)
+          / execution_time_squared;
+    y += dt_int * yd;
+    yd += dt_int * ydd;
+  }
+  assert(current_t == t);
+}
+
+
+/**
+ * Integrate the transformation system of a quaternion DMP from last_t to t.
+ *
+ * \param forces computes the forcing term of the i-th integration step at
+ *        the given time: forces(i, current_t)
+ */
+template <typename ForcingTerm>
+void quaternionIntegrate(
+  const double last_t,
+  const double t,
+  const double execution_time,
+  const Eigen::Quaterniond& goal_r,
+  Eigen::Quaterniond& r,
+  Eigen::Map<Eigen::ArrayXd>& rd,
+  Eigen::Map<Eigen::ArrayXd>& rdd,
+  const double alpha_r,
+  const double beta_r,
+  const double integration_dt,
+  ForcingTerm forces
+)
+{
+  const double execution_time_squared = execution_time * execution_time;
+
+  // We use multiple integration steps to improve numerical precision
+  double current_t = last_t;
+  int i = 0;
+  while(current_t < t)
+  {
+    double dt_int = integration_dt;
+    if(t - current_t < dt_int)
+      dt_int = t - current_t;
+
+    current_t += dt_int;
+
+    const Eigen::ArrayXd f = forces(i++, current_t);
+
+    rdd = (alpha_r * (beta_r * 2.0 * qLog(goal_r * r.conjugate())
+                      - execution_time * rd)
+           + f)
+          / execution_time_squared;
+    r = vecExp(dt_int / 2.0 * rd) * r;
+    rd += dt_int * rdd;
+  }
+  assert(current_t == t);
+}
+
+
+/**
+ * Forcing term of the i-th integration step with precomputed phases and RBF
+ * activations, each column of the activations belongs to one integration
+ * step.
+ */
+const Eigen::ArrayXd precomputedForcingTerm(
+  const int i,
+  const double* phases,
+  const int num_phases,
+  const Eigen::Map<const Eigen::ArrayXXd>& activations,
+  const Eigen::Map<const Eigen::ArrayXXd>& weights
+);
+
+
 double calculateAlpha(
   const double goal_z,
   const double goal_t,
@@ -234,63 +350,668 @@ void initializeRbf(
     const double diff = centers_array(i) - centers_array(i - 1);
     widths_array(i - 1) = logOverlap / (diff * diff);
   }
-  // Width of last gausian cannot be calculated, just use the same width as the one before
-  widths_array(num_weights_per_dim - 1) = widths_array(num_weights_per_dim - 2);
+  // Width of last gausian cannot be calculated, just use the same width as the one before
+  widths_array(num_weights_per_dim - 1) = widths_array(num_weights_per_dim - 2);
+}
+
+
+void imitate(
+  const double* T,
+  int num_T,
+  const double* Y,
+  int num_steps,
+  int num_task_dims,
+  double* weights,
+  int num_weights_per_dim,
+  int num_weight_dims,
+  const double* widths,
+  int num_widths,
+  const double* centers,
+  int num_centers,
+  const double regularization_coefficient,
+  const double alpha_y,
+  const double beta_y,
+  const double alpha_z,
+  bool allow_final_velocity
+)
+{
+  assert(num_steps == num_T);
+  assert(num_weights_per_dim == num_widths);
+  assert(num_weights_per_dim == num_centers);
+  assert(num_task_dims == num_weight_dims);
+
+  if(regularization_coefficient < 0.0)
+  {
+    throw std::invalid_argument("Regularization coefficient must be >= 0!");
+  }
+  else if(regularization_coefficient == 0.0 && num_weights_per_dim >= num_T)
+  {
+    throw std::invalid_argument(
+        "If the regularization coefficient is set to zero, the number of "
+        "samples must be greater than number of weights per dimension. "
+        "Otherwise this will result in an instable learning problem.");
+  }
+
+  Eigen::Map<const Eigen::ArrayXd> widths_array(widths, num_widths);
+  Eigen::Map<const Eigen::ArrayXd> centers_array(centers, num_centers);
+
+  Eigen::ArrayXd T_array = Eigen::Map<const Eigen::ArrayXd>(T, num_T);
+  Eigen::ArrayXXd Y_array = Eigen::Map<const Eigen::ArrayXXd>(Y, num_task_dims, num_steps);
+  Eigen::ArrayXXd F(num_task_dims, num_steps);
+  determineForces(T_array, Y_array, F, alpha_y, beta_y, allow_final_velocity);
+
+  const Eigen::MatrixXd X = rbfDesignMatrix(T_array, alpha_z, widths_array, centers_array);
+
+  Eigen::Map<Eigen::ArrayXXd> weights_array(weights, num_task_dims, num_weights_per_dim);
+  ridgeRegression(X, F, regularization_coefficient, weights_array);
+}
+
+void imitateBatch(
+  const double* T,
+  int num_T,
+  const double* Y,
+  int num_demos,
+  int num_steps,
+  int num_task_dims,
+  double* weights,
+  int num_samples,
+  int num_weights_per_dim,
+  int num_weight_dims,
+  const double* widths,
+  int num_widths,
+  const double* centers,
+  int num_centers,
+  const double regularization_coefficient,
+  const double alpha_y,
+  const double beta_y,
+  const double alpha_z,
+  bool allow_final_velocity
+)
+{
+  assert(num_steps == num_T);
+  assert(num_weights_per_dim == num_widths);
+  assert(num_weights_per_dim == num_centers);
+  assert(num_task_dims == num_weight_dims);
+
+  if(num_samples != 1 && num_samples != num_demos)
+  {
+    throw std::invalid_argument(
+        "Number of weight matrices must be 1 or the number of demonstrations!");
+  }
+  if(regularization_coefficient < 0.0)
+  {
+    throw std::invalid_argument("Regularization coefficient must be >= 0!");
+  }
+  else if(regularization_coefficient == 0.0 && num_weights_per_dim >= num_T)
+  {
+    throw std::invalid_argument(
+        "If the regularization coefficient is set to zero, the number of "
+        "samples must be greater than number of weights per dimension. "
+        "Otherwise this will result in an instable learning problem.");
+  }
+
+  Eigen::Map<const Eigen::ArrayXd> widths_array(widths, num_widths);
+  Eigen::Map<const Eigen::ArrayXd> centers_array(centers, num_centers);
+
+  Eigen::ArrayXd T_array = Eigen::Map<const Eigen::ArrayXd>(T, num_T);
+  const Eigen::MatrixXd X = rbfDesignMatrix(T_array, alpha_z, widths_array, centers_array);
+
+  // Each block of num_task_dims rows contains the forces of one demonstration
+  const int num_targets = num_samples == 1 ? num_task_dims : num_demos * num_task_dims;
+  Eigen::ArrayXXd targets = Eigen::ArrayXXd::Zero(num_targets, num_steps);
+  Eigen::ArrayXXd F(num_task_dims, num_steps);
+  for(int d = 0; d < num_demos; d++)
+  {
+    Eigen::ArrayXXd Y_array = Eigen::Map<const Eigen::ArrayXXd>(
+        Y + d * num_steps * num_task_dims, num_task_dims, num_steps);
+    determineForces(T_array, Y_array, F, alpha_y, beta_y, allow_final_velocity);
+    if(num_samples == 1)
+      targets += F;
+    else
+      targets.middleRows(d * num_task_dims, num_task_dims) = F;
+  }
+
+  // Stacking the demonstrations in one regression problem repeats the design
+  // matrix num_demos times, which only scales the Gram matrix
+  const double num_repetitions = num_samples == 1 ? num_demos : 1;
+  const Eigen::PartialPivLU<Eigen::MatrixXd> solver(
+      num_repetitions * X * X.transpose()
+      + regularization_coefficient * Eigen::MatrixXd::Identity(num_weights_per_dim, num_weights_per_dim));
+  const Eigen::MatrixXd solution = solver.solve(X * targets.matrix().transpose());
+
+  for(int i = 0; i < num_samples; i++)
+  {
+    Eigen::Map<Eigen::MatrixXd> weights_matrix(
+        weights + i * num_weights_per_dim * num_task_dims,
+        num_task_dims, num_weights_per_dim);
+    weights_matrix = solution.middleCols(i * num_task_dims, num_task_dims).transpose();
+  }
+}
+
+void dmpStep(
+  const double last_t,
+  const double t,
+  const double* last_y,
+  int num_last_y,
+  const double* last_yd,
+  int num_last_yd,
+  const double* last_ydd,
+  int num_last_ydd,
+  double* y,
+  int num_y,
+  double* yd,
+  int num_yd,
+  double* ydd,
+  int num_ydd,
+  const double* goal_y,
+  int num_goal_y,
+  const double* goal_yd,
+  int num_goal_yd,
+  const double* goal_ydd,
+  int num_goal_ydd,
+  const double* start_y,
+  int num_start_y,
+  const double* start_yd,
+  int num_start_yd,
+  const double* start_ydd,
+  int num_start_ydd,
+  const double goal_t,
+  const double start_t,
+  const double* weights,
+  int num_weights_per_dim,
+  int num_weight_dims,
+  const double* widths,
+  int num_widths,
+  const double* centers,
+  int num_centers,
+  const double alpha_y,
+  const double beta_y,
+  const double alpha_z,
+  const double integration_dt
+)
+{
+  const int num_dimensions = num_last_y;
+  if(start_t >= goal_t)
+    throw std::invalid_argument("Goal must be chronologically after start!");
+
+  assert(num_dimensions == num_last_y);
+  assert(num_dimensions == num_last_yd);
+  assert(num_dimensions == num_last_ydd);
+  Eigen::Map<const Eigen::ArrayXd> last_y_array(last_y, num_last_y);
+  Eigen::Map<const Eigen::ArrayXd> last_yd_array(last_yd, num_last_yd);
+  Eigen::Map<const Eigen::ArrayXd> last_ydd_array(last_ydd, num_last_ydd);
+
+  assert(num_dimensions == num_y);
+  assert(num_dimensions == num_yd);
+  assert(num_dimensions == num_ydd);
+  Eigen::Map<Eigen::ArrayXd> y_array(y, num_y);
+  Eigen::Map<Eigen::ArrayXd> yd_array(yd, num_yd);
+  Eigen::Map<Eigen::ArrayXd> ydd_array(ydd, num_ydd);
+
+  assert(num_dimensions == num_goal_y);
+  assert(num_dimensions == num_goal_yd);
+  assert(num_dimensions == num_goal_ydd);
+  Eigen::Map<const Eigen::ArrayXd> goal_y_array(goal_y, num_goal_y);
+  Eigen::Map<const Eigen::ArrayXd> goal_yd_array(goal_yd, num_goal_yd);
+  Eigen::Map<const Eigen::ArrayXd> goal_ydd_array(goal_ydd, num_goal_ydd);
+
+  assert(num_dimensions == num_start_y);
+  assert(num_dimensions == num_start_yd);
+  assert(num_dimensions == num_start_ydd);
+  Eigen::Map<const Eigen::ArrayXd> start_y_array(start_y, num_start_y);
+  Eigen::Map<const Eigen::ArrayXd> start_yd_array(start_yd, num_start_yd);
+  Eigen::Map<const Eigen::ArrayXd> start_ydd_array(start_ydd, num_start_ydd);
+
+  if(t <= start_t)
+  {
+    y_array = start_y_array;
+    yd_array = start_yd_array;
+    ydd_array = start_ydd_array;
+  }
+  else
+  {
+    const double execution_time = goal_t - start_t;
+
+    // TODO only recompute iff start or goal state changes
+    std::vector<Eigen::Matrix<double, 6, 1>, Eigen::aligned_allocator<Eigen::Matrix<double, 6, 1> > > coefficients;
+    solveConstraints(
+        start_t, goal_t,
+        start_y_array, start_yd_array, start_ydd_array,
+        goal_y_array, goal_yd_array, goal_ydd_array,
+        coefficients);
+
+    y_array = last_y_array;
+    yd_array = last_yd_array;
+    ydd_array = last_ydd_array;
+
+    assert(num_weights_per_dim == num_widths);
+    assert(num_weights_per_dim == num_centers);
+    assert(num_weight_dims == num_dimensions);
+    Eigen::Map<const Eigen::ArrayXXd> weights_array(
+        weights, num_dimensions, num_weights_per_dim);
+    Eigen::Map<const Eigen::ArrayXd> widths_array(widths, num_widths);
+    Eigen::Map<const Eigen::ArrayXd> centers_array(centers, num_centers);
+
+    integrate(
+        last_t, t, execution_time, goal_y_array, goal_t, coefficients,
+        y_array, yd_array, ydd_array, alpha_y, beta_y, integration_dt,
+        [&](int, double current_t)
+        {
+          const double z = phase(current_t, alpha_z, goal_t, start_t);
+          return forcingTerm(z, weights_array, widths_array, centers_array);
+        });
+  }
+}
+
+
+void dmpTrajectories(
+  const double* T,
+  int num_T,
+  const double* goal_y,
+  int num_goal_y,
+  const double* goal_yd,
+  int num_goal_yd,
+  const double* goal_ydd,
+  int num_goal_ydd,
+  const double* start_y,
+  int num_start_y,
+  const double* start_yd,
+  int num_start_yd,
+  const double* start_ydd,
+  int num_start_ydd,
+  const double goal_t,
+  const double start_t,
+  const double* weights,
+  int num_samples,
+  int num_weights_per_dim,
+  int num_weight_dims,
+  const double* widths,
+  int num_widths,
+  const double* centers,
+  int num_centers,
+  double* Y,
+  int num_Y_samples,
+  int num_Y_steps,
+  int num_Y_dims,
+  double* Yd,
+  int num_Yd_samples,
+  int num_Yd_steps,
+  int num_Yd_dims,
+  double* Ydd,
+  int num_Ydd_samples,
+  int num_Ydd_steps,
+  int num_Ydd_dims,
+  const double alpha_y,
+  const double beta_y,
+  const double alpha_z,
+  const double integration_dt
+)
+{
+  const int num_dimensions = num_start_y;
+  if(start_t >= goal_t)
+    throw std::invalid_argument("Goal must be chronologically after start!");
+
+  // We write to the output arrays, hence, we check their shapes even in
+  // release mode
+  if(num_dimensions != num_start_yd || num_dimensions != num_start_ydd
+     || num_dimensions != num_goal_y || num_dimensions != num_goal_yd
+     || num_dimensions != num_goal_ydd || num_dimensions != num_weight_dims)
+    throw std::invalid_argument("Inconsistent number of dimensions!");
+  if(num_weights_per_dim != num_widths || num_weights_per_dim != num_centers)
+    throw std::invalid_argument("Inconsistent number of weights per dimension!");
+  if(num_Y_samples != num_samples || num_Yd_samples != num_samples
+     || num_Ydd_samples != num_samples || num_Y_steps != num_T
+     || num_Yd_steps != num_T || num_Ydd_steps != num_T
+     || num_Y_dims != num_dimensions || num_Yd_dims != num_dimensions
+     || num_Ydd_dims != num_dimensions)
+    throw std::invalid_argument("Output arrays have the wrong shape!");
+
+  Eigen::Map<const Eigen::ArrayXd> goal_y_array(goal_y, num_goal_y);
+  Eigen::Map<const Eigen::ArrayXd> goal_yd_array(goal_yd, num_goal_yd);
+  Eigen::Map<const Eigen::ArrayXd> goal_ydd_array(goal_ydd, num_goal_ydd);
+  Eigen::Map<const Eigen::ArrayXd> start_y_array(start_y, num_start_y);
+  Eigen::Map<const Eigen::ArrayXd> start_yd_array(start_yd, num_start_yd);
+  Eigen::Map<const Eigen::ArrayXd> start_ydd_array(start_ydd, num_start_ydd);
+  Eigen::Map<const Eigen::ArrayXd> widths_array(widths, num_widths);
+  Eigen::Map<const Eigen::ArrayXd> centers_array(centers, num_centers);
+
+  const double execution_time = goal_t - start_t;
+  const double execution_time_squared = execution_time * execution_time;
+  const int sample_weights_size = num_weights_per_dim * num_weight_dims;
+  const int sample_trajectory_size = num_T * num_dimensions;
+
+  // The goal trajectory does not depend on the weights
+  std::vector<Eigen::Matrix<double, 6, 1>, Eigen::aligned_allocator<Eigen::Matrix<double, 6, 1> > > coefficients;
+  solveConstraints(
+      start_t, goal_t,
+      start_y_array, start_yd_array, start_ydd_array,
+      goal_y_array, goal_yd_array, goal_ydd_array,
+      coefficients);
+  Eigen::ArrayXd g(num_dimensions);
+  Eigen::ArrayXd gd(num_dimensions);
+  Eigen::ArrayXd gdd(num_dimensions);
+
+  double last_t = T[0];
+  for(int i = 0; i < num_T; ++i)
+  {
+    const double t = T[i];
+    const int offset = i * num_dimensions;
+
+    for(int s = 0; s < num_samples; ++s)
+    {
+      const int current = s * sample_trajectory_size + offset;
+      Eigen::Map<Eigen::ArrayXd> y_array(Y + current, num_dimensions);
+      Eigen::Map<Eigen::ArrayXd> yd_array(Yd + current, num_dimensions);
+      Eigen::Map<Eigen::ArrayXd> ydd_array(Ydd + current, num_dimensions);
+      if(t <= start_t || i == 0)
+      {
+        y_array = start_y_array;
+        yd_array = start_yd_array;
+        ydd_array = start_ydd_array;
+      }
+      else
+      {
+        const int last = current - num_dimensions;
+        y_array = Eigen::Map<const Eigen::ArrayXd>(Y + last, num_dimensions);
+        yd_array = Eigen::Map<const Eigen::ArrayXd>(Yd + last, num_dimensions);
+        ydd_array = Eigen::Map<const Eigen::ArrayXd>(Ydd + last, num_dimensions);
+      }
+    }
+
+    if(t <= start_t)
+    {
+      last_t = t;
+      continue;
+    }
+
+    // We use multiple integration steps to improve numerical precision
+    double current_t = last_t;
+    while(current_t < t)
+    {
+      double dt_int = integration_dt;
+      if(t - current_t < dt_int)
+        dt_int = t - current_t;
+
+      current_t += dt_int;
+
+      const double z = phase(current_t, alpha_z, goal_t, start_t);
+      const Eigen::ArrayXd activations = rbfActivations(
+          z, widths_array, centers_array, true);
+      applyConstraints(current_t, goal_y_array, goal_t, coefficients, g, gd, gdd);
+
+      for(int s = 0; s < num_samples; ++s)
+      {
+        Eigen::Map<const Eigen::ArrayXXd> weights_array(
+            weights + s * sample_weights_size, num_dimensions,
+            num_weights_per_dim);
+        const int current = s * sample_trajectory_size + offset;
+        Eigen::Map<Eigen::ArrayXd> y_array(Y + current, num_dimensions);
+        Eigen::Map<Eigen::ArrayXd> yd_array(Yd + current, num_dimensions);
+        Eigen::Map<Eigen::ArrayXd> ydd_array(Ydd + current, num_dimensions);
+
+        const Eigen::ArrayXd f = (
+            z * weights_array.matrix() * activations.matrix()).array();
+        ydd_array = (alpha_y
+                     * (beta_y * (g - y_array)
+                        + execution_time * gd
+                        - execution_time * yd_array)
+                     + gdd * execution_time_squared + f)
+                    / execution_time_squared;
+        y_array += dt_int * yd_array;
+        yd_array += dt_int * ydd_array;
+      }
+    }
+    last_t = t;
+  }
+}
+
+
+void dmpSegmentTrajectories(
+  const double* T,
+  int num_T,
+  const double* goal_y,
+  int num_goal_y_samples,
+  int num_goal_y_dims,
+  const double* goal_yd,
+  int num_goal_yd_samples,
+  int num_goal_yd_dims,
+  const double* goal_ydd,
+  int num_goal_ydd_samples,
+  int num_goal_ydd_dims,
+  const double* start_y,
+  int num_start_y_samples,
+  int num_start_y_dims,
+  const double* start_yd,
+  int num_start_yd_samples,
+  int num_start_yd_dims,
+  const double* start_ydd,
+  int num_start_ydd_samples,
+  int num_start_ydd_dims,
+  const double goal_t,
+  const double start_t,
+  const double* weights,
+  int num_samples,
+  int num_weights_per_dim,
+  int num_weight_dims,
+  const double* widths,
+  int num_widths,
+  const double* centers,
+  int num_centers,
+  double* Y,
+  int num_Y_samples,
+  int num_Y_steps,
+  int num_Y_dims,
+  double* Yd,
+  int num_Yd_samples,
+  int num_Yd_steps,
+  int num_Yd_dims,
+  double* Ydd,
+  int num_Ydd_samples,
+  int num_Ydd_steps,
+  int num_Ydd_dims,
+  const double alpha_y,
+  const double beta_y,
+  const double alpha_z,
+  const double integration_dt
+)
+{
+  const int num_dimensions = num_start_y_dims;
+  if(start_t >= goal_t)
+    throw std::invalid_argument("Goal must be chronologically after start!");
+
+  // We write to the output arrays, hence, we check their shapes even in
+  // release mode
+  if(num_dimensions != num_start_yd_dims
+     || num_dimensions != num_start_ydd_dims
+     || num_dimensions != num_goal_y_dims
+     || num_dimensions != num_goal_yd_dims
+     || num_dimensions != num_goal_ydd_dims
+     || num_dimensions != num_weight_dims)
+    throw std::invalid_argument("Inconsistent number of dimensions!");
+  if(num_samples != num_start_y_samples || num_samples != num_start_yd_samples
+     || num_samples != num_start_ydd_samples
+     || num_samples != num_goal_y_samples || num_samples != num_goal_yd_samples
+     || num_samples != num_goal_ydd_samples)
+    throw std::invalid_argument("Inconsistent number of samples!");
+  if(num_weights_per_dim != num_widths || num_weights_per_dim != num_centers)
+    throw std::invalid_argument("Inconsistent number of weights per dimension!");
+  if(num_Y_samples != num_samples || num_Yd_samples != num_samples
+     || num_Ydd_samples != num_samples || num_Y_steps != num_T
+     || num_Yd_steps != num_T || num_Ydd_steps != num_T
+     || num_Y_dims != num_dimensions || num_Yd_dims != num_dimensions
+     || num_Ydd_dims != num_dimensions)
+    throw std::invalid_argument("Output arrays have the wrong shape!");
+
+  Eigen::Map<const Eigen::ArrayXd> widths_array(widths, num_widths);
+  Eigen::Map<const Eigen::ArrayXd> centers_array(centers, num_centers);
+
+  const double execution_time = goal_t - start_t;
+  const double execution_time_squared = execution_time * execution_time;
+  const int sample_weights_size = num_weights_per_dim * num_weight_dims;
+  const int sample_trajectory_size = num_T * num_dimensions;
+
+  // The goal trajectories do not depend on the time steps
+  std::vector<Eigen::ArrayXd> goals(num_samples);
+  std::vector<std::vector<Eigen::Matrix<double, 6, 1>, Eigen::aligned_allocator<Eigen::Matrix<double, 6, 1> > > > coefficients(num_samples);
+  for(int s = 0; s < num_samples; ++s)
+  {
+    const int current = s * num_dimensions;
+    goals[s] = Eigen::Map<const Eigen::ArrayXd>(goal_y + current, num_dimensions);
+    solveConstraints(
+        start_t, goal_t,
+        Eigen::Map<const Eigen::ArrayXd>(start_y + current, num_dimensions),
+        Eigen::Map<const Eigen::ArrayXd>(start_yd + current, num_dimensions),
+        Eigen::Map<const Eigen::ArrayXd>(start_ydd + current, num_dimensions),
+        goals[s],
+        Eigen::Map<const Eigen::ArrayXd>(goal_yd + current, num_dimensions),
+        Eigen::Map<const Eigen::ArrayXd>(goal_ydd + current, num_dimensions),
+        coefficients[s]);
+  }
+  Eigen::ArrayXd g(num_dimensions);
+  Eigen::ArrayXd gd(num_dimensions);
+  Eigen::ArrayXd gdd(num_dimensions);
+
+  for(int i = 1; i < num_T; ++i)
+  {
+    const double last_t = T[i - 1];
+    const double t = T[i];
+    const int offset = i * num_dimensions;
+
+    for(int s = 0; s < num_samples; ++s)
+    {
+      const int current = s * sample_trajectory_size + offset;
+      Eigen::Map<Eigen::ArrayXd> y_array(Y + current, num_dimensions);
+      Eigen::Map<Eigen::ArrayXd> yd_array(Yd + current, num_dimensions);
+      Eigen::Map<Eigen::ArrayXd> ydd_array(Ydd + current, num_dimensions);
+      if(t <= start_t)
+      {
+        const int start = s * num_dimensions;
+        y_array = Eigen::Map<const Eigen::ArrayXd>(start_y + start, num_dimensions);
+        yd_array = Eigen::Map<const Eigen::ArrayXd>(start_yd + start, num_dimensions);
+        ydd_array = Eigen::Map<const Eigen::ArrayXd>(start_ydd + start, num_dimensions);
+      }
+      else
+      {
+        const int last = current - num_dimensions;
+        y_array = Eigen::Map<const Eigen::ArrayXd>(Y + last, num_dimensions);
+        yd_array = Eigen::Map<const Eigen::ArrayXd>(Yd + last, num_dimensions);
+        ydd_array = Eigen::Map<const Eigen::ArrayXd>(Ydd + last, num_dimensions);
+      }
+    }
+
+    if(t <= start_t)
+      continue;
+
+    // We use multiple integration steps to improve numerical precision
+    double current_t = last_t;
+    while(current_t < t)
+    {
+      double dt_int = integration_dt;
+      if(t - current_t < dt_int)
+        dt_int = t - current_t;
+
+      current_t += dt_int;
+
+      const double z = phase(current_t, alpha_z, goal_t, start_t);
+      const Eigen::ArrayXd activations = rbfActivations(
+          z, widths_array, centers_array, true);
+
+      for(int s = 0; s < num_samples; ++s)
+      {
+        Eigen::Map<const Eigen::ArrayXXd> weights_array(
+            weights + s * sample_weights_size, num_dimensions,
+            num_weights_per_dim);
+        const int current = s * sample_trajectory_size + offset;
+        Eigen::Map<Eigen::ArrayXd> y_array(Y + current, num_dimensions);
+        Eigen::Map<Eigen::ArrayXd> yd_array(Yd + current, num_dimensions);
+        Eigen::Map<Eigen::ArrayXd> ydd_array(Ydd + current, num_dimensions);
+
+        applyConstraints(current_t, goals[s], goal_t, coefficients[s], g, gd, gdd);
+        const Eigen::ArrayXd f = (
+            z * weights_array.matrix() * activations.matrix()).array();
+        ydd_array = (alpha_y
+                     * (beta_y * (g - y_array)
+                        + execution_time * gd
+                        - execution_time * yd_array)
+                     + gdd * execution_time_squared + f)
+                    / execution_time_squared;
+        y_array += dt_int * yd_array;
+        yd_array += dt_int * ydd_array;
+      }
+    }
+  }
 }
 
 
-void imitate(
+void rbfActivationTable(
   const double* T,
   int num_T,
-  const double* Y,
-  int num_steps,
-  int num_task_dims,
-  double* weights,
-  int num_weights_per_dim,
-  int num_weight_dims,
+  double* phases,
+  int num_phases_steps,
+  int num_phases_substeps,
+  double* activations,
+  int num_activations_steps,
+  int num_activations_substeps,
+  int num_activations_features,
   const double* widths,
   int num_widths,
   const double* centers,
   int num_centers,
-  const double regularization_coefficient,
-  const double alpha_y,
-  const double beta_y,
+  const double goal_t,
+  const double start_t,
   const double alpha_z,
-  bool allow_final_velocity
+  const double integration_dt
 )
 {
-  assert(num_steps == num_T);
-  assert(num_weights_per_dim == num_widths);
-  assert(num_weights_per_dim == num_centers);
-  assert(num_task_dims == num_weight_dims);
-
-  if(regularization_coefficient < 0.0)
-  {
-    throw std::invalid_argument("Regularization coefficient must be >= 0!");
-  }
-  else if(regularization_coefficient == 0.0 && num_weights_per_dim >= num_T)
-  {
-    throw std::invalid_argument(
-        "If the regularization coefficient is set to zero, the number of "
-        "samples must be greater than number of weights per dimension. "
-        "Otherwise this will result in an instable learning problem.");
-  }
+  if(start_t >= goal_t)
+    throw std::invalid_argument("Goal must be chronologically after start!");
+  if(num_phases_steps != num_T || num_activations_steps != num_T
+     || num_phases_substeps != num_activations_substeps
+     || num_activations_features != num_widths
+     || num_activations_features != num_centers)
+    throw std::invalid_argument("Output arrays have the wrong shape!");
 
   Eigen::Map<const Eigen::ArrayXd> widths_array(widths, num_widths);
   Eigen::Map<const Eigen::ArrayXd> centers_array(centers, num_centers);
+  Eigen::Map<Eigen::ArrayXXd> phases_array(
+      phases, num_phases_substeps, num_phases_steps);
+  Eigen::Map<Eigen::ArrayXXd> activations_array(
+      activations, num_activations_features,
+      num_activations_steps * num_activations_substeps);
+  phases_array.setZero();
+  activations_array.setZero();
+
+  for(int i = 1; i < num_T; ++i)
+  {
+    const double t = T[i];
+    if(t <= start_t)
+      continue;
 
-  Eigen::ArrayXd T_array = Eigen::Map<const Eigen::ArrayXd>(T, num_T);
-  Eigen::ArrayXXd Y_array = Eigen::Map<const Eigen::ArrayXXd>(Y, num_task_dims, num_steps);
-  Eigen::ArrayXXd F(num_task_dims, num_steps);
-  determineForces(T_array, Y_array, F, alpha_y, beta_y, allow_final_velocity);
+    // Same integration steps as in dmpStep
+    double current_t = T[i - 1];
+    int j = 0;
+    while(current_t < t)
+    {
+      if(j >= num_phases_substeps)
+        throw std::invalid_argument("Not enough integration steps per step!");
 
-  const Eigen::MatrixXd X = rbfDesignMatrix(T_array, alpha_z, widths_array, centers_array);
+      double dt_int = integration_dt;
+      if(t - current_t < dt_int)
+        dt_int = t - current_t;
 
-  Eigen::Map<Eigen::ArrayXXd> weights_array(weights, num_task_dims, num_weights_per_dim);
-  ridgeRegression(X, F, regularization_coefficient, weights_array);
+      current_t += dt_int;
+
+      const double z = phase(current_t, alpha_z, goal_t, start_t);
+      phases_array(j, i) = z;
+      activations_array.col(i * num_activations_substeps + j) = rbfActivations(
+          z, widths_array, centers_array, true);
+      ++j;
+    }
+  }
 }
 
-void dmpStep(
+
+void dmpStepPrecomputed(
   const double last_t,
   const double t,
   const double* last_y,
@@ -322,21 +1043,24 @@ void dmpStep(
   const double* weights,
   int num_weights_per_dim,
   int num_weight_dims,
-  const double* widths,
-  int num_widths,
-  const double* centers,
-  int num_centers,
+  const double* phases,
+  int num_phases,
+  const double* activations,
+  int num_activations_substeps,
+  int num_activations_features,
   const double alpha_y,
   const double beta_y,
-  const double alpha_z,
   const double integration_dt
 )
 {
   const int num_dimensions = num_last_y;
   if(start_t >= goal_t)
     throw std::invalid_argument("Goal must be chronologically after start!");
+  if(num_phases != num_activations_substeps)
+    throw std::invalid_argument("Inconsistent number of integration steps!");
+  if(num_activations_features != num_weights_per_dim)
+    throw std::invalid_argument("Inconsistent number of weights per dimension!");
 
-  assert(num_dimensions == num_last_y);
   assert(num_dimensions == num_last_yd);
   assert(num_dimensions == num_last_ydd);
   Eigen::Map<const Eigen::ArrayXd> last_y_array(last_y, num_last_y);
@@ -374,7 +1098,6 @@ void dmpStep(
   {
     const double execution_time = goal_t - start_t;
 
-    // TODO only recompute iff start or goal state changes
     std::vector<Eigen::Matrix<double, 6, 1>, Eigen::aligned_allocator<Eigen::Matrix<double, 6, 1> > > coefficients;
     solveConstraints(
         start_t, goal_t,
@@ -385,43 +1108,21 @@ void dmpStep(
     y_array = last_y_array;
     yd_array = last_yd_array;
     ydd_array = last_ydd_array;
-    Eigen::ArrayXd g(num_y);
-    Eigen::ArrayXd gd(num_y);
-    Eigen::ArrayXd gdd(num_y);
 
-    assert(num_weights_per_dim == num_widths);
-    assert(num_weights_per_dim == num_centers);
     assert(num_weight_dims == num_dimensions);
     Eigen::Map<const Eigen::ArrayXXd> weights_array(
         weights, num_dimensions, num_weights_per_dim);
-    Eigen::Map<const Eigen::ArrayXd> widths_array(widths, num_widths);
-    Eigen::Map<const Eigen::ArrayXd> centers_array(centers, num_centers);
-
-    // We use multiple integration steps to improve numerical precision
-    double current_t = last_t;
-    while(current_t < t)
-    {
-      double dt_int = integration_dt;
-      if(t - current_t < dt_int)
-        dt_int = t - current_t;
-
-      current_t += dt_int;
-
-      const double z = phase(current_t, alpha_z, goal_t, start_t);
-      const Eigen::ArrayXd f = forcingTerm(z, weights_array, widths_array, centers_array);
-
-      applyConstraints(current_t, goal_y_array, goal_t, coefficients, g, gd, gdd);
-      const double execution_time_squared = execution_time * execution_time;
-      ydd_array = (alpha_y
-                   * (beta_y * (g - y_array)
-                      + execution_time * gd
-                      - execution_time * yd_array)
-                   + gdd * execution_time_squared + f)
-                  / execution_time_squared;
-      y_array += dt_int * yd_array;
-      yd_array += dt_int * ydd_array;
-    }
-    assert(current_t == t);
+    Eigen::Map<const Eigen::ArrayXXd> activations_array(
+        activations, num_activations_features, num_activations_substeps);
+
+    integrate(
+        last_t, t, execution_time, goal_y_array, goal_t, coefficients,
+        y_array, yd_array, ydd_array, alpha_y, beta_y, integration_dt,
+        [&](int i, double)
+        {
+          return precomputedForcingTerm(
+              i, phases, num_phases, activations_array, weights_array);
+        });
   }
 }
 
@@ -599,15 +1300,12 @@ void ridgeRegression(
   Eigen::Map<Eigen::ArrayXXd>& weights
 )
 {
-  const int num_outputs = weights.rows();
   const int num_features = weights.cols();
-  for(int i = 0; i < num_outputs; i++)
-    weights.row(i) =
-        ((X * X.transpose()
-          + regularization_coefficient * Eigen::MatrixXd::Identity(num_features, num_features)
-          ).inverse()
-         * X * targets.row(i).transpose().matrix()
-         ).transpose();
+  // All outputs share the same design matrix, hence, we factorize it once
+  const Eigen::PartialPivLU<Eigen::MatrixXd> solver(
+      X * X.transpose()
+      + regularization_coefficient * Eigen::MatrixXd::Identity(num_features, num_features));
+  weights = solver.solve(X * targets.matrix().transpose()).transpose().array();
 }
 
 
@@ -637,6 +1335,20 @@ const Eigen::ArrayXd forcingTerm(
 }
 
 
+const Eigen::ArrayXd precomputedForcingTerm(
+  const int i,
+  const double* phases,
+  const int num_phases,
+  const Eigen::Map<const Eigen::ArrayXXd>& activations,
+  const Eigen::Map<const Eigen::ArrayXXd>& weights
+)
+{
+  if(i >= num_phases)
+    throw std::invalid_argument("Not enough precomputed integration steps!");
+  return (phases[i] * weights.matrix() * activations.col(i).matrix()).array();
+}
+
+
 Eigen::Array3d qLog(const Eigen::Quaterniond& q)
 {
   const double len = q.vec().norm();
@@ -847,29 +1559,124 @@ void quaternionDmpStep(
     Eigen::Map<const Eigen::ArrayXd> widths_array(widths, num_widths);
     Eigen::Map<const Eigen::ArrayXd> centers_array(centers, num_centers);
 
-    // We use multiple integration steps to improve numerical precision
-    double current_t = last_t;
-    while(current_t < t)
-    {
-      double dt_int = integration_dt;
-      if(t - current_t < dt_int)
-        dt_int = t - current_t;
+    quaternionIntegrate(
+        last_t, t, execution_time, goal_r_array, r_array, rd_array, rdd_array,
+        alpha_r, beta_r, integration_dt,
+        [&](int, double current_t)
+        {
+          const double z = phase(current_t, alpha_z, goal_t, start_t);
+          return forcingTerm(z, weights_array, widths_array, centers_array);
+        });
+  }
 
-      current_t += dt_int;
+  r[0] = r_array.w();
+  r[1] = r_array.x();
+  r[2] = r_array.y();
+  r[3] = r_array.z();
+}
 
-      const double z = phase(current_t, alpha_z, goal_t, start_t);
-      const Eigen::ArrayXd f = forcingTerm(z, weights_array, widths_array, centers_array);
 
-      const double execution_time_squared = execution_time * execution_time;
+void quaternionDmpStepPrecomputed(
+  const double last_t,
+  const double t,
+  const double* last_r,
+  int num_last_r,
+  const double* last_rd,
+  int num_last_rd,
+  const double* last_rdd,
+  int num_last_rdd,
+  double* r,
+  int num_r,
+  double* rd,
+  int num_rd,
+  double* rdd,
+  int num_rdd,
+  const double* goal_r,
+  int num_goal_r,
+  const double* goal_rd,
+  int num_goal_rd,
+  const double* goal_rdd,
+  int num_goal_rdd,
+  const double* start_r,
+  int num_start_r,
+  const double* start_rd,
+  int num_start_rd,
+  const double* start_rdd,
+  int num_start_rdd,
+  const double goal_t,
+  const double start_t,
+  const double* weights,
+  int num_weights_per_dim,
+  int num_weight_dims,
+  const double* phases,
+  int num_phases,
+  const double* activations,
+  int num_activations_substeps,
+  int num_activations_features,
+  const double alpha_r,
+  const double beta_r,
+  const double integration_dt
+)
+{
+  if(start_t >= goal_t)
+    throw std::invalid_argument("Goal must be chronologically after start!");
+  if(num_phases != num_activations_substeps)
+    throw std::invalid_argument("Inconsistent number of integration steps!");
+  if(num_activations_features != num_weights_per_dim)
+    throw std::invalid_argument("Inconsistent number of weights per dimension!");
+
+  assert(4 == num_last_r);
+  assert(3 == num_last_rd);
+  assert(3 == num_last_rdd);
+  const Eigen::Quaterniond last_r_array(last_r[0], last_r[1], last_r[2], last_r[3]);
+  Eigen::Map<const Eigen::ArrayXd> last_rd_array(last_rd, num_last_rd);
+  Eigen::Map<const Eigen::ArrayXd> last_rdd_array(last_rdd, num_last_rdd);
+
+  assert(4 == num_r);
+  assert(3 == num_rd);
+  assert(3 == num_rdd);
+  Eigen::Quaterniond r_array(r[0], r[1], r[2], r[3]);
+  Eigen::Map<Eigen::ArrayXd> rd_array(rd, num_rd);
+  Eigen::Map<Eigen::ArrayXd> rdd_array(rdd, num_rdd);
+
+  assert(4 == num_goal_r);
+  const Eigen::Quaterniond goal_r_array(goal_r[0], goal_r[1], goal_r[2], goal_r[3]);
 
-      rdd_array = (alpha_r * (beta_r * 2.0 * qLog(goal_r_array * r_array.conjugate())
-                              - execution_time * rd_array)
-                   + f)
-                  / execution_time_squared;
-      r_array = vecExp(dt_int / 2.0 * rd_array) * r_array;
-      rd_array += dt_int * rdd_array;
-    }
-    assert(current_t == t);
+  assert(4 == num_start_r);
+  assert(3 == num_start_rd);
+  assert(3 == num_start_rdd);
+  const Eigen::Quaterniond start_r_array(start_r[0], start_r[1], start_r[2], start_r[3]);
+  Eigen::Map<const Eigen::ArrayXd> start_rd_array(start_rd, num_start_rd);
+  Eigen::Map<const Eigen::ArrayXd> start_rdd_array(start_rdd, num_start_rdd);
+
+  if(t <= start_t)
+  {
+    r_array = start_r_array;
+    rd_array = start_rd_array;
+    rdd_array = start_rdd_array;
+  }
+  else
+  {
+    const double execution_time = goal_t - start_t;
+
+    r_array = last_r_array;
+    rd_array = last_rd_array;
+    rdd_array = last_rdd_array;
+
+    assert(num_weight_dims == 3);
+    Eigen::Map<const Eigen::ArrayXXd> weights_array(
+        weights, num_weight_dims, num_weights_per_dim);
+    Eigen::Map<const Eigen::ArrayXXd> activations_array(
+        activations, num_activations_features, num_activations_substeps);
+
+    quaternionIntegrate(
+        last_t, t, execution_time, goal_r_array, r_array, rd_array, rdd_array,
+        alpha_r, beta_r, integration_dt,
+        [&](int i, double)
+        {
+          return precomputedForcingTerm(
+              i, phases, num_phases, activations_array, weights_array);
+        });
   }
 
   r[0] = r_array.w();
@@ -878,6 +1685,191 @@ void quaternionDmpStep(
   r[3] = r_array.z();
 }
 
+void cartesianDmpTrajectories(
+  const double* T,
+  int num_T,
+  const double* goal_y,
+  int num_goal_y,
+  const double* goal_yd,
+  int num_goal_yd,
+  const double* goal_ydd,
+  int num_goal_ydd,
+  const double* start_y,
+  int num_start_y,
+  const double* start_yd,
+  int num_start_yd,
+  const double* start_ydd,
+  int num_start_ydd,
+  const double* goal_r,
+  int num_goal_r,
+  const double* start_r,
+  int num_start_r,
+  const double* start_rd,
+  int num_start_rd,
+  const double* start_rdd,
+  int num_start_rdd,
+  const double goal_t,
+  const double start_t,
+  const double* weights,
+  int num_samples,
+  int num_weights_per_dim,
+  int num_weight_dims,
+  const double* widths,
+  int num_widths,
+  const double* centers,
+  int num_centers,
+  double* X,
+  int num_X_samples,
+  int num_X_steps,
+  int num_X_dims,
+  const double alpha_y,
+  const double beta_y,
+  const double alpha_z,
+  const double integration_dt
+)
+{
+  if(start_t >= goal_t)
+    throw std::invalid_argument("Goal must be chronologically after start!");
+
+  // We write to the output array, hence, we check the shapes even in
+  // release mode
+  if(num_start_y != 3 || num_start_yd != 3 || num_start_ydd != 3
+     || num_goal_y != 3 || num_goal_yd != 3 || num_goal_ydd != 3
+     || num_start_r != 4 || num_start_rd != 3 || num_start_rdd != 3
+     || num_goal_r != 4 || num_weight_dims != 6)
+    throw std::invalid_argument("Inconsistent number of dimensions!");
+  if(num_weights_per_dim != num_widths || num_weights_per_dim != num_centers)
+    throw std::invalid_argument("Inconsistent number of weights per dimension!");
+  if(num_X_samples != num_samples || num_X_steps != num_T || num_X_dims != 7)
+    throw std::invalid_argument("Output array has the wrong shape!");
+
+  Eigen::Map<const Eigen::ArrayXd> goal_y_array(goal_y, num_goal_y);
+  Eigen::Map<const Eigen::ArrayXd> goal_yd_array(goal_yd, num_goal_yd);
+  Eigen::Map<const Eigen::ArrayXd> goal_ydd_array(goal_ydd, num_goal_ydd);
+  Eigen::Map<const Eigen::ArrayXd> start_y_array(start_y, num_start_y);
+  Eigen::Map<const Eigen::ArrayXd> start_yd_array(start_yd, num_start_yd);
+  Eigen::Map<const Eigen::ArrayXd> start_ydd_array(start_ydd, num_start_ydd);
+  const Eigen::Quaterniond goal_r_array(goal_r[0], goal_r[1], goal_r[2], goal_r[3]);
+  const Eigen::Quaterniond start_r_array(start_r[0], start_r[1], start_r[2], start_r[3]);
+  Eigen::Map<const Eigen::ArrayXd> start_rd_array(start_rd, num_start_rd);
+  Eigen::Map<const Eigen::ArrayXd> start_rdd_array(start_rdd, num_start_rdd);
+  Eigen::Map<const Eigen::ArrayXd> widths_array(widths, num_widths);
+  Eigen::Map<const Eigen::ArrayXd> centers_array(centers, num_centers);
+
+  const double execution_time = goal_t - start_t;
+  const double execution_time_squared = execution_time * execution_time;
+  const int sample_weights_size = num_weights_per_dim * num_weight_dims;
+  const int sample_trajectory_size = num_T * num_X_dims;
+
+  // Split the weights of each sample into contiguous matrices for position
+  // and orientation, i.e. the layout that dmpStep and quaternionDmpStep use
+  std::vector<Eigen::ArrayXXd> position_weights(num_samples);
+  std::vector<Eigen::ArrayXXd> orientation_weights(num_samples);
+  for(int s = 0; s < num_samples; ++s)
+  {
+    Eigen::Map<const Eigen::ArrayXXd> weights_array(
+        weights + s * sample_weights_size, num_weight_dims,
+        num_weights_per_dim);
+    position_weights[s] = weights_array.topRows(3);
+    orientation_weights[s] = weights_array.bottomRows(3);
+  }
+
+  // The goal trajectory does not depend on the weights
+  std::vector<Eigen::Matrix<double, 6, 1>, Eigen::aligned_allocator<Eigen::Matrix<double, 6, 1> > > coefficients;
+  solveConstraints(
+      start_t, goal_t,
+      start_y_array, start_yd_array, start_ydd_array,
+      goal_y_array, goal_yd_array, goal_ydd_array,
+      coefficients);
+  Eigen::ArrayXd g(3);
+  Eigen::ArrayXd gd(3);
+  Eigen::ArrayXd gdd(3);
+
+  // Current state of each sample, one column per sample
+  Eigen::ArrayXXd y(3, num_samples);
+  Eigen::ArrayXXd yd(3, num_samples);
+  Eigen::ArrayXXd ydd(3, num_samples);
+  std::vector<Eigen::Quaterniond, Eigen::aligned_allocator<Eigen::Quaterniond> > r(
+      num_samples, start_r_array);
+  Eigen::ArrayXXd rd(3, num_samples);
+  Eigen::ArrayXXd rdd(3, num_samples);
+
+  double last_t = T[0];
+  for(int i = 0; i < num_T; ++i)
+  {
+    const double t = T[i];
+
+    if(t <= start_t || i == 0)
+    {
+      for(int s = 0; s < num_samples; ++s)
+      {
+        y.col(s) = start_y_array;
+        yd.col(s) = start_yd_array;
+        ydd.col(s) = start_ydd_array;
+        r[s] = start_r_array;
+        rd.col(s) = start_rd_array;
+        rdd.col(s) = start_rdd_array;
+      }
+    }
+
+    if(t > start_t)
+    {
+      // We use multiple integration steps to improve numerical precision
+      double current_t = last_t;
+      while(current_t < t)
+      {
+        double dt_int = integration_dt;
+        if(t - current_t < dt_int)
+          dt_int = t - current_t;
+
+        current_t += dt_int;
+
+        const double z = phase(current_t, alpha_z, goal_t, start_t);
+        const Eigen::ArrayXd activations = rbfActivations(
+            z, widths_array, centers_array, true);
+        applyConstraints(current_t, goal_y_array, goal_t, coefficients, g, gd, gdd);
+
+        for(int s = 0; s < num_samples; ++s)
+        {
+          const Eigen::ArrayXd f = (
+              z * position_weights[s].matrix() * activations.matrix()).array();
+          ydd.col(s) = (alpha_y
+                        * (beta_y * (g - y.col(s))
+                           + execution_time * gd
+                           - execution_time * yd.col(s))
+                        + gdd * execution_time_squared + f)
+                       / execution_time_squared;
+          y.col(s) += dt_int * yd.col(s);
+          yd.col(s) += dt_int * ydd.col(s);
+
+          const Eigen::ArrayXd fr = (
+              z * orientation_weights[s].matrix() * activations.matrix()).array();
+          rdd.col(s) = (alpha_y * (beta_y * 2.0 * qLog(goal_r_array * r[s].conjugate())
+                                   - execution_time * rd.col(s))
+                        + fr)
+                       / execution_time_squared;
+          r[s] = vecExp(dt_int / 2.0 * rd.col(s).matrix()) * r[s];
+          rd.col(s) += dt_int * rdd.col(s);
+        }
+      }
+    }
+    last_t = t;
+
+    for(int s = 0; s < num_samples; ++s)
+    {
+      double* x = X + s * sample_trajectory_size + i * num_X_dims;
+      x[0] = y(0, s);
+      x[1] = y(1, s);
+      x[2] = y(2, s);
+      x[3] = r[s].w();
+      x[4] = r[s].x();
+      x[5] = r[s].y();
+      x[6] = r[s].z();
+    }
+  }
+}
+
+
 namespace internal
 {
 
@@ -92,6 +92,67 @@ void imitate(
   bool allow_final_velocity = true
 );
 
+/**
+ * Represent multiple demonstrations as DMPs.
+ *
+ * All demonstrations must have the same time steps. The design matrix of the
+ * radial basis functions and its factorization are computed only once.
+ * There are two modes that will be selected based on the shape of weights:
+ *
+ * - num_samples == 1: fit one weight matrix to all demonstrations (stacked
+ *   ridge regression)
+ * - num_samples == num_demos: fit one weight matrix to each demonstration
+ *   independently, the result is the same as calling imitate for each
+ *   demonstration
+ *
+ * \param T time for each step of the trajectories
+ * \param num_T number of steps
+ * \param Y positions, contains num_demos * num_T * num_dimensions entries in
+ *        row-major order
+ * \param num_demos number of demonstrations
+ * \param num_steps number of steps
+ * \param num_task_dims number of dimensions
+ * \param weights weights that reproduce the trajectories (will be updated),
+ *        contains num_samples * num_weights_per_dim * num_weight_dims
+ *        entries in row-major order
+ * \param num_samples number of weight matrices (1 or num_demos)
+ * \param num_weights_per_dim number of features per dimension
+ * \param num_weight_dims number of dimensions
+ * \param widths widths of the radial basis functions (shared among DOFs)
+ * \param num_widths number of RBFs
+ * \param centers centers of the radial basis functions (shared among DOFs)
+ * \param num_centers number of RBFs
+ * \param regularization_coefficient can be set to solve instable problems
+ *        where there are more weights that have to be learned than samples
+ *        in the demonstrated trajectory (default: 1e-10)
+ * \param alpha_y constant that has to be set for critical damping (default: 25)
+ * \param beta_y constant that has to be set for critical damping (default: 25 / 4.0)
+ * \param alpha_z decay rate of the phase variable (default: 25.0 / 3.0)
+ * \param allow_final_velocity compute the final velocity from the data,
+ *        otherwise we will assume it to be zero
+ */
+void imitateBatch(
+  const double* T,
+  int num_T,
+  const double* Y,
+  int num_demos,
+  int num_steps,
+  int num_task_dims,
+  double* weights,
+  int num_samples,
+  int num_weights_per_dim,
+  int num_weight_dims,
+  const double* widths,
+  int num_widths,
+  const double* centers,
+  int num_centers,
+  const double regularization_coefficient = 1e-10,
+  const double alpha_y = 25.0,
+  const double beta_y = 6.25,
+  const double alpha_z = 8.33,
+  bool allow_final_velocity = true
+);
+
 /**
  * Execute one step of the DMP.
  *
@@ -182,6 +243,366 @@ void dmpStep(
   const double integration_dt = 0.001
 );
 
+/**
+ * Generate open-loop trajectories of a DMP for multiple weight matrices.
+ *
+ * This is equivalent to calling dmpStep for each time step and each weight
+ * matrix, where the outputs of the previous step are the inputs of the next
+ * step. The goal trajectory and the activations of the RBFs are computed
+ * only once per integration step for all weight matrices.
+ *
+ * \param T time for each step of the trajectories, the state at T[0] will be
+ *        the start state if T[0] <= start_t
+ * \param num_T number of steps
+ * \param goal_y goal position
+ * \param num_goal_y number of dimensions
+ * \param goal_yd goal velocity
+ * \param num_goal_yd number of dimensions
+ * \param goal_ydd goal acceleration
+ * \param num_goal_ydd number of dimensions
+ * \param start_y start position
+ * \param num_start_y number of dimensions
+ * \param start_yd start velocity
+ * \param num_start_yd number of dimensions
+ * \param start_ydd start acceleration
+ * \param num_start_ydd number of dimensions
+ * \param goal_t time at the end of the DMP
+ * \param start_t time at the start of the DMP
+ * \param weights weights of the forcing term for each sample, contains
+ *        num_samples * num_weights_per_dim * num_weight_dims entries in
+ *        row-major order
+ * \param num_samples number of weight matrices
+ * \param num_weights_per_dim number of features per dimension
+ * \param num_weight_dims number of dimensions
+ * \param widths widths of the radial basis functions (shared among DOFs)
+ * \param num_widths number of RBFs
+ * \param centers centers of the radial basis functions (shared among DOFs)
+ * \param num_centers number of RBFs
+ * \param Y positions (will be updated), contains
+ *        num_samples * num_T * num_dimensions entries in row-major order
+ * \param num_Y_samples number of weight matrices
+ * \param num_Y_steps number of steps
+ * \param num_Y_dims number of dimensions
+ * \param Yd velocities (will be updated)
+ * \param num_Yd_samples number of weight matrices
+ * \param num_Yd_steps number of steps
+ * \param num_Yd_dims number of dimensions
+ * \param Ydd accelerations (will be updated)
+ * \param num_Ydd_samples number of weight matrices
+ * \param num_Ydd_steps number of steps
+ * \param num_Ydd_dims number of dimensions
+ * \param alpha_y constant that has to be set for critical damping (default: 25)
+ * \param beta_y constant that has to be set for critical damping (default: 25 / 4.0)
+ * \param alpha_z decay rate of the phase variable (default: 25.0 / 3.0)
+ * \param integration_dt temporal step-size that will be used to integrate the
+ *        velocity and position of the trajectory from the acceleration,
+ *        smaller values will require more computation but will reproduce the
+ *        demonstration more accurately
+ */
+void dmpTrajectories(
+  const double* T,
+  int num_T,
+  const double* goal_y,
+  int num_goal_y,
+  const double* goal_yd,
+  int num_goal_yd,
+  const double* goal_ydd,
+  int num_goal_ydd,
+  const double* start_y,
+  int num_start_y,
+  const double* start_yd,
+  int num_start_yd,
+  const double* start_ydd,
+  int num_start_ydd,
+  const double goal_t,
+  const double start_t,
+  const double* weights,
+  int num_samples,
+  int num_weights_per_dim,
+  int num_weight_dims,
+  const double* widths,
+  int num_widths,
+  const double* centers,
+  int num_centers,
+  double* Y,
+  int num_Y_samples,
+  int num_Y_steps,
+  int num_Y_dims,
+  double* Yd,
+  int num_Yd_samples,
+  int num_Yd_steps,
+  int num_Yd_dims,
+  double* Ydd,
+  int num_Ydd_samples,
+  int num_Ydd_steps,
+  int num_Ydd_dims,
+  const double alpha_y = 25.0,
+  const double beta_y = 6.25,
+  const double alpha_z = 8.33,
+  const double integration_dt = 0.001
+);
+
+/**
+ * Generate open-loop trajectories of one DMP of a sequence for multiple
+ * samples.
+ *
+ * In contrast to dmpTrajectories, each sample has its own start and goal and
+ * the trajectories do not begin in the start state. The state of each sample
+ * at T[0], e.g. the last state of the previous DMP of the sequence, has to
+ * be set in the first step of Y, Yd, and Ydd and the remaining steps will be
+ * integrated from it. This is equivalent to calling dmpStep for each of the
+ * remaining time steps and each sample, where the outputs of the previous
+ * step are the inputs of the next step. The activations of the RBFs are
+ * computed only once per integration step for all samples.
+ *
+ * \param T time for each step of the trajectories
+ * \param num_T number of steps
+ * \param goal_y goal position of each sample
+ * \param num_goal_y_samples number of samples
+ * \param num_goal_y_dims number of dimensions
+ * \param goal_yd goal velocity of each sample
+ * \param num_goal_yd_samples number of samples
+ * \param num_goal_yd_dims number of dimensions
+ * \param goal_ydd goal acceleration of each sample
+ * \param num_goal_ydd_samples number of samples
+ * \param num_goal_ydd_dims number of dimensions
+ * \param start_y start position of each sample
+ * \param num_start_y_samples number of samples
+ * \param num_start_y_dims number of dimensions
+ * \param start_yd start velocity of each sample
+ * \param num_start_yd_samples number of samples
+ * \param num_start_yd_dims number of dimensions
+ * \param start_ydd start acceleration of each sample
+ * \param num_start_ydd_samples number of samples
+ * \param num_start_ydd_dims number of dimensions
+ * \param goal_t time at the end of the DMP
+ * \param start_t time at the start of the DMP
+ * \param weights weights of the forcing term for each sample, contains
+ *        num_samples * num_weights_per_dim * num_weight_dims entries in
+ *        row-major order
+ * \param num_samples number of weight matrices
+ * \param num_weights_per_dim number of features per dimension
+ * \param num_weight_dims number of dimensions
+ * \param widths widths of the radial basis functions (shared among DOFs)
+ * \param num_widths number of RBFs
+ * \param centers centers of the radial basis functions (shared among DOFs)
+ * \param num_centers number of RBFs
+ * \param Y positions (the first step has to be set, the others will be
+ *        updated), contains num_samples * num_T * num_dimensions entries in
+ *        row-major order
+ * \param num_Y_samples number of samples
+ * \param num_Y_steps number of steps
+ * \param num_Y_dims number of dimensions
+ * \param Yd velocities (the first step has to be set, the others will be
+ *        updated)
+ * \param num_Yd_samples number of samples
+ * \param num_Yd_steps number of steps
+ * \param num_Yd_dims number of dimensions
+ * \param Ydd accelerations (the first step has to be set, the others will be
+ *        updated)
+ * \param num_Ydd_samples number of samples
+ * \param num_Ydd_steps number of steps
+ * \param num_Ydd_dims number of dimensions
+ * \param alpha_y constant that has to be set for critical damping (default: 25)
+ * \param beta_y constant that has to be set for critical damping (default: 25 / 4.0)
+ * \param alpha_z decay rate of the phase variable (default: 25.0 / 3.0)
+ * \param integration_dt temporal step-size that will be used to integrate the
+ *        velocity and position of the trajectory from the acceleration,
+ *        smaller values will require more computation but will reproduce the
+ *        demonstration more accurately
+ */
+void dmpSegmentTrajectories(
+  const double* T,
+  int num_T,
+  const double* goal_y,
+  int num_goal_y_samples,
+  int num_goal_y_dims,
+  const double* goal_yd,
+  int num_goal_yd_samples,
+  int num_goal_yd_dims,
+  const double* goal_ydd,
+  int num_goal_ydd_samples,
+  int num_goal_ydd_dims,
+  const double* start_y,
+  int num_start_y_samples,
+  int num_start_y_dims,
+  const double* start_yd,
+  int num_start_yd_samples,
+  int num_start_yd_dims,
+  const double* start_ydd,
+  int num_start_ydd_samples,
+  int num_start_ydd_dims,
+  const double goal_t,
+  const double start_t,
+  const double* weights,
+  int num_samples,
+  int num_weights_per_dim,
+  int num_weight_dims,
+  const double* widths,
+  int num_widths,
+  const double* centers,
+  int num_centers,
+  double* Y,
+  int num_Y_samples,
+  int num_Y_steps,
+  int num_Y_dims,
+  double* Yd,
+  int num_Yd_samples,
+  int num_Yd_steps,
+  int num_Yd_dims,
+  double* Ydd,
+  int num_Ydd_samples,
+  int num_Ydd_steps,
+  int num_Ydd_dims,
+  const double alpha_y = 25.0,
+  const double beta_y = 6.25,
+  const double alpha_z = 8.33,
+  const double integration_dt = 0.001
+);
+
+/**
+ * Precompute the phase and the normalized RBF activations for each
+ * integration step of a sequence of DMP steps.
+ *
+ * The activations only depend on the time, hence, they can be reused for
+ * every execution of a DMP with the same step size, execution time, and
+ * decay rate of the phase variable. The integration steps between T[i - 1]
+ * and T[i] are determined exactly like in dmpStep.
+ *
+ * \param T time for each step, the entries for T[0] will be 0
+ * \param num_T number of steps
+ * \param phases phase value of each integration step (will be updated),
+ *        unused entries will be 0
+ * \param num_phases_steps number of steps
+ * \param num_phases_substeps maximum number of integration steps per step
+ * \param activations normalized activations of the RBFs for each
+ *        integration step (will be updated), unused entries will be 0
+ * \param num_activations_steps number of steps
+ * \param num_activations_substeps maximum number of integration steps per
+ *        step
+ * \param num_activations_features number of RBFs
+ * \param widths widths of the radial basis functions (shared among DOFs)
+ * \param num_widths number of RBFs
+ * \param centers centers of the radial basis functions (shared among DOFs)
+ * \param num_centers number of RBFs
+ * \param goal_t time at the end of the DMP
+ * \param start_t time at the start of the DMP
+ * \param alpha_z decay rate of the phase variable (default: 25.0 / 3.0)
+ * \param integration_dt temporal step-size that will be used to integrate the
+ *        velocity and position of the trajectory from the acceleration
+ */
+void rbfActivationTable(
+  const double* T,
+  int num_T,
+  double* phases,
+  int num_phases_steps,
+  int num_phases_substeps,
+  double* activations,
+  int num_activations_steps,
+  int num_activations_substeps,
+  int num_activations_features,
+  const double* widths,
+  int num_widths,
+  const double* centers,
+  int num_centers,
+  const double goal_t,
+  const double start_t,
+  const double alpha_z = 8.33,
+  const double integration_dt = 0.001
+);
+
+/**
+ * Execute one step of the DMP with precomputed RBF activations.
+ *
+ * This is equivalent to dmpStep, but the phase and the activations of the
+ * RBFs for each integration step are taken from a row of the tables that
+ * have been computed by rbfActivationTable.
+ *
+ * \param last_t time of last step (should equal t initially)
+ * \param t current time
+ * \param last_y last position
+ * \param num_last_y number of dimensions
+ * \param last_yd last velocity
+ * \param num_last_yd number of dimensions
+ * \param last_ydd last acceleration
+ * \param num_last_ydd number of dimensions
+ * \param y current position (will be updated)
+ * \param num_y number of dimensions
+ * \param yd velocity (will be updated)
+ * \param num_yd number of dimensions
+ * \param ydd acceleration (will be updated)
+ * \param num_ydd number of dimensions
+ * \param goal_y goal position
+ * \param num_goal_y number of dimensions
+ * \param goal_yd goal velocity
+ * \param num_goal_yd number of dimensions
+ * \param goal_ydd goal acceleration
+ * \param num_goal_ydd number of dimensions
+ * \param start_y start position
+ * \param num_start_y number of dimensions
+ * \param start_yd start velocity
+ * \param num_start_yd number of dimensions
+ * \param start_ydd start acceleration
+ * \param num_start_ydd number of dimensions
+ * \param goal_t time at the end of the DMP
+ * \param start_t time at the start of the DMP
+ * \param weights weights of the forcing term
+ * \param num_weights_per_dim number of features per dimension
+ * \param num_weight_dims number of dimensions
+ * \param phases phase value of each integration step of this step
+ * \param num_phases maximum number of integration steps
+ * \param activations normalized activations of the RBFs for each
+ *        integration step of this step
+ * \param num_activations_substeps maximum number of integration steps
+ * \param num_activations_features number of RBFs
+ * \param alpha_y constant that has to be set for critical damping (default: 25)
+ * \param beta_y constant that has to be set for critical damping (default: 25 / 4.0)
+ * \param integration_dt temporal step-size that will be used to integrate the
+ *        velocity and position of the trajectory from the acceleration,
+ *        must be the same that has been used to compute the activations
+ */
+void dmpStepPrecomputed(
+  const double last_t,
+  const double t,
+  const double* last_y,
+  int num_last_y,
+  const double* last_yd,
+  int num_last_yd,
+  const double* last_ydd,
+  int num_last_ydd,
+  double* y,
+  int num_y,
+  double* yd,
+  int num_yd,
+  double* ydd,
+  int num_ydd,
+  const double* goal_y,
+  int num_goal_y,
+  const double* goal_yd,
+  int num_goal_yd,
+  const double* goal_ydd,
+  int num_goal_ydd,
+  const double* start_y,
+  int num_start_y,
+  const double* start_yd,
+  int num_start_yd,
+  const double* start_ydd,
+  int num_start_ydd,
+  const double goal_t,
+  const double start_t,
+  const double* weights,
+  int num_weights_per_dim,
+  int num_weight_dims,
+  const double* phases,
+  int num_phases,
+  const double* activations,
+  int num_activations_substeps,
+  int num_activations_features,
+  const double alpha_y = 25.0,
+  const double beta_y = 6.25,
+  const double integration_dt = 0.001
+);
+
 /**
  * Represent trajectory as quaternion DMP.
  *
@@ -324,6 +745,203 @@ void quaternionDmpStep(
   const double integration_dt
 );
 
+/**
+ * Execute one step of the Quaternion DMP with precomputed RBF activations.
+ *
+ * This is equivalent to quaternionDmpStep, but the phase and the activations
+ * of the RBFs for each integration step are taken from a row of the tables
+ * that have been computed by rbfActivationTable.
+ *
+ * \param last_t time of last step (should equal t initially)
+ * \param t current time
+ * \param last_r last rotation
+ * \param num_last_r should be 4
+ * \param last_rd last rotational velocity
+ * \param num_last_rd should be 3
+ * \param last_rdd last rotational acceleration
+ * \param num_last_rdd should be 3
+ * \param r current rotation (will be updated)
+ * \param num_r should be 4
+ * \param rd rotational velocity (will be updated)
+ * \param num_rd should be 3
+ * \param rdd rotational acceleration (will be updated)
+ * \param num_rdd should be 3
+ * \param goal_r final rotation
+ * \param num_goal_r should be 4
+ * \param goal_rd final rotational velocity
+ * \param num_goal_rd should be 3
+ * \param goal_rdd final rotational acceleration
+ * \param num_goal_rdd should be 3
+ * \param start_r first rotation
+ * \param num_start_r should be 4
+ * \param start_rd first rotational velocity
+ * \param num_start_rd should be 3
+ * \param start_rdd first rotational acceleration
+ * \param num_start_rdd should be 3
+ * \param goal_t time at the end of the DMP
+ * \param start_t time at the start of the DMP
+ * \param weights weights of the forcing term
+ * \param num_weights_per_dim number of features per dimension
+ * \param num_weight_dims should be 3
+ * \param phases phase value of each integration step of this step
+ * \param num_phases maximum number of integration steps
+ * \param activations normalized activations of the RBFs for each
+ *        integration step of this step
+ * \param num_activations_substeps maximum number of integration steps
+ * \param num_activations_features number of RBFs
+ * \param alpha_r constant that has to be set for critical damping (default: 25)
+ * \param beta_r constant that has to be set for critical damping (default: 25 / 4.0)
+ * \param integration_dt temporal step-size that will be used to integrate the
+ *        velocity and position of the trajectory from the acceleration,
+ *        must be the same that has been used to compute the activations
+ */
+void quaternionDmpStepPrecomputed(
+  const double last_t,
+  const double t,
+  const double* last_r,
+  int num_last_r,
+  const double* last_rd,
+  int num_last_rd,
+  const double* last_rdd,
+  int num_last_rdd,
+  double* r,
+  int num_r,
+  double* rd,
+  int num_rd,
+  double* rdd,
+  int num_rdd,
+  const double* goal_r,
+  int num_goal_r,
+  const double* goal_rd,
+  int num_goal_rd,
+  const double* goal_rdd,
+  int num_goal_rdd,
+  const double* start_r,
+  int num_start_r,
+  const double* start_rd,
+  int num_start_rd,
+  const double* start_rdd,
+  int num_start_rdd,
+  const double goal_t,
+  const double start_t,
+  const double* weights,
+  int num_weights_per_dim,
+  int num_weight_dims,
+  const double* phases,
+  int num_phases,
+  const double* activations,
+  int num_activations_substeps,
+  int num_activations_features,
+  const double alpha_r,
+  const double beta_r,
+  const double integration_dt
+);
+
+/**
+ * Generate open-loop pose trajectories of a Cartesian DMP for multiple weight
+ * matrices.
+ *
+ * A Cartesian DMP consists of a DMP for the position and a quaternion DMP
+ * for the orientation that share the phase variable and the RBFs. This is
+ * equivalent to calling dmpStep and quaternionDmpStep for each time step and
+ * each weight matrix, where the outputs of the previous step are the inputs
+ * of the next step. The goal trajectory of the position and the activations
+ * of the RBFs are computed only once per integration step for all weight
+ * matrices.
+ *
+ * \param T time for each step of the trajectories, the state at T[0] will be
+ *        the start state if T[0] <= start_t
+ * \param num_T number of steps
+ * \param goal_y goal position
+ * \param num_goal_y should be 3
+ * \param goal_yd goal velocity
+ * \param num_goal_yd should be 3
+ * \param goal_ydd goal acceleration
+ * \param num_goal_ydd should be 3
+ * \param start_y start position
+ * \param num_start_y should be 3
+ * \param start_yd start velocity
+ * \param num_start_yd should be 3
+ * \param start_ydd start acceleration
+ * \param num_start_ydd should be 3
+ * \param goal_r final rotation
+ * \param num_goal_r should be 4
+ * \param start_r first rotation
+ * \param num_start_r should be 4
+ * \param start_rd first rotational velocity
+ * \param num_start_rd should be 3
+ * \param start_rdd first rotational acceleration
+ * \param num_start_rdd should be 3
+ * \param goal_t time at the end of the DMP
+ * \param start_t time at the start of the DMP
+ * \param weights weights of the forcing term for each sample, contains
+ *        num_samples * num_weights_per_dim * 6 entries in row-major order,
+ *        the first three columns of each weight matrix belong to the
+ *        position and the last three columns belong to the orientation
+ * \param num_samples number of weight matrices
+ * \param num_weights_per_dim number of features per dimension
+ * \param num_weight_dims should be 6
+ * \param widths widths of the radial basis functions (shared among DOFs)
+ * \param num_widths number of RBFs
+ * \param centers centers of the radial basis functions (shared among DOFs)
+ * \param num_centers number of RBFs
+ * \param X poses (will be updated), contains num_samples * num_T * 7
+ *        entries in row-major order, each pose is represented by a position
+ *        and a quaternion (order: x, y, z, qw, qx, qy, qz)
+ * \param num_X_samples number of weight matrices
+ * \param num_X_steps number of steps
+ * \param num_X_dims should be 7
+ * \param alpha_y constant that has to be set for critical damping (default: 25)
+ * \param beta_y constant that has to be set for critical damping (default: 25 / 4.0)
+ * \param alpha_z decay rate of the phase variable (default: 25.0 / 3.0)
+ * \param integration_dt temporal step-size that will be used to integrate the
+ *        velocity and position of the trajectory from the acceleration,
+ *        smaller values will require more computation but will reproduce the
+ *        demonstration more accurately
+ */
+void cartesianDmpTrajectories(
+  const double* T,
+  int num_T,
+  const double* goal_y,
+  int num_goal_y,
+  const double* goal_yd,
+  int num_goal_yd,
+  const double* goal_ydd,
+  int num_goal_ydd,
+  const double* start_y,
+  int num_start_y,
+  const double* start_yd,
+  int num_start_yd,
+  const double* start_ydd,
+  int num_start_ydd,
+  const double* goal_r,
+  int num_goal_r,
+  const double* start_r,
+  int num_start_r,
+  const double* start_rd,
+  int num_start_rd,
+  const double* start_rdd,
+  int num_start_rdd,
+  const double goal_t,
+  const double start_t,
+  const double* weights,
+  int num_samples,
+  int num_weights_per_dim,
+  int num_weight_dims,
+  const double* widths,
+  int num_widths,
+  const double* centers,
+  int num_centers,
+  double* X,
+  int num_X_samples,
+  int num_X_steps,
+  int num_X_dims,
+  const double alpha_y = 25.0,
+  const double beta_y = 6.25,
+  const double alpha_z = 8.33,
+  const double integration_dt = 0.001
+);
+
 namespace internal
 {
 
@@ -4,13 +4,15 @@
  */
 #include "DMPModel.h"
 #include <iostream>
+#include <cstring>
+#include <map>
 using namespace std;
 
 namespace dmp_cpp
 {
 
 DMPModel::DMPModel(const string& yamlFile, const string& name){
-  if(!from_yaml_file(yamlFile, name)){
+  if(!from_file(yamlFile, name)){
     stringstream ss;
     ss << "DMPModel: Unable to load dmp model file: " << yamlFile;
     throw std::runtime_error(ss.str());
@@ -112,6 +114,248 @@ bool DMPModel::from_yaml_file(string filepath, string name)
   return from_yaml_istream(fin, name);
 }
 
+bool DMPModel::from_file(string filepath, string name)
+{
+  if(is_binary_file(filepath))
+  {
+    return from_binary_file(filepath);
+  }
+  return from_yaml_file(filepath, name);
+}
+
+namespace
+{
+const char BINARY_MAGIC[4] = {'B', 'D', 'M', 'P'};
+const uint32_t BINARY_VERSION = 1;
+
+size_t padded(size_t numBytes)
+{
+  return numBytes + (8 - numBytes % 8) % 8;
+}
+
+//The binary format is little-endian independent of the platform
+bool read_uint(istream& stream, uint64_t& value, int numBytes)
+{
+  unsigned char buffer[8];
+  if(!stream.read(reinterpret_cast<char*>(buffer), numBytes))
+    return false;
+  value = 0;
+  for(int i = numBytes - 1; i >= 0; --i)
+    value = (value << 8) | buffer[i];
+  return true;
+}
+
+void write_uint(ostream& stream, uint64_t value, int numBytes)
+{
+  for(int i = 0; i < numBytes; ++i)
+  {
+    stream.put(static_cast<char>(value & 0xff));
+    value >>= 8;
+  }
+}
+
+bool read_doubles(istream& stream, vector<double>& values)
+{
+  for(size_t i = 0; i < values.size(); ++i)
+  {
+    uint64_t bits;
+    if(!read_uint(stream, bits, 8))
+      return false;
+    memcpy(&values[i], &bits, sizeof(double));
+  }
+  return true;
+}
+
+void write_doubles(ostream& stream, const vector<double>& values)
+{
+  for(size_t i = 0; i < values.size(); ++i)
+  {
+    uint64_t bits;
+    memcpy(&bits, &values[i], sizeof(double));
+    write_uint(stream, bits, 8);
+  }
+}
+
+void write_padding(ostream& stream, size_t numBytes)
+{
+  for(size_t i = numBytes; i < padded(numBytes); ++i)
+    stream.put('\0');
+}
+
+struct BinaryArray
+{
+  uint64_t rows;
+  uint64_t cols;
+  uint64_t offset;
+};
+}
+
+bool DMPModel::is_binary_file(const string& filepath)
+{
+  ifstream fin(filepath.c_str(), ios::in | ios::binary);
+  char magic[4];
+  if(!fin.is_open() || !fin.read(magic, 4))
+  {
+    return false;
+  }
+  return memcmp(magic, BINARY_MAGIC, 4) == 0;
+}
+
+bool DMPModel::from_binary_file(string filepath)
+{
+  ifstream fin(filepath.c_str(), ios::in | ios::binary);
+  if(!fin.is_open())
+  {
+    return false;
+  }
+  return from_binary_istream(fin);
+}
+
+bool DMPModel::from_binary_istream(istream& stream)
+{
+  char magic[4];
+  uint64_t version, numArrays, nameLength;
+  if(!stream.read(magic, 4) || memcmp(magic, BINARY_MAGIC, 4) != 0 ||
+     !read_uint(stream, version, 4) || !read_uint(stream, numArrays, 4) ||
+     !read_uint(stream, nameLength, 4))
+  {
+    cerr << "Not a binary DMP model" << endl;
+    return false;
+  }
+  if(version != BINARY_VERSION)
+  {
+    cerr << "Unsupported version of binary DMP model: " << version << endl;
+    return false;
+  }
+
+  vector<char> buffer(padded(nameLength));
+  if(!buffer.empty() && !stream.read(&buffer[0], buffer.size()))
+    return false;
+  model_name = string(buffer.begin(), buffer.begin() + nameLength);
+
+  map<string, BinaryArray> arrays;
+  for(uint64_t i = 0; i < numArrays; ++i)
+  {
+    uint64_t keyLength, ndim;
+    BinaryArray array;
+    if(!read_uint(stream, keyLength, 4) || !read_uint(stream, ndim, 4) ||
+       !read_uint(stream, array.rows, 8) || !read_uint(stream, array.cols, 8) ||
+       !read_uint(stream, array.offset, 8))
+      return false;
+    buffer.resize(padded(keyLength));
+    if(!buffer.empty() && !stream.read(&buffer[0], buffer.size()))
+      return false;
+    arrays[string(buffer.begin(), buffer.begin() + keyLength)] = array;
+  }
+
+  const char* scalarKeys[] = {"ts_alpha_z", "ts_beta_z", "ts_tau", "ts_dt",
+                              "cs_execution_time", "cs_alpha", "cs_dt"};
+  double* scalars[] = {&ts_alpha_z, &ts_beta_z, &ts_tau, &ts_dt,
+                       &cs_execution_time, &cs_alpha, &cs_dt};
+  const char* vectorKeys[] = {"rbf_centers", "rbf_widths", "weights"};
+  vector<double>* vectors[3] = {&rbf_centers, &rbf_widths, 0};
+  vector<double> weights;
+  vectors[2] = &weights;
+
+  for(int i = 0; i < 7; ++i)
+  {
+    map<string, BinaryArray>::const_iterator it = arrays.find(scalarKeys[i]);
+    vector<double> value(1);
+    if(it == arrays.end() || !stream.seekg(it->second.offset) ||
+       !read_doubles(stream, value))
+    {
+      cerr << "Binary DMP model does not contain '" << scalarKeys[i] << "'" << endl;
+      return false;
+    }
+    *scalars[i] = value[0];
+  }
+  BinaryArray weightsShape = {0, 0, 0};
+  for(int i = 0; i < 3; ++i)
+  {
+    map<string, BinaryArray>::const_iterator it = arrays.find(vectorKeys[i]);
+    if(it == arrays.end())
+    {
+      cerr << "Binary DMP model does not contain '" << vectorKeys[i] << "'" << endl;
+      return false;
+    }
+    vectors[i]->resize(it->second.rows * it->second.cols);
+    if(!stream.seekg(it->second.offset) || !read_doubles(stream, *vectors[i]))
+      return false;
+    if(i == 2)
+      weightsShape = it->second;
+  }
+
+  //weights are stored as (num_features, num_task_dims)
+  ft_weights.assign(weightsShape.cols, vector<double>(weightsShape.rows));
+  for(uint64_t feature = 0; feature < weightsShape.rows; ++feature)
+    for(uint64_t dim = 0; dim < weightsShape.cols; ++dim)
+      ft_weights[dim][feature] = weights[feature * weightsShape.cols + dim];
+
+  return is_valid();
+}
+
+bool DMPModel::to_binary_file(string filepath)
+{
+  const size_t numTaskDims = ft_weights.size();
+  const size_t numFeatures = numTaskDims > 0 ? ft_weights[0].size() : 0;
+  vector<double> weights(numFeatures * numTaskDims);
+  for(size_t dim = 0; dim < numTaskDims; ++dim)
+  {
+    if(ft_weights[dim].size() != numFeatures)
+      return false;
+    for(size_t feature = 0; feature < numFeatures; ++feature)
+      weights[feature * numTaskDims + dim] = ft_weights[dim][feature];
+  }
+
+  const char* keys[] = {"cs_alpha", "cs_execution_time", "cs_dt",
+                        "ts_alpha_z", "ts_beta_z", "ts_tau", "ts_dt",
+                        "rbf_widths", "rbf_centers", "weights"};
+  const double scalarValues[] = {cs_alpha, cs_execution_time, cs_dt,
+                                 ts_alpha_z, ts_beta_z, ts_tau, ts_dt};
+  vector<vector<double> > values;
+  vector<uint64_t> ndims, rows, cols;
+  for(int i = 0; i < 7; ++i)
+  {
+    values.push_back(vector<double>(1, scalarValues[i]));
+    ndims.push_back(0); rows.push_back(1); cols.push_back(1);
+  }
+  values.push_back(rbf_widths);
+  ndims.push_back(1); rows.push_back(rbf_widths.size()); cols.push_back(1);
+  values.push_back(rbf_centers);
+  ndims.push_back(1); rows.push_back(rbf_centers.size()); cols.push_back(1);
+  values.push_back(weights);
+  ndims.push_back(2); rows.push_back(numFeatures); cols.push_back(numTaskDims);
+  const size_t numArrays = values.size();
+
+  uint64_t offset = 16 + padded(model_name.size());
+  for(size_t i = 0; i < numArrays; ++i)
+    offset += 32 + padded(strlen(keys[i]));
+
+  ofstream fout(filepath.c_str(), ios::out | ios::binary | ios::trunc);
+  if(!fout.is_open())
+    return false;
+  fout.write(BINARY_MAGIC, 4);
+  write_uint(fout, BINARY_VERSION, 4);
+  write_uint(fout, numArrays, 4);
+  write_uint(fout, model_name.size(), 4);
+  fout << model_name;
+  write_padding(fout, model_name.size());
+  for(size_t i = 0; i < numArrays; ++i)
+  {
+    write_uint(fout, strlen(keys[i]), 4);
+    write_uint(fout, ndims[i], 4);
+    write_uint(fout, rows[i], 8);
+    write_uint(fout, cols[i], 8);
+    write_uint(fout, offset, 8);
+    fout << keys[i];
+    write_padding(fout, strlen(keys[i]));
+    offset += 8 * values[i].size();
+  }
+  for(size_t i = 0; i < numArrays; ++i)
+    write_doubles(fout, values[i]);
+  return fout.good();
+}
+
 bool DMPModel::from_yaml_string(const string &yaml, string name)
 {
   stringstream sin(yaml);
@@ -9,6 +9,7 @@
 #include <istream>
 #include <iomanip>
 #include <math.h>
+#include <stdint.h>
 
 namespace dmp_cpp{
 class DMPModel{
@@ -36,6 +37,34 @@ public:
     bool from_yaml_istream(std::istream& stream, std::string name);
     bool from_yaml_string(const std::string& yaml, std::string name);
 
+    /**
+     * Loads the model from a YAML file or a binary file.
+     * The format is detected from the content of the file.
+     * \param name is ignored for binary files, they contain only one model
+     */
+    bool from_file(std::string filepath, std::string name);
+
+    /**
+     * Loads the model from a binary file that has been written by
+     * to_binary_file() or by bolero.representation.dmp_behavior.
+     * All numbers are stored as little-endian values. The file contains
+     * a header ("BDMP", version, number of arrays, length of the name as
+     * uint32), the name, an entry for each array (length of the key and
+     * number of dimensions as uint32, two dimensions and the offset of the
+     * data as uint64, the key) and the data of the arrays as float64.
+     * The name, the keys and the data are padded to multiples of 8 bytes.
+     * The weights are stored as array "weights" with the shape
+     * (num_features, num_task_dims), i.e. transposed to ft_weights.
+     */
+    bool from_binary_file(std::string filepath);
+    bool from_binary_istream(std::istream& stream);
+
+    /**
+     * \return true if the file starts with the magic number of the binary
+     *         format
+     */
+    static bool is_binary_file(const std::string& filepath);
+
 
 
     /**
@@ -44,6 +73,7 @@ public:
     virtual bool is_valid() const;
 
     void to_yaml_file(std::string filepath);
+    bool to_binary_file(std::string filepath);
 
     friend std::ostream& operator << (std::ostream& os, DMPModel& val);
 
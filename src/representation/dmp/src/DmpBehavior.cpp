@@ -31,7 +31,7 @@ DmpBehavior::DmpBehavior(lib_manager::LibManager *manager) :
 
 bool DmpBehavior::initialize(const std::string& modelPath)
 {
-  model.from_yaml_file(modelPath, ""); //FIXME find a way to specify the model name
+  model.from_file(modelPath, ""); //FIXME find a way to specify the model name
   return initialize(model);
 }
 
@@ -34,7 +34,7 @@ QuaternionDmp::QuaternionDmp(lib_manager::LibManager* manager) :
 bool QuaternionDmp::initialize(const std::string &initialConfigPath)
 {
   QuaternionDmpModel model;
-  if(!model.from_yaml_file(initialConfigPath, ""))//FIXME find way to set name
+  if(!model.from_file(initialConfigPath, ""))//FIXME find way to set name
   {
     return false;
   }
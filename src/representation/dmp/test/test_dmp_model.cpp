@@ -119,6 +119,26 @@ TEST_CASE("Test DMPModel", "[DMPModel]") {
     }
 }
 
+TEST_CASE("Test binary DMPModel", "[DMPModel]") {
+    make_model();
+
+    char cp[1000];
+    get_current_dir(cp, sizeof(cp));
+    std::string current_path = cp;
+    std::string filepath = current_path+"/import_export_test.bdmp";
+    TestHelpers::delete_file_if_exists(filepath);
+
+    REQUIRE(initial_model.to_binary_file(filepath));
+    REQUIRE(DMPModel::is_binary_file(filepath));
+    REQUIRE_FALSE(DMPModel::is_binary_file("model.yaml"));
+
+    DMPModel loaded_model;
+    REQUIRE(loaded_model.from_file(filepath, ""));
+    compare_models(loaded_model, initial_model);
+    REQUIRE(loaded_model.ft_weights.size() == initial_model.ft_weights.size());
+    TestHelpers::delete_file_if_exists(filepath);
+}
+
 TEST_CASE("from_yaml_string", "[DMPModel]")
 {
     string yaml = "---\n"